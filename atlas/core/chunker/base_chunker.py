@@ -1,10 +1,20 @@
 from abc import ABC
 from abc import abstractmethod
-from typing import List, Dict
+from typing import Callable, Deque, List, Dict, Iterable, Iterator, Tuple
+from collections import deque
+from contextlib import ExitStack
+from itertools import chain
 from pathlib import Path
-import json
 
+from atlas.core.chunker.chunk_manifest import (
+    ChunkDelta,
+    ChunkManifest,
+    ChunkManifestEntry,
+    PreviousChunks,
+)
+from atlas.core.chunker.note_store import NoteStore
 from atlas.utils.logger import LoggerConfig
+from atlas.utils.io_utils import iter_records, write_records
 
 LOGGER = LoggerConfig().logger
 
@@ -15,15 +25,39 @@ class BaseChunker(ABC):
 
     Args:
         processed_data_path (str): Path to the processed data file.
-        output_path (str): Path to save the chunked data.
+        output_path (str): Path to save the chunked data. A `.jsonl` path streams one
+                           record per line, any other path is written as a JSON list.
+        incremental (bool): If True, only notes which changed since the last run are
+                            re-chunked. The chunks of unchanged notes are carried over from
+                            the previous chunked data. Default is False.
+        manifest_path (str | None): Path of the chunk manifest used in incremental mode.
+                                    Defaults to `<output_path stem>.chunk_manifest.json`.
     """
 
-    def __init__(self, processed_data_path: str, output_path: str) -> None:
+    # directory of the note store written along the chunks, set by chunkers which create
+    # compact chunks, ie, chunks referencing the note text and metadata by `note_id`
+    note_store_path: Path | None = None
+
+    def __init__(
+        self,
+        processed_data_path: str,
+        output_path: str,
+        incremental: bool = False,
+        manifest_path: str | None = None,
+    ) -> None:
         LOGGER.info("-" * 20)
         LOGGER.info("StructuralChunker initialized.")
         LOGGER.info(f"Chunking processed data at {processed_data_path}")
         self.processed_data_path = Path(processed_data_path)
         self.output_path = Path(output_path)
+        self.manifest: ChunkManifest | None = None
+        self.delta: ChunkDelta | None = None
+        if incremental:
+            self.manifest = ChunkManifest(
+                Path(manifest_path)
+                if manifest_path
+                else self.output_path.with_suffix(".chunk_manifest.json")
+            )
 
     def read_processed_data(self) -> List[Dict] | None:
         """
@@ -34,14 +68,23 @@ class BaseChunker(ABC):
             List[Dict] | None: The processed data as a list of dictionaries or None if an error occurs.
         """
         try:
-            with open(self.processed_data_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
+            data = list(self.iter_processed_data())
             LOGGER.info("Processed data successfully read.")
             return data
         except Exception as e:
             LOGGER.error(f"Error reading processed data: {e}")
             return None
 
+    def iter_processed_data(self) -> Iterator[Dict]:
+        """
+        Lazily read the processed data which is the output of the previous module
+        ie, `KnowledgeBaseProcessor`. A `.jsonl` file is streamed one note at a time.
+
+        Returns:
+            Iterator[Dict]: The processed notes.
+        """
+        return iter_records(self.processed_data_path)
+
     @abstractmethod
     def create_chunks(self, processed_data: List[Dict]) -> List[Dict]:
         """
@@ -55,36 +98,206 @@ class BaseChunker(ABC):
         """
         pass
 
-    def save_chunked_data(self, chunked_data: List[Dict]) -> None:
+    def iter_chunks(self, processed_data: Iterable[Dict]) -> Iterator[Dict]:
         """
-        Save the chunked data to the output path in JSON format.
-        This method writes to a temporary file first and then renames it to ensure atomicity.
-        This prevents data corruption in case of interruptions during the write process.
+        Chunk the processed data, yielding one chunk at a time. Chunkers which can stream
+        their output should override this, by default it yields the chunks returned by
+        `self.create_chunks()`.
+
+        Args:
+            processed_data (Iterable[Dict]): The processed data to be chunked.
+
+        Returns:
+            Iterator[Dict]: The chunked data.
+        """
+        yield from self.create_chunks(list(processed_data))
+
+    def iter_note_chunks(
+        self, jobs: Iterable[Tuple[Dict, List[Dict] | None]]
+    ) -> Iterator[Tuple[Dict, List[Dict]]]:
+        """
+        Chunk notes one at a time, passing through the notes whose chunks are already known
+        (eg, unchanged notes in incremental mode). Chunkers which can chunk notes more
+        efficiently (eg, in parallel) should override this.
 
         Args:
-            chunked_data (List[Dict]): The chunked data to be saved.
+            jobs (Iterable[Tuple[Dict, List[Dict] | None]]): Every processed note and its
+                                                               chunks, None if the note
+                                                               needs to be chunked.
+
+        Returns:
+            Iterator[Tuple[Dict, List[Dict]]]: Every note and its chunks, in job order.
         """
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self.output_path.with_suffix(".tmp")
+        for note, chunks in jobs:
+            yield note, chunks if chunks is not None else list(self.iter_chunks([note]))
 
-        with tmp_path.open("w", encoding="utf-8") as f:
-            json.dump(chunked_data, f, indent=2, ensure_ascii=False)
+    def chunk_config(self) -> Dict:
+        """
+        Get the configuration which determines the chunks of a note. In incremental mode,
+        every note is re-chunked when it changes. Chunkers with options should extend it.
 
-        tmp_path.replace(self.output_path)
-        LOGGER.info(f"Chunks saved successfully to {str(self.output_path)}")
+        Returns:
+            Dict: The chunking configuration, JSON serializable.
+        """
+        return {"chunker": type(self).__name__}
+
+    def iter_chunks_incremental(self, processed_data: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Chunk the processed data, only re-chunking the notes whose content hash changed
+        since the last run. The chunks of unchanged notes are streamed from the previous
+        chunked data, in the same order as they would be created.
+
+        Once the chunks are consumed, `self.delta` holds the added, removed and unchanged
+        chunk IDs and the manifest is ready to be saved.
+
+        Args:
+            processed_data (Iterable[Dict]): The processed data to be chunked, in the order
+                                             written by the ingester.
+
+        Returns:
+            Iterator[Dict]: The chunked data.
+        """
+        if self.manifest is None:
+            LOGGER.error("Incremental chunking requires incremental mode")
+            raise ValueError("Incremental chunking requires incremental mode")
+        manifest = self.manifest
+        manifest.load()
+
+        config = self.chunk_config()
+        previous_entries = manifest.entries
+        if manifest.config != config:
+            if previous_entries:
+                LOGGER.info("Chunking configuration changed, re-chunking every note")
+            previous_entries = {}
+        previous_chunk_ids = [
+            chunk_id
+            for entry in manifest.entries.values()
+            for chunk_id in entry.chunk_ids
+        ]
+
+        entries: Dict[str, ChunkManifestEntry] = {}
+        chunk_ids: List[str] = []
+        num_rechunked = 0
+        # hashes of the notes read ahead by `iter_note_chunks`, in note order
+        content_hashes: Deque[str] = deque()
+        previous_chunks = PreviousChunks(self.output_path)
+
+        def jobs() -> Iterator[Tuple[Dict, List[Dict] | None]]:
+            nonlocal num_rechunked
+            for note in processed_data:
+                content_hash = ChunkManifest.hash_note(note)
+                content_hashes.append(content_hash)
+                entry = previous_entries.get(note["note_id"])
+                if entry is not None and entry.content_hash == content_hash:
+                    chunks = previous_chunks.get(note["note_id"])
+                    if [chunk["chunk_id"] for chunk in chunks] == entry.chunk_ids:
+                        yield note, chunks
+                        continue
+                num_rechunked += 1
+                yield note, None
+
+        try:
+            for note, chunks in self.iter_note_chunks(jobs()):
+                entries[note["note_id"]] = ChunkManifestEntry(
+                    content_hash=content_hashes.popleft(),
+                    chunk_ids=[chunk["chunk_id"] for chunk in chunks],
+                )
+                chunk_ids.extend(entries[note["note_id"]].chunk_ids)
+                yield from chunks
+        finally:
+            previous_chunks.close()
+
+        previous_chunk_id_set = set(previous_chunk_ids)
+        chunk_id_set = set(chunk_ids)
+        delta = ChunkDelta(
+            added=[
+                chunk_id
+                for chunk_id in chunk_ids
+                if chunk_id not in previous_chunk_id_set
+            ],
+            removed=[
+                chunk_id
+                for chunk_id in previous_chunk_ids
+                if chunk_id not in chunk_id_set
+            ],
+            unchanged=[
+                chunk_id for chunk_id in chunk_ids if chunk_id in previous_chunk_id_set
+            ],
+        )
+        manifest.config = config
+        manifest.entries = entries
+        manifest.delta = delta
+        self.delta = delta
+        LOGGER.info(
+            f"Incremental chunking: {num_rechunked} notes re-chunked, "
+            f"{len(entries) - num_rechunked} carried over. Chunks: {len(delta.added)} added, "
+            f"{len(delta.removed)} removed, {len(delta.unchanged)} unchanged"
+        )
+
+    def save_chunked_data(self, chunked_data: Iterable[Dict]) -> None:
+        """
+        Save the chunked data to the output path in JSON (or JSON Lines) format.
+        This method writes to a temporary file first and then renames it to ensure atomicity.
+        This prevents data corruption in case of interruptions during the write process.
+
+        Args:
+            chunked_data (Iterable[Dict]): The chunked data to be saved.
+        """
+        count = write_records(self.output_path, chunked_data)
+        LOGGER.info(f"{count} chunks saved successfully to {str(self.output_path)}")
 
     def chunk(self) -> None:
         """
         Perform the chunking process.
         """
-        processed_data = self.read_processed_data()
-        if processed_data is None or len(processed_data) == 0:
+        # notes are streamed from the processed data file and chunks straight to the output file
+        try:
+            processed_data = self.iter_processed_data()
+            first_note = next(processed_data, None)
+        except Exception as e:
+            LOGGER.error(f"Error reading processed data: {e}")
+            first_note = None
+        if first_note is None:
             LOGGER.error("No processed data available for chunking. Aborting.")
             return
-        LOGGER.info(f"Creating chunks for {len(processed_data)} items.")
-        chunked_data = self.create_chunks(processed_data)
-        if chunked_data and len(chunked_data) > 0:
-            LOGGER.info(f"Saving chunked data for {len(chunked_data)} items.")
-            self.save_chunked_data(chunked_data)
-        else:
-            LOGGER.warning("No chunked data created. Nothing to save.")
+        LOGGER.info("Creating chunks.")
+        notes: Iterable[Dict] = chain([first_note], processed_data)
+        with ExitStack() as stack:
+            if self.note_store_path is not None:
+                # every note is stored as it is chunked, the store is committed with the
+                # chunks which reference it
+                note_store = stack.enter_context(NoteStore.writer(self.note_store_path))
+                notes = self._store_notes(notes, note_store.add)
+            chunked_data = (
+                self.iter_chunks_incremental(notes)
+                if self.manifest is not None
+                else self.iter_chunks(notes)
+            )
+            first_chunk = next(chunked_data, None)
+            if first_chunk is None:
+                LOGGER.warning("No chunked data created. Nothing to save.")
+                return
+            LOGGER.info("Saving chunked data.")
+            self.save_chunked_data(chain([first_chunk], chunked_data))
+        # the manifest is saved after the chunked data, so that a failed run is
+        # simply re-detected on the next run
+        if self.manifest is not None:
+            self.manifest.save()
+
+    @staticmethod
+    def _store_notes(
+        notes: Iterable[Dict], store: Callable[[Dict], None]
+    ) -> Iterator[Dict]:
+        """
+        Pass the notes through, storing each one on the way.
+
+        Args:
+            notes (Iterable[Dict]): The processed notes.
+            store (Callable[[Dict], None]): Stores a note.
+
+        Returns:
+            Iterator[Dict]: The processed notes.
+        """
+        for note in notes:
+            store(note)
+            yield note
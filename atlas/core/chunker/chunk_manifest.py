@@ -0,0 +1,201 @@
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Iterator, List
+import hashlib
+import json
+
+from atlas.core.ingester.vault_walker import walk_order_key
+from atlas.utils.io_utils import iter_records
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+
+@dataclass
+class ChunkManifestEntry:
+    """Content fingerprint of a chunked note and the IDs of its chunks."""
+
+    content_hash: str
+    chunk_ids: List[str]
+
+
+@dataclass
+class ChunkDelta:
+    """
+    Set of chunks (by `chunk_id`) that changed between two chunking runs.
+
+    Chunk IDs are derived from the note, the heading and the text of a chunk, so an
+    unchanged chunk ID means an unchanged embedding. The embedder only needs to embed the
+    `added` chunks and the indexer to drop the `removed` ones. The other metadata of an
+    `unchanged` chunk (eg, `chunk_index` or `frontmatter`) may still have changed.
+    """
+
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    def has_changes(self) -> bool:
+        """
+        Returns:
+            bool: True if any chunk was added or removed.
+        """
+        return bool(self.added or self.removed)
+
+
+class ChunkManifest:
+    """
+    Persisted manifest of every chunked note's content hash and chunk IDs. Used to only
+    re-chunk the notes which changed since the last run.
+
+    The chunking configuration is stored as well, notes are all re-chunked when it changes.
+
+    Manifest file schema:
+    {
+        "config": {...},
+        "notes": {"<note_id>": {"content_hash": str, "chunk_ids": [...]}},
+        "delta": {"added": [...], "removed": [...], "unchanged": [...]}
+    }
+
+    Args:
+        path (Path): Path of the manifest JSON file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.config: Dict = {}
+        self.entries: Dict[str, ChunkManifestEntry] = {}
+        self.delta = ChunkDelta()
+
+    @staticmethod
+    def hash_note(note: Dict) -> str:
+        """
+        Compute the content hash of a processed note. Every field is hashed as chunks copy
+        some of the note metadata (eg, `tags` and `frontmatter`).
+
+        Args:
+            note (Dict): The processed note.
+
+        Returns:
+            str: SHA-256 hex digest of the note serialized with sorted keys.
+        """
+        serialized = json.dumps(note, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def load(self) -> None:
+        """
+        Load the manifest from disk. A missing or unreadable manifest results in an
+        empty manifest, which means every note is re-chunked.
+        """
+        if not self.path.exists():
+            LOGGER.info(f"No chunk manifest found at {str(self.path)}. Starting fresh.")
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.config = data.get("config", {})
+            self.entries = {
+                note_id: ChunkManifestEntry(**entry)
+                for note_id, entry in data.get("notes", {}).items()
+            }
+            self.delta = ChunkDelta(**data.get("delta", {}))
+            LOGGER.info(
+                f"Chunk manifest with {len(self.entries)} notes loaded from {str(self.path)}"
+            )
+        except Exception as e:
+            LOGGER.error(f"Error reading chunk manifest, starting fresh : {e}")
+            self.config = {}
+            self.entries = {}
+            self.delta = ChunkDelta()
+
+    def save(self) -> None:
+        """
+        Save the manifest to disk atomically.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+
+        data = {
+            "config": self.config,
+            "notes": {
+                note_id: asdict(entry) for note_id, entry in self.entries.items()
+            },
+            "delta": asdict(self.delta),
+        }
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        tmp_path.replace(self.path)
+        LOGGER.info(f"Chunk manifest saved successfully to {str(self.path)}")
+
+
+def load_chunk_delta(manifest_path: Path) -> ChunkDelta:
+    """
+    Load the delta of the last chunking run, eg, for the embedder to only embed the added
+    chunks.
+
+    Args:
+        manifest_path (Path): Path of the chunk manifest JSON file.
+
+    Returns:
+        ChunkDelta: The delta, empty if the manifest cannot be read.
+    """
+    manifest = ChunkManifest(manifest_path)
+    manifest.load()
+    return manifest.delta
+
+
+class PreviousChunks:
+    """
+    Streams the chunks (or embedded chunks) written by the previous run to look up the
+    chunks to carry over, without loading the whole file in memory.
+
+    Chunks are looked up note by note in vault walk order, which is also the order the
+    previous run wrote them in, so the file is read only once front to back. A note which
+    cannot be found this way is simply processed again.
+
+    Args:
+        path (Path): Path of the previous chunk file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._records: Iterator[Dict] = iter(())
+        self._current: Dict | None = None
+        if Path(path).exists():
+            self._records = iter_records(Path(path))
+            self._advance()
+
+    def _advance(self) -> None:
+        """Move to the next chunk of the previous file."""
+        try:
+            self._current = next(self._records, None)
+        except Exception as e:
+            LOGGER.error(f"Error reading previous chunks, processing notes again : {e}")
+            self._current = None
+
+    def get(self, note_id: str) -> List[Dict]:
+        """
+        Get the chunks of a note from the previous file. Notes must be requested in vault
+        walk order.
+
+        Args:
+            note_id (str): ID of the note.
+
+        Returns:
+            List[Dict]: The previous chunks of the note, empty if there are none.
+        """
+        key = walk_order_key(note_id)
+        while (
+            self._current is not None and walk_order_key(self._current["note_id"]) < key
+        ):
+            self._advance()
+        chunks = []
+        while self._current is not None and self._current["note_id"] == note_id:
+            chunks.append(self._current)
+            self._advance()
+        return chunks
+
+    def close(self) -> None:
+        """Close the previous chunk file."""
+        close = getattr(self._records, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,215 @@
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Dict, Type
+import json
+import mmap
+
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+# note level metadata which compact chunks reference by `note_id` instead of copying
+NOTE_METADATA_FIELDS = ("title", "relative_path", "tags", "frontmatter")
+
+
+def note_text(note: Dict) -> str:
+    """
+    Get the text of a processed note which is chunked, ie, which the chunk offsets
+    (`start`, `end`) refer to.
+
+    Args:
+        note (Dict): The processed note.
+
+    Returns:
+        str: The stripped raw text of the note.
+    """
+    return note["raw_text"].strip()
+
+
+class NoteStoreWriter:
+    """
+    Context manager which writes a note store, see `NoteStore`.
+
+    The files are written to temporary files which replace the store files only when the
+    context exits without error.
+
+    Args:
+        path (Path): Directory of the note store.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.notes: Dict[str, Dict] = {}
+        self._offset = 0
+        self._file: BinaryIO | None = None
+
+    def __enter__(self) -> "NoteStoreWriter":
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._file = (self.path / "texts.tmp").open("wb")
+        return self
+
+    def add(self, note: Dict) -> None:
+        """
+        Append the text and the metadata of a processed note.
+
+        Args:
+            note (Dict): The processed note.
+        """
+        assert (
+            self._file is not None
+        ), "NoteStoreWriter must be used as a context manager"
+        data = note_text(note).encode("utf-8")
+        self._file.write(data)
+        self.notes[note["note_id"]] = {
+            "offset": self._offset,
+            "length": len(data),
+            **{field: note.get(field) for field in NOTE_METADATA_FIELDS},
+        }
+        self._offset += len(data)
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        assert self._file is not None
+        self._file.close()
+        if exc_type is not None:
+            (self.path / "texts.tmp").unlink(missing_ok=True)
+            return
+
+        with (self.path / "notes.tmp").open("w", encoding="utf-8") as f:
+            json.dump(self.notes, f, ensure_ascii=False)
+        (self.path / "texts.tmp").replace(self.path / "texts.txt")
+        (self.path / "notes.tmp").replace(self.path / "notes.json")
+        LOGGER.info(
+            f"{len(self.notes)} notes saved successfully to note store : {str(self.path)}"
+        )
+
+
+class NoteStore:
+    """
+    Store of the text and the metadata of every note, which compact chunks reference
+    instead of copying them. A compact chunk only holds the `note_id` and the character
+    offsets (`start`, `end`) of its text in the note text, so its text is materialized
+    only when it is needed, ie, to encode it or to assemble the retrieved context.
+
+    Store files:
+    - texts.txt -> the UTF-8 encoded note texts, one after the other (memory-mapped)
+    - notes.json -> {"<note_id>": {"offset": int, "length": int, "title": str,
+                     "relative_path": str, "tags": [...], "frontmatter": {...}}}
+                    where `offset` and `length` are in bytes within `texts.txt`
+
+    Args:
+        path (Path): Directory of the note store.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._mmap: mmap.mmap | None = None
+        # the chunks of a note are contiguous, so the last decoded text is kept
+        self._last_note_id: str | None = None
+        self._last_text = ""
+        try:
+            with (self.path / "notes.json").open("r", encoding="utf-8") as f:
+                self.notes: Dict[str, Dict] = json.load(f)
+            with (self.path / "texts.txt").open("rb") as f:
+                # an empty file cannot be memory-mapped
+                if any(note["length"] for note in self.notes.values()):
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception as e:
+            LOGGER.error(f"Error reading note store : {e}")
+            raise Exception(f"Error reading note store : {e}")
+
+    @staticmethod
+    def writer(path: Path) -> NoteStoreWriter:
+        """
+        Get a writer of a note store.
+
+        Args:
+            path (Path): Directory of the note store.
+
+        Returns:
+            NoteStoreWriter: The writer, to be used as a context manager.
+        """
+        return NoteStoreWriter(path)
+
+    def __len__(self) -> int:
+        return len(self.notes)
+
+    def __contains__(self, note_id: object) -> bool:
+        return note_id in self.notes
+
+    def text(self, note_id: str) -> str:
+        """
+        Get the text of a note.
+
+        Args:
+            note_id (str): ID of the note.
+
+        Returns:
+            str: The note text.
+        """
+        if note_id != self._last_note_id:
+            note = self.notes[note_id]
+            data = (
+                self._mmap[note["offset"] : note["offset"] + note["length"]]
+                if self._mmap is not None
+                else b""
+            )
+            self._last_note_id = note_id
+            self._last_text = data.decode("utf-8")
+        return self._last_text
+
+    def metadata(self, note_id: str) -> Dict:
+        """
+        Get the metadata of a note which is shared by all its chunks.
+
+        Args:
+            note_id (str): ID of the note.
+
+        Returns:
+            Dict: The `title`, `relative_path`, `tags` and `frontmatter` of the note.
+        """
+        note = self.notes[note_id]
+        return {field: note[field] for field in NOTE_METADATA_FIELDS}
+
+    def chunk_text(self, chunk: Dict) -> str:
+        """
+        Get the text of a chunk. The text of a compact chunk is sliced from its note text.
+
+        Args:
+            chunk (Dict): The chunk dictionary, compact or not.
+
+        Returns:
+            str: The chunk text.
+        """
+        if "text" in chunk:
+            return chunk["text"]
+        return self.text(chunk["note_id"])[chunk["start"] : chunk["end"]]
+
+    def materialize(self, chunk: Dict, with_text: bool = True) -> Dict:
+        """
+        Get the full chunk dictionary of a compact chunk, ie, with the metadata of its note
+        and its text. A chunk which is not compact is returned as is.
+
+        Args:
+            chunk (Dict): The chunk dictionary.
+            with_text (bool): If False, only the note metadata is added. Default is True.
+
+        Returns:
+            Dict: The chunk dictionary with the note metadata (and text).
+        """
+        if "text" in chunk:
+            return chunk
+        materialized = {**self.metadata(chunk["note_id"]), **chunk}
+        if with_text:
+            materialized["text"] = self.chunk_text(chunk)
+        return materialized
+
+    def close(self) -> None:
+        """Close the memory-mapped texts."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
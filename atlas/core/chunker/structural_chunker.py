@@ -1,31 +1,230 @@
 from atlas.utils.logger import LoggerConfig
 from atlas.core.chunker.base_chunker import BaseChunker
-from atlas.utils.chunker_utils import slugify
-
-import re
+from atlas.core.chunker.token_counter import TokenCounter
+from atlas.core.embedder.config import load_encoder_config
+from atlas.utils.chunker_utils import sliding_windows, slugify
+from atlas.utils.markdown_utils import scan_markdown
+from atlas.utils.parallel_utils import batched, ordered_parallel_map
+
+from collections import deque
+from dataclasses import dataclass
+from itertools import accumulate
 from pathlib import Path
-from typing import List, Dict
+from typing import Deque, List, Dict, Iterable, Iterator, Tuple
+import copy
+import hashlib
 import json
+import os
+import re
+import time
 
 LOGGER = LoggerConfig().logger
 
+# a note to chunk and its chunks if they are already known
+_NoteJob = Tuple[Dict, List[Dict] | None]
+# a piece of a text split by size: start and end offsets, text and word count if known
+_Piece = Tuple[int, int, str, int | None]
+
+
+@dataclass
+class ChunkingWorkerStats:
+    """Throughput of a chunking worker process."""
+
+    notes: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def notes_per_second(self) -> float:
+        """
+        Returns:
+            float: Number of notes chunked per second of work.
+        """
+        return self.notes / self.seconds if self.seconds > 0 else 0.0
+
 
 class StructuralChunker(BaseChunker):
     """
     Chunker that splits notes based on their structural elements like headings.
     See comments in `create_chunks` method for detailed chunking strategy.
 
+    Chunk sizes are measured in whitespace separated words by default. If `max_tokens` is set,
+    they are measured in tokens of the encoder's tokenizer instead, so that no chunk is
+    truncated by the encoder.
+
     Args:
         processed_data_path (str): Path to the processed data file (obsidian indexed data).
         output_path (str): Path to save the chunked data.
         max_words (int): Maximum number of words allowed in a single chunk.
+        max_tokens (int | None): Maximum number of tokens allowed in a single chunk, including
+                                 the special tokens the encoder adds (ie, at most the
+                                 encoder's maximum sequence length). If set, `max_words` is
+                                 ignored and `token_counter` is required. Default is None.
+        token_counter (TokenCounter | None): Counts tokens with the encoder's tokenizer.
+                                             Default is None.
+        stable_ids (bool): If True, chunk IDs are derived from the chunk content
+                           (`<note_id>::<section>::<content hash>`) instead of the chunk
+                           position (`<note_id>::<section>::chunk_<index>`), so that adding
+                           a chunk does not change the IDs of the chunks after it. Always
+                           True in incremental mode. Default is False.
+        incremental (bool): If True, only notes which changed since the last run are
+                            re-chunked, see `BaseChunker`. Default is False.
+        manifest_path (str | None): Path of the chunk manifest used in incremental mode.
+                                    Defaults to `<output_path stem>.chunk_manifest.json`.
+        compact (bool): If True, chunks only hold the character offsets (`start`, `end`) of
+                        their text in the note text instead of the text itself, and the
+                        note texts and metadata are saved once in a `NoteStore` at
+                        `note_store_path`. Default is False.
+        note_store_path (str | None): Directory of the note store in compact mode.
+                                      Defaults to `<output_path stem>.notes`.
+        workers (int): Number of worker processes used to chunk notes. 1 chunks serially in
+                       the current process. Default is 1.
+        batch_size (int): Number of notes sent to a worker process at a time. Larger batches
+                          keep the inter-process (pickling) overhead low. Default is 64.
+        overlap (int): Number of words (or tokens if `max_tokens` is set) shared by
+                       consecutive chunks of a note or section which is split by size, so
+                       that a sentence cut by a chunk boundary is whole in one of them. Must
+                       be less than the maximum chunk size. Default is 0.
     """
 
     def __init__(
-        self, processed_data_path: str, output_path: str, max_words: int
+        self,
+        processed_data_path: str,
+        output_path: str,
+        max_words: int,
+        max_tokens: int | None = None,
+        token_counter: TokenCounter | None = None,
+        stable_ids: bool = False,
+        incremental: bool = False,
+        manifest_path: str | None = None,
+        compact: bool = False,
+        note_store_path: str | None = None,
+        workers: int = 1,
+        batch_size: int = 64,
+        overlap: int = 0,
     ) -> None:
-        super().__init__(processed_data_path, output_path)
+        super().__init__(processed_data_path, output_path, incremental, manifest_path)
+        self.workers = workers
+        self.batch_size = batch_size
+        # throughput of every worker process (by PID) of the last parallel chunking run
+        self.worker_stats: Dict[int, ChunkingWorkerStats] = {}
+        self.compact = compact
+        if compact:
+            self.note_store_path = (
+                Path(note_store_path)
+                if note_store_path
+                else self.output_path.with_suffix(".notes")
+            )
+        # chunk IDs must not depend on positions to tell which chunks changed
+        self.stable_ids = stable_ids or incremental
         self.max_words = max_words
+        self.max_tokens = max_tokens
+        self.token_counter = token_counter
+        if max_tokens is not None:
+            if token_counter is None:
+                LOGGER.error("Token based chunking requires a token counter")
+                raise ValueError("Token based chunking requires a token counter")
+            if max_tokens <= token_counter.num_special_tokens:
+                LOGGER.error(f"Invalid maximum number of tokens : {max_tokens}")
+                raise ValueError(f"Invalid maximum number of tokens : {max_tokens}")
+        if not 0 <= overlap < self._max_size():
+            LOGGER.error(f"Invalid chunk overlap : {overlap}")
+            raise ValueError(f"Invalid chunk overlap : {overlap}")
+        self.overlap = overlap
+
+    def chunk_config(self) -> Dict:
+        """
+        Get the configuration which determines the chunks of a note.
+
+        Returns:
+            Dict: The chunking configuration, JSON serializable.
+        """
+        tokenizer = getattr(self.token_counter, "tokenizer", None)
+        return {
+            **super().chunk_config(),
+            "max_words": self.max_words,
+            "max_tokens": self.max_tokens,
+            "tokenizer": getattr(tokenizer, "name_or_path", None),
+            "stable_ids": self.stable_ids,
+            "compact": self.compact,
+            "overlap": self.overlap,
+        }
+
+    def _max_size(self) -> int:
+        """
+        Get the maximum size of a chunk, in words or in tokens (excluding the special tokens
+        added by the encoder).
+
+        Returns:
+            int: The maximum chunk size.
+        """
+        if self.max_tokens is not None and self.token_counter is not None:
+            return self.max_tokens - self.token_counter.num_special_tokens
+        return self.max_words
+
+    def _size(self, text: str) -> int:
+        """
+        Get the size of a text, in words or in tokens (excluding the special tokens added by
+        the encoder). Token counts are cached, see `_prefetch_token_counts`.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            int: The size of the text.
+        """
+        if self.max_tokens is not None and self.token_counter is not None:
+            return self.token_counter.count([text])[0]
+        return len(text.split())
+
+    def _split_by_size(self, text: str) -> List[_Piece]:
+        """
+        Split text into chunks of at most the maximum chunk size, consecutive chunks sharing
+        `overlap` words (or tokens).
+
+        Args:
+            text (str): The text to be split.
+
+        Returns:
+            List[_Piece]: The start and end offsets in the text, the text and the word count
+                          (None if not known) of every chunk.
+        """
+        if self.max_tokens is not None and self.token_counter is not None:
+            return [
+                (start, end, text[start:end], None)
+                for start, end in self.token_counter.split_spans(
+                    text, self._max_size(), self.overlap
+                )
+            ]
+        # word split chunks must be slices of the note text in compact mode
+        return self._word_windows(
+            text, self.max_words, self.overlap, normalize=not self.compact
+        )
+
+    def _prefetch_token_counts(
+        self, notes: List[Dict], token_counter: TokenCounter
+    ) -> None:
+        """
+        Count the tokens of the texts the chunking rules will measure for a batch of notes,
+        ie, the notes and the sections of the notes which are too large to be a single
+        chunk, so that they are tokenized in two large batches instead of one at a time.
+
+        Args:
+            notes (List[Dict]): The processed notes.
+            token_counter (TokenCounter): The token counter.
+        """
+        texts = [note["raw_text"].strip() for note in notes]
+        counts = token_counter.count(texts)
+
+        section_texts: List[str] = []
+        for note, text, num_tokens in zip(notes, texts, counts):
+            if num_tokens > self._max_size() and note["headings"]:
+                sections = self._split_by_headings(
+                    text,
+                    self._strip_heading_offsets(note["raw_text"], note["headings"]),
+                )
+                section_texts.extend(section["text"] for section in sections)
+        token_counter.count(section_texts)
 
     def _split_by_word_limit(self, text: str, max_words: int) -> list[str]:
         """
@@ -39,20 +238,62 @@ class StructuralChunker(BaseChunker):
         Returns:
             list[str]: A list of text chunks.
         """
-        words = text.split()
-        chunks = []
+        return [piece[2] for piece in self._word_windows(text, max_words)]
 
-        for i in range(0, len(words), max_words):
-            chunk_words = words[i : i + max_words]
-            chunks.append(" ".join(chunk_words))
+    def _word_windows(
+        self, text: str, max_words: int, overlap: int = 0, normalize: bool = True
+    ) -> List[_Piece]:
+        """
+        Split text into windows of at most `max_words` words, consecutive windows sharing
+        `overlap` words. The word offsets are found in a single pass over the text and
+        every window is a slice, so no window text is split and joined again.
 
-        return chunks
+        Args:
+            text (str): The text to be split.
+            max_words (int): The maximum number of words per window.
+            overlap (int): The number of words shared by consecutive windows. Default is 0.
+            normalize (bool): If True, the whitespace between the words of a window is
+                              normalized to single spaces, otherwise a window is a slice of
+                              `text` from its first to its last word. Default is True.
 
-    def _split_by_headings(self, text: str) -> List[Dict]:
+        Returns:
+            List[_Piece]: The start and end offsets in the text, the text and the word count
+                          of every window.
+        """
+        words = [match.span() for match in re.finditer(r"\S+", text)]
+        windows = sliding_windows(len(words), max_words, overlap)
+        if not normalize:
+            return [
+                (
+                    words[i][0],
+                    words[j - 1][1],
+                    text[words[i][0] : words[j - 1][1]],
+                    j - i,
+                )
+                for i, j in windows
+            ]
+
+        normalized = " ".join(text[start:end] for start, end in words)
+        # offset of every word in the normalized text, word k ends at starts[k + 1] - 1
+        starts = list(accumulate((end - start + 1 for start, end in words), initial=0))
+        return [
+            (words[i][0], words[j - 1][1], normalized[starts[i] : starts[j] - 1], j - i)
+            for i, j in windows
+        ]
+
+    def _split_by_headings(
+        self, text: str, headings: List[Dict] | None = None
+    ) -> List[Dict]:
         """
         Split text into sections based on markdown headings.
+        The heading offsets found by the ingester are reused when available, so the text
+        is not scanned for headings a second time.
+
         Args:
             text (str): The text to be split.
+            headings (List[Dict] | None): Headings of `text` with their character offsets
+                                          (`start`, `end`) as found by `scan_markdown`.
+                                          If None, `text` is scanned for headings.
 
         Returns:
             List[Dict]: A list of sections with headings and text.
@@ -60,37 +301,93 @@ class StructuralChunker(BaseChunker):
             Returns list of:
             {
                 "heading": str | None,
-                "text": str
+                "text": str,
+                "start": int,  # offset of the (stripped) section text in `text`
+                "end": int
             }
         """
+        if headings is None or any("start" not in h for h in headings):
+            headings = scan_markdown(text).headings
+
         sections = []
         current_heading = None
-        buffer: List[str] = []
-
-        for line in text.splitlines():
-            match = re.match(r"^(#{1,6})\s+(.*)", line)
-            if match:
-                # save previous section
-                if buffer:
-                    sections.append(
-                        {"heading": current_heading, "text": "\n".join(buffer).strip()}
-                    )
-                    buffer = []
+        section_start = 0
+
+        def make_section(start: int, end: int) -> Dict:
+            section_text = text[start:end]
+            stripped_start = start + len(section_text) - len(section_text.lstrip())
+            section_text = section_text.strip()
+            return {
+                "heading": current_heading,
+                "text": section_text,
+                "start": stripped_start,
+                "end": stripped_start + len(section_text),
+            }
 
-                current_heading = match.group(2).strip()
-            else:
-                buffer.append(line)
+        for heading in headings:
+            # save previous section, if there are any lines before this heading
+            if heading["start"] > section_start:
+                sections.append(make_section(section_start, heading["start"]))
+
+            current_heading = heading["title"]
+            # the section starts on the line after the heading line
+            section_start = heading["end"]
+            if text.startswith("\r\n", section_start):
+                section_start += 2
+            elif text.startswith(("\n", "\r"), section_start):
+                section_start += 1
 
         # last section
-        if buffer:
-            sections.append(
-                {"heading": current_heading, "text": "\n".join(buffer).strip()}
-            )
+        if section_start < len(text):
+            sections.append(make_section(section_start, len(text)))
 
         return sections
 
+    def _strip_heading_offsets(
+        self, raw_text: str, headings: List[Dict]
+    ) -> List[Dict] | None:
+        """
+        Shift the heading offsets found by the ingester (relative to the raw note text) so
+        they are relative to the stripped note text which is chunked.
+
+        Args:
+            raw_text (str): The raw text of the note.
+            headings (List[Dict]): The headings of the note.
+
+        Returns:
+            List[Dict] | None: The shifted headings or None if the headings dont have
+                               offsets (eg, index created by an older ingester).
+        """
+        if any("start" not in h for h in headings):
+            return None
+
+        text = raw_text.strip()
+        shift = len(raw_text) - len(raw_text.lstrip())
+        shifted_headings = [
+            {**h, "start": h["start"] - shift, "end": h["end"] - shift}
+            for h in headings
+            # a trailing heading without title is no longer a heading once the
+            # whitespace after its marker is stripped
+            if h["start"] - shift + h["level"] < len(text)
+        ]
+
+        # an indented first line can become a heading once the leading whitespace is stripped
+        if shift and text.startswith("#"):
+            if not shifted_headings or shifted_headings[0]["start"] != 0:
+                first_line = text.partition("\n")[0]
+                shifted_headings = scan_markdown(first_line).headings + shifted_headings
+
+        return shifted_headings
+
     def _make_chunk(
-        self, note: Dict, text: str, heading: str | None, chunk_index: int
+        self,
+        note: Dict,
+        text: str,
+        heading: str | None,
+        chunk_index: int,
+        start: int = 0,
+        end: int | None = None,
+        word_count: int | None = None,
     ) -> Dict:
         """
         Create a chunk dictionary.
@@ -100,25 +397,87 @@ class StructuralChunker(BaseChunker):
             text (str): The chunk text.
             heading (str | None): The heading of the section.
             chunk_index (int): The index of the chunk within the note.
+            start (int): Start offset of the chunk text in the note text. Default is 0.
+            end (int | None): End offset of the chunk text in the note text. Defaults to
+                              `start + len(text)`.
+            word_count (int | None): The number of words of the chunk text, if already
+                                     known. Default is None.
 
         Returns:
-            Dict: The chunk dictionary.
+            Dict: The chunk dictionary, compact (without the text and note metadata) in
+                  compact mode.
         """
         section_id = slugify(heading) if heading else "root"
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if self.stable_ids:
+            chunk_id = f"{note['note_id']}::{section_id}::{content_hash[:16]}"
+        else:
+            chunk_id = f"{note['note_id']}::{section_id}::chunk_{chunk_index}"
+        if word_count is None:
+            word_count = len(text.split())
+
+        if self.compact:
+            return {
+                "chunk_id": chunk_id,
+                "note_id": note["note_id"],
+                "heading": heading,
+                "chunk_index": chunk_index,
+                "start": start,
+                "end": start + len(text) if end is None else end,
+                "word_count": word_count,
+                "content_hash": content_hash,
+            }
 
         return {
-            "chunk_id": f"{note['note_id']}::{section_id}::chunk_{chunk_index}",
+            "chunk_id": chunk_id,
             "note_id": note["note_id"],
             "title": note["title"],
             "relative_path": note["relative_path"],
             "heading": heading,
             "chunk_index": chunk_index,
             "text": text,
-            "word_count": len(text.split()),
+            "word_count": word_count,
+            "content_hash": content_hash,
             "tags": note.get("tags", []),
             "frontmatter": note.get("frontmatter", {}),
         }
 
+    def _make_size_chunks(
+        self,
+        note: Dict,
+        text: str,
+        offset: int,
+        heading: str | None,
+        chunk_index: int,
+    ) -> List[Dict]:
+        """
+        Split a text which is larger than the maximum chunk size into chunks.
+
+        Args:
+            note (Dict): The original note dictionary.
+            text (str): The text to be split, the whole note text or a section.
+            offset (int): Offset of `text` in the note text.
+            heading (str | None): The heading of the section.
+            chunk_index (int): The index of the first chunk within the note.
+
+        Returns:
+            List[Dict]: The chunk dictionaries.
+        """
+        return [
+            self._make_chunk(
+                note,
+                piece_text,
+                heading=heading,
+                chunk_index=chunk_index + idx,
+                start=offset + start,
+                end=offset + end,
+                word_count=word_count,
+            )
+            for idx, (start, end, piece_text, word_count) in enumerate(
+                self._split_by_size(text)
+            )
+        ]
+
     def create_chunks(self, processed_data: List[Dict]) -> List[Dict]:
         """
         Create chunks from processed data based on strucutural chunking strategy.
@@ -129,69 +488,235 @@ class StructuralChunker(BaseChunker):
         Returns:
             List[Dict]: The chunked data.
         """
-        chunks = []
-
-        for note in processed_data:
-            text = note["raw_text"].strip()
-            word_count = note["word_count"]
-
-            # -------- Rule 1 --------
-            # if word count <= max_words, create single chunk from whole note
-            if word_count <= self.max_words:
-                chunks.append(self._make_chunk(note, text, heading=None, chunk_index=0))
-                continue
-
-            # -------- Rule 2 --------
-            # if note has headings, split by headings first
-            if note["headings"]:
-                sections = self._split_by_headings(text)
-                chunk_idx = 0
-
-                for section in sections:
-                    section_text = section["text"]
-                    section_words = len(section_text.split())
-
-                    # -------- Rule 3 --------
-                    # if section > max_words, split by word limit into inidividual chunks
-                    if section_words > self.max_words:
-                        sub_chunks = self._split_by_word_limit(
-                            section_text, self.max_words
-                        )
-                        for sub_text in sub_chunks:
-                            chunks.append(
-                                self._make_chunk(
-                                    note,
-                                    sub_text,
-                                    heading=section["heading"],
-                                    chunk_index=chunk_idx,
-                                )
-                            )
-                            chunk_idx += 1
-                    else:
-                        # if section <= max_words, create single chunk from section
-                        chunks.append(
-                            self._make_chunk(
-                                note,
-                                section_text,
-                                heading=section["heading"],
-                                chunk_index=chunk_idx,
-                            )
-                        )
-                        chunk_idx += 1
+        return list(self.iter_chunks(processed_data))
 
-                continue
+    def iter_chunks(self, processed_data: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Create chunks from processed data based on strucutural chunking strategy, yielding
+        one chunk at a time so that only one note is processed in memory at a time.
+
+        Args:
+            processed_data (Iterable[Dict]): The processed data to be chunked.
 
-            # -------- Rule 4 --------
-            # if note has no headings and word count > max_words, split by word limit
-            sub_chunks = self._split_by_word_limit(text, self.max_words)
-            for idx, sub_text in enumerate(sub_chunks):
-                chunks.append(
-                    self._make_chunk(note, sub_text, heading=None, chunk_index=idx)
+        Returns:
+            Iterator[Dict]: The chunked data.
+        """
+        for _, chunks in self.iter_note_chunks((note, None) for note in processed_data):
+            yield from chunks
+
+    def iter_note_chunks(
+        self, jobs: Iterable[_NoteJob]
+    ) -> Iterator[Tuple[Dict, List[Dict]]]:
+        """
+        Chunk notes either serially or, if `self.workers > 1`, in batches across a pool of
+        worker processes. The notes are yielded in the same order as `jobs`. Jobs which
+        already carry their chunks are passed through without being sent to a worker.
+
+        Args:
+            jobs (Iterable[_NoteJob]): Every processed note and its chunks, None if the
+                                       note needs to be chunked.
+
+        Returns:
+            Iterator[Tuple[Dict, List[Dict]]]: Every note and its chunks, in job order.
+        """
+        if self.workers <= 1:
+            if self.max_tokens is None or self.token_counter is None:
+                for note, chunks in jobs:
+                    yield note, chunks if chunks is not None else self._chunk_note(note)
+                return
+            for batch in batched(jobs, self.token_counter.batch_size):
+                yield from zip(
+                    (note for note, _ in batch), self._chunk_note_jobs(batch)
                 )
+            return
+
+        LOGGER.info(
+            f"Chunking notes with {self.workers} workers in batches of {self.batch_size}"
+        )
+        self.worker_stats = {}
+        # batches are chunked in submission order, so the batches kept here line up with
+        # the chunks coming back from the workers
+        submitted_batches: Deque[List[_NoteJob]] = deque()
+
+        def tasks() -> Iterator[List[Dict]]:
+            for batch in batched(jobs, self.batch_size):
+                submitted_batches.append(batch)
+                yield [note for note, chunks in batch if chunks is None]
+
+        # the workers get a copy of the chunker without the (possibly large) manifest
+        worker_chunker = copy.copy(self)
+        worker_chunker.manifest = None
+        for note_chunks, (pid, seconds) in ordered_parallel_map(
+            _chunk_note_batch,
+            tasks(),
+            workers=self.workers,
+            initializer=_init_chunk_worker,
+            initargs=(worker_chunker,),
+        ):
+            stats = self.worker_stats.setdefault(pid, ChunkingWorkerStats())
+            stats.notes += len(note_chunks)
+            stats.chunks += sum(len(chunks) for chunks in note_chunks)
+            stats.seconds += seconds
+
+            chunked_notes = iter(note_chunks)
+            for note, chunks in submitted_batches.popleft():
+                yield note, chunks if chunks is not None else next(chunked_notes)
+
+        for pid, stats in sorted(self.worker_stats.items()):
+            LOGGER.info(
+                f"Chunking worker {pid}: {stats.notes} notes, {stats.chunks} chunks in "
+                f"{stats.seconds:.2f}s ({stats.notes_per_second:.1f} notes/sec)"
+            )
+
+    def _chunk_note_jobs(self, jobs: List[_NoteJob]) -> List[List[Dict]]:
+        """
+        Chunk a batch of notes. With token based chunking, the token counts of the whole
+        batch are computed at once first.
+
+        Args:
+            jobs (List[_NoteJob]): Every processed note and its chunks, None if the note
+                                   needs to be chunked.
+
+        Returns:
+            List[List[Dict]]: The chunks of every note, in batch order.
+        """
+        if self.max_tokens is not None and self.token_counter is not None:
+            self._prefetch_token_counts(
+                [note for note, chunks in jobs if chunks is None], self.token_counter
+            )
+        return [
+            chunks if chunks is not None else self._chunk_note(note)
+            for note, chunks in jobs
+        ]
+
+    def _chunk_note(self, note: Dict) -> List[Dict]:
+        """
+        Create the chunks of a single note, with unique chunk IDs.
+
+        Args:
+            note (Dict): The processed note to be chunked.
+
+        Returns:
+            List[Dict]: The chunks of the note.
+        """
+        chunks = self._split_note(note)
+        if self.stable_ids:
+            # identical chunks under the same heading get the same content based ID,
+            # the repeated ones are numbered in order of appearance
+            occurrences: Dict[str, int] = {}
+            for chunk in chunks:
+                chunk_id = chunk["chunk_id"]
+                occurrences[chunk_id] = occurrences.get(chunk_id, 0) + 1
+                if occurrences[chunk_id] > 1:
+                    chunk["chunk_id"] = f"{chunk_id}_{occurrences[chunk_id] - 1}"
+        return chunks
+
+    def _split_note(self, note: Dict) -> List[Dict]:
+        """
+        Split a single note into chunks. See the rules below for the chunking strategy.
+
+        Args:
+            note (Dict): The processed note to be chunked.
+
+        Returns:
+            List[Dict]: The chunks of the note.
+        """
+        chunks: List[Dict] = []
+
+        raw_text = note["raw_text"]
+        text = raw_text.strip()
+        # the word count of the note was already computed by the ingester
+        size = note["word_count"] if self.max_tokens is None else self._size(text)
+        max_size = self._max_size()
+
+        # -------- Rule 1 --------
+        # if size <= max size (max_words or max_tokens), create single chunk from whole note
+        if size <= max_size:
+            chunks.append(self._make_chunk(note, text, heading=None, chunk_index=0))
+            return chunks
+
+        # -------- Rule 2 --------
+        # if note has headings, split by headings first
+        if note["headings"]:
+            sections = self._split_by_headings(
+                text, self._strip_heading_offsets(raw_text, note["headings"])
+            )
+            chunk_idx = 0
+
+            for section in sections:
+                section_text = section["text"]
+                section_size = self._size(section_text)
+
+                # -------- Rule 3 --------
+                # if section > max size, split by size limit into inidividual chunks
+                if section_size > max_size:
+                    sub_chunks = self._make_size_chunks(
+                        note,
+                        section_text,
+                        section["start"],
+                        heading=section["heading"],
+                        chunk_index=chunk_idx,
+                    )
+                    chunks.extend(sub_chunks)
+                    chunk_idx += len(sub_chunks)
+                else:
+                    # if section <= max size, create single chunk from section
+                    chunks.append(
+                        self._make_chunk(
+                            note,
+                            section_text,
+                            heading=section["heading"],
+                            chunk_index=chunk_idx,
+                            start=section["start"],
+                        )
+                    )
+                    chunk_idx += 1
+
+            return chunks
+
+        # -------- Rule 4 --------
+        # if note has no headings and size > max size, split by size limit
+        chunks.extend(
+            self._make_size_chunks(note, text, 0, heading=None, chunk_index=0)
+        )
 
         return chunks
 
 
+# chunker used by the worker processes of the parallel chunking mode,
+# set once per worker so that it isnt pickled along with every batch
+_WORKER_CHUNKER: StructuralChunker | None = None
+
+
+def _init_chunk_worker(chunker: StructuralChunker) -> None:
+    """
+    Initialize a chunking worker process.
+
+    Args:
+        chunker (StructuralChunker): The chunker whose chunking logic the worker uses.
+    """
+    global _WORKER_CHUNKER
+    _WORKER_CHUNKER = chunker
+
+
+def _chunk_note_batch(notes: List[Dict]) -> Tuple[List[List[Dict]], Tuple[int, float]]:
+    """
+    Chunk a batch of notes inside a worker process.
+
+    Args:
+        notes (List[Dict]): The processed notes to chunk.
+
+    Returns:
+        Tuple[List[List[Dict]], Tuple[int, float]]: The chunks of every note, in batch
+                                                    order, and the PID of the worker with
+                                                    the time it spent chunking them.
+    """
+    assert _WORKER_CHUNKER is not None, "Worker must be initialized before chunking"
+    start = time.perf_counter()
+    note_chunks = _WORKER_CHUNKER._chunk_note_jobs([(note, None) for note in notes])
+    return note_chunks, (os.getpid(), time.perf_counter() - start)
+
+
 if __name__ == "__main__":
     processed_data_path = r"D:\\Deep learning\\Atlas\\Resources\\obsidian_index.json"
     output_path = r"D:\\Deep learning\\Atlas\\Resources\\chunked_data.json"
@@ -202,5 +727,22 @@ if __name__ == "__main__":
     # TinyLLama-1.1B-Chat has a context window of 2048 tokens
     # souce - https://huggingface.co/TinyLlama/TinyLlama-1.1B-Chat-v1.0/discussions/9
     max_words = 250  # increase this value to have larger chunks
-    chunker = StructuralChunker(processed_data_path, output_path, max_words)
+
+    # set to size chunks in tokens of the encoder's tokenizer instead of words, so that no
+    # chunk exceeds the encoder's maximum sequence length (256 tokens for all-MiniLM-L6-v2)
+    max_tokens = None
+    token_counter = None
+    if max_tokens is not None:
+        encoder_config = load_encoder_config(
+            Path("atlas") / "core" / "configs" / "sentence_transformer_config.yaml"
+        )
+        token_counter = TokenCounter.from_encoder_config(encoder_config)
+
+    chunker = StructuralChunker(
+        processed_data_path,
+        output_path,
+        max_words,
+        max_tokens=max_tokens,
+        token_counter=token_counter,
+    )
     chunker.chunk()
@@ -0,0 +1,200 @@
+from typing import Any, Dict, List, Sequence, Tuple
+import hashlib
+
+from atlas.core.embedder.config import EncoderConfig
+from atlas.utils.logger import LoggerConfig
+from atlas.utils.parallel_utils import batched
+
+LOGGER = LoggerConfig().logger
+
+
+class TokenCounter:
+    """
+    Counts tokens with the tokenizer of the encoder, so that chunks can be sized by what the
+    encoder actually sees rather than by whitespace words (code and non-English text can have
+    several tokens per word and would otherwise be silently truncated by the encoder).
+
+    Texts are tokenized in large batches by a fast (Rust backed) tokenizer and the token counts
+    are cached by text hash, so an unchanged text is only tokenized once. The least recently
+    used counts are evicted beyond `max_cache_entries`.
+
+    Args:
+        tokenizer (Any): A Hugging Face fast tokenizer.
+        batch_size (int): Number of texts tokenized at a time. Default is 1024.
+        max_cache_entries (int): Maximum number of cached token counts. Default is 100000.
+    """
+
+    def __init__(
+        self, tokenizer: Any, batch_size: int = 1024, max_cache_entries: int = 100_000
+    ) -> None:
+        if not getattr(tokenizer, "is_fast", False):
+            LOGGER.error("Token counting requires a fast tokenizer")
+            raise ValueError("Token counting requires a fast tokenizer")
+
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.max_cache_entries = max_cache_entries
+        # tokens the encoder adds to every text, eg, [CLS] and [SEP]
+        self.num_special_tokens: int = tokenizer.num_special_tokens_to_add()
+        self._cache: Dict[bytes, int] = {}
+
+    @classmethod
+    def from_encoder_config(
+        cls, config: EncoderConfig, **kwargs: Any
+    ) -> "TokenCounter":
+        """
+        Create a token counter with the tokenizer of the configured encoder model.
+
+        Args:
+            config (EncoderConfig): The encoder configuration.
+            **kwargs (Any): Other arguments of `TokenCounter`.
+
+        Returns:
+            TokenCounter: The token counter.
+        """
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(config.model_name, use_fast=True)
+        LOGGER.info(f"Tokenizer of {config.model_name} loaded for token counting")
+        return cls(tokenizer, **kwargs)
+
+    @staticmethod
+    def _hash_text(text: str) -> bytes:
+        """
+        Compute the cache key of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            bytes: BLAKE2b digest of the UTF-8 encoded text.
+        """
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _tokenize(self, texts: List[str], return_offsets: bool = False) -> Any:
+        """
+        Tokenize texts without the special tokens of the encoder.
+
+        Args:
+            texts (List[str]): The texts.
+            return_offsets (bool): If True, the character offsets of the tokens are returned.
+
+        Returns:
+            Any: The tokenizer encodings.
+        """
+        return self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_offsets_mapping=return_offsets,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            # texts longer than the encoder window are expected, they are what is counted
+            verbose=False,
+        )
+
+    def count(self, texts: Sequence[str]) -> List[int]:
+        """
+        Count the tokens of texts, excluding the special tokens added by the encoder.
+        Texts which are not cached are tokenized in batches of `batch_size`.
+
+        Args:
+            texts (Sequence[str]): The texts.
+
+        Returns:
+            List[int]: The number of tokens of every text.
+        """
+        keys = [self._hash_text(text) for text in texts]
+        uncached: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in self._cache:
+                uncached[key] = text
+
+        for batch in batched(list(uncached.items()), self.batch_size):
+            input_ids = self._tokenize([text for _, text in batch])["input_ids"]
+            for (key, _), ids in zip(batch, input_ids):
+                self._cache[key] = len(ids)
+
+        counts = []
+        for key in keys:
+            # move the count to the end to mark it as recently used
+            num_tokens = self._cache.pop(key)
+            self._cache[key] = num_tokens
+            counts.append(num_tokens)
+
+        while len(self._cache) > self.max_cache_entries:
+            del self._cache[next(iter(self._cache))]
+        return counts
+
+    def split(self, text: str, max_tokens: int) -> List[str]:
+        """
+        Split a text into pieces of at most `max_tokens` tokens (excluding special tokens).
+        The pieces are cut between two words whenever possible, using the character offsets
+        of the tokens, and keep the original formatting of the text within a piece.
+
+        Args:
+            text (str): The text to split.
+            max_tokens (int): The maximum number of tokens per piece.
+
+        Returns:
+            List[str]: The pieces of the text.
+        """
+        return [text[start:end] for start, end in self.split_spans(text, max_tokens)]
+
+    def split_spans(
+        self, text: str, max_tokens: int, overlap: int = 0
+    ) -> List[Tuple[int, int]]:
+        """
+        Get the character offsets of the pieces `split()` cuts a text into. With an
+        overlap, every piece after the first starts with (at most) the last `overlap`
+        tokens of the previous piece, from the first word boundary among them.
+
+        Args:
+            text (str): The text to split.
+            max_tokens (int): The maximum number of tokens per piece.
+            overlap (int): The maximum number of tokens shared by two consecutive pieces,
+                           less than `max_tokens`. Default is 0.
+
+        Returns:
+            List[Tuple[int, int]]: The start and end offsets of every piece.
+        """
+        if max_tokens < 1:
+            LOGGER.error(f"Invalid maximum number of tokens : {max_tokens}")
+            raise ValueError(f"Invalid maximum number of tokens : {max_tokens}")
+        if not 0 <= overlap < max_tokens:
+            LOGGER.error(f"Invalid token overlap : {overlap}")
+            raise ValueError(f"Invalid token overlap : {overlap}")
+
+        offsets = self._tokenize([text], return_offsets=True)["offset_mapping"][0]
+        num_tokens = len(offsets)
+
+        def window_end(start: int) -> int:
+            end = min(start + max_tokens, num_tokens)
+            if end < num_tokens:
+                # move the cut back to the last gap between two tokens, ie, between two
+                # words, unless the window is a single word
+                for cut in range(end, start, -1):
+                    if offsets[cut][0] > offsets[cut - 1][1]:
+                        return cut
+            return end
+
+        spans = []
+        start = 0
+        previous_end = 0
+        while start < num_tokens:
+            end = window_end(start)
+            if end <= previous_end:
+                # the overlapping window ends where the previous one does, start it after
+                # the previous one instead so that every window has new tokens
+                start = previous_end
+                end = window_end(start)
+            spans.append((offsets[start][0], offsets[end - 1][1]))
+            previous_end = end
+            next_start = end
+            if overlap and end < num_tokens:
+                # the overlap starts at a word boundary, so no word is cut in two
+                for cut in range(max(end - overlap, start + 1), end):
+                    if offsets[cut][0] > offsets[cut - 1][1]:
+                        next_start = cut
+                        break
+            start = next_start
+        return spans
@@ -0,0 +1,147 @@
+from abc import ABC
+from abc import abstractmethod
+from typing import Dict, Iterable, Iterator, List
+from pathlib import Path
+
+import numpy as np
+
+from atlas.core.chunker.note_store import NOTE_METADATA_FIELDS, NoteStore
+from atlas.utils.logger import LoggerConfig
+from atlas.utils.io_utils import iter_records, write_records
+from atlas.utils.parallel_utils import batched
+
+LOGGER = LoggerConfig().logger
+
+
+class BaseDeduplicator(ABC):
+    """
+    Abstract base class for deduplicators that cluster near-duplicate chunks (eg, the
+    boilerplate sections of templated and daily notes) between the chunker and the
+    embedder, so that only one representative per cluster is embedded and indexed.
+
+    The deduplicated chunk data holds the chunks without their duplicates, in the same
+    order. Every representative with duplicates lists them in `duplicates`, with their chunk
+    ID, note ID and note metadata (`title`, `relative_path`, `tags` and `frontmatter`, only
+    the IDs for compact chunks whose note metadata is in the note store), so that the vector
+    store can filter and attribute the representative by the notes of its duplicates too.
+
+    Args:
+        chunk_data_path (str): Path to the chunk data file.
+        output_path (str): Path to save the deduplicated chunk data. A `.jsonl` path
+                           streams one record per line, any other path is written as a
+                           JSON list.
+        note_store_path (str | None): Directory of the note store of compact chunks.
+                                      Default is None.
+    """
+
+    # number of chunks read and clustered at a time
+    stream_batch_size: int = 1024
+
+    def __init__(
+        self,
+        chunk_data_path: str,
+        output_path: str,
+        note_store_path: str | None = None,
+    ) -> None:
+        LOGGER.info("-" * 20)
+        LOGGER.info("Initializing Deduplicator.")
+        self.chunk_data_path = Path(chunk_data_path)
+        self.output_path = Path(output_path)
+        self.note_store_path = Path(note_store_path) if note_store_path else None
+
+    def iter_chunk_data(self) -> Iterator[Dict]:
+        """
+        Lazily read the chunk data to be deduplicated.
+
+        Returns:
+            Iterator[Dict]: The chunk dictionaries.
+        """
+        return iter_records(self.chunk_data_path)
+
+    @abstractmethod
+    def cluster(self, text_batches: Iterable[List[str]]) -> Iterator[np.ndarray]:
+        """
+        Cluster near-duplicate texts. The first text of a cluster is its representative.
+        The result of a batch must be yielded before the next batch is read.
+
+        Args:
+            text_batches (Iterable[List[str]]): The texts, in batches.
+
+        Returns:
+            Iterator[np.ndarray]: For every batch, the index (among all the texts) of the
+                                  representative of every text, its own index if it is
+                                  a representative.
+        """
+        pass
+
+    def find_duplicates(self) -> Dict[int, List[Dict]]:
+        """
+        Cluster the chunks of the chunk data.
+
+        Returns:
+            Dict[int, List[Dict]]: The duplicates (see `duplicates` above) of every
+                                   representative with duplicates, by index of the
+                                   representative.
+        """
+        note_store = NoteStore(self.note_store_path) if self.note_store_path else None
+        chunk_batches: List[List[Dict]] = []
+
+        def text_batches() -> Iterator[List[str]]:
+            for batch in batched(self.iter_chunk_data(), self.stream_batch_size):
+                # only the batch being clustered is kept
+                chunk_batches[:] = [batch]
+                if note_store is None:
+                    yield [chunk["text"] for chunk in batch]
+                else:
+                    yield [note_store.chunk_text(chunk) for chunk in batch]
+
+        duplicates: Dict[int, List[Dict]] = {}
+        start = 0
+        try:
+            for representatives in self.cluster(text_batches()):
+                for idx, (chunk, representative) in enumerate(
+                    zip(chunk_batches[0], representatives.tolist()), start=start
+                ):
+                    if representative != idx:
+                        duplicates.setdefault(representative, []).append(
+                            {
+                                "chunk_id": chunk["chunk_id"],
+                                "note_id": chunk["note_id"],
+                                **{
+                                    field: chunk[field]
+                                    for field in NOTE_METADATA_FIELDS
+                                    if field in chunk
+                                },
+                            }
+                        )
+                start += len(representatives)
+        finally:
+            if note_store is not None:
+                note_store.close()
+        return duplicates
+
+    def deduplicate(self) -> None:
+        """
+        Perform the deduplication process. The chunk data is read twice, once to cluster
+        the chunks and once to write the deduplicated chunks.
+        """
+        assert self.chunk_data_path.exists(), "Chunk data read should be present."
+        duplicates = self.find_duplicates()
+        duplicate_ids = {
+            duplicate["chunk_id"]
+            for cluster in duplicates.values()
+            for duplicate in cluster
+        }
+
+        def deduplicated_chunks() -> Iterator[Dict]:
+            for idx, chunk in enumerate(self.iter_chunk_data()):
+                if idx in duplicates:
+                    yield {**chunk, "duplicates": duplicates[idx]}
+                elif chunk["chunk_id"] not in duplicate_ids:
+                    yield chunk
+
+        count = write_records(self.output_path, deduplicated_chunks())
+        LOGGER.info(
+            f"{count} deduplicated chunks saved successfully to {str(self.output_path)}. "
+            f"{len(duplicate_ids)} duplicates of {len(duplicates)} chunks removed"
+        )
@@ -0,0 +1,224 @@
+from typing import Dict, Iterable, Iterator, List
+import re
+import zlib
+
+import numpy as np
+
+from atlas.core.deduplicator.base_deduplicator import BaseDeduplicator
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+# largest prime below 2^32, the permuted shingle hashes fit in 32 bits and their products
+# with the permutation coefficients fit in 64 bits
+_PRIME = np.uint64(4294967291)
+_MASK_32 = np.uint64(0xFFFFFFFF)
+# FNV-1a 64 bit prime, combines the token hashes of a shingle
+_FNV_PRIME = np.uint64(0x100000001B3)
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+class MinHashDeduplicator(BaseDeduplicator):
+    """
+    Deduplicator which clusters near-duplicate chunks with MinHash signatures and
+    locality-sensitive hashing (LSH), so it never compares all pairs of chunks.
+
+    1. A chunk is shingled into the hashes of its `shingle_size` consecutive (lower cased)
+       words, and its MinHash signature is the minimum of `num_perm` random permutations of
+       these hashes. Two signatures agree on a permutation with a probability equal to the
+       Jaccard similarity of the shingle sets.
+    2. The signature is cut into `num_bands` bands. Chunks sharing a band bucket are
+       candidate duplicates, so a chunk is only compared with the few representatives in
+       its buckets. With the defaults (16 bands of 8 rows), chunks with a similarity of 0.8
+       are candidates ~95% of the time and chunks with a similarity of 0.5 ~6% of the time.
+    3. A chunk joins the cluster of the most similar candidate representative whose
+       estimated similarity is at least `threshold`, otherwise it becomes a representative.
+
+    Only the signatures and buckets of the representatives are held in memory.
+
+    Args:
+        chunk_data_path (str): Path to the chunk data file.
+        output_path (str): Path to save the deduplicated chunk data.
+        threshold (float): Minimum estimated Jaccard similarity of near-duplicates.
+                           Default is 0.8.
+        num_perm (int): Number of MinHash permutations. Default is 128.
+        num_bands (int): Number of LSH bands, must divide `num_perm`. Default is 16.
+        shingle_size (int): Number of words per shingle. Default is 3.
+        seed (int): Seed of the MinHash permutations. Default is 42.
+        note_store_path (str | None): Directory of the note store of compact chunks.
+                                      Default is None.
+    """
+
+    def __init__(
+        self,
+        chunk_data_path: str,
+        output_path: str,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        num_bands: int = 16,
+        shingle_size: int = 3,
+        seed: int = 42,
+        note_store_path: str | None = None,
+    ) -> None:
+        super().__init__(chunk_data_path, output_path, note_store_path)
+        if not 0 < threshold <= 1:
+            LOGGER.error(f"Invalid similarity threshold : {threshold}")
+            raise ValueError(f"Invalid similarity threshold : {threshold}")
+        if num_bands < 1 or num_perm % num_bands != 0:
+            LOGGER.error(f"{num_bands} bands do not divide {num_perm} permutations")
+            raise ValueError(f"{num_bands} bands do not divide {num_perm} permutations")
+        if shingle_size < 1:
+            LOGGER.error(f"Invalid shingle size : {shingle_size}")
+            raise ValueError(f"Invalid shingle size : {shingle_size}")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.shingle_size = shingle_size
+        # permutations h -> (a * h + b) mod prime
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+        # coefficients hashing the rows of a band into a bucket key
+        self._band_coefficients = rng.integers(
+            1, 2**63, size=num_perm // num_bands, dtype=np.uint64
+        )
+
+    def shingle(self, text: str) -> np.ndarray:
+        """
+        Get the 32 bit hashes of the word shingles of a text. A text with fewer words than
+        `shingle_size` is a single shingle.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            np.ndarray: The unique shingle hashes, empty if the text has no words.
+        """
+        token_hashes = np.array(
+            [
+                zlib.crc32(token.encode("utf-8"))
+                for token in _WORD_PATTERN.findall(text.lower())
+            ],
+            dtype=np.uint64,
+        )
+        if len(token_hashes) == 0:
+            return token_hashes
+        num_shingles = max(len(token_hashes) - self.shingle_size + 1, 1)
+
+        shingle_hashes = np.zeros(num_shingles, dtype=np.uint64)
+        for offset in range(min(self.shingle_size, len(token_hashes))):
+            # multiplications wrap around modulo 2^64
+            shingle_hashes = (shingle_hashes * _FNV_PRIME) ^ token_hashes[
+                offset : offset + num_shingles
+            ]
+        return np.unique(
+            (shingle_hashes ^ (shingle_hashes >> np.uint64(32))) & _MASK_32
+        )
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """
+        Get the MinHash signatures of texts.
+
+        Args:
+            texts (List[str]): The texts.
+
+        Returns:
+            np.ndarray: The `num_perm` minimum permuted shingle hashes of every text, of
+                        shape `(len(texts), num_perm)`. The signature of a text without
+                        words is all `0xFFFFFFFF`, which no permuted hash can be.
+        """
+        signatures = np.full((len(texts), self.num_perm), _MASK_32, dtype=np.uint32)
+        for idx, text in enumerate(texts):
+            shingle_hashes = self.shingle(text)
+            if len(shingle_hashes):
+                # the (a * h + b) products of a text stay in the CPU cache, permuting
+                # the shingles of several texts at once is not faster
+                permuted = (
+                    np.multiply.outer(shingle_hashes, self._a) + self._b
+                ) % _PRIME
+                signatures[idx] = permuted.min(axis=0)
+        return signatures
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """
+        Hash every band of signatures into a bucket key.
+
+        Args:
+            signatures (np.ndarray): The signatures, of shape `(n, num_perm)`.
+
+        Returns:
+            np.ndarray: The bucket keys, of shape `(n, num_bands)`.
+        """
+        bands = signatures.astype(np.uint64).reshape(
+            len(signatures), self.num_bands, -1
+        )
+        return (bands * self._band_coefficients).sum(axis=2, dtype=np.uint64)
+
+    def cluster(self, text_batches: Iterable[List[str]]) -> Iterator[np.ndarray]:
+        """
+        Cluster near-duplicate texts with MinHash LSH, see the class docstring.
+
+        Args:
+            text_batches (Iterable[List[str]]): The texts, in batches.
+
+        Returns:
+            Iterator[np.ndarray]: For every batch, the index (among all the texts) of the
+                                  representative of every text.
+        """
+        # one table per band, bucket key -> indices of the representatives in the bucket
+        buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.num_bands)]
+        representative_signatures: Dict[int, np.ndarray] = {}
+        num_texts = 0
+        num_duplicates = 0
+
+        for texts in text_batches:
+            signatures = self.signatures(texts)
+            has_words = (signatures != _MASK_32).any(axis=1).tolist()
+            keys = self.band_keys(signatures)
+
+            representatives = np.arange(
+                num_texts, num_texts + len(texts), dtype=np.int64
+            )
+            for idx, (sig, text_keys) in enumerate(zip(signatures, keys.tolist())):
+                if not has_words[idx]:
+                    continue
+                candidates = {
+                    candidate
+                    for band, key in enumerate(text_keys)
+                    for candidate in buckets[band].get(key, ())
+                }
+                best = None
+                best_similarity = 0.0
+                for candidate in sorted(candidates):
+                    # the fraction of equal permutations estimates the Jaccard similarity
+                    similarity = float(
+                        np.mean(representative_signatures[candidate] == sig)
+                    )
+                    if similarity > best_similarity:
+                        best = candidate
+                        best_similarity = similarity
+                if best is not None and best_similarity >= self.threshold:
+                    representatives[idx] = best
+                    num_duplicates += 1
+                    continue
+
+                representative_signatures[num_texts + idx] = sig
+                for band, key in enumerate(text_keys):
+                    buckets[band].setdefault(key, []).append(num_texts + idx)
+
+            num_texts += len(texts)
+            yield representatives
+
+        LOGGER.info(
+            f"{num_texts} chunks clustered, {num_duplicates} are near-duplicates of "
+            "another chunk"
+        )
+
+
+if __name__ == "__main__":
+    chunk_data_path = r"D:\\Deep learning\\Atlas\\Resources\\chunked_data.json"
+    output_path = r"D:\\Deep learning\\Atlas\\Resources\\deduplicated_chunks.json"
+
+    deduplicator = MinHashDeduplicator(chunk_data_path, output_path)
+    deduplicator.deduplicate()
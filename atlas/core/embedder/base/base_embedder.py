@@ -1,10 +1,15 @@
 from abc import ABC
 from abc import abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
 from pathlib import Path
-import json
+import numpy as np
 
+from atlas.core.chunker.chunk_manifest import ChunkDelta
+from atlas.core.chunker.note_store import NoteStore
+from atlas.core.embedder.embedding_store import EmbeddingWriter, load_embeddings
 from atlas.utils.logger import LoggerConfig
+from atlas.utils.io_utils import iter_records, write_records
+from atlas.utils.parallel_utils import batched
 
 LOGGER = LoggerConfig().logger
 
@@ -15,18 +20,32 @@ class BaseEmbedder(ABC):
 
     Args:
         chunk_data_path (str): Path to the chunk data file.
-        output_path (str): Path to save the embedded chunks.
+        output_path (str): Path to save the embedded chunks. A `.jsonl` path streams one
+                           record per line, any other path is written as a JSON list.
+                           The embeddings are saved along it, see `EmbeddingWriter`.
         encoder_config_path (str): Path to the encoder configuration file.
+        note_store_path (str | None): Directory of the note store of compact chunks, whose
+                                      text is read from it only to be encoded. The embedded
+                                      chunks stay compact. Default is None.
     """
 
+    # number of chunks read, embedded and written at a time by `embed()`
+    stream_batch_size: int = 1024
+
     def __init__(
-        self, chunk_data_path: str, output_path: str, encoder_config_path: str
+        self,
+        chunk_data_path: str,
+        output_path: str,
+        encoder_config_path: str,
+        note_store_path: str | None = None,
     ):
         LOGGER.info("-" * 20)
         LOGGER.info("Initializing Embedder.")
         self.chunk_data_path = Path(chunk_data_path)
         self.output_path = Path(output_path)
         self.encoder_config_path = Path(encoder_config_path)
+        self.note_store_path = Path(note_store_path) if note_store_path else None
+        self.note_store: NoteStore | None = None
         self.load_encoder()
 
     def read_chunk_data(self) -> List[Dict] | None:
@@ -39,14 +58,43 @@ class BaseEmbedder(ABC):
 
         LOGGER.info(f"Loading chunk data from {self.chunk_data_path}")
         try:
-            with self.chunk_data_path.open("r", encoding="utf-8") as f:
-                chunk_data = json.load(f)
-                LOGGER.info(f"Loaded {len(chunk_data)} chunks for embedding.")
-                return chunk_data
+            chunk_data = list(self.iter_chunk_data())
+            LOGGER.info(f"Loaded {len(chunk_data)} chunks for embedding.")
+            return chunk_data
         except Exception as e:
             LOGGER.error(f"Error reading chunk data file: {e}")
             return None
 
+    def iter_chunk_data(self) -> Iterator[Dict]:
+        """
+        Lazily read the chunk data to be embedded. A `.jsonl` file is streamed one chunk
+        at a time.
+
+        Returns:
+            Iterator[Dict]: The chunk dictionaries to be embedded.
+        """
+        return iter_records(self.chunk_data_path)
+
+    def chunk_texts(self, chunks: List[Dict]) -> List[str]:
+        """
+        Get the texts of chunks to be encoded. The text of a compact chunk is sliced from
+        its note text in the note store.
+
+        Args:
+            chunks (List[Dict]): List of chunk dictionaries, compact or not.
+
+        Returns:
+            List[str]: The chunk texts.
+        """
+        if all("text" in chunk for chunk in chunks):
+            return [chunk["text"] for chunk in chunks]
+        if self.note_store_path is None:
+            LOGGER.error("Embedding compact chunks requires a note store")
+            raise ValueError("Embedding compact chunks requires a note store")
+        if self.note_store is None:
+            self.note_store = NoteStore(self.note_store_path)
+        return [self.note_store.chunk_text(chunk) for chunk in chunks]
+
     @abstractmethod
     def load_encoder(self) -> None:
         """
@@ -54,16 +102,98 @@ class BaseEmbedder(ABC):
         """
         pass
 
-    def embed(self) -> None:
+    def embed(self, chunk_delta: ChunkDelta | None = None) -> None:
         """
         Main method to perform the embedding process.
+
+        Args:
+            chunk_delta (ChunkDelta | None): The delta of an incremental chunking run. If
+                                             given, the embeddings of the unchanged chunks
+                                             are reused from the previous embeddings
+                                             and only the other chunks are encoded.
+                                             Default is None.
         """
-        chunks = self.read_chunk_data()
-        assert chunks is not None, "Chunk data read should be present."
-        embedded_chunks = self.embed_chunks(chunks)
+        assert self.chunk_data_path.exists(), "Chunk data read should be present."
+        # the note store is re-opened, it is written again with every chunking run
+        if self.note_store is not None:
+            self.note_store.close()
+            self.note_store = None
+        # chunks are read, embedded and written in batches, so with `.jsonl` files
+        # the whole corpus is never held in memory
+        if chunk_delta is None:
+            embedded_chunks: Iterable[Dict] = (
+                embedded_chunk
+                for batch in batched(self.iter_chunk_data(), self.stream_batch_size)
+                for embedded_chunk in self.embed_chunks(batch)
+            )
+        else:
+            embedded_chunks = self._iter_embedded_chunks_incremental(chunk_delta)
         self.save_embedded_chunks(embedded_chunks)
         LOGGER.info("Embedding process completed.")
 
+    def _iter_embedded_chunks_incremental(
+        self, chunk_delta: ChunkDelta
+    ) -> Iterator[Dict]:
+        """
+        Embed the chunk data in batches, reusing the embeddings of the unchanged chunks from
+        the previous embedding matrix (along `output_path`). A chunk which is not unchanged
+        reuses the embedding of a previous chunk with the same `content_hash`, eg, every
+        chunk of a renamed note (the note ID is part of the chunk ID). A chunk whose previous
+        embedding cannot be found is encoded.
+
+        Args:
+            chunk_delta (ChunkDelta): The delta of the incremental chunking run.
+
+        Returns:
+            Iterator[Dict]: The embedded chunks, in the order of the chunk data.
+        """
+        unchanged = set(chunk_delta.unchanged)
+        previous_rows: Dict[str, int] = {}
+        previous_rows_by_hash: Dict[str, int] = {}
+        previous_embeddings = np.empty((0, 0), dtype=np.float32)
+        try:
+            previous_embeddings, previous_ids = load_embeddings(self.output_path)
+            previous_rows = {chunk_id: row for row, chunk_id in enumerate(previous_ids)}
+            for previous_chunk in iter_records(self.output_path):
+                row = previous_rows.get(previous_chunk["chunk_id"])
+                if row is not None and "content_hash" in previous_chunk:
+                    previous_rows_by_hash.setdefault(
+                        previous_chunk["content_hash"], row
+                    )
+        except Exception:
+            LOGGER.warning("No previous embeddings found, encoding every chunk")
+        num_reused = 0
+        num_encoded = 0
+        try:
+            for batch in batched(self.iter_chunk_data(), self.stream_batch_size):
+                reused: Dict[int, np.ndarray] = {}
+                for idx, chunk in enumerate(batch):
+                    row = previous_rows.get(chunk["chunk_id"])
+                    if row is None or chunk["chunk_id"] not in unchanged:
+                        # embeddings only depend on the chunk content
+                        row = previous_rows_by_hash.get(chunk.get("content_hash", ""))
+                    if row is not None:
+                        # copied, so no chunk holds on to the memory-mapped file
+                        reused[idx] = np.array(previous_embeddings[row])
+
+                to_encode = [
+                    chunk for idx, chunk in enumerate(batch) if idx not in reused
+                ]
+                encoded = iter(self.embed_chunks(to_encode) if to_encode else [])
+                for idx, chunk in enumerate(batch):
+                    if idx in reused:
+                        yield {**chunk, "embedding": reused[idx]}
+                    else:
+                        yield next(encoded)
+                num_reused += len(reused)
+                num_encoded += len(to_encode)
+        finally:
+            # unmap the previous matrix before it is replaced
+            del previous_embeddings
+        LOGGER.info(
+            f"Incremental embedding: {num_encoded} chunks encoded, {num_reused} reused"
+        )
+
     @abstractmethod
     def embed_chunks(self, chunks: List[Dict]) -> List[Dict]:
         """
@@ -77,19 +207,41 @@ class BaseEmbedder(ABC):
         """
         pass
 
-    def save_embedded_chunks(self, embedded_chunks: List[Dict]) -> None:
+    def save_embedded_chunks(self, embedded_chunks: Iterable[Dict]) -> None:
         """
-        Save the embedded chunks to a suitable format for later use.
+        Save the embedded chunks to a suitable format (JSON or JSON Lines) for later use.
+        The embeddings are not saved in the chunk data but as a float32 matrix along it,
+        see `EmbeddingWriter`.
 
         Args:
-            embedded_chunks (List[Dict]): List of chunk dictionaries with added embeddings.
+            embedded_chunks (Iterable[Dict]): Chunk dictionaries with added embeddings.
         """
 
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self.output_path.with_suffix(".tmp")
+        with EmbeddingWriter(self.output_path) as embedding_writer:
+            write_records(
+                self.output_path,
+                self._split_embeddings(embedded_chunks, embedding_writer),
+            )
+        LOGGER.info(f"Embedded chunks saved successfully to {str(self.output_path)}")
 
-        with tmp_path.open("w", encoding="utf-8") as f:
-            json.dump(embedded_chunks, f, indent=2, ensure_ascii=False)
+    def _split_embeddings(
+        self, embedded_chunks: Iterable[Dict], embedding_writer: EmbeddingWriter
+    ) -> Iterator[Dict]:
+        """
+        Write the embeddings of the embedded chunks in batches and yield the chunks
+        without their embedding.
 
-        tmp_path.replace(self.output_path)
-        LOGGER.info(f"Embedded chunks saved successfully to {str(self.output_path)}")
+        Args:
+            embedded_chunks (Iterable[Dict]): Chunk dictionaries with added embeddings.
+            embedding_writer (EmbeddingWriter): Writer of the embedding matrix.
+
+        Returns:
+            Iterator[Dict]: The chunk dictionaries without the `embedding` key.
+        """
+        for batch in batched(embedded_chunks, self.stream_batch_size):
+            embedding_writer.add(
+                [chunk["chunk_id"] for chunk in batch],
+                np.array([chunk["embedding"] for chunk in batch], dtype=np.float32),
+            )
+            for chunk in batch:
+                yield {key: value for key, value in chunk.items() if key != "embedding"}
@@ -31,3 +31,11 @@ class BaseEncoder(ABC):
             np.ndarray: An array of embeddings corresponding to the input texts.
         """
         pass
+
+    def close(self) -> None:
+        """
+        Releases the resources held by the encoder (eg, worker processes). Does nothing
+        by default.
+
+        """
+        pass
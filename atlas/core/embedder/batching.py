@@ -0,0 +1,149 @@
+from typing import Callable, Iterable, List, Sequence
+
+import numpy as np
+
+from atlas.core.chunker.token_counter import TokenCounter
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+
+def model_token_lengths(
+    token_counter: TokenCounter, texts: List[str], max_length: int | None
+) -> List[int]:
+    """
+    Get the number of tokens an encoder model sees for every text, ie, including the
+    special tokens and at most the maximum sequence length of the model.
+
+    Args:
+        token_counter (TokenCounter): Token counter of the tokenizer of the model.
+        texts (List[str]): List of texts.
+        max_length (int | None): Maximum sequence length of the model, longer texts are
+                                 truncated. None if unknown.
+
+    Returns:
+        List[int]: The number of tokens of every text.
+    """
+    num_special_tokens = token_counter.num_special_tokens
+    lengths = [count + num_special_tokens for count in token_counter.count(texts)]
+    if max_length is not None:
+        lengths = [min(length, max_length) for length in lengths]
+    return lengths
+
+
+def token_budget_batches(
+    lengths: Sequence[int], max_batch_tokens: int
+) -> List[List[int]]:
+    """
+    Schedule texts into batches by their token length. Texts are sorted by decreasing
+    length, so every batch holds texts of similar lengths and is padded very little, and
+    a batch holds as many texts as fit in `max_batch_tokens` padded tokens, ie,
+    `len(batch) * longest length <= max_batch_tokens`. Short texts are thus encoded in
+    large batches and long texts in small ones. A text longer than the budget is a batch
+    of its own.
+
+    Args:
+        lengths (Sequence[int]): The number of tokens of every text.
+        max_batch_tokens (int): The maximum number of (padded) tokens per batch.
+
+    Returns:
+        List[List[int]]: The indices of the texts of every batch, longest texts first.
+    """
+    if max_batch_tokens < 1:
+        LOGGER.error(f"Invalid maximum number of tokens per batch : {max_batch_tokens}")
+        raise ValueError(
+            f"Invalid maximum number of tokens per batch : {max_batch_tokens}"
+        )
+
+    batches: List[List[int]] = []
+    batch: List[int] = []
+    batch_length = 0
+    # stable, texts of the same length keep their order
+    for idx in sorted(range(len(lengths)), key=lambda idx: -lengths[idx]):
+        # the first text of a batch is its longest
+        if batch and (len(batch) + 1) * batch_length > max_batch_tokens:
+            batches.append(batch)
+            batch = []
+        if not batch:
+            batch_length = max(lengths[idx], 1)
+        batch.append(idx)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def padded_tokens(lengths: Sequence[int], batches: List[List[int]]) -> int:
+    """
+    Count the tokens the encoder processes for batches of texts, padding included.
+
+    Args:
+        lengths (Sequence[int]): The number of tokens of every text.
+        batches (List[List[int]]): The indices of the texts of every batch.
+
+    Returns:
+        int: The number of padded tokens of all batches.
+    """
+    return sum(
+        len(batch) * max(lengths[idx] for idx in batch) for batch in batches if batch
+    )
+
+
+def scatter_embeddings(
+    num_texts: int, batches: List[List[int]], batch_embeddings: Iterable[np.ndarray]
+) -> np.ndarray:
+    """
+    Put the embeddings of batches of texts back in the original order of the texts.
+
+    Args:
+        num_texts (int): Number of texts.
+        batches (List[List[int]]): The indices of the texts of every batch.
+        batch_embeddings (Iterable[np.ndarray]): The embeddings of every batch, in the
+                                                 order of the batches.
+
+    Returns:
+        np.ndarray: The embedding of every text, of shape `(num_texts, dim)`.
+    """
+    embeddings: np.ndarray | None = None
+    for batch, embeddings_of_batch in zip(batches, batch_embeddings):
+        embeddings_of_batch = np.asarray(embeddings_of_batch)
+        if embeddings is None:
+            embeddings = np.empty(
+                (num_texts, embeddings_of_batch.shape[1]),
+                dtype=embeddings_of_batch.dtype,
+            )
+        embeddings[batch] = embeddings_of_batch
+    if embeddings is None:
+        return np.empty((0, 0), dtype=np.float32)
+    return embeddings
+
+
+def encode_in_token_batches(
+    texts: List[str],
+    lengths: Sequence[int],
+    max_batch_tokens: int,
+    encode_batch: Callable[[List[str]], np.ndarray],
+) -> np.ndarray:
+    """
+    Encode texts in the batches scheduled by `token_budget_batches` and return the
+    embeddings in the original order of the texts.
+
+    Args:
+        texts (List[str]): The texts to encode.
+        lengths (Sequence[int]): The number of tokens of every text.
+        max_batch_tokens (int): The maximum number of (padded) tokens per batch.
+        encode_batch (Callable[[List[str]], np.ndarray]): Encodes a batch of texts.
+
+    Returns:
+        np.ndarray: The embedding of every text, of shape `(len(texts), dim)`.
+    """
+    batches = token_budget_batches(lengths, max_batch_tokens)
+    embeddings = scatter_embeddings(
+        len(texts),
+        batches,
+        (encode_batch([texts[idx] for idx in batch]) for batch in batches),
+    )
+    LOGGER.info(
+        f"{len(texts)} texts encoded in {len(batches)} token budget batches, "
+        f"{sum(lengths)} tokens ({padded_tokens(lengths, batches)} with padding)"
+    )
+    return embeddings
@@ -1,5 +1,4 @@
 from dataclasses import dataclass
-import yaml
 from pathlib import Path
 
 from atlas.utils.logger import LoggerConfig
@@ -15,6 +14,19 @@ class EncoderConfig:
     batch_size: int
     normalize_embeddings: bool
     device: str
+    # if set, texts are batched by token length with at most this many (padded) tokens
+    # per batch instead of `batch_size` texts per batch
+    max_batch_tokens: int | None = None
+    # number of worker processes encoding on the CPU, each with its own copy of the model
+    num_workers: int = 1
+    # number of torch threads of every worker, defaults to the CPU count / `num_workers`
+    threads_per_worker: int | None = None
+    # "sentence_transformer" (PyTorch) or "onnx" (ONNX Runtime on the CPU)
+    backend: str = "sentence_transformer"
+    # directory of the ONNX export of the model, defaults to ~/.cache/atlas/onnx/<model>
+    onnx_dir: str | None = None
+    # if True, the ONNX backend runs the dynamically int8 quantized export of the model
+    quantize: bool = False
 
 
 def load_encoder_config(path: Path) -> EncoderConfig:
@@ -24,6 +36,9 @@ def load_encoder_config(path: Path) -> EncoderConfig:
     Args:
         path (Path): Path to the encoder YAML configuration file.
     """
+    # imported on first use, the chunker imports this module to count tokens
+    import yaml
+
     try:
         with path.open("r", encoding="utf-8") as f:
             data = yaml.safe_load(f)
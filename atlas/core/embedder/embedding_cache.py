@@ -0,0 +1,281 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+import hashlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+# SQLite limits the number of parameters of a statement (999 in older versions)
+_MAX_QUERY_HASHES = 500
+# recently used marks kept in memory before they are written by a read
+_MAX_PENDING_TOUCHES = 10_000
+
+
+def text_hash(text: str) -> str:
+    """
+    Get the hash of a text which the cached embeddings are keyed by.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        str: The SHA-256 hex digest of the UTF-8 encoded text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed cache of text embeddings in a SQLite database, so that
+    a text which was already encoded by the same model is never encoded again (eg, the
+    unchanged chunks of a vault after a small edit).
+
+    Embeddings are keyed by (`model_name`, `normalize_embeddings`, SHA-256 of the text).
+    The cache holds at most `max_entries` embeddings, the least recently used ones are
+    evicted first.
+
+    The database uses write-ahead logging (WAL), so readers never block the writer, and
+    every write is a single `BEGIN IMMEDIATE` transaction, so several processes can share
+    a cache. A writer waits up to `timeout` seconds for another one to finish. Lookups
+    only read: the recently used marks of cache hits are kept in memory and written in
+    the transaction of the next `put` (or by `flush`/`close`), so concurrent readers do
+    not wait for each other. An instance can be shared by several threads.
+
+    Args:
+        path (Path): Path of the SQLite database, created if missing.
+        model_name (str): Name of the encoder model.
+        normalize_embeddings (bool): Whether the encoder normalizes the embeddings.
+        max_entries (int): Maximum number of cached embeddings (of all models).
+                           Default is 100000.
+        timeout (float): Seconds to wait for the lock of another writer. Default is 30.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        model_name: str,
+        normalize_embeddings: bool,
+        max_entries: int = 100_000,
+        timeout: float = 30.0,
+    ) -> None:
+        if max_entries < 1:
+            LOGGER.error(f"Invalid maximum number of cache entries : {max_entries}")
+            raise ValueError(f"Invalid maximum number of cache entries : {max_entries}")
+
+        self.path = Path(path)
+        self.model_name = model_name
+        self.normalize_embeddings = normalize_embeddings
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # text hash -> last use of the cache hits not written yet
+        self._pending_touches: Dict[str, int] = {}
+        # the connection is shared by the threads using this instance
+        self._lock = threading.RLock()
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # transactions are managed explicitly, see `_write`
+            self._conn = sqlite3.connect(
+                self.path,
+                timeout=timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._write():
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "model_name TEXT NOT NULL, "
+                    "normalize INTEGER NOT NULL, "
+                    "text_hash TEXT NOT NULL, "
+                    "vector BLOB NOT NULL, "
+                    "last_used INTEGER NOT NULL, "
+                    "UNIQUE (model_name, normalize, text_hash))"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS embeddings_last_used "
+                    "ON embeddings (last_used)"
+                )
+        except sqlite3.Error as e:
+            LOGGER.error(f"Error opening embedding cache : {e}")
+            raise Exception(f"Error opening embedding cache : {e}")
+
+    @contextmanager
+    def _write(self) -> Iterator[None]:
+        """
+        Run the statements of the context in a single write transaction, committed when
+        the context exits without error and rolled back otherwise. `BEGIN IMMEDIATE` takes
+        the write lock up front, so concurrent writers wait for each other (up to
+        `timeout`) instead of failing to upgrade a read lock.
+        """
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def get(self, texts: List[str]) -> List[np.ndarray | None]:
+        """
+        Get the cached embeddings of texts, and mark them as recently used. The marks are
+        written along the next write, so a lookup never takes the write lock.
+
+        Args:
+            texts (List[str]): The texts.
+
+        Returns:
+            List[np.ndarray | None]: The embedding of every text, None if not cached.
+        """
+        hashes = [text_hash(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+        with self._lock:
+            for i in range(0, len(unique_hashes), _MAX_QUERY_HASHES):
+                query_hashes = unique_hashes[i : i + _MAX_QUERY_HASHES]
+                rows = self._conn.execute(
+                    "SELECT text_hash, vector FROM embeddings "
+                    "WHERE model_name = ? AND normalize = ? "
+                    f"AND text_hash IN ({', '.join('?' * len(query_hashes))})",
+                    [self.model_name, int(self.normalize_embeddings), *query_hashes],
+                ).fetchall()
+                vectors.update(
+                    (row_hash, np.frombuffer(vector, dtype=np.float32))
+                    for row_hash, vector in rows
+                )
+
+            now = time.time_ns()
+            self._pending_touches.update((h, now) for h in vectors)
+            if len(self._pending_touches) >= _MAX_PENDING_TOUCHES:
+                self.flush()
+        return [vectors.get(h) for h in hashes]
+
+    def _write_touches(self) -> None:
+        """Write the pending recently used marks, within a write transaction."""
+        if not self._pending_touches:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_used = MAX(last_used, ?) "
+            "WHERE model_name = ? AND normalize = ? AND text_hash = ?",
+            [
+                (last_used, self.model_name, int(self.normalize_embeddings), h)
+                for h, last_used in self._pending_touches.items()
+            ],
+        )
+        self._pending_touches.clear()
+
+    def flush(self) -> None:
+        """Write the pending recently used marks of the cache hits."""
+        with self._lock:
+            if self._pending_touches:
+                with self._write():
+                    self._write_touches()
+
+    def put(self, texts: List[str], embeddings: np.ndarray) -> None:
+        """
+        Cache the embeddings of texts, then evict the least recently used embeddings
+        beyond `max_entries`.
+
+        Args:
+            texts (List[str]): The texts.
+            embeddings (np.ndarray): The embedding of every text, of shape
+                                     `(len(texts), dim)`.
+        """
+        if not texts:
+            return
+        now = time.time_ns()
+        rows = [
+            (
+                self.model_name,
+                int(self.normalize_embeddings),
+                text_hash(text),
+                np.asarray(embedding, dtype=np.float32).tobytes(),
+                now,
+            )
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock, self._write():
+            # before the eviction, which must not evict the recent cache hits
+            self._write_touches()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model_name, normalize, text_hash, vector, last_used) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            (num_entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()
+            if num_entries > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN ("
+                    # a replaced row gets a new rowid, so ties evict older inserts
+                    "SELECT rowid FROM embeddings ORDER BY last_used, rowid LIMIT ?)",
+                    (num_entries - self.max_entries,),
+                )
+                LOGGER.info(
+                    f"{num_entries - self.max_entries} embeddings evicted from cache"
+                )
+
+    def get_or_encode(
+        self, texts: List[str], encode: Callable[[List[str]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Get the embeddings of texts, encoding (once) and caching only the texts which are
+        not cached yet.
+
+        Args:
+            texts (List[str]): The texts.
+            encode (Callable[[List[str]], np.ndarray]): Encodes a list of texts.
+
+        Returns:
+            np.ndarray: The embedding of every text, of shape `(len(texts), dim)`.
+        """
+        cached = self.get(texts)
+        # a text which occurs several times is encoded once
+        missing = list(
+            dict.fromkeys(
+                text for text, embedding in zip(texts, cached) if embedding is None
+            )
+        )
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        LOGGER.info(
+            f"Embedding cache : {len(texts) - len(missing)} hits, "
+            f"{len(missing)} texts to encode"
+        )
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        encoded: Dict[str, np.ndarray] = {}
+        if missing:
+            missing_embeddings = np.asarray(encode(missing), dtype=np.float32)
+            self.put(missing, missing_embeddings)
+            encoded = dict(zip(missing, missing_embeddings))
+        return np.stack(
+            [
+                encoded[text] if embedding is None else embedding
+                for text, embedding in zip(texts, cached)
+            ]
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            (num_entries,) = self._conn.execute(
+                "SELECT COUNT(*) FROM embeddings"
+            ).fetchone()
+        return num_entries
+
+    def close(self) -> None:
+        """Write the pending recently used marks and close the database connection."""
+        with self._lock:
+            self.flush()
+            self._conn.close()
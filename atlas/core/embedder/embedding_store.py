@@ -0,0 +1,168 @@
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, List, Tuple, Type
+import io
+import json
+
+import numpy as np
+
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+EMBEDDINGS_SUFFIX = ".embeddings.npy"
+EMBEDDING_IDS_SUFFIX = ".embedding_ids.json"
+
+
+def embedding_paths(output_path: Path) -> Tuple[Path, Path]:
+    """
+    Get the paths of the embedding matrix and of its chunk IDs which go along an embedded
+    chunks file.
+
+    Args:
+        output_path (Path): Path of the embedded chunks file.
+
+    Returns:
+        Tuple[Path, Path]: `<output stem>.embeddings.npy` and
+                           `<output stem>.embedding_ids.json`.
+    """
+    output_path = Path(output_path)
+    return (
+        output_path.with_suffix(EMBEDDINGS_SUFFIX),
+        output_path.with_suffix(EMBEDDING_IDS_SUFFIX),
+    )
+
+
+def _npy_header(num_rows: int, dim: int) -> bytes:
+    """
+    Get the `.npy` header of a float32 matrix.
+
+    Args:
+        num_rows (int): Number of rows of the matrix.
+        dim (int): Number of columns of the matrix.
+
+    Returns:
+        bytes: The header. Its length does not depend on `num_rows`, numpy leaves spare
+               space for the first axis to grow.
+    """
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        buffer,
+        {"descr": "<f4", "fortran_order": False, "shape": (num_rows, dim)},
+    )
+    return buffer.getvalue()
+
+
+class EmbeddingWriter:
+    """
+    Context manager which writes the embeddings of the embedded chunks as a contiguous
+    float32 `.npy` matrix, whose row `i` is the embedding of the chunk with the `i`-th ID
+    of the chunk IDs sidecar (a JSON list), see `embedding_paths`.
+
+    Embeddings are appended row by row to a temporary file, whose header is rewritten in
+    place with the final number of rows, so the matrix is never held in memory. The files
+    replace the previous ones only when the context exits without error.
+
+    Args:
+        output_path (Path): Path of the embedded chunks file.
+    """
+
+    def __init__(self, output_path: Path) -> None:
+        self.path, self.ids_path = embedding_paths(output_path)
+        self.tmp_path = self.path.with_suffix(".tmp")
+        self.chunk_ids: List[str] = []
+        self.dim: int | None = None
+        self._file: BinaryIO | None = None
+
+    def __enter__(self) -> "EmbeddingWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.tmp_path.open("wb")
+        return self
+
+    def add(self, chunk_ids: List[str], embeddings: np.ndarray) -> None:
+        """
+        Append the embeddings of chunks.
+
+        Args:
+            chunk_ids (List[str]): IDs of the chunks.
+            embeddings (np.ndarray): The embedding of every chunk, of shape
+                                     `(len(chunk_ids), dim)`.
+        """
+        assert (
+            self._file is not None
+        ), "EmbeddingWriter must be used as a context manager"
+        if not chunk_ids:
+            return
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2 or len(embeddings) != len(chunk_ids):
+            LOGGER.error("Embeddings and chunk IDs length mismatch")
+            raise ValueError("Embeddings and chunk IDs length mismatch")
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+            self._file.write(_npy_header(0, self.dim))
+        elif embeddings.shape[1] != self.dim:
+            LOGGER.error(f"Invalid embedding size. Expected {self.dim}")
+            raise ValueError(f"Invalid embedding size. Expected {self.dim}")
+
+        self._file.write(embeddings.tobytes())
+        self.chunk_ids.extend(chunk_ids)
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        assert self._file is not None
+        if exc_type is not None:
+            self._file.close()
+            self.tmp_path.unlink(missing_ok=True)
+            return
+
+        if self.dim is None:
+            self._file.write(_npy_header(0, 0))
+        else:
+            self._file.seek(0)
+            self._file.write(_npy_header(len(self.chunk_ids), self.dim))
+        self._file.close()
+
+        ids_tmp_path = self.ids_path.with_suffix(".tmp")
+        with ids_tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.chunk_ids, f, ensure_ascii=False)
+        self.tmp_path.replace(self.path)
+        ids_tmp_path.replace(self.ids_path)
+        LOGGER.info(
+            f"{len(self.chunk_ids)} embeddings saved successfully to {str(self.path)}"
+        )
+
+
+def load_embeddings(
+    output_path: Path, mmap: bool = True
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Load the embedding matrix and the chunk IDs of its rows saved along an embedded chunks
+    file.
+
+    Args:
+        output_path (Path): Path of the embedded chunks file.
+        mmap (bool): If True, the matrix is memory-mapped (read-only) instead of being read
+                     in memory. Default is True.
+
+    Returns:
+        Tuple[np.ndarray, List[str]]: The float32 embedding matrix and the chunk ID of
+                                      every row.
+    """
+    path, ids_path = embedding_paths(output_path)
+    try:
+        embeddings = np.load(path, mmap_mode="r" if mmap else None)
+        with ids_path.open("r", encoding="utf-8") as f:
+            chunk_ids = json.load(f)
+    except Exception as e:
+        LOGGER.error(f"Error loading embeddings : {e}")
+        raise Exception(f"Error loading embeddings : {e}")
+
+    if len(embeddings) != len(chunk_ids):
+        LOGGER.error("Embeddings and chunk IDs length mismatch")
+        raise ValueError("Embeddings and chunk IDs length mismatch")
+    LOGGER.info(f"Embeddings successfully loaded from {str(path)}")
+    return embeddings, chunk_ids
@@ -0,0 +1,38 @@
+from atlas.core.embedder.base.base_encoder import BaseEncoder
+from atlas.core.embedder.config import EncoderConfig
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+ENCODER_BACKENDS = ("sentence_transformer", "onnx")
+
+
+def create_encoder(config: EncoderConfig) -> BaseEncoder:
+    """
+    Create the encoder of the backend selected by the `backend` of the configuration. The
+    backend module is only imported when selected, so ONNX Runtime is not needed by the
+    PyTorch backend.
+
+    Args:
+        config (EncoderConfig): Configuration for the encoder.
+
+    Returns:
+        BaseEncoder: The loaded encoder.
+    """
+    if config.backend == "sentence_transformer":
+        from atlas.core.embedder.sentence_transformer.impl_encoder import (
+            SentenceTransformerEncoder,
+        )
+
+        return SentenceTransformerEncoder(config)
+    if config.backend == "onnx":
+        from atlas.core.embedder.onnx_runtime.impl_encoder import OnnxEncoder
+
+        return OnnxEncoder(config)
+
+    LOGGER.error(
+        f"Invalid encoder backend : {config.backend}. Expected one of {ENCODER_BACKENDS}"
+    )
+    raise ValueError(
+        f"Invalid encoder backend : {config.backend}. Expected one of {ENCODER_BACKENDS}"
+    )
@@ -0,0 +1,137 @@
+from dataclasses import astuple, replace
+from typing import Dict, List, Tuple
+import threading
+
+import numpy as np
+
+from atlas.core.embedder.base.base_encoder import BaseEncoder
+from atlas.core.embedder.config import EncoderConfig
+from atlas.core.embedder.encoder_factory import create_encoder
+from atlas.utils.logger import LoggerConfig
+from atlas.utils.singleton import SingletonMeta
+
+LOGGER = LoggerConfig().logger
+
+WARM_UP_TEXT = "Atlas warms up the encoder"
+
+
+class _Entry:
+    """
+    An encoder of the registry, with the lock which serializes its loading and its
+    encoding (Hugging Face fast tokenizers must not be used by several threads at once).
+    """
+
+    def __init__(self, config: EncoderConfig) -> None:
+        self.config = config
+        self.lock = threading.Lock()
+        self.encoder: BaseEncoder | None = None
+
+
+class EncoderRegistry(metaclass=SingletonMeta):
+    """
+    Process-wide registry of loaded encoders, keyed by their configuration, so that an
+    encoder model is loaded once and shared by all its callers (eg, every query of the
+    retriever) instead of being reloaded from disk on every call.
+
+    The registry is thread-safe: a model is loaded once even when several threads ask for
+    it at once, and different models are loaded concurrently.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple, _Entry] = {}
+
+    def _entry(self, config: EncoderConfig) -> _Entry:
+        """
+        Get the entry of an encoder configuration, loading its encoder if needed.
+
+        Args:
+            config (EncoderConfig): Configuration of the encoder.
+
+        Returns:
+            _Entry: The entry, whose encoder is loaded.
+        """
+        key = astuple(config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                # a copy, the caller may modify its configuration
+                entry = self._entries[key] = _Entry(replace(config))
+        with entry.lock:
+            if entry.encoder is None:
+                LOGGER.info(f"Loading encoder {config.model_name} into the registry")
+                entry.encoder = create_encoder(entry.config)
+        return entry
+
+    def get(self, config: EncoderConfig) -> BaseEncoder:
+        """
+        Get the shared encoder of a configuration, loading it on first use. Use `encode`
+        to encode texts from several threads, and do not use the encoder once unloaded.
+
+        Args:
+            config (EncoderConfig): Configuration of the encoder.
+
+        Returns:
+            BaseEncoder: The loaded encoder.
+        """
+        encoder = self._entry(config).encoder
+        assert encoder is not None
+        return encoder
+
+    def encode(self, config: EncoderConfig, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts with the shared encoder of a configuration, one thread at a time.
+
+        Args:
+            config (EncoderConfig): Configuration of the encoder.
+            texts (List[str]): List of texts to encode.
+
+        Returns:
+            np.ndarray: Array of embeddings.
+        """
+        while True:
+            entry = self._entry(config)
+            with entry.lock:
+                # unless unloaded by another thread in the meantime
+                if entry.encoder is not None:
+                    return entry.encoder.encode(texts)
+
+    def warm_up(self, config: EncoderConfig) -> None:
+        """
+        Load the encoder of a configuration and encode a text, so that the first query
+        pays neither the loading of the model nor its lazy initialization.
+
+        Args:
+            config (EncoderConfig): Configuration of the encoder.
+        """
+        self.encode(config, [WARM_UP_TEXT])
+        LOGGER.info(f"Encoder {config.model_name} warmed up")
+
+    def unload(self, config: EncoderConfig | None = None) -> None:
+        """
+        Unload the encoder of a configuration, or all encoders, and release their
+        resources. An unloaded encoder is loaded again on its next use.
+
+        Args:
+            config (EncoderConfig | None): Configuration of the encoder to unload, all
+                                           encoders if None. Default is None.
+        """
+        with self._lock:
+            if config is None:
+                entries = list(self._entries.values())
+                self._entries.clear()
+            else:
+                entry = self._entries.pop(astuple(config), None)
+                entries = [entry] if entry is not None else []
+
+        for entry in entries:
+            with entry.lock:
+                if entry.encoder is not None:
+                    entry.encoder.close()
+                    LOGGER.info(f"Encoder {entry.config.model_name} unloaded")
+                    entry.encoder = None
+
+    def __contains__(self, config: EncoderConfig) -> bool:
+        with self._lock:
+            entry = self._entries.get(astuple(config))
+        return entry is not None and entry.encoder is not None
@@ -0,0 +1,298 @@
+from pathlib import Path
+from typing import Any, Dict, List
+import json
+
+import numpy as np
+import onnxruntime as ort  # type: ignore[import-untyped]
+from transformers import AutoTokenizer
+
+from atlas.core.chunker.token_counter import TokenCounter
+from atlas.core.embedder.base.base_encoder import BaseEncoder
+from atlas.core.embedder.batching import (
+    encode_in_token_batches,
+    model_token_lengths,
+    scatter_embeddings,
+)
+from atlas.core.embedder.config import EncoderConfig
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+ONNX_MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model.int8.onnx"
+# written last, its presence marks a complete export
+EXPORT_INFO_FILE = "export_info.json"
+OUTPUT_NAME = "sentence_embedding"
+
+
+def default_onnx_dir(model_name: str) -> Path:
+    """
+    Get the default directory of the ONNX export of a model.
+
+    Args:
+        model_name (str): Name (or path) of the Sentence Transformer model.
+
+    Returns:
+        Path: `~/.cache/atlas/onnx/<model name>`.
+    """
+    return (
+        Path.home()
+        / ".cache"
+        / "atlas"
+        / "onnx"
+        / model_name.strip("/\\").replace("/", "--").replace("\\", "--")
+    )
+
+
+def export_onnx(model_name: str, onnx_dir: Path, quantize: bool = False) -> None:
+    """
+    Export a Sentence Transformer model to ONNX: the graph maps the tokenizer outputs to
+    the sentence embeddings (pooling and any normalization of the model included). The
+    tokenizer is saved along the graph, so the exported model is loaded without PyTorch.
+
+    Args:
+        model_name (str): Name (or path) of the Sentence Transformer model.
+        onnx_dir (Path): Directory to export the model to.
+        quantize (bool): If True, also save a copy of the graph whose weights are
+                         dynamically quantized to int8. Default is False.
+    """
+    # the export only needs PyTorch once per model
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    class _SentenceEmbedding(torch.nn.Module):
+        """Sentence Transformer taking the tokenizer outputs as positional inputs."""
+
+        def __init__(self, model: SentenceTransformer, input_names: List[str]):
+            super().__init__()
+            self.model = model
+            self.input_names = input_names
+
+        def forward(self, *inputs: torch.Tensor) -> torch.Tensor:
+            return self.model(dict(zip(self.input_names, inputs)))[OUTPUT_NAME]
+
+    onnx_dir = Path(onnx_dir)
+    onnx_dir.mkdir(parents=True, exist_ok=True)
+    model = SentenceTransformer(model_name, device="cpu")
+    model.eval()
+    tokenizer = model.tokenizer
+    # a batch of texts of different lengths, so no axis is traced as a constant
+    features = tokenizer(
+        ["Atlas exports the encoder", "to ONNX"], padding=True, return_tensors="pt"
+    )
+    input_names = list(features.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes[OUTPUT_NAME] = {0: "batch"}
+
+    tmp_path = onnx_dir / f"{ONNX_MODEL_FILE}.tmp"
+    try:
+        with torch.no_grad():
+            # the TorchScript exporter, the dynamo one needs `onnxscript`
+            torch.onnx.export(
+                _SentenceEmbedding(model, input_names),
+                tuple(features[name] for name in input_names),
+                str(tmp_path),
+                input_names=input_names,
+                output_names=[OUTPUT_NAME],
+                dynamic_axes=dynamic_axes,
+                opset_version=17,
+                dynamo=False,
+            )
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        LOGGER.error(f"Error exporting {model_name} to ONNX : {e}")
+        raise Exception(f"Error exporting {model_name} to ONNX : {e}")
+    tmp_path.replace(onnx_dir / ONNX_MODEL_FILE)
+    tokenizer.save_pretrained(str(onnx_dir))
+
+    if quantize:
+        quantize_onnx(onnx_dir)
+
+    export_info = {
+        "model_name": model_name,
+        "max_seq_length": model.max_seq_length,
+        "input_names": input_names,
+    }
+    with (onnx_dir / EXPORT_INFO_FILE).open("w", encoding="utf-8") as f:
+        json.dump(export_info, f, indent=2)
+    LOGGER.info(f"Exported {model_name} to ONNX in {str(onnx_dir)}")
+
+
+def quantize_onnx(onnx_dir: Path) -> None:
+    """
+    Save a copy of an exported graph whose weights are dynamically quantized to int8,
+    ie, the activations are quantized on the fly.
+
+    Args:
+        onnx_dir (Path): Directory of the exported model.
+    """
+    from onnxruntime.quantization import (  # type: ignore[import-untyped]
+        QuantType,
+        quantize_dynamic,
+    )
+
+    onnx_dir = Path(onnx_dir)
+    tmp_path = onnx_dir / f"{QUANTIZED_MODEL_FILE}.tmp"
+    try:
+        quantize_dynamic(
+            onnx_dir / ONNX_MODEL_FILE, tmp_path, weight_type=QuantType.QInt8
+        )
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        LOGGER.error(f"Error quantizing ONNX model : {e}")
+        raise Exception(f"Error quantizing ONNX model : {e}")
+    tmp_path.replace(onnx_dir / QUANTIZED_MODEL_FILE)
+    LOGGER.info(f"Quantized ONNX model saved to {str(onnx_dir)}")
+
+
+class OnnxEncoder(BaseEncoder):
+    """
+    Encoder running the ONNX export of a Sentence Transformer model with ONNX Runtime on
+    the CPU.
+
+    The model is exported to `onnx_dir` (and its weights quantized to int8 if `quantize`
+    is set) the first time it is loaded, which needs PyTorch; afterwards only ONNX Runtime
+    and the tokenizer are loaded.
+
+    Args:
+        config (EncoderConfig): Configuration for the encoder.
+    """
+
+    def __init__(self, config: EncoderConfig):
+        LOGGER.info("-" * 20)
+        LOGGER.info("Initializing ONNX Runtime Encoder")
+        if config.device != "cpu":
+            LOGGER.warning(
+                f"ONNX Runtime encoder runs on the CPU, not on {config.device}"
+            )
+        if config.num_workers > 1:
+            LOGGER.warning("Encoding workers are not used by the ONNX Runtime encoder")
+        self.config = config
+        self.onnx_dir = (
+            Path(config.onnx_dir)
+            if config.onnx_dir is not None
+            else default_onnx_dir(config.model_name)
+        )
+        self.session: ort.InferenceSession | None = None
+        self.tokenizer: Any = None
+        self.input_names: List[str] = []
+        self.max_seq_length: int | None = None
+        self.token_counter: TokenCounter | None = None
+        self.load()
+
+    def _export_info(self) -> Dict[str, Any] | None:
+        """
+        Get the information of the export of the configured model in `onnx_dir`.
+
+        Returns:
+            Dict[str, Any] | None: The export information, None if the model was not
+                                   exported there.
+        """
+        try:
+            with (self.onnx_dir / EXPORT_INFO_FILE).open("r", encoding="utf-8") as f:
+                export_info = json.load(f)
+        except FileNotFoundError:
+            return None
+        if export_info.get("model_name") != self.config.model_name:
+            return None
+        return export_info
+
+    def load(self) -> None:
+        """Load the ONNX model, exporting (and quantizing) it first if needed."""
+        if self.session is not None:
+            return
+
+        export_info = self._export_info()
+        if export_info is None:
+            export_onnx(self.config.model_name, self.onnx_dir, self.config.quantize)
+            export_info = self._export_info()
+            assert export_info is not None
+        elif (
+            self.config.quantize and not (self.onnx_dir / QUANTIZED_MODEL_FILE).exists()
+        ):
+            quantize_onnx(self.onnx_dir)
+
+        model_path = self.onnx_dir / (
+            QUANTIZED_MODEL_FILE if self.config.quantize else ONNX_MODEL_FILE
+        )
+        self.session = ort.InferenceSession(
+            str(model_path), providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(str(self.onnx_dir))
+        self.input_names = export_info["input_names"]
+        self.max_seq_length = export_info["max_seq_length"]
+        LOGGER.info(f"Loaded ONNX model: {str(model_path)}")
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a List of texts into embeddings.
+
+        Args:
+            texts (List[str]): List of texts to encode.
+
+        Returns:
+            np.ndarray: Array of embeddings.
+        """
+        LOGGER.info(f"Encoding {len(texts)} texts using ONNX Runtime.")
+
+        if self.config.max_batch_tokens is not None:
+            return encode_in_token_batches(
+                texts,
+                self.token_lengths(texts),
+                self.config.max_batch_tokens,
+                self._encode_batch,
+            )
+
+        # like sentence transformers, batch texts of similar (character) lengths
+        order = sorted(range(len(texts)), key=lambda idx: -len(texts[idx]))
+        batches = [
+            order[start : start + self.config.batch_size]
+            for start in range(0, len(order), self.config.batch_size)
+        ]
+        return scatter_embeddings(
+            len(texts),
+            batches,
+            (self._encode_batch([texts[idx] for idx in batch]) for batch in batches),
+        )
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """
+        Get the number of tokens the model sees for every text, ie, including the special
+        tokens and at most the maximum sequence length of the model.
+
+        Args:
+            texts (List[str]): List of texts.
+
+        Returns:
+            List[int]: The number of tokens of every text.
+        """
+        if self.token_counter is None:
+            self.token_counter = TokenCounter(self.tokenizer)
+        return model_token_lengths(self.token_counter, texts, self.max_seq_length)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a batch of texts.
+
+        Args:
+            texts (List[str]): The texts of the batch.
+
+        Returns:
+            np.ndarray: Array of float32 embeddings.
+        """
+        assert self.session is not None, "Model must be loaded before encoding"
+        features = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np",
+        )
+        (embeddings,) = self.session.run(
+            [OUTPUT_NAME],
+            {name: features[name].astype(np.int64) for name in self.input_names},
+        )
+        if self.config.normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings = embeddings / np.maximum(norms, 1e-12)
+        return embeddings.astype(np.float32, copy=False)
@@ -1,29 +1,80 @@
 import os
+from pathlib import Path
 from typing import List, Dict
 
+from atlas.core.chunker.chunk_manifest import ChunkDelta
 from atlas.core.embedder.base.base_embedder import BaseEmbedder
 from atlas.core.embedder.config import load_encoder_config
-from atlas.core.embedder.sentence_transformer.impl_encoder import (
-    SentenceTransformerEncoder,
-)
+from atlas.core.embedder.embedding_cache import EmbeddingCache
+from atlas.core.embedder.encoder_factory import create_encoder
 from atlas.utils.logger import LoggerConfig
 
 LOGGER = LoggerConfig().logger
 
 
 class SentenceTransformerEmbedder(BaseEmbedder):
-    """Embedder implementation using Sentence Transformers."""
+    """
+    Embedder implementation using Sentence Transformers.
+
+    Args:
+        chunk_data_path (str): Path to the chunk data file.
+        output_path (str): Path to save the embedded chunks.
+        encoder_config_path (str): Path to the encoder configuration file.
+        note_store_path (str | None): Directory of the note store of compact chunks.
+                                      Default is None.
+        cache_path (str | None): Path of a persistent `EmbeddingCache` database. If set,
+                                 only the chunk texts which are not cached for the
+                                 encoder's model are encoded. Default is None.
+        cache_max_entries (int): Maximum number of embeddings in the cache, the least
+                                 recently used ones are evicted. Default is 100000.
+    """
 
     def __init__(
-        self, chunk_data_path: str, output_path: str, encoder_config_path: str
+        self,
+        chunk_data_path: str,
+        output_path: str,
+        encoder_config_path: str,
+        note_store_path: str | None = None,
+        cache_path: str | None = None,
+        cache_max_entries: int = 100_000,
     ):
-        super().__init__(chunk_data_path, output_path, encoder_config_path)
+        super().__init__(
+            chunk_data_path, output_path, encoder_config_path, note_store_path
+        )
+        self.embedding_cache: EmbeddingCache | None = None
+        if cache_path is not None:
+            model_name = self.encoder_config.model_name
+            if self.encoder_config.backend == "onnx" and self.encoder_config.quantize:
+                # int8 embeddings differ from the float ones of the same model
+                model_name = f"{model_name}:int8"
+            self.embedding_cache = EmbeddingCache(
+                Path(cache_path),
+                model_name,
+                self.encoder_config.normalize_embeddings,
+                max_entries=cache_max_entries,
+            )
+
+    def embed(self, chunk_delta: ChunkDelta | None = None) -> None:
+        """
+        Perform the embedding process, see `BaseEmbedder.embed()`. The recently used marks
+        of the cache hits are written to the embedding cache at the end, even if every chunk
+        was a hit, so that the least recently used embeddings are still evicted first.
+
+        Args:
+            chunk_delta (ChunkDelta | None): The delta of an incremental chunking run.
+                                             Default is None.
+        """
+        try:
+            super().embed(chunk_delta)
+        finally:
+            if self.embedding_cache is not None:
+                self.embedding_cache.flush()
 
     def load_encoder(self) -> None:
-        """Load the Sentence Transformer encoder model."""
+        """Load the encoder model of the backend selected in the encoder configuration."""
 
-        embedding_config = load_encoder_config(self.encoder_config_path)
-        encoder = SentenceTransformerEncoder(embedding_config)
+        self.encoder_config = load_encoder_config(self.encoder_config_path)
+        encoder = create_encoder(self.encoder_config)
         self.encoder = encoder
 
     def embed_chunks(self, chunks: List[Dict]) -> List[Dict]:
@@ -40,9 +91,12 @@ class SentenceTransformerEmbedder(BaseEmbedder):
             LOGGER.warning("No chunks provided for embedding.")
             return []
 
-        texts = [chunk["text"] for chunk in chunks]
+        texts = self.chunk_texts(chunks)
 
-        embeddings = self.encoder.encode(texts)
+        if self.embedding_cache is not None:
+            embeddings = self.embedding_cache.get_or_encode(texts, self.encoder.encode)
+        else:
+            embeddings = self.encoder.encode(texts)
 
         if len(embeddings) != len(chunks):
             LOGGER.error("Embedding count does not match chunk count.")
@@ -53,7 +107,8 @@ class SentenceTransformerEmbedder(BaseEmbedder):
         for chunk, embedding in zip(chunks, embeddings):
             embedded_chunk = {
                 **chunk,
-                "embedding": embedding.tolist(),  # Convert numpy array to list for JSON serialization
+                # saved in a float32 matrix along the chunks, see `EmbeddingWriter`
+                "embedding": embedding,
             }
             embedded_chunks.append(embedded_chunk)
 
@@ -61,7 +116,8 @@ class SentenceTransformerEmbedder(BaseEmbedder):
 
 
 if __name__ == "__main__":
-    chunk_data_path = r"D:\\Deep learning\\Atlas\\Resources\\chunked_data.json"
+    # output of the deduplicator, which runs between the chunker and the embedder
+    chunk_data_path = r"D:\\Deep learning\\Atlas\\Resources\\deduplicated_chunks.json"
     output_path = r"D:\\Deep learning\\Atlas\\Resources\\embedded_chunks.json"
     encoder_config_path = os.path.join(
         os.getcwd(), "atlas", "core", "configs", "sentence_transformer_config.yaml"
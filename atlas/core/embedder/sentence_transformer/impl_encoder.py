@@ -1,20 +1,41 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
-import torch
 
+from atlas.core.chunker.token_counter import TokenCounter
 from atlas.core.embedder.base.base_encoder import BaseEncoder
+from atlas.core.embedder.batching import (
+    encode_in_token_batches,
+    model_token_lengths,
+    scatter_embeddings,
+    token_budget_batches,
+)
 from atlas.core.embedder.config import EncoderConfig
 from atlas.utils.logger import LoggerConfig
+from atlas.utils.parallel_utils import ordered_map
 
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Tuple
+import multiprocessing
+import os
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 LOGGER = LoggerConfig().logger
 
+# model of an encoding worker process, see `_init_encode_worker`
+_WORKER_MODEL: "SentenceTransformer | None" = None
+
 
 class SentenceTransformerEncoder(BaseEncoder):
     """
     Sentence Transformer Encoder Wrapper.
 
+    With `num_workers > 1` in the configuration (CPU only), the texts are encoded by a pool
+    of worker processes which each load their own copy of the model and use
+    `threads_per_worker` threads. The batches are sharded across the workers and their
+    embeddings are merged back in the order of the texts. Call `close()` to shut the pool
+    down.
+
     Args:
         config (EncoderConfig): Configuration for the encoder.
     """
@@ -22,21 +43,75 @@ class SentenceTransformerEncoder(BaseEncoder):
     def __init__(self, config: EncoderConfig):
         LOGGER.info("-" * 20)
         LOGGER.info("Initializing Sentence Transformer Encoder Wrapper")
+        if config.num_workers < 1:
+            LOGGER.error(f"Invalid number of encoding workers : {config.num_workers}")
+            raise ValueError(
+                f"Invalid number of encoding workers : {config.num_workers}"
+            )
         self.config = config
-        self.model: SentenceTransformer | None = None
+        self.model: "SentenceTransformer | None" = None
+        self.token_counter: TokenCounter | None = None
+        self.pool: ProcessPoolExecutor | None = None
         self.load()
 
+    def _device(self) -> str:
+        """
+        Get the device to run the model on, the CPU if CUDA is configured but unavailable.
+
+        Returns:
+            str: The device.
+        """
+        import torch
+
+        if self.config.device == "cuda" and not torch.cuda.is_available():
+            return "cpu"
+        return self.config.device
+
     def load(self) -> None:
-        """Load the Sentence Transformer model."""
-        if self.model is not None:
+        """Load the Sentence Transformer model, or start the worker pool which loads it."""
+        if self.model is not None or self.pool is not None:
             return
 
-        if self.config.device == "cuda":
-            device = "cuda" if torch.cuda.is_available() else "cpu"
+        device = self._device()
+        if self.config.num_workers > 1:
+            if device == "cpu":
+                self._start_pool()
+                return
+            LOGGER.warning(
+                f"Encoding workers are only used on CPU, encoding on {device} instead"
+            )
+
+        # imported on first use, importing torch takes seconds
+        from sentence_transformers import SentenceTransformer
 
         self.model = SentenceTransformer(self.config.model_name, device=device)
         LOGGER.info(f"Loaded Sentence Transformer model: {self.config.model_name}")
 
+    def _start_pool(self) -> None:
+        """
+        Start the worker processes. They are spawned rather than forked, as forking a
+        process whose torch thread pools are running is unsafe.
+        """
+        threads_per_worker = self.config.threads_per_worker or max(
+            1, (os.cpu_count() or 1) // self.config.num_workers
+        )
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.config.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_encode_worker,
+            initargs=(self.config.model_name, threads_per_worker),
+        )
+        LOGGER.info(
+            f"Started {self.config.num_workers} encoding workers with "
+            f"{threads_per_worker} threads each"
+        )
+
+    def close(self) -> None:
+        """Shut down the worker processes, if any."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
     def encode(self, texts: List[str]) -> np.ndarray:
         """
         Encode a List of texts into embeddings.
@@ -49,8 +124,19 @@ class SentenceTransformerEncoder(BaseEncoder):
         """
         LOGGER.info(f"Encoding {len(texts)} texts using Sentence Transformer model.")
 
+        if self.pool is not None:
+            return self._encode_in_pool(texts)
+
         assert self.model is not None, "Model must be loaded before encoding"
 
+        if self.config.max_batch_tokens is not None:
+            return encode_in_token_batches(
+                texts,
+                self.token_lengths(texts),
+                self.config.max_batch_tokens,
+                self._encode_batch,
+            )
+
         embeddings = self.model.encode(
             texts,
             batch_size=self.config.batch_size,
@@ -59,3 +145,115 @@ class SentenceTransformerEncoder(BaseEncoder):
         )
 
         return embeddings
+
+    def _encode_in_pool(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts with the worker processes, one batch per task.
+
+        Args:
+            texts (List[str]): List of texts to encode.
+
+        Returns:
+            np.ndarray: Array of embeddings, in the order of the texts.
+        """
+        assert self.pool is not None, "Worker pool must be started before encoding"
+        if self.config.max_batch_tokens is not None:
+            batches = token_budget_batches(
+                self.token_lengths(texts), self.config.max_batch_tokens
+            )
+        else:
+            batches = [
+                list(range(start, min(start + self.config.batch_size, len(texts))))
+                for start in range(0, len(texts), self.config.batch_size)
+            ]
+        tasks = (
+            ([texts[idx] for idx in batch], self.config.normalize_embeddings)
+            for batch in batches
+        )
+        return scatter_embeddings(
+            len(texts),
+            batches,
+            ordered_map(
+                self.pool,
+                _encode_worker_batch,
+                tasks,
+                max_pending=2 * self.config.num_workers,
+            ),
+        )
+
+    def token_lengths(self, texts: List[str]) -> List[int]:
+        """
+        Get the number of tokens the model sees for every text, ie, including the special
+        tokens and at most the maximum sequence length of the model.
+
+        Args:
+            texts (List[str]): List of texts.
+
+        Returns:
+            List[int]: The number of tokens of every text.
+        """
+        if self.token_counter is None:
+            # only the workers hold a model in a worker pool
+            self.token_counter = (
+                TokenCounter(self.model.tokenizer)
+                if self.model is not None
+                else TokenCounter.from_encoder_config(self.config)
+            )
+        # longer texts are truncated by the model
+        max_length = self.model.max_seq_length if self.model is not None else None
+        return model_token_lengths(self.token_counter, texts, max_length)
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode a batch of texts scheduled by `encode_in_token_batches`.
+
+        Args:
+            texts (List[str]): The texts of the batch.
+
+        Returns:
+            np.ndarray: Array of embeddings.
+        """
+        assert self.model is not None, "Model must be loaded before encoding"
+        return self.model.encode(
+            texts,
+            batch_size=len(texts),
+            show_progress_bar=False,
+            normalize_embeddings=self.config.normalize_embeddings,
+        )
+
+
+def _init_encode_worker(model_name: str, threads: int) -> None:
+    """
+    Initialize an encoding worker process: load the model on the CPU.
+
+    Args:
+        model_name (str): Name of the Sentence Transformer model.
+        threads (int): Number of torch threads of the worker.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    global _WORKER_MODEL
+    torch.set_num_threads(threads)
+    _WORKER_MODEL = SentenceTransformer(model_name, device="cpu")
+
+
+def _encode_worker_batch(task: Tuple[List[str], bool]) -> np.ndarray:
+    """
+    Encode a batch of texts in a worker process.
+
+    Args:
+        task (Tuple[List[str], bool]): The texts of the batch and whether to normalize
+                                       their embeddings.
+
+    Returns:
+        np.ndarray: Array of embeddings.
+    """
+    texts, normalize_embeddings = task
+    assert _WORKER_MODEL is not None, "Worker must be initialized before encoding"
+    return _WORKER_MODEL.encode(
+        texts,
+        batch_size=len(texts),
+        show_progress_bar=False,
+        normalize_embeddings=normalize_embeddings,
+    )
@@ -0,0 +1,345 @@
+from pathlib import Path
+from typing import Dict, Iterable, List, Set, Tuple
+import json
+import posixpath
+
+import numpy as np
+
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+
+class LinkResolver:
+    """
+    Resolves wikilink targets to `note_id`s the way Obsidian does.
+
+    A raw wikilink such as `folder/Note#Heading|alias` is first stripped of its alias
+    (after `|`) and of its heading or block anchor (after `#`). The remaining link path
+    is matched case-insensitively, with or without the `.md` extension:
+    1. as a path relative to the linking note if it starts with `./` or `../`
+    2. as a full path from the vault root
+    3. as the end of a path, eg, `Note` or `folder/Note` (the shortest unique path
+       Obsidian writes by default). If several notes match, the one in the same folder
+       as the linking note wins, then the one with the shortest path.
+
+    Links to the linking note itself (eg, `[[#Heading]]`) and links to non-note files
+    (eg, `[[image.png]]`) are not resolved.
+
+    Args:
+        note_ids (Iterable[str]): The `note_id`s of all notes in the vault.
+    """
+
+    def __init__(self, note_ids: Iterable[str]) -> None:
+        # lower cased path without extension -> note_id
+        self._by_path: Dict[str, str] = {}
+        # lower cased note name without extension -> note_ids, shortest path first
+        self._by_name: Dict[str, List[str]] = {}
+        for note_id in note_ids:
+            key = self._normalize(note_id)
+            self._by_path.setdefault(key, note_id)
+            self._by_name.setdefault(key.rpartition("/")[2], []).append(note_id)
+        for candidates in self._by_name.values():
+            candidates.sort(key=lambda note_id: (note_id.count("/"), note_id))
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        """
+        Normalize a note path or link path for matching.
+
+        Args:
+            path (str): The note path or link path.
+
+        Returns:
+            str: The lower cased path without leading `/` and `.md` extension.
+        """
+        path = path.strip().lstrip("/").lower()
+        return path[:-3] if path.endswith(".md") else path
+
+    @staticmethod
+    def link_path(wikilink: str) -> str:
+        """
+        Strip the alias and the heading/block anchor of a wikilink.
+
+        Eg: `folder/Note#Heading|alias` -> `folder/Note`
+
+        Args:
+            wikilink (str): The raw wikilink, without the surrounding `[[` and `]]`.
+
+        Returns:
+            str: The link path, empty if the link points into the linking note itself.
+        """
+        return wikilink.split("|", 1)[0].split("#", 1)[0].strip()
+
+    def resolve(self, wikilink: str, source_note_id: str) -> str | None:
+        """
+        Resolve a wikilink to the `note_id` of the note it points to.
+
+        Args:
+            wikilink (str): The raw wikilink, without the surrounding `[[` and `]]`.
+            source_note_id (str): The `note_id` of the note containing the link.
+
+        Returns:
+            str | None: The `note_id` of the linked note or None if it cannot be resolved.
+        """
+        link_path = self.link_path(wikilink)
+        if not link_path:
+            return None
+        source_folder = posixpath.dirname(source_note_id)
+
+        if link_path.startswith(("./", "../")):
+            relative_path = posixpath.normpath(posixpath.join(source_folder, link_path))
+            target = self._by_path.get(self._normalize(relative_path))
+            return target if target != source_note_id else None
+
+        key = self._normalize(link_path)
+        target = self._by_path.get(key)
+        if target is None:
+            candidates = self._by_name.get(key.rpartition("/")[2], [])
+            if "/" in key:
+                candidates = [
+                    note_id
+                    for note_id in candidates
+                    if self._normalize(note_id).endswith("/" + key)
+                ]
+            same_folder = [
+                note_id
+                for note_id in candidates
+                if posixpath.dirname(note_id) == source_folder
+            ]
+            matches = same_folder or candidates
+            target = matches[0] if matches else None
+        return target if target != source_note_id else None
+
+
+class WikilinkGraph:
+    """
+    Graph of the resolved wikilinks between notes, with forward links and backlinks stored
+    as compressed sparse row (CSR) arrays. The links of node `i` are
+    `indices[indptr[i]:indptr[i + 1]]`, in node order and without duplicates.
+
+    Saved as `.npy` files which are memory-mapped on load, so that loading a graph is
+    instantaneous and its adjacency is only paged in as it is accessed.
+
+    Saved files:
+    - nodes.json -> the `note_id` of every node, in node order
+    - forward_indptr.npy, forward_indices.npy -> links from a note
+    - backward_indptr.npy, backward_indices.npy -> backlinks to a note
+
+    Args:
+        note_ids (List[str]): The `note_id` of every node.
+        forward_indptr (np.ndarray): Row pointers of the forward links.
+        forward_indices (np.ndarray): Linked nodes of the forward links.
+        backward_indptr (np.ndarray): Row pointers of the backlinks.
+        backward_indices (np.ndarray): Linking nodes of the backlinks.
+    """
+
+    _ARRAYS = (
+        "forward_indptr",
+        "forward_indices",
+        "backward_indptr",
+        "backward_indices",
+    )
+
+    def __init__(
+        self,
+        note_ids: List[str],
+        forward_indptr: np.ndarray,
+        forward_indices: np.ndarray,
+        backward_indptr: np.ndarray,
+        backward_indices: np.ndarray,
+    ) -> None:
+        self.note_ids = note_ids
+        self.forward_indptr = forward_indptr
+        self.forward_indices = forward_indices
+        self.backward_indptr = backward_indptr
+        self.backward_indices = backward_indices
+        self._node_by_note_id = {note_id: idx for idx, note_id in enumerate(note_ids)}
+
+    @staticmethod
+    def _to_csr(
+        num_nodes: int, sources: np.ndarray, targets: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Build the CSR arrays of a set of edges.
+
+        Args:
+            num_nodes (int): Number of nodes.
+            sources (np.ndarray): Source node of every edge.
+            targets (np.ndarray): Target node of every edge.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The row pointers and the column indices.
+        """
+        order = np.lexsort((targets, sources))
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+        return indptr, targets[order].astype(np.int32)
+
+    @classmethod
+    def build(cls, notes: Iterable[Tuple[str, List[str]]]) -> "WikilinkGraph":
+        """
+        Build the graph by resolving the wikilinks of every note.
+
+        Args:
+            notes (Iterable[Tuple[str, List[str]]]): The `note_id` and the raw wikilinks
+                                                     of every note.
+
+        Returns:
+            WikilinkGraph: The graph.
+        """
+        notes = list(notes)
+        note_ids = [note_id for note_id, _ in notes]
+        node_by_note_id = {note_id: idx for idx, note_id in enumerate(note_ids)}
+        resolver = LinkResolver(note_ids)
+
+        edges: Set[Tuple[int, int]] = set()
+        num_unresolved = 0
+        for source, (note_id, wikilinks) in enumerate(notes):
+            for wikilink in wikilinks:
+                target_note_id = resolver.resolve(wikilink, note_id)
+                if target_note_id is None:
+                    num_unresolved += 1
+                    continue
+                edges.add((source, node_by_note_id[target_note_id]))
+
+        edge_array = np.array(sorted(edges), dtype=np.int64).reshape(-1, 2)
+        sources, targets = edge_array[:, 0], edge_array[:, 1]
+        num_nodes = len(note_ids)
+        forward_indptr, forward_indices = cls._to_csr(num_nodes, sources, targets)
+        backward_indptr, backward_indices = cls._to_csr(num_nodes, targets, sources)
+
+        LOGGER.info(
+            f"Wikilink graph built with {num_nodes} notes and {len(edges)} links "
+            f"({num_unresolved} links could not be resolved)"
+        )
+        return cls(
+            note_ids, forward_indptr, forward_indices, backward_indptr, backward_indices
+        )
+
+    def save(self, graph_path: str) -> None:
+        """
+        Save the graph to a directory. Every file is written to a temporary file first and
+        then renamed, so that a file is either fully written or not written at all.
+
+        Args:
+            graph_path (str): Directory to save the graph files to.
+        """
+        _graph_path = Path(graph_path)
+        _graph_path.mkdir(parents=True, exist_ok=True)
+
+        for name in self._ARRAYS:
+            tmp_path = _graph_path / f"{name}.tmp.npy"
+            np.save(tmp_path, getattr(self, name))
+            tmp_path.replace(_graph_path / f"{name}.npy")
+
+        tmp_path = _graph_path / "nodes.tmp"
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(self.note_ids, f, ensure_ascii=False)
+        tmp_path.replace(_graph_path / "nodes.json")
+        LOGGER.info(f"Wikilink graph saved successfully to directory : {graph_path}")
+
+    @classmethod
+    def load(cls, graph_path: str) -> "WikilinkGraph":
+        """
+        Load a graph saved with `save()`. The CSR arrays are memory-mapped.
+
+        Args:
+            graph_path (str): Directory to load the graph files from.
+
+        Returns:
+            WikilinkGraph: The graph.
+        """
+        _graph_path = Path(graph_path)
+        try:
+            with (_graph_path / "nodes.json").open("r", encoding="utf-8") as f:
+                note_ids = json.load(f)
+            arrays = [
+                np.load(_graph_path / f"{name}.npy", mmap_mode="r")
+                for name in cls._ARRAYS
+            ]
+        except Exception as e:
+            LOGGER.error(f"Error reading wikilink graph : {e}")
+            raise Exception(f"Error reading wikilink graph : {e}")
+        return cls(note_ids, *arrays)
+
+    def __len__(self) -> int:
+        return len(self.note_ids)
+
+    def _node(self, note_id: str) -> int:
+        """
+        Get the node of a note.
+
+        Args:
+            note_id (str): The `note_id` of the note.
+
+        Returns:
+            int: The node index.
+        """
+        try:
+            return self._node_by_note_id[note_id]
+        except KeyError:
+            raise KeyError(f"Note not in the wikilink graph : {note_id}")
+
+    def links(self, note_id: str) -> List[str]:
+        """
+        Get the notes a note links to.
+
+        Args:
+            note_id (str): The `note_id` of the note.
+
+        Returns:
+            List[str]: The `note_id`s of the linked notes.
+        """
+        node = self._node(note_id)
+        targets = self.forward_indices[
+            self.forward_indptr[node] : self.forward_indptr[node + 1]
+        ]
+        return [self.note_ids[target] for target in targets]
+
+    def backlinks(self, note_id: str) -> List[str]:
+        """
+        Get the notes linking to a note.
+
+        Args:
+            note_id (str): The `note_id` of the note.
+
+        Returns:
+            List[str]: The `note_id`s of the linking notes.
+        """
+        node = self._node(note_id)
+        sources = self.backward_indices[
+            self.backward_indptr[node] : self.backward_indptr[node + 1]
+        ]
+        return [self.note_ids[source] for source in sources]
+
+    def neighbours(self, note_id: str, hops: int = 1) -> List[str]:
+        """
+        Get the notes within `hops` links of a note, following links in both directions.
+
+        Args:
+            note_id (str): The `note_id` of the note.
+            hops (int): Maximum number of links to follow. Default is 1.
+
+        Returns:
+            List[str]: The `note_id`s of the neighbours (excluding the note itself), closest
+                       first.
+        """
+        start = self._node(note_id)
+        visited = {start}
+        frontier = [start]
+        neighbours: List[int] = []
+        for _ in range(hops):
+            next_frontier: List[int] = []
+            for node in frontier:
+                for indptr, indices in (
+                    (self.forward_indptr, self.forward_indices),
+                    (self.backward_indptr, self.backward_indices),
+                ):
+                    for neighbour in indices[indptr[node] : indptr[node + 1]].tolist():
+                        if neighbour not in visited:
+                            visited.add(neighbour)
+                            next_frontier.append(neighbour)
+            neighbours.extend(sorted(next_frontier))
+            frontier = next_frontier
+        return [self.note_ids[node] for node in neighbours]
@@ -1,6 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Iterable, Tuple
 import numpy as np
 
 
@@ -22,13 +22,68 @@ class BaseVectorStore(ABC):
         pass
 
     @abstractmethod
-    def search(self, query_vector: np.ndarray, k: int) -> List[Dict]:
+    def get(self, note_ids: Iterable[str]) -> Tuple[np.ndarray, List[Dict]]:
+        """
+        Get the vector embeddings and the metadata of all the chunks of the given notes.
+
+        Args:
+            note_ids (Iterable[str]): IDs of the notes whose chunks are returned.
+
+        Returns:
+            Tuple[np.ndarray, List[Dict]]: The vector embeddings and the corresponding list of
+                                           chunk dictionaries.
+        """
+        pass
+
+    @abstractmethod
+    def remove(self, note_ids: Iterable[str]) -> int:
+        """
+        Remove the vector embeddings and the metadata of all the chunks of the given notes.
+        The invariant `vector ID <-> metadata list index` must hold after the removal.
+
+        Args:
+            note_ids (Iterable[str]): IDs of the notes whose chunks are removed.
+
+        Returns:
+            int: Number of chunks removed.
+        """
+        pass
+
+    def upsert(
+        self,
+        vectors: np.ndarray,
+        metadata: List[Dict],
+        note_ids: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Replace the chunks of some notes with new ones, ie, remove all the existing chunks
+        of the notes and add the new vector embeddings and chunks.
+
+        Args:
+            vectors (np.ndarray): Vector embeddings to add to the vector store.
+            metadata (List[Dict]): Corresponding list of chunk dictionaries.
+            note_ids (Iterable[str] | None): IDs of the notes to replace. This can include notes
+                                             which no longer have any chunk (eg, deleted notes).
+                                             Defaults to the notes of the chunks in `metadata`.
+        """
+        if note_ids is None:
+            note_ids = {chunk["note_id"] for chunk in metadata}
+        self.remove(note_ids)
+        if len(metadata) > 0:
+            self.add(vectors, metadata)
+
+    @abstractmethod
+    def search(
+        self, query_vector: np.ndarray, k: int, ids: np.ndarray | None = None
+    ) -> List[Dict]:
         """
         Search a query (via its embedding) in the vector store.
 
         Args:
             query_vector (np.ndarray): Embedding of the query to search in the vector store.
             k (int): Number of most similar embeddings (aka neighbors) to the query vector.
+            ids (np.ndarray | None): Vector IDs to restrict the search to. If None, every
+                                     vector is searched.
 
         Returns:
             List[Dict]: List of dictionaries of the most similar embeddings to the query vector.
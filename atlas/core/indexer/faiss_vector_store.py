@@ -1,10 +1,11 @@
-import faiss
 import numpy as np
-from typing import List, Dict
+from typing import List, Dict, Iterable, Tuple
 from pathlib import Path
 import json
 
+from atlas.core.chunker.note_store import NoteStore
 from atlas.core.indexer.base_vector_store import BaseVectorStore
+from atlas.core.indexer.metadata_index import MetadataIndex
 from atlas.utils.logger import LoggerConfig
 
 LOGGER = LoggerConfig().logger
@@ -14,17 +15,61 @@ class FaissVectorStore(BaseVectorStore):
     """
     Vector store using FAISS (Facebook AI Semantic Search) library.
     Currently uses Flat Indexing but can be changed as needed.
+    The tags and frontmatter of the chunks are indexed in `metadata_index`, which is kept in
+    sync with the vector IDs and can be used to restrict a search to some chunks.
+
+    Compact chunks (see `StructuralChunker`) are stored as is, their note metadata and text
+    are read from the note store when they are indexed and searched.
+
+    A chunk with near-duplicates (see `BaseDeduplicator`) stands for them, it is indexed
+    under the note metadata of their notes as well and a search result lists the notes of
+    the chunk and of its duplicates in `sources`.
 
     Args:
         dim (int): Number of dimensions of the embeddings/vectors.
+        note_store (NoteStore | None): Note store of the compact chunks. Default is None.
     """
 
-    def __init__(self, dim: int):
+    def __init__(self, dim: int, note_store: NoteStore | None = None):
         LOGGER.info("-" * 20)
         LOGGER.info("Initializing Indexer.")
+        # imported on first use, only the stores need FAISS
+        import faiss
+
         self.dim = dim
         self.index = faiss.IndexFlatIP(dim)
         self.metadata: List[Dict] = []
+        self.metadata_index = MetadataIndex()
+        self.note_store = note_store
+
+    def _materialize(self, metadata: List[Dict], with_text: bool) -> List[Dict]:
+        """
+        Add the note metadata (and text) of compact chunks, and the note metadata of their
+        duplicates, from the note store.
+
+        Args:
+            metadata (List[Dict]): List of chunk dictionaries.
+            with_text (bool): If True, the chunk text is added as well.
+
+        Returns:
+            List[Dict]: List of chunk dictionaries, unchanged without a note store.
+        """
+        if self.note_store is None:
+            return metadata
+        note_store = self.note_store
+        materialized = []
+        for chunk in metadata:
+            chunk = note_store.materialize(chunk, with_text=with_text)
+            if "duplicates" in chunk:
+                chunk = {
+                    **chunk,
+                    "duplicates": [
+                        note_store.materialize(duplicate, with_text=False)
+                        for duplicate in chunk["duplicates"]
+                    ],
+                }
+            materialized.append(chunk)
+        return materialized
 
     def add(self, vectors: np.ndarray, metadata: List[Dict]) -> None:
         """
@@ -53,22 +98,125 @@ class FaissVectorStore(BaseVectorStore):
         # this also means that when passing `vectors` and `metadata` to `add()`,
         # they need to by synced
         self.index.add(vectors)
+        self.metadata_index.add(
+            self._materialize(metadata, with_text=False), start_id=len(self.metadata)
+        )
         self.metadata.extend(metadata)
 
-    def search(self, query_vector: np.ndarray, k: int) -> List[Dict]:
+    def get(self, note_ids: Iterable[str]) -> Tuple[np.ndarray, List[Dict]]:
+        """
+        Get the vector embeddings and the metadata of all the chunks of the given notes.
+        The vectors are reconstructed from the FAISS index.
+
+        Args:
+            note_ids (Iterable[str]): IDs of the notes whose chunks are returned.
+
+        Returns:
+            Tuple[np.ndarray, List[Dict]]: The vector embeddings and the corresponding list of
+                                           chunk dictionaries.
+        """
+        _note_ids = set(note_ids)
+        ids = [
+            idx
+            for idx, chunk in enumerate(self.metadata)
+            if chunk["note_id"] in _note_ids
+        ]
+        if not ids:
+            return np.empty((0, self.dim), dtype=np.float32), []
+
+        vectors = self.index.reconstruct_batch(np.array(ids, dtype=np.int64))
+        return vectors, [self.metadata[idx] for idx in ids]
+
+    def remove(self, note_ids: Iterable[str]) -> int:
+        """
+        Remove the vector embeddings and the metadata of all the chunks of the given notes.
+
+        Removing IDs from a flat FAISS index shifts the IDs of the vectors after them down,
+        the same as removing elements from the metadata list, so the invariant
+        `FAISS vector ID <-> metadata list index` still holds after the removal. The
+        duplicates in the given notes are dropped from the chunks they were mapped onto.
+
+        Args:
+            note_ids (Iterable[str]): IDs of the notes whose chunks are removed.
+
+        Returns:
+            int: Number of chunks removed.
+        """
+        _note_ids = set(note_ids)
+        if not _note_ids:
+            return 0
+
+        ids_to_remove = [
+            idx
+            for idx, chunk in enumerate(self.metadata)
+            if chunk["note_id"] in _note_ids
+        ]
+        if ids_to_remove:
+            # the FAISS python wrapper converts an array of IDs to an ID selector
+            self.index.remove_ids(np.array(ids_to_remove, dtype=np.int64))  # type: ignore[arg-type]
+            self.metadata_index.remove(ids_to_remove)
+            self.metadata = [
+                chunk for chunk in self.metadata if chunk["note_id"] not in _note_ids
+            ]
+
+        # the remaining chunks no longer stand for the duplicates in the removed notes
+        stale = False
+        for idx, chunk in enumerate(self.metadata):
+            duplicates = chunk.get("duplicates", [])
+            if any(duplicate["note_id"] in _note_ids for duplicate in duplicates):
+                self.metadata[idx] = {
+                    **chunk,
+                    "duplicates": [
+                        duplicate
+                        for duplicate in duplicates
+                        if duplicate["note_id"] not in _note_ids
+                    ],
+                }
+                stale = True
+        if stale:
+            self.metadata_index = MetadataIndex.build(
+                self._materialize(self.metadata, with_text=False)
+            )
+        if not ids_to_remove:
+            return 0
+
+        LOGGER.info(f"Removed {len(ids_to_remove)} chunks from the index")
+        return len(ids_to_remove)
+
+    def search(
+        self, query_vector: np.ndarray, k: int, ids: np.ndarray | None = None
+    ) -> List[Dict]:
         """
         Search a query (via its embedding/vector) in the FAISS vector store.
 
         Args:
             query_vector (np.ndarray): Embedding of the query to search in the FAISS vector store.
             k (int): Number of most similar embeddings (aka neighbors) to the query vector.
+            ids (np.ndarray | None): Vector IDs to restrict the search to, eg, from
+                                     `metadata_index`. At most `len(ids)` results are
+                                     returned. If None, every vector is searched.
 
         Returns:
             List[Dict]: List of dictionaries of the most similar embeddings to the query vector.
                         Each dictionary contains the score (probability) for each similar embedding
-                        match along with the full chunk metadata.
+                        match along with the full chunk metadata and the note IDs of the chunk
+                        and of its duplicates (`sources`).
         """
 
+        import faiss
+
+        params = None
+        if ids is not None:
+            if len(ids) == 0:
+                LOGGER.info("Number of similar embeddings found : 0")
+                return []
+            k = min(k, len(ids))
+            # the selector must be passed to the constructor (not set afterwards) for the
+            # FAISS python wrapper to keep a reference to it
+            params = faiss.SearchParameters(
+                sel=faiss.IDSelectorBatch(np.asarray(ids, dtype=np.int64))  # type: ignore[call-arg]
+            )
+
         if k > self.index.ntotal:
             LOGGER.error(f"k is more than maximum possible value : {self.index.ntotal}")
             raise Exception(
@@ -80,7 +228,7 @@ class FaissVectorStore(BaseVectorStore):
                 1, -1
             )  # add first dimension as batch == 1
 
-        scores, indices = self.index.search(query_vector, k)
+        scores, indices = self.index.search(query_vector, k, params=params)
 
         # search() returns two arrays:
         # scores:   shape (n_queries, k)
@@ -93,7 +241,13 @@ class FaissVectorStore(BaseVectorStore):
             if idx == -1:  # guard for neighbor not found for given query vector
                 continue
 
-            result = {"score": float(score), **self.metadata[idx]}
+            chunk = self._materialize([self.metadata[idx]], with_text=True)[0]
+            # the notes the chunk text was found in, its own note first
+            sources = [chunk["note_id"]]
+            for duplicate in chunk.get("duplicates", []):
+                if duplicate["note_id"] not in sources:
+                    sources.append(duplicate["note_id"])
+            result = {"score": float(score), **chunk, "sources": sources}
             results.append(result)
 
         LOGGER.info(f"Number of similar embeddings found : {len(results)}")
@@ -108,6 +262,9 @@ class FaissVectorStore(BaseVectorStore):
         1. index file -> index.faiss
         2. chunk metadata -> metadata.json
 
+        along with the metadata index (see `MetadataIndex.save()`), so that loading the store
+        does not rebuild it.
+
         Ensure that the elements in the two files are in sync
         ie, `FAISS vector ID <-> metadata list index`
 
@@ -115,10 +272,18 @@ class FaissVectorStore(BaseVectorStore):
             results_save_path (str): Directory to save the above mentioned two result files.
         """
 
+        import faiss
+
         _results_save_path = Path(results_save_path)
         _results_save_path.mkdir(parents=True, exist_ok=True)
 
-        faiss.write_index(self.index, str(_results_save_path / "index.faiss"))
+        # the index is written to a temporary file first as well, so that a reader
+        # (eg, the retriever while the vault watcher updates the index) never sees a
+        # partially written index
+        index_save_path = _results_save_path / "index.faiss"
+        index_tmp_path = index_save_path.with_suffix(".faiss.tmp")
+        faiss.write_index(self.index, str(index_tmp_path))
+        index_tmp_path.replace(index_save_path)
 
         metadata_save_path = _results_save_path / "metadata.json"
         tmp_path = metadata_save_path.with_suffix(".tmp")
@@ -126,16 +291,37 @@ class FaissVectorStore(BaseVectorStore):
             json.dump(self.metadata, f, indent=2, ensure_ascii=False)
 
         tmp_path.replace(metadata_save_path)
+
+        self.metadata_index.save(
+            results_save_path, self._metadata_stamp(metadata_save_path)
+        )
         LOGGER.info(
             f"Index file and chunk metadata saved successfully to directory : {results_save_path}"
         )
 
+    def _metadata_stamp(self, metadata_path: Path) -> List[int]:
+        """
+        Get the stamp of the saved chunk metadata the metadata index is built from, ie, the
+        number of vectors and the size and modification time of the metadata file.
+
+        Args:
+            metadata_path (Path): Path of the chunk metadata file.
+
+        Returns:
+            List[int]: The stamp.
+        """
+        stat = metadata_path.stat()
+        return [self.index.ntotal, stat.st_size, stat.st_mtime_ns]
+
     def load(self, results_load_path: str) -> None:
         """
         Load the following two files:
         1. index file -> index.faiss
         2. chunk metadata -> metadata.json
 
+        The saved metadata index is memory-mapped, it is only rebuilt if it is missing or was
+        saved from other chunk metadata.
+
         Use this in case we dont want to build the index and metadata from scratch and already
         have both of them saved.
 
@@ -143,6 +329,8 @@ class FaissVectorStore(BaseVectorStore):
             results_load_path (str): Directory to load the above mentioned two result files from.
         """
 
+        import faiss
+
         _results_load_path = Path(results_load_path)
         try:
             self.index = faiss.read_index(str(_results_load_path / "index.faiss"))
@@ -151,6 +339,17 @@ class FaissVectorStore(BaseVectorStore):
                 "r", encoding="utf-8"
             ) as f:
                 self.metadata = json.load(f)
+            # the saved metadata index is reused unless the metadata changed since
+            metadata_index = MetadataIndex.load(
+                results_load_path,
+                self._metadata_stamp(_results_load_path / "metadata.json"),
+            )
+            if metadata_index is None:
+                LOGGER.info("Rebuilding the metadata index.")
+                metadata_index = MetadataIndex.build(
+                    self._materialize(self.metadata, with_text=False)
+                )
+            self.metadata_index = metadata_index
 
             LOGGER.info(
                 f"Index file and chunk metadata loaded successfully from directory : {results_load_path}"
@@ -0,0 +1,363 @@
+from bisect import bisect_left, bisect_right, insort
+from functools import reduce
+from pathlib import Path
+import json
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+# a value is indexed under a key which sorts booleans, numbers and strings separately,
+# so that values of different types are never compared (and `True` and `1` stay apart)
+_ValueKey = Tuple[int, Any]
+
+TAGS_FIELD = "tags"
+
+# files of a saved index, the posting lists are concatenated into a single array
+POSTINGS_FILE = "metadata_index.npy"
+KEYS_FILE = "metadata_index.json"
+
+
+def _value_key(value: Any) -> _ValueKey | None:
+    """
+    Get the index key of a metadata value.
+
+    Args:
+        value (Any): A tag or frontmatter value.
+
+    Returns:
+        _ValueKey | None: The index key or None if the value type is not indexed.
+    """
+    if isinstance(value, bool):
+        return (0, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return None
+
+
+class MetadataIndex:
+    """
+    Inverted index of the tags and frontmatter properties of the chunks of a vector store.
+    Every indexed value maps to a sorted posting list of the vector IDs of the chunks
+    carrying it, so that metadata-constrained retrieval does not need a pass over the
+    metadata of every chunk.
+
+    Indexed fields:
+    - "tags" -> the tags of a chunk (without `#`, lower cased as Obsidian tags are case
+      insensitive), including the `tags` frontmatter property
+    - every other frontmatter property -> its boolean, number or string values (each element
+      of a list value is indexed)
+
+    A chunk with near-duplicates is also indexed under the values of their notes, so that a
+    filter on a value only the note of a duplicate has still finds the chunk.
+
+    Vector IDs follow the `vector ID <-> metadata list index` invariant of the vector store,
+    so the index must be updated with every `add()` and `remove()` of the store.
+    """
+
+    def __init__(self) -> None:
+        # field -> value key -> sorted vector IDs
+        self._postings: Dict[str, Dict[_ValueKey, np.ndarray]] = {}
+        # field -> sorted value keys, for range queries
+        self._sorted_keys: Dict[str, List[_ValueKey]] = {}
+
+    @classmethod
+    def build(cls, metadata: List[Dict]) -> "MetadataIndex":
+        """
+        Build the index of a list of chunks.
+
+        Args:
+            metadata (List[Dict]): The list of chunk dictionaries, in vector ID order.
+
+        Returns:
+            MetadataIndex: The index.
+        """
+        index = cls()
+        index.add(metadata, start_id=0)
+        return index
+
+    def save(self, index_path: str, source_stamp: List[int]) -> None:
+        """
+        Save the index to a directory, next to the files of the vector store. The posting
+        lists are concatenated into one array which `load()` memory-maps, and the value keys
+        are saved with the offset and length of their posting list. Every file is written to
+        a temporary file first and then renamed.
+
+        Args:
+            index_path (str): Directory to save the index files to.
+            source_stamp (List[int]): Stamp of the metadata the index was built from,
+                                      `load()` discards the index if it does not match.
+        """
+        _index_path = Path(index_path)
+        _index_path.mkdir(parents=True, exist_ok=True)
+
+        fields: Dict[str, List[List[Any]]] = {}
+        posting_lists: List[np.ndarray] = []
+        offset = 0
+        for field, keys in self._sorted_keys.items():
+            entries = fields[field] = []
+            for rank, value in keys:
+                ids = self._postings[field][(rank, value)]
+                entries.append([rank, value, offset, len(ids)])
+                posting_lists.append(ids)
+                offset += len(ids)
+        postings = (
+            np.concatenate(posting_lists)
+            if posting_lists
+            else np.empty(0, dtype=np.int64)
+        )
+
+        tmp_path = _index_path / "metadata_index.tmp.npy"
+        np.save(tmp_path, postings)
+        tmp_path.replace(_index_path / POSTINGS_FILE)
+
+        # the keys are written last, with the length of the postings they were saved with,
+        # so that an interrupted save is detected on load
+        tmp_path = _index_path / "metadata_index.tmp"
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "source_stamp": source_stamp,
+                    "num_postings": len(postings),
+                    "fields": fields,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        tmp_path.replace(_index_path / KEYS_FILE)
+
+    @classmethod
+    def load(cls, index_path: str, source_stamp: List[int]) -> "MetadataIndex | None":
+        """
+        Load an index saved with `save()`. The posting lists are read-only views of the
+        memory-mapped postings file, `add()` and `remove()` replace them with new arrays.
+
+        Args:
+            index_path (str): Directory to load the index files from.
+            source_stamp (List[int]): Stamp of the current metadata of the vector store.
+
+        Returns:
+            MetadataIndex | None: The index, or None if it is missing, was saved from other
+                                  metadata or is incomplete, in which case it has to be
+                                  rebuilt with `build()`.
+        """
+        _index_path = Path(index_path)
+        try:
+            with (_index_path / KEYS_FILE).open("r", encoding="utf-8") as f:
+                saved = json.load(f)
+            postings = np.load(_index_path / POSTINGS_FILE, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            LOGGER.info(f"Metadata index not loaded : {e}")
+            return None
+        if saved["source_stamp"] != source_stamp or saved["num_postings"] != len(
+            postings
+        ):
+            LOGGER.info("Metadata index is stale.")
+            return None
+
+        index = cls()
+        for field, entries in saved["fields"].items():
+            keys = index._sorted_keys[field] = []
+            field_postings = index._postings[field] = {}
+            for rank, value, offset, length in entries:
+                # saved in sorted order
+                keys.append((rank, value))
+                field_postings[(rank, value)] = postings[offset : offset + length]
+        return index
+
+    @staticmethod
+    def _iter_values(chunk: Dict) -> Iterable[Tuple[str, _ValueKey]]:
+        """
+        Iterate over the indexed values of a chunk, including the values of the notes of
+        its near-duplicates (see `BaseDeduplicator`), which are only indexed through it.
+
+        Args:
+            chunk (Dict): The chunk dictionary.
+
+        Returns:
+            Iterable[Tuple[str, _ValueKey]]: The field and value key of every indexed value.
+        """
+        for note in [chunk, *chunk.get("duplicates", [])]:
+            frontmatter = note.get("frontmatter") or {}
+            tags = list(note.get("tags") or [])
+            frontmatter_tags = frontmatter.get(TAGS_FIELD)
+            if isinstance(frontmatter_tags, str):
+                frontmatter_tags = [frontmatter_tags]
+            if isinstance(frontmatter_tags, list):
+                tags.extend(tag for tag in frontmatter_tags if isinstance(tag, str))
+            for tag in tags:
+                yield TAGS_FIELD, (2, tag.lstrip("#").lower())
+
+            for field, value in frontmatter.items():
+                if field == TAGS_FIELD:
+                    continue
+                for item in value if isinstance(value, list) else [value]:
+                    key = _value_key(item)
+                    if key is not None:
+                        yield field, key
+
+    def add(self, metadata: List[Dict], start_id: int) -> None:
+        """
+        Index chunks added to the vector store. Vector IDs only grow, so the new IDs are
+        appended to the posting lists which stay sorted.
+
+        Args:
+            metadata (List[Dict]): The list of added chunk dictionaries.
+            start_id (int): The vector ID of the first added chunk.
+        """
+        new_postings: Dict[Tuple[str, _ValueKey], List[int]] = {}
+        for vector_id, chunk in enumerate(metadata, start=start_id):
+            for field, key in self._iter_values(chunk):
+                ids = new_postings.setdefault((field, key), [])
+                # a value can be listed more than once in a chunk
+                if not ids or ids[-1] != vector_id:
+                    ids.append(vector_id)
+
+        for (field, key), ids in new_postings.items():
+            postings = self._postings.setdefault(field, {})
+            new_ids = np.array(ids, dtype=np.int64)
+            if key in postings:
+                postings[key] = np.concatenate([postings[key], new_ids])
+            else:
+                postings[key] = new_ids
+                insort(self._sorted_keys.setdefault(field, []), key)
+
+    def remove(self, vector_ids: Iterable[int]) -> None:
+        """
+        Unindex chunks removed from the vector store. The vector IDs after the removed ones
+        are shifted down, the same as in the vector store.
+
+        Args:
+            vector_ids (Iterable[int]): Vector IDs of the removed chunks.
+        """
+        removed = np.unique(np.fromiter(vector_ids, dtype=np.int64))
+        if len(removed) == 0:
+            return
+
+        for field, postings in self._postings.items():
+            for key in list(postings):
+                ids = postings[key]
+                ids = ids[~np.isin(ids, removed, assume_unique=True)]
+                if len(ids) == 0:
+                    del postings[key]
+                    keys = self._sorted_keys[field]
+                    del keys[bisect_left(keys, key)]
+                    continue
+                postings[key] = ids - np.searchsorted(removed, ids)
+        for field in [
+            field for field, postings in self._postings.items() if not postings
+        ]:
+            del self._postings[field]
+            del self._sorted_keys[field]
+
+    def fields(self) -> List[str]:
+        """
+        Get the indexed fields.
+
+        Returns:
+            List[str]: The fields, sorted.
+        """
+        return sorted(self._postings)
+
+    def values(self, field: str) -> List[Any]:
+        """
+        Get the indexed values of a field.
+
+        Args:
+            field (str): "tags" or a frontmatter property.
+
+        Returns:
+            List[Any]: The values, sorted (booleans, then numbers, then strings).
+        """
+        return [value for _, value in self._sorted_keys.get(field, [])]
+
+    def lookup(self, field: str, value: Any) -> np.ndarray:
+        """
+        Get the vector IDs of the chunks with a given value.
+
+        Args:
+            field (str): "tags" or a frontmatter property.
+            value (Any): The tag (with or without `#`) or the frontmatter value.
+
+        Returns:
+            np.ndarray: The sorted vector IDs.
+        """
+        if field == TAGS_FIELD and isinstance(value, str):
+            value = value.lstrip("#").lower()
+        key = _value_key(value)
+        ids = self._postings.get(field, {}).get(key) if key is not None else None
+        return ids if ids is not None else np.empty(0, dtype=np.int64)
+
+    def range(self, field: str, low: Any = None, high: Any = None) -> np.ndarray:
+        """
+        Get the vector IDs of the chunks with a value in `[low, high]`, eg, every chunk
+        whose note has a frontmatter `date` in a given month. Both bounds must have the same
+        type (numbers or strings, ISO dates compare correctly as strings).
+
+        Args:
+            field (str): "tags" or a frontmatter property.
+            low (Any): The inclusive lower bound. If None, the range is open below.
+            high (Any): The inclusive upper bound. If None, the range is open above.
+
+        Returns:
+            np.ndarray: The sorted vector IDs.
+        """
+        ranks = {
+            value_key[0]
+            for value_key in (_value_key(low), _value_key(high))
+            if value_key is not None
+        }
+        if len(ranks) != 1 or any(
+            bound is not None and _value_key(bound) is None for bound in (low, high)
+        ):
+            LOGGER.error(f"Invalid range bounds : {low}, {high}")
+            raise ValueError(f"Invalid range bounds : {low}, {high}")
+        rank = ranks.pop()
+
+        keys = self._sorted_keys.get(field, [])
+        # `(rank,)` sorts before and `(rank + 1,)` after every key of the same type
+        start = bisect_left(keys, (rank, low) if low is not None else (rank,))
+        end = bisect_right(keys, (rank, high)) if high is not None else None
+        if end is None:
+            end = bisect_left(keys, (rank + 1,))
+        postings = self._postings.get(field, {})
+        return self.union(*(postings[key] for key in keys[start:end]))
+
+    @staticmethod
+    def intersect(*posting_lists: np.ndarray) -> np.ndarray:
+        """
+        Get the vector IDs in every posting list, eg, chunks with all of some tags.
+
+        Args:
+            *posting_lists (np.ndarray): Sorted vector IDs.
+
+        Returns:
+            np.ndarray: The sorted vector IDs.
+        """
+        if not posting_lists:
+            return np.empty(0, dtype=np.int64)
+        # intersecting the shortest lists first keeps the intermediate results small
+        return reduce(
+            lambda a, b: np.intersect1d(a, b, assume_unique=True),
+            sorted(posting_lists, key=len),
+        )
+
+    @staticmethod
+    def union(*posting_lists: np.ndarray) -> np.ndarray:
+        """
+        Get the vector IDs in any posting list, eg, chunks with any of some tags.
+
+        Args:
+            *posting_lists (np.ndarray): Sorted vector IDs.
+
+        Returns:
+            np.ndarray: The sorted vector IDs.
+        """
+        if not posting_lists:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate(posting_lists))
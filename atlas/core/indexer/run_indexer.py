@@ -1,6 +1,7 @@
 import os
-import numpy as np
+from pathlib import Path
 
+from atlas.core.embedder.embedding_store import load_embeddings
 from atlas.utils.embedder_utils import load_embedded_chunks, generate_embedding
 from atlas.core.indexer.faiss_vector_store import FaissVectorStore
 
@@ -8,6 +9,9 @@ from atlas.utils.logger import LoggerConfig
 
 LOGGER = LoggerConfig().logger
 
+# number of memory-mapped embeddings copied and added to the index at a time
+INDEX_BATCH_SIZE = 8192
+
 
 def build_and_save_index(
     store: FaissVectorStore, results_save_path: str, embedded_chunks_json_file: str
@@ -18,17 +22,25 @@ def build_and_save_index(
         1. index file -> index.faiss
         2. chunk metadata -> metadata.json
 
+    The embedding matrix saved along the embedded chunks is memory-mapped and added to the
+    index in batches, so it is never parsed or held in memory as a whole.
+
     Args:
         store (FaissVectorStore): Instance of FAISS Vector Store from Facebook AI Semantic Search.
         results_save_path (str): Directory to save the above mentioned two result files.
         embedded_chunks_json_file (str): The path to the embedded chunks json file.
     """
     embedded_chunks = load_embedded_chunks(embedded_chunks_json_file)
-
-    store.add(
-        vectors=np.array([chunk["embedding"] for chunk in embedded_chunks]),
-        metadata=embedded_chunks,
-    )
+    vectors, chunk_ids = load_embeddings(Path(embedded_chunks_json_file))
+    if chunk_ids != [chunk["chunk_id"] for chunk in embedded_chunks]:
+        LOGGER.error("Embeddings do not match the embedded chunks")
+        raise ValueError("Embeddings do not match the embedded chunks")
+
+    for start in range(0, len(embedded_chunks), INDEX_BATCH_SIZE):
+        store.add(
+            vectors=vectors[start : start + INDEX_BATCH_SIZE],
+            metadata=embedded_chunks[start : start + INDEX_BATCH_SIZE],
+        )
 
     store.save(results_save_path)
 
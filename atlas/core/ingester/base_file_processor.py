@@ -1,10 +1,11 @@
 from abc import ABC
 from abc import abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Iterable, Iterator
+from itertools import chain
 from pathlib import Path
-import json
 
 from atlas.utils.logger import LoggerConfig
+from atlas.utils.io_utils import write_records
 
 LOGGER = LoggerConfig().logger
 
@@ -15,7 +16,8 @@ class KnowledgeBaseProcessor(ABC):
 
     Args:
         vault_path (str): Path to the knowledge base.
-        output_path (str): Path to save the processed data.
+        output_path (str): Path to save the processed data. A `.jsonl` path streams one
+                           record per line, any other path is written as a JSON list.
     """
 
     def __init__(self, vault_path: str, output_path: str) -> None:
@@ -41,22 +43,41 @@ class KnowledgeBaseProcessor(ABC):
         """
         pass
 
-    def save_processed_data(self, processed_data: List[Dict]) -> None:
+    def iter_process(self) -> Iterator[Dict]:
         """
-        Save the processed data to a JSON file atomically.
+        Performs processing of the files and folders in the knowledge base, yielding one
+        processed item at a time. Processors which can stream their output should override
+        this, by default it yields the items returned by `self.process()`.
+
+        Returns:
+            Iterator[Dict]: The processed data.
+        """
+        yield from self.process()
+
+    def save_processed_data(self, processed_data: Iterable[Dict]) -> None:
+        """
+        Save the processed data to a JSON (or JSON Lines) file atomically.
         This ensures that the file is either fully written or not written at all.
 
         Args:
-            processed_data (list[dict]): The list of parsed notes metadata.
+            processed_data (Iterable[dict]): The parsed notes metadata.
         """
-        self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        tmp_path = self.output_path.with_suffix(".tmp")
+        count = write_records(self.output_path, processed_data)
+        LOGGER.info(
+            f"Processed data for {count} items saved successfully to {str(self.output_path)}"
+        )
 
-        with tmp_path.open("w", encoding="utf-8") as f:
-            json.dump(processed_data, f, indent=2, ensure_ascii=False)
+    def save_empty_output(self) -> bool:
+        """
+        Whether an empty processing result is saved (replacing the previous output) rather
+        than skipped. Checked once `self.iter_process()` is exhausted. Processors which
+        update a previous output incrementally should override this, so that removing the
+        last file of the knowledge base is saved as well.
 
-        tmp_path.replace(self.output_path)
-        LOGGER.info(f"Processed data successfully to {str(self.output_path)}")
+        Returns:
+            bool: True if the empty output is saved. False by default.
+        """
+        return False
 
     def ingest(self) -> None:
         """
@@ -65,9 +86,14 @@ class KnowledgeBaseProcessor(ABC):
         if not self.precheck():
             LOGGER.error("Precheck failed. Aborting processing.")
             return
-        processed_data = self.process()
-        if processed_data and len(processed_data) > 0:
-            LOGGER.info(f"Saving processed data for {len(processed_data)} items.")
-            self.save_processed_data(processed_data)
+        # processed items are streamed straight to the output file
+        processed_data = self.iter_process()
+        first_item = next(processed_data, None)
+        if first_item is not None:
+            LOGGER.info("Saving processed data.")
+            self.save_processed_data(chain([first_item], processed_data))
+        elif self.save_empty_output():
+            LOGGER.info("No data processed. Saving empty processed data.")
+            self.save_processed_data([])
         else:
             LOGGER.warning("No data processed. Nothing to save.")
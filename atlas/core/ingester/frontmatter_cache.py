@@ -0,0 +1,171 @@
+from pathlib import Path
+from typing import Dict
+import hashlib
+import json
+
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+# bumped when the meaning of the entries changes, older cache files are discarded
+CACHE_VERSION = 2
+
+
+class FrontmatterCache:
+    """
+    Cache of parsed (and normalized) frontmatter keyed on the hash of the raw frontmatter
+    block, so that an unchanged property block is never parsed again, neither across
+    notes sharing it (eg, notes created from the same template) nor across runs.
+
+    Entries are kept as JSON strings, so every lookup returns a fresh copy which can be
+    modified safely. Only frontmatter which JSON represents losslessly is cached (eg, not
+    a mapping with integer or date keys, which JSON would turn into strings), so a cache
+    hit always returns exactly what parsing the block returns. The least recently used
+    entries are evicted beyond `max_entries`.
+
+    Cache file schema:
+    {
+        "version": 2,
+        "entries": {
+            "<block hash>": "<frontmatter as a JSON string>"
+        }
+    }
+
+    Args:
+        path (Path | None): Path of the cache JSON file. If None, the cache is in memory only.
+        max_entries (int): Maximum number of cached frontmatter blocks. Default is 100000.
+    """
+
+    def __init__(self, path: Path | None, max_entries: int = 100_000) -> None:
+        self.path = Path(path) if path is not None else None
+        self.max_entries = max_entries
+        self._entries: Dict[str, str] = {}
+        # entries added since the last `drain_new_entries()`, only recorded in worker processes
+        self.record_new_entries = False
+        self._new_entries: Dict[str, str] = {}
+
+    @staticmethod
+    def hash_block(block: str) -> str:
+        """
+        Compute the cache key of a frontmatter block.
+
+        Args:
+            block (str): The raw frontmatter block.
+
+        Returns:
+            str: BLAKE2b hex digest of the UTF-8 encoded block.
+        """
+        return hashlib.blake2b(block.encode("utf-8"), digest_size=16).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Dict | None:
+        """
+        Get a cached frontmatter and mark it as recently used.
+
+        Args:
+            key (str): Hash of the frontmatter block.
+
+        Returns:
+            Dict | None: A copy of the frontmatter or None if it isnt cached.
+        """
+        value = self._entries.pop(key, None)
+        if value is None:
+            return None
+        self._entries[key] = value
+        return json.loads(value)
+
+    def put(self, key: str, frontmatter: Dict) -> None:
+        """
+        Cache a parsed frontmatter. Frontmatter which JSON cannot represent losslessly is
+        not cached.
+
+        Args:
+            key (str): Hash of the frontmatter block.
+            frontmatter (Dict): The parsed and normalized frontmatter.
+        """
+        try:
+            value = json.dumps(frontmatter, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        # eg, non-string keys come back as strings
+        if json.loads(value) != frontmatter:
+            return
+        self._add(key, value)
+        if self.record_new_entries:
+            self._new_entries[key] = value
+
+    def _add(self, key: str, value: str) -> None:
+        """
+        Add an entry, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (str): Hash of the frontmatter block.
+            value (str): The frontmatter as a JSON string.
+        """
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def drain_new_entries(self) -> Dict[str, str]:
+        """
+        Get and forget the entries added since the last call. Used to send the entries
+        added in a worker process back to the main process.
+
+        Returns:
+            Dict[str, str]: The new entries.
+        """
+        new_entries, self._new_entries = self._new_entries, {}
+        return new_entries
+
+    def merge(self, entries: Dict[str, str]) -> None:
+        """
+        Add entries drained from another cache (eg, of a worker process).
+
+        Args:
+            entries (Dict[str, str]): The entries to add.
+        """
+        for key, value in entries.items():
+            self._add(key, value)
+
+    def load(self) -> None:
+        """
+        Load the cache from disk. A missing or unreadable cache file results in an empty cache.
+        """
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+                LOGGER.info("Outdated frontmatter cache, starting fresh")
+                self._entries = {}
+                return
+            self._entries = data["entries"]
+            LOGGER.info(
+                f"Frontmatter cache with {len(self._entries)} entries loaded from {str(self.path)}"
+            )
+        except Exception as e:
+            LOGGER.error(f"Error reading frontmatter cache, starting fresh : {e}")
+            self._entries = {}
+
+    def save(self) -> None:
+        """
+        Save the cache to disk atomically.
+        """
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {"version": CACHE_VERSION, "entries": self._entries},
+                f,
+                ensure_ascii=False,
+            )
+
+        tmp_path.replace(self.path)
+        LOGGER.info(f"Frontmatter cache saved successfully to {str(self.path)}")
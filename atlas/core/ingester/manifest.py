@@ -0,0 +1,135 @@
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List
+import hashlib
+import json
+
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+
+@dataclass
+class ManifestEntry:
+    """Filesystem and content fingerprint of a single note."""
+
+    mtime_ns: int
+    size: int
+    content_hash: str
+
+
+@dataclass
+class NoteDelta:
+    """
+    Set of notes (by `note_id`) that changed between two ingestion runs.
+
+    Later stages (chunker, embedder, indexer) can use this to only act on
+    the notes that were actually touched.
+
+    `renamed` maps the previous `note_id` of a moved/renamed note to its new `note_id`.
+    Neither of them is listed in `added` or `deleted`. If the content of the note changed
+    as well, the new `note_id` is also listed in `modified`.
+    """
+
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    renamed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> List[str]:
+        """
+        Notes which need to be (re)processed downstream ie, added or modified notes.
+        """
+        return self.added + self.modified
+
+    def has_changes(self) -> bool:
+        """
+        Returns:
+            bool: True if any note was added, modified, deleted or renamed.
+        """
+        return bool(self.added or self.modified or self.deleted or self.renamed)
+
+
+class VaultManifest:
+    """
+    Persisted manifest of every ingested note's path, mtime, size and content hash.
+    Used to detect which notes were added, modified, deleted or renamed since the last run.
+
+    Manifest file schema:
+    {
+        "notes": {"<note_id>": {"mtime_ns": int, "size": int, "content_hash": str}},
+        "delta": {"added": [...], "modified": [...], "deleted": [...], "unchanged": [...],
+                  "renamed": {"<previous note_id>": "<note_id>"}},
+        "commit": str | null  # git commit of the vault at the last run, in git change detection mode
+    }
+
+    Args:
+        path (Path): Path of the manifest JSON file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.delta = NoteDelta()
+        self.commit: str | None = None
+
+    @staticmethod
+    def hash_content(text: str) -> str:
+        """
+        Compute the content hash of a note.
+
+        Args:
+            text (str): The content of the note.
+
+        Returns:
+            str: SHA-256 hex digest of the UTF-8 encoded content.
+        """
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def load(self) -> None:
+        """
+        Load the manifest from disk. A missing or unreadable manifest results in an
+        empty manifest, which means every note is treated as added.
+        """
+        if not self.path.exists():
+            LOGGER.info(f"No manifest found at {str(self.path)}. Starting fresh.")
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = {
+                note_id: ManifestEntry(**entry)
+                for note_id, entry in data.get("notes", {}).items()
+            }
+            self.delta = NoteDelta(**data.get("delta", {}))
+            self.commit = data.get("commit")
+            LOGGER.info(
+                f"Manifest with {len(self.entries)} notes loaded from {str(self.path)}"
+            )
+        except Exception as e:
+            LOGGER.error(f"Error reading manifest, starting fresh : {e}")
+            self.entries = {}
+            self.delta = NoteDelta()
+            self.commit = None
+
+    def save(self) -> None:
+        """
+        Save the manifest to disk atomically.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+
+        data = {
+            "notes": {
+                note_id: asdict(entry) for note_id, entry in self.entries.items()
+            },
+            "delta": asdict(self.delta),
+            "commit": self.commit,
+        }
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        tmp_path.replace(self.path)
+        LOGGER.info(f"Manifest saved successfully to {str(self.path)}")
@@ -1,19 +1,70 @@
 from datetime import date
 from atlas.utils.logger import LoggerConfig
 from atlas.core.ingester.base_file_processor import KnowledgeBaseProcessor
+from atlas.core.ingester.manifest import VaultManifest, ManifestEntry, NoteDelta
+from atlas.core.ingester.vault_walker import VaultFile, VaultWalker, walk_order_key
+from atlas.core.ingester.git_changes import GitChangeDetector
+from atlas.core.ingester.frontmatter_cache import FrontmatterCache
+from atlas.utils.parallel_utils import batched, ordered_parallel_map
+from atlas.utils.markdown_utils import scan_markdown
+from atlas.utils.io_utils import iter_records
 
 from pathlib import Path
 from datetime import date, datetime
 import re
 import yaml
 import json
-from typing import Dict, Any, List
+import os
+import stat
+from collections import deque
+from typing import Dict, Any, List, Iterator, Iterable, Set, Tuple, Deque
 
 LOGGER = LoggerConfig().logger
 
+_FRONTMATTER_PATTERN = re.compile(r"^---\n(.*?)\n---\n(.*)", re.S)
+
+# the libyaml backed loader is much faster than the pure python one, use it when available
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# path of a note to parse, its content if already read and the note itself if it is
+# carried over unchanged from the previous run
+_NoteJob = Tuple[Path, str | None, Dict | None]
+
 
 class ObsidianVaultProcessor(KnowledgeBaseProcessor):
-    """Processor for Obsidian Vaults to extract notes metadata."""
+    """
+    Processor for Obsidian Vaults to extract notes metadata.
+
+    Args:
+        vault_path (str): Path to the Obsidian vault.
+        output_path (str): Path to save the processed data.
+        incremental (bool): If True, only notes which were added or modified since the last
+                            run are re-parsed. Unchanged notes are carried over from the
+                            previous index. Default is False.
+        manifest_path (str | None): Path of the change manifest used in incremental mode.
+                                    Defaults to `<output_path stem>.manifest.json`.
+        workers (int): Number of worker processes used to parse notes. 1 parses serially in
+                       the current process. Default is 1.
+        batch_size (int): Number of notes sent to a worker process at a time. Larger batches
+                          keep the inter-process (pickling) overhead low. Default is 64.
+        ignore_patterns (List[str] | None): Gitignore-style patterns of files and folders to skip,
+                                            in addition to `.obsidian/`, `.trash/` and `.git/`.
+        change_detection (str): How changed notes are found in incremental mode.
+                                "filesystem" compares every note against the manifest.
+                                "git" asks git which files changed since the commit of the
+                                last run and only checks those, falling back to a
+                                filesystem scan if the vault is not in a git repository.
+                                Default is "filesystem".
+        frontmatter_cache_path (str | None): Path of the cache of parsed frontmatter blocks.
+                                             Defaults to `<output_path stem>.frontmatter_cache.json`.
+        cache_frontmatter (bool): If True, parsed frontmatter blocks are cached (and the cache
+                                  is saved along with the processed data). Default is True.
+        graph_path (str | None): Directory to save the wikilink graph of the vault to, built
+                                 along with the processed data. If None, no graph is built.
+                                 Default is None.
+    """
+
+    _CHANGE_DETECTION_MODES = ("filesystem", "git")
 
     _OBSIDIAN_CONFIG_FILES = {
         "app.json",
@@ -21,8 +72,56 @@ class ObsidianVaultProcessor(KnowledgeBaseProcessor):
         "workspace.json",
     }
 
-    def __init__(self, vault_path: str, output_path: str) -> None:
+    def __init__(
+        self,
+        vault_path: str,
+        output_path: str,
+        incremental: bool = False,
+        manifest_path: str | None = None,
+        workers: int = 1,
+        batch_size: int = 64,
+        ignore_patterns: List[str] | None = None,
+        change_detection: str = "filesystem",
+        frontmatter_cache_path: str | None = None,
+        cache_frontmatter: bool = True,
+        graph_path: str | None = None,
+    ) -> None:
+        if change_detection not in self._CHANGE_DETECTION_MODES:
+            LOGGER.error(f"Invalid change detection mode : {change_detection}")
+            raise ValueError(f"Invalid change detection mode : {change_detection}")
+        if change_detection == "git" and not incremental:
+            LOGGER.error("Git change detection requires incremental mode")
+            raise ValueError("Git change detection requires incremental mode")
+
         super().__init__(vault_path, output_path)
+        self.change_detection = change_detection
+        self.incremental = incremental
+        self.workers = workers
+        self.batch_size = batch_size
+        self.ignore_patterns = ignore_patterns or []
+        self.manifest: VaultManifest | None = None
+        # the cache is always used in memory but only persisted when enabled
+        self.frontmatter_cache = FrontmatterCache(
+            (
+                Path(frontmatter_cache_path)
+                if frontmatter_cache_path
+                else self.output_path.with_suffix(".frontmatter_cache.json")
+            )
+            if cache_frontmatter
+            else None
+        )
+        self.graph_path = graph_path
+        self.delta: NoteDelta | None = None
+        # if set, the next incremental run only checks these notes and directories (paths
+        # relative to the vault root) for changes, eg, the paths reported by the vault
+        # watcher, the other notes are carried over as unchanged without being stat-ed
+        self.changed_paths: Set[str] | None = None
+        if incremental:
+            self.manifest = VaultManifest(
+                Path(manifest_path)
+                if manifest_path
+                else self.output_path.with_suffix(".manifest.json")
+            )
         LOGGER.info("-" * 20)
         LOGGER.info("ObsidianVaultProcessor initialized.")
         LOGGER.info(f"Obsidian Vault to be processed: {vault_path}")
@@ -131,32 +230,44 @@ class ObsidianVaultProcessor(KnowledgeBaseProcessor):
         """
 
         if text.startswith("---"):
-            match = re.match(r"^---\n(.*?)\n---\n(.*)", text, re.S)
+            match = _FRONTMATTER_PATTERN.match(text)
             if match:
-                frontmatter = self._normalize_yaml(yaml.safe_load(match.group(1))) or {}
+                frontmatter = self._load_frontmatter(match.group(1))
                 body = match.group(2)
                 return frontmatter, body
         return {}, text
 
+    def _load_frontmatter(self, block: str) -> dict:
+        """
+        Parse and normalize a YAML frontmatter block, unless it is already cached.
+
+        Args:
+            block (str): The frontmatter block, without the `---` delimiters.
+
+        Returns:
+            dict: The frontmatter as a dictionary.
+        """
+        key = FrontmatterCache.hash_block(block)
+        frontmatter = self.frontmatter_cache.get(key)
+        if frontmatter is None:
+            frontmatter = (
+                self._normalize_yaml(yaml.load(block, Loader=_YAML_LOADER)) or {}
+            )
+            self.frontmatter_cache.put(key, frontmatter)
+        return frontmatter
+
     def _extract_headings(self, text: str) -> list[dict]:
         """
         Extract Markdown headings from the text.
 
         Args:
-            text (str): One line of the Markdown file content.
+            text (str): The Markdown file content.
 
         Returns:
-            list[dict]: A list of dictionaries containing heading levels and titles.
+            list[dict]: A list of dictionaries containing heading levels, titles and the
+                        character offsets (`start`, `end`) of the heading lines.
         """
-
-        headings = []
-        for line in text.splitlines():
-            match = re.match(r"^(#{1,6})\s+(.*)", line)
-            if match:
-                headings.append(
-                    {"level": len(match.group(1)), "title": match.group(2).strip()}
-                )
-        return headings
+        return scan_markdown(text).headings
 
     def _extract_tags(self, text: str) -> list[str]:
         """
@@ -171,7 +282,7 @@ class ObsidianVaultProcessor(KnowledgeBaseProcessor):
         Returns:
             list[str]: A list of unique tags found in the text.
         """
-        return sorted(set(re.findall(r"#(\w+)", text)))
+        return scan_markdown(text).tags
 
     def _extract_wikilinks(self, text: str) -> list[str]:
         """
@@ -186,23 +297,30 @@ class ObsidianVaultProcessor(KnowledgeBaseProcessor):
         Returns:
             list[str]: A list of unique wikilinks found in the text.
         """
-        return sorted(set(re.findall(r"\[\[(.*?)\]\]", text)))
+        return scan_markdown(text).wikilinks
 
-    def _parse_markdown_note(self, note_path: Path, vault_path: Path) -> Dict[str, Any]:
+    def _parse_markdown_note(
+        self, note_path: Path, vault_path: Path, text: str | None = None
+    ) -> Dict[str, Any]:
         """
         Parse a Markdown note to extract metadata and content.
 
         Args:
             note_path (Path): The path to the Markdown note.
             vault_path (Path): The root path of the Obsidian vault.
+            text (str | None): The content of the note if already read, else it is read from
+                               `note_path`.
 
         Returns:
             dict: A dictionary containing the note's metadata and content.
         """
 
-        text = note_path.read_text(encoding="utf-8")
+        if text is None:
+            text = note_path.read_text(encoding="utf-8")
 
         frontmatter, body = self._extract_frontmatter(text)
+        # headings, tags, wikilinks and word count are all found in one pass over the body
+        scan = scan_markdown(body)
 
         return {
             "note_id": note_path.relative_to(vault_path).as_posix(),
@@ -210,11 +328,417 @@ class ObsidianVaultProcessor(KnowledgeBaseProcessor):
             "relative_path": note_path.relative_to(vault_path).as_posix(),
             "raw_text": body,
             "frontmatter": frontmatter,
-            "headings": self._extract_headings(body),
-            "tags": self._extract_tags(body),
-            "wikilinks": self._extract_wikilinks(body),
-            "word_count": len(body.split()),
+            "headings": scan.headings,
+            "tags": scan.tags,
+            "wikilinks": scan.wikilinks,
+            "word_count": scan.word_count,
+        }
+
+    def _iter_markdown_files(self, vault_path: Path) -> Iterator[VaultFile]:
+        """
+        Iterate over the markdown files of the vault. Ignored directories (`.obsidian`,
+        `.trash`, `.git` and `self.ignore_patterns`) are pruned without being walked.
+
+        Args:
+            vault_path (Path): The root path of the Obsidian vault.
+
+        Returns:
+            Iterator[VaultFile]: The markdown files in the vault along with their `stat` results.
+        """
+        walker = VaultWalker(vault_path, ignore_patterns=self.ignore_patterns)
+        yield from walker.walk()
+
+    def _git_vault_files(
+        self, vault_path: Path, head_commit: str, renamed: Dict[str, str]
+    ) -> List[VaultFile] | None:
+        """
+        Build the list of notes in the vault from the manifest and the files git reports
+        as changed since the commit of the last run, without walking the vault. Only the
+        changed files are stat-ed, the other notes keep their manifest fingerprint and are
+        thus carried over as unchanged.
+
+        Files ignored by git are not reported by it, so changes to them are only picked up
+        by a filesystem scan.
+
+        Args:
+            vault_path (Path): The root path of the Obsidian vault.
+            head_commit (str): The commit currently checked out in the vault.
+            renamed (Dict[str, str]): Filled in place with the renames reported by git.
+
+        Returns:
+            List[VaultFile] | None: The notes in vault walk order or None if the changes
+                                    could not be found with git.
+        """
+        assert self.manifest is not None, "Manifest must be set in incremental mode"
+        previous_entries = self.manifest.entries
+        if self.manifest.commit is None or not previous_entries:
+            LOGGER.info("No commit recorded by the last run. Scanning the vault.")
+            return None
+
+        changes = GitChangeDetector(vault_path).changes_since(self.manifest.commit)
+        if changes is None:
+            LOGGER.warning(
+                f"Could not find changes since commit {self.manifest.commit}. Scanning the vault."
+            )
+            return None
+        LOGGER.info(
+            f"{len(changes.paths)} files changed since commit {self.manifest.commit} "
+            f"(HEAD is {head_commit})"
+        )
+
+        renamed.update(changes.renamed)
+        return self._changed_vault_files(vault_path, changes.paths)
+
+    def _changed_vault_files(
+        self, vault_path: Path, changed_paths: Iterable[str]
+    ) -> List[VaultFile]:
+        """
+        Build the list of notes in the vault from the manifest and the paths known to have
+        changed since the last run, without walking the vault. Only the changed notes are
+        stat-ed, the other notes keep their manifest fingerprint and are thus carried over
+        as unchanged. A changed directory (eg, a moved folder) stands for every note in it,
+        before and after the change.
+
+        Args:
+            vault_path (Path): The root path of the Obsidian vault.
+            changed_paths (Iterable[str]): Posix style paths relative to the vault root of
+                                           the changed notes and directories.
+
+        Returns:
+            List[VaultFile]: The notes in vault walk order.
+        """
+        assert self.manifest is not None, "Manifest must be set in incremental mode"
+        previous_entries = self.manifest.entries
+        walker = VaultWalker(vault_path, ignore_patterns=self.ignore_patterns)
+
+        changed = set(changed_paths)
+        for relative_path in list(changed):
+            if walker.includes(relative_path, is_dir=True) and (
+                (vault_path / relative_path).is_dir()
+            ):
+                changed.update(
+                    vault_file.relative_path
+                    for vault_file in walker.walk(relative_path)
+                )
+        # notes of a directory which was changed, eg, moved away or deleted
+        for relative_path in previous_entries:
+            parts = relative_path.split("/")
+            if any(
+                "/".join(parts[:depth]) in changed for depth in range(1, len(parts))
+            ):
+                changed.add(relative_path)
+
+        relative_paths = [
+            relative_path
+            for relative_path in previous_entries.keys() | changed
+            if walker.includes(relative_path)
+        ]
+
+        vault_files = []
+        for relative_path in sorted(relative_paths, key=walk_order_key):
+            note_path = vault_path / relative_path
+            entry = previous_entries.get(relative_path)
+            if entry is not None and relative_path not in changed:
+                vault_files.append(
+                    VaultFile(note_path, relative_path, entry.mtime_ns, entry.size)
+                )
+                continue
+            try:
+                note_stat = os.stat(note_path)
+            except OSError:
+                continue  # deleted
+            if stat.S_ISREG(note_stat.st_mode):
+                vault_files.append(
+                    VaultFile(
+                        note_path,
+                        relative_path,
+                        note_stat.st_mtime_ns,
+                        note_stat.st_size,
+                    )
+                )
+        return vault_files
+
+    def _detect_renames(
+        self,
+        delta: NoteDelta,
+        entries: Dict[str, ManifestEntry],
+        candidates: Dict[str, str],
+    ) -> None:
+        """
+        Pair deleted notes with added notes which are their renamed (or moved) versions and
+        record them in `delta.renamed` instead. A pair is either a rename reported by git
+        (the content may have changed as well) or a deleted and an added note with the
+        same content hash.
+
+        Args:
+            delta (NoteDelta): The delta to the previous run, updated in place.
+            entries (Dict[str, ManifestEntry]): The new manifest entries.
+            candidates (Dict[str, str]): Renames reported by git, previous to new note ID.
+        """
+        assert self.manifest is not None, "Manifest must be set in incremental mode"
+        previous_entries = self.manifest.entries
+        deleted = set(delta.deleted)
+        added = set(delta.added)
+
+        renamed = {
+            previous_id: note_id
+            for previous_id, note_id in candidates.items()
+            if previous_id in deleted and note_id in added
         }
+        renamed_ids = set(renamed.values())
+
+        deleted_by_hash: Dict[str, List[str]] = {}
+        for previous_id in delta.deleted:
+            if previous_id not in renamed:
+                deleted_by_hash.setdefault(
+                    previous_entries[previous_id].content_hash, []
+                ).append(previous_id)
+        for note_id in delta.added:
+            if note_id in renamed_ids:
+                continue
+            previous_ids = deleted_by_hash.get(entries[note_id].content_hash)
+            if previous_ids:
+                renamed[previous_ids.pop(0)] = note_id
+                renamed_ids.add(note_id)
+
+        if not renamed:
+            return
+
+        delta.added = [note_id for note_id in delta.added if note_id not in renamed_ids]
+        delta.deleted = [
+            previous_id for previous_id in delta.deleted if previous_id not in renamed
+        ]
+        delta.modified.extend(
+            note_id
+            for previous_id, note_id in renamed.items()
+            if previous_entries[previous_id].content_hash
+            != entries[note_id].content_hash
+        )
+        delta.modified.sort(key=walk_order_key)
+        delta.renamed = renamed
+
+    def _iter_incremental_jobs(
+        self,
+        vault_files: Iterable[VaultFile],
+        previous_index: "_PreviousIndex",
+        entries: Dict[str, ManifestEntry],
+        delta: NoteDelta,
+    ) -> Iterator[_NoteJob]:
+        """
+        Compare every note in the vault against the manifest and yield a parsing job for it.
+        Unchanged notes are carried over from the previous index, others are marked to be
+        parsed. `entries` and `delta` are filled in as the jobs are consumed.
+
+        A note is considered unchanged if its mtime and size match the manifest, or if
+        they differ but its content hash does not (eg, the file was only touched).
+
+        Args:
+            vault_files (Iterable[VaultFile]): The notes in the vault, in vault walk order.
+            previous_index (_PreviousIndex): The index written by the previous run.
+            entries (Dict[str, ManifestEntry]): The new manifest entries, filled in place.
+            delta (NoteDelta): The delta to the previous run, filled in place.
+
+        Returns:
+            Iterator[_NoteJob]: Path of each note, its content if already read and the
+                                previous note if it is unchanged.
+        """
+        assert self.manifest is not None, "Manifest must be set in incremental mode"
+        previous_entries = self.manifest.entries
+
+        for vault_file in vault_files:
+            note_id = vault_file.relative_path
+            previous_entry = previous_entries.get(note_id)
+            previous_note = (
+                previous_index.get(note_id) if previous_entry is not None else None
+            )
+
+            if (
+                previous_entry is not None
+                and previous_note is not None
+                and previous_entry.mtime_ns == vault_file.mtime_ns
+                and previous_entry.size == vault_file.size
+            ):
+                entries[note_id] = previous_entry
+                delta.unchanged.append(note_id)
+                yield vault_file.path, None, previous_note
+                continue
+
+            text = vault_file.path.read_text(encoding="utf-8")
+            entry = ManifestEntry(
+                mtime_ns=vault_file.mtime_ns,
+                size=vault_file.size,
+                content_hash=VaultManifest.hash_content(text),
+            )
+            entries[note_id] = entry
+
+            if (
+                previous_entry is not None
+                and previous_note is not None
+                and previous_entry.content_hash == entry.content_hash
+            ):
+                delta.unchanged.append(note_id)
+                yield vault_file.path, None, previous_note
+                continue
+
+            if previous_entry is None:
+                delta.added.append(note_id)
+            else:
+                delta.modified.append(note_id)
+            yield vault_file.path, text, None
+
+    def _iter_process_incremental(self, vault_path: Path) -> Iterator[Dict]:
+        """
+        Process only the notes which were added or modified since the last run, as
+        recorded in the manifest. Unchanged notes are carried over from the previous index.
+        If `changed_paths` is set, only those paths are checked. Otherwise, in git change
+        detection mode, only the files git reports as changed are checked.
+        The manifest and `self.delta` are updated once all notes have been yielded.
+
+        Args:
+            vault_path (Path): The root path of the Obsidian vault.
+
+        Returns:
+            Iterator[Dict]: The notes metadata ie, processed data.
+        """
+        assert self.manifest is not None, "Manifest must be set in incremental mode"
+
+        self.manifest.load()
+        entries: Dict[str, ManifestEntry] = {}
+        delta = NoteDelta()
+        git_renamed: Dict[str, str] = {}
+
+        head_commit = None
+        vault_files: Iterable[VaultFile] | None = None
+        if self.changed_paths is not None and self.manifest.entries:
+            vault_files = self._changed_vault_files(vault_path, self.changed_paths)
+            # the changes since the recorded commit are still checked by the next git run
+            head_commit = self.manifest.commit
+        elif self.change_detection == "git":
+            head_commit = GitChangeDetector(vault_path).head_commit()
+            if head_commit is None:
+                LOGGER.warning(
+                    f"{str(vault_path)} is not in a git repository. Scanning the vault."
+                )
+            else:
+                vault_files = self._git_vault_files(
+                    vault_path, head_commit, git_renamed
+                )
+        if vault_files is None:
+            vault_files = self._iter_markdown_files(vault_path)
+
+        previous_index = _PreviousIndex(self.output_path)
+        try:
+            jobs = self._iter_incremental_jobs(
+                vault_files, previous_index, entries, delta
+            )
+            yield from self._parse_notes(jobs, vault_path)
+        finally:
+            # release the previous index before it gets replaced by the new one
+            previous_index.close()
+
+        delta.deleted = sorted(set(self.manifest.entries) - set(entries))
+        self._detect_renames(delta, entries, git_renamed)
+
+        self.manifest.entries = entries
+        self.manifest.delta = delta
+        self.manifest.commit = head_commit
+        self.delta = delta
+        LOGGER.info(
+            f"Notes added: {len(delta.added)}, modified: {len(delta.modified)}, "
+            f"deleted: {len(delta.deleted)}, renamed: {len(delta.renamed)}, "
+            f"unchanged: {len(delta.unchanged)}"
+        )
+
+    def _parse_notes(
+        self, jobs: Iterable[_NoteJob], vault_path: Path
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Parse notes either serially or, if `self.workers > 1`, in batches across a pool of
+        worker processes. The notes are yielded in the same order as `jobs`. Jobs which
+        already carry a note (unchanged notes in incremental mode) are passed through
+        without being sent to a worker.
+
+        Args:
+            jobs (Iterable[_NoteJob]): Path of each note to parse, its content if already
+                                       read and the note itself if it needs no parsing.
+            vault_path (Path): The root path of the Obsidian vault.
+
+        Returns:
+            Iterator[Dict[str, Any]]: The parsed notes.
+        """
+        if self.workers <= 1:
+            for note_path, text, note_data in jobs:
+                if note_data is None:
+                    note_data = self._parse_markdown_note(
+                        note_path, vault_path, text=text
+                    )
+                yield note_data
+            return
+
+        LOGGER.info(
+            f"Parsing notes with {self.workers} workers in batches of {self.batch_size}"
+        )
+        # batches are parsed in submission order, so the batches kept here line up with
+        # the parsed results coming back from the workers
+        submitted_batches: Deque[List[_NoteJob]] = deque()
+
+        def tasks() -> Iterator[Tuple[Path, List[Tuple[Path, str | None]]]]:
+            for batch in batched(jobs, self.batch_size):
+                submitted_batches.append(batch)
+                yield vault_path, [
+                    (note_path, text)
+                    for note_path, text, note_data in batch
+                    if note_data is None
+                ]
+
+        for parsed_batch, new_cache_entries in ordered_parallel_map(
+            _parse_note_batch,
+            tasks(),
+            workers=self.workers,
+            initializer=_init_parse_worker,
+            initargs=(self,),
+        ):
+            # frontmatter parsed by the workers is cached in the main process as well
+            self.frontmatter_cache.merge(new_cache_entries)
+            parsed_notes = iter(parsed_batch)
+            for _, _, note_data in submitted_batches.popleft():
+                yield note_data if note_data is not None else next(parsed_notes)
+
+    def iter_process(self) -> Iterator[Dict]:
+        """
+        Process the Obsidian vault to extract notes metadata, yielding one note at a time
+        so that the whole vault is never held in memory.
+
+        Returns:
+            Iterator[Dict]: The notes metadata ie, processed data.
+        """
+
+        LOGGER.info(f"Processing Obsidian markdown files from {str(self.vault_path)}")
+
+        vault_path = self.vault_path.resolve()
+        if len(self.frontmatter_cache) == 0:
+            self.frontmatter_cache.load()
+
+        if self.incremental:
+            yield from self._iter_process_incremental(vault_path)
+            return
+
+        jobs = (
+            (vault_file.path, None, None)
+            for vault_file in self._iter_markdown_files(vault_path)
+        )
+        yield from self._parse_notes(jobs, vault_path)
+
+    def save_empty_output(self) -> bool:
+        """
+        In incremental mode, a run with a delta (eg, the last note of the vault was
+        deleted) is saved even without notes, so that the index and the manifest no longer
+        list the deleted notes.
+
+        Returns:
+            bool: True if the empty output is saved.
+        """
+        return self.incremental and self.delta is not None
 
     def process(self) -> list[dict]:
         """
@@ -223,18 +747,134 @@ class ObsidianVaultProcessor(KnowledgeBaseProcessor):
         Returns:
             list[dict]: A list of dictionaries containing notes metadata ie, processed data.
         """
+        return list(self.iter_process())
 
-        LOGGER.info(f"Processing Obsidian markdown files from {str(self.vault_path)}")
+    def save_processed_data(self, processed_data: Iterable[Dict]) -> None:
+        """
+        Save the processed data to a JSON (or JSON Lines) file atomically.
+        In incremental mode the manifest is saved after the index, so that a failed run
+        is simply re-detected on the next run.
+        If `graph_path` is set, the wikilink graph of the notes is built and saved as well.
 
-        vault_path = self.vault_path.resolve()
-        notes = []
+        Args:
+            processed_data (Iterable[dict]): The parsed notes metadata.
+        """
+        if self.graph_path is None:
+            super().save_processed_data(processed_data)
+        else:
+            # only the links are kept while streaming, the graph is built once every
+            # note is known since a link may point to a note which comes later
+            note_links: List[Tuple[str, List[str]]] = []
+
+            def collect_links(notes: Iterable[Dict]) -> Iterator[Dict]:
+                for note in notes:
+                    note_links.append((note["note_id"], note["wikilinks"]))
+                    yield note
+
+            super().save_processed_data(collect_links(processed_data))
+            # imported on first use, only the graph needs numpy
+            from atlas.core.graph.wikilink_graph import WikilinkGraph
+
+            WikilinkGraph.build(note_links).save(self.graph_path)
+        self.frontmatter_cache.save()
+        if self.manifest is not None:
+            self.manifest.save()
+
+
+class _PreviousIndex:
+    """
+    Streams the index written by the previous run to look up the notes to carry over in
+    incremental mode, without loading the whole index in memory.
+
+    Notes are looked up in vault walk order, which is also the order the previous run wrote
+    them in, so the index is read only once front to back. A note which cannot be found
+    this way (eg, an index written in another order) is simply re-parsed.
+
+    Args:
+        path (Path): Path of the previous index.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._records: Iterator[Dict] = iter(())
+        self._current: Dict | None = None
+        if path.exists():
+            self._records = iter_records(path)
+            self._advance()
+
+    def _advance(self) -> None:
+        """Move to the next note of the previous index."""
+        try:
+            self._current = next(self._records, None)
+        except Exception as e:
+            LOGGER.error(f"Error reading previous index, re-parsing notes : {e}")
+            self._current = None
+
+    def get(self, note_id: str) -> Dict | None:
+        """
+        Get a note of the previous index. Notes must be requested in vault walk order.
 
-        for md_file in vault_path.rglob("*.md"):
-            if ".obsidian" in md_file.parts:
-                continue
-            note_data = self._parse_markdown_note(md_file, vault_path)
-            notes.append(note_data)
-        return notes
+        Args:
+            note_id (str): ID of the note.
+
+        Returns:
+            Dict | None: The previous note or None if it isnt in the previous index.
+        """
+        key = walk_order_key(note_id)
+        while (
+            self._current is not None and walk_order_key(self._current["note_id"]) < key
+        ):
+            self._advance()
+        if self._current is not None and self._current["note_id"] == note_id:
+            return self._current
+        return None
+
+    def close(self) -> None:
+        """Close the previous index file."""
+        close = getattr(self._records, "close", None)
+        if close is not None:
+            close()
+
+
+# processor used by the worker processes of the parallel parsing mode,
+# set once per worker so that it isnt pickled along with every batch
+_WORKER_PROCESSOR: ObsidianVaultProcessor | None = None
+
+
+def _init_parse_worker(processor: ObsidianVaultProcessor) -> None:
+    """
+    Initialize a parsing worker process.
+
+    Args:
+        processor (ObsidianVaultProcessor): The processor whose parsing logic the worker uses.
+    """
+    global _WORKER_PROCESSOR
+    _WORKER_PROCESSOR = processor
+    # new frontmatter cache entries are sent back to the main process with every batch
+    _WORKER_PROCESSOR.frontmatter_cache.record_new_entries = True
+
+
+def _parse_note_batch(
+    task: Tuple[Path, List[Tuple[Path, str | None]]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Parse a batch of notes inside a worker process.
+
+    Args:
+        task (Tuple[Path, List[Tuple[Path, str | None]]]): The vault root path and the batch
+                                                          of notes to parse.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Dict[str, str]]: The parsed notes, in batch order, and
+                                                     the frontmatter cache entries added
+                                                     while parsing them.
+    """
+    assert _WORKER_PROCESSOR is not None, "Worker must be initialized before parsing"
+    vault_path, batch = task
+    parsed_notes = [
+        _WORKER_PROCESSOR._parse_markdown_note(note_path, vault_path, text=text)
+        for note_path, text in batch
+    ]
+    return parsed_notes, _WORKER_PROCESSOR.frontmatter_cache.drain_new_entries()
 
 
 if __name__ == "__main__":
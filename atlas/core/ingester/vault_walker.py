@@ -0,0 +1,241 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple
+import os
+import re
+
+from atlas.utils.logger import LoggerConfig
+
+LOGGER = LoggerConfig().logger
+
+
+@dataclass
+class VaultFile:
+    """
+    A file found by `VaultWalker`, along with the `stat` results gathered while walking
+    so that callers (eg, the incremental manifest) dont need another syscall per file.
+    """
+
+    path: Path
+    relative_path: str  # posix style path relative to the vault root
+    mtime_ns: int
+    size: int
+
+
+def walk_order_key(relative_path: str) -> Tuple[Tuple[int, str], ...]:
+    """
+    Sort key which orders relative paths the same way `VaultWalker` yields them,
+    ie, directory by directory with the files of a directory before its sub directories.
+
+    Eg: "b.md" < "a/c.md" < "a/d/e.md" < "b/a.md"
+
+    Args:
+        relative_path (str): Posix style path relative to the vault root.
+
+    Returns:
+        Tuple[Tuple[int, str], ...]: The sort key.
+    """
+    *dirs, name = relative_path.split("/")
+    return (*((1, d) for d in dirs), (0, name))
+
+
+class IgnoreRules:
+    """
+    Gitignore-style ignore rules.
+
+    Supported syntax:
+    - blank lines and lines starting with `#` are skipped
+    - `!pattern` re-includes paths excluded by an earlier pattern
+    - `pattern/` only matches directories
+    - a pattern containing a `/` (other than a trailing one) is anchored to the vault root,
+      otherwise it matches the file or directory name at any depth
+    - `*`, `?` and `[...]` match within a path segment, `**` matches across segments
+
+    As in git, the last matching pattern wins and a path inside an ignored directory
+    cannot be re-included since the directory is never walked.
+
+    Args:
+        patterns (Iterable[str]): The ignore patterns.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        # list of (compiled pattern, is negated, only matches directories, match on name)
+        self._rules: List[Tuple[re.Pattern, bool, bool, bool]] = []
+        for pattern in patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+
+            negated = pattern.startswith("!")
+            if negated:
+                pattern = pattern[1:]
+
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+
+            match_on_name = "/" not in pattern
+            pattern = pattern.lstrip("/")
+            if not pattern:
+                continue
+
+            self._rules.append(
+                (
+                    re.compile(self._translate(pattern)),
+                    negated,
+                    dir_only,
+                    match_on_name,
+                )
+            )
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """
+        Translate a gitignore-style glob pattern to a regular expression.
+
+        Args:
+            pattern (str): The glob pattern.
+
+        Returns:
+            str: The equivalent regular expression.
+        """
+        regex = []
+        i = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if pattern.startswith("**/", i):
+                regex.append("(?:.*/)?")
+                i += 3
+            elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+                regex.append("(?:/.*)?")
+                i += 3
+            elif pattern.startswith("**", i):
+                regex.append(".*")
+                i += 2
+            elif char == "*":
+                regex.append("[^/]*")
+                i += 1
+            elif char == "?":
+                regex.append("[^/]")
+                i += 1
+            elif char == "[" and "]" in pattern[i + 1 :]:
+                end = pattern.index("]", i + 1)
+                char_class = pattern[i + 1 : end]
+                if char_class.startswith("!"):
+                    char_class = "^" + char_class[1:]
+                regex.append(f"[{char_class}]")
+                i = end + 1
+            else:
+                regex.append(re.escape(char))
+                i += 1
+        return "^" + "".join(regex) + "$"
+
+    def is_ignored(self, relative_path: str, is_dir: bool) -> bool:
+        """
+        Check if a path is ignored.
+
+        Args:
+            relative_path (str): Posix style path relative to the vault root.
+            is_dir (bool): Whether the path is a directory.
+
+        Returns:
+            bool: True if the path is ignored.
+        """
+        name = relative_path.rpartition("/")[2]
+        ignored = False
+        for regex, negated, dir_only, match_on_name in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(name if match_on_name else relative_path):
+                ignored = not negated
+        return ignored
+
+
+class VaultWalker:
+    """
+    Walks a vault with `os.scandir`, pruning ignored directories before descending into
+    them. Files are yielded in a deterministic order (sorted by name, directory by directory).
+
+    Args:
+        vault_path (Path): The root path of the vault.
+        ignore_patterns (Iterable[str] | None): Gitignore-style patterns applied on top of
+                                                `DEFAULT_IGNORE_PATTERNS`.
+        extensions (Tuple[str, ...]): Extensions of the files to yield. Default is `(".md",)`.
+    """
+
+    DEFAULT_IGNORE_PATTERNS = [".obsidian/", ".trash/", ".git/"]
+
+    def __init__(
+        self,
+        vault_path: Path,
+        ignore_patterns: Iterable[str] | None = None,
+        extensions: Tuple[str, ...] = (".md",),
+    ) -> None:
+        self.vault_path = Path(vault_path)
+        self.extensions = extensions
+        self.ignore_rules = IgnoreRules(
+            [*self.DEFAULT_IGNORE_PATTERNS, *(ignore_patterns or [])]
+        )
+
+    def includes(self, relative_path: str, is_dir: bool = False) -> bool:
+        """
+        Check if a path is part of the walk, ie, it has a matching extension (for files)
+        and neither it nor any of its parent directories is ignored. The path does not
+        need to exist, eg, for paths reported by git or file system events.
+
+        Args:
+            relative_path (str): Posix style path relative to the vault root.
+            is_dir (bool): Whether the path is a directory. Default is False.
+
+        Returns:
+            bool: True if the path is part of the walk.
+        """
+        if not is_dir and not relative_path.endswith(self.extensions):
+            return False
+        parts = relative_path.split("/")
+        for depth in range(1, len(parts)):
+            if self.ignore_rules.is_ignored("/".join(parts[:depth]), is_dir=True):
+                return False
+        return not self.ignore_rules.is_ignored(relative_path, is_dir=is_dir)
+
+    def walk(self, relative_dir: str = "") -> Iterator[VaultFile]:
+        """
+        Walk the vault, or only a directory of it.
+
+        Args:
+            relative_dir (str): Posix style path relative to the vault root of the directory
+                                to walk. Default is "", the whole vault.
+
+        Returns:
+            Iterator[VaultFile]: The (not ignored) files in the vault with matching extensions.
+        """
+        # depth first, with the sub directories pushed in reverse so they are popped in order
+        stack = [(str(self.vault_path / relative_dir), relative_dir)]
+        while stack:
+            dir_path, relative_dir = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name)
+            except OSError as e:
+                LOGGER.warning(f"Skipping unreadable directory {dir_path} : {e}")
+                continue
+
+            sub_dirs = []
+            for entry in entries:
+                relative_path = (
+                    f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                )
+                if entry.is_dir(follow_symlinks=False):
+                    if not self.ignore_rules.is_ignored(relative_path, is_dir=True):
+                        sub_dirs.append((entry.path, relative_path))
+                elif entry.name.endswith(self.extensions) and entry.is_file():
+                    if self.ignore_rules.is_ignored(relative_path, is_dir=False):
+                        continue
+                    stat = entry.stat()
+                    yield VaultFile(
+                        path=Path(entry.path),
+                        relative_path=relative_path,
+                        mtime_ns=stat.st_mtime_ns,
+                        size=stat.st_size,
+                    )
+
+            stack.extend(reversed(sub_dirs))
@@ -1,6 +1,9 @@
 import os
+from pathlib import Path
+from typing import List
 
 from atlas.utils.embedder_utils import generate_embedding
+from atlas.core.chunker.note_store import NoteStore
 from atlas.core.indexer.faiss_vector_store import FaissVectorStore
 
 from atlas.utils.logger import LoggerConfig
@@ -8,7 +11,13 @@ from atlas.utils.logger import LoggerConfig
 LOGGER = LoggerConfig().logger
 
 
-def retrieve_context(results_load_path: str, user_query: str, k: int = 5) -> str | None:
+def retrieve_context(
+    results_load_path: str,
+    user_query: str,
+    k: int = 5,
+    tags: List[str] | None = None,
+    note_store_path: str | None = None,
+) -> str | None:
     """
     Retrieve the context for the user query. The context is the concatenated text of the most
     relevant chunks associated with the user query.
@@ -18,16 +27,21 @@ def retrieve_context(results_load_path: str, user_query: str, k: int = 5) -> str
         user_query (str): User query to retrieve context for.
         k (int): Number of most similar embeddings (aka neighbors) to the query vector.
                  Default is 5.
+        tags (List[str] | None): If given, only chunks with all of these tags are searched.
+                                 Default is None.
+        note_store_path (str | None): Directory of the note store, if the index holds
+                                      compact chunks. Default is None.
 
     Returns:
         str | None: The context associated with the user query.
     """
 
     # 1. load the vector store
-    store = FaissVectorStore(
-        dim=384
-    )  # the encoder model we used generated embeddings of size 384
     try:
+        note_store = NoteStore(Path(note_store_path)) if note_store_path else None
+        store = FaissVectorStore(
+            dim=384, note_store=note_store
+        )  # the encoder model we used generated embeddings of size 384
         store.load(results_load_path)
     except Exception as e:
         LOGGER.error(f"Error while retrieving context : {repr(e)}")
@@ -39,9 +53,14 @@ def retrieve_context(results_load_path: str, user_query: str, k: int = 5) -> str
     )
     query_vector = generate_embedding(user_query, encoder_config_path)
 
-    # 3. search for k top neighbors
+    # 3. search for k top neighbors, among the chunks with the requested tags if any
+    ids = None
+    if tags:
+        ids = store.metadata_index.intersect(
+            *(store.metadata_index.lookup("tags", tag) for tag in tags)
+        )
     try:
-        results = store.search(query_vector, k)
+        results = store.search(query_vector, k, ids=ids)
     except Exception as e:
         LOGGER.error(f"Error while retrieving context : {repr(e)}")
         return None
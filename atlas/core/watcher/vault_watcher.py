@@ -0,0 +1,483 @@
+from atlas.utils.logger import LoggerConfig
+from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+from atlas.core.ingester.manifest import NoteDelta
+from atlas.core.ingester.vault_walker import VaultWalker
+from atlas.core.chunker.base_chunker import BaseChunker
+from atlas.core.embedder.base.base_embedder import BaseEmbedder
+from atlas.core.indexer.base_vector_store import BaseVectorStore
+from atlas.utils.io_utils import iter_records
+from atlas.utils.parallel_utils import batched
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+import os
+import threading
+import time
+import numpy as np
+
+LOGGER = LoggerConfig().logger
+
+# relative path of a note -> (mtime in ns, size in bytes)
+_Snapshot = Dict[str, Tuple[int, int]]
+
+
+class ChangeDebouncer:
+    """
+    Collects the paths of changed files and releases them once the vault has been quiet
+    for `debounce_seconds`, so that a burst of events (eg, an editor saving a note
+    several times, a sync client updating many notes) results in a single refresh.
+    Under a constant stream of events the paths are released at the latest
+    `max_delay_seconds` after the first one, so the index never falls too far behind.
+
+    Events can come from the file system observer thread, hence all methods are thread-safe.
+
+    Args:
+        debounce_seconds (float): Quiet period after the last event before releasing the paths.
+        max_delay_seconds (float): Maximum time a path is held back after the first event.
+        clock (Callable[[], float]): Monotonic clock in seconds. Default is `time.monotonic`.
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float,
+        max_delay_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pending: Set[str] = set()
+        self._first_event_time = 0.0
+        self._last_event_time = 0.0
+
+    def notify(self, paths: Iterable[str]) -> None:
+        """
+        Record changed paths.
+
+        Args:
+            paths (Iterable[str]): The changed paths.
+        """
+        with self._lock:
+            now = self._clock()
+            size_before = len(self._pending)
+            self._pending.update(paths)
+            if len(self._pending) == size_before:
+                return
+            if size_before == 0:
+                self._first_event_time = now
+            self._last_event_time = now
+
+    def pop_ready(self) -> Set[str]:
+        """
+        Release the pending paths if the debounce period (or the maximum delay) has passed.
+
+        Returns:
+            Set[str]: The changed paths, empty if there are none or if they are held back.
+        """
+        with self._lock:
+            if not self._pending:
+                return set()
+            now = self._clock()
+            if (
+                now - self._last_event_time < self.debounce_seconds
+                and now - self._first_event_time < self.max_delay_seconds
+            ):
+                return set()
+            ready, self._pending = self._pending, set()
+            return ready
+
+
+class VaultWatcher:
+    """
+    Long-running watcher which keeps the vector index live as the notes in an Obsidian
+    vault change. Only the notes which were added, modified or deleted are re-chunked,
+    re-embedded and upserted into the vector store, the rest of the index is left as is.
+
+    Changes are detected with the native file system events of the OS (inotify on Linux)
+    through the `watchdog` package when it is installed, and by polling the vault
+    otherwise. Either way, the changed paths are passed to the incremental ingester, which
+    only stats and re-parses those notes, and its manifest decides which of them have
+    actually changed, so a duplicated event never re-indexes an unchanged note. Changes
+    made while the watcher was not running are caught up with a check of every note on
+    start.
+
+    Embeddings are reused from the vector store for the chunks whose content did not
+    change (eg, the chunks of a renamed note or the untouched sections of a modified note),
+    the other chunks are encoded by the embedder, through its `EmbeddingCache` if it has
+    one.
+
+    The processed data file of the ingester is kept up to date. The chunked data and
+    embedded chunks files are not, since the vector store is updated directly.
+
+    The chunks of the refreshed notes are not deduplicated (see `BaseDeduplicator`), the
+    signatures of the indexed chunks are not kept, so near-duplicates added or edited while
+    the watcher runs are indexed as they are until the batch pipeline is run again.
+
+    Args:
+        processor (ObsidianVaultProcessor): The ingester, which must be in incremental mode.
+        chunker (BaseChunker): The chunker used to re-chunk the changed notes.
+        embedder (BaseEmbedder): The embedder used to embed the new chunks.
+        store (BaseVectorStore): The vector store to keep up to date.
+        results_path (str): Directory the vector store is loaded from and saved to.
+        debounce_seconds (float): Quiet period after the last change before refreshing the
+                                  index. Default is 2.0.
+        max_delay_seconds (float): Maximum time a change is held back under a constant
+                                   stream of changes. Default is 30.0.
+        poll_interval (float): Seconds between two scans of the vault when polling.
+                               Default is 2.0.
+        use_native_events (bool): If True, use the file system events of the OS when
+                                  `watchdog` is installed. Default is True.
+    """
+
+    # seconds between two checks of the debouncer in the main loop
+    tick_seconds = 0.25
+
+    def __init__(
+        self,
+        processor: ObsidianVaultProcessor,
+        chunker: BaseChunker,
+        embedder: BaseEmbedder,
+        store: BaseVectorStore,
+        results_path: str,
+        debounce_seconds: float = 2.0,
+        max_delay_seconds: float = 30.0,
+        poll_interval: float = 2.0,
+        use_native_events: bool = True,
+    ) -> None:
+        if not processor.incremental:
+            LOGGER.error("The vault watcher requires an incremental ingester")
+            raise ValueError("The vault watcher requires an incremental ingester")
+
+        LOGGER.info("-" * 20)
+        LOGGER.info("Initializing Vault Watcher.")
+        self.processor = processor
+        self.chunker = chunker
+        self.embedder = embedder
+        self.store = store
+        self.results_path = results_path
+        self.poll_interval = poll_interval
+        self.use_native_events = use_native_events
+        self.debouncer = ChangeDebouncer(debounce_seconds, max_delay_seconds)
+        self._stop_event = threading.Event()
+        self._observer: Any = None  # `watchdog` observer, None when polling
+        self._walker: VaultWalker | None = None
+        self._snapshot: _Snapshot = {}
+
+        # without a saved vector store, every note has to be indexed on the first
+        # refresh, not just the ones the manifest reports as changed
+        self._full_rebuild = False
+        try:
+            self.store.load(results_path)
+        except Exception:
+            LOGGER.warning(
+                f"No vector store found at {results_path}, building it from scratch"
+            )
+            self._full_rebuild = True
+
+    def refresh(self, changed_paths: Set[str] | None = None) -> NoteDelta | None:
+        """
+        Re-ingest the vault and upsert the chunks of the added, modified and renamed notes
+        into the vector store. Chunks of modified, renamed and deleted notes are removed
+        first. Modified and renamed notes are re-chunked (the note ID is part of every
+        chunk) but the embeddings of the chunks whose content did not change are carried
+        over instead of being re-embedded.
+
+        Args:
+            changed_paths (Set[str] | None): Paths relative to the vault root of the notes
+                                             and directories which changed. If None, every
+                                             note is checked. Default is None.
+
+        Returns:
+            NoteDelta | None: The changes since the last refresh or None if the vault could
+                              not be ingested.
+        """
+        self.processor.delta = None
+        # without a saved vector store every note is checked, see `_full_rebuild`
+        self.processor.changed_paths = None if self._full_rebuild else changed_paths
+        try:
+            self.processor.ingest()
+        finally:
+            self.processor.changed_paths = None
+        delta = self.processor.delta
+        if delta is None:
+            LOGGER.error("Vault could not be ingested. Index not refreshed.")
+            return None
+
+        note_ids = set(delta.changed) | set(delta.renamed.values())
+        if self._full_rebuild:
+            note_ids |= set(delta.unchanged)
+        stale_note_ids = note_ids | set(delta.deleted) | set(delta.renamed)
+
+        if not stale_note_ids:
+            LOGGER.info("No notes changed. Index is up to date.")
+            return delta
+
+        # embeddings only depend on the chunk content, whose hash is kept by compact
+        # chunks (without text) as well
+        previous_vectors, previous_chunks = self.store.get(
+            set(delta.modified) | set(delta.renamed)
+        )
+        reusable_embeddings = {
+            chunk["content_hash"]: vector
+            for chunk, vector in zip(previous_chunks, previous_vectors)
+        }
+
+        notes = (
+            note
+            for note in iter_records(self.processor.output_path)
+            if note["note_id"] in note_ids
+        )
+        # the chunks are embedded and added in batches, so that on a full rebuild the
+        # chunks and vectors of the whole vault are never held in memory at once. The
+        # store is only saved once every batch is added.
+        self.store.remove(stale_note_ids)
+        num_chunks = 0
+        num_reused = 0
+        for batch in batched(
+            self.chunker.iter_chunks(notes), self.embedder.stream_batch_size
+        ):
+            chunks_to_embed = [
+                chunk
+                for chunk in batch
+                if chunk["content_hash"] not in reusable_embeddings
+            ]
+            newly_embedded_chunks = iter(
+                self.embedder.embed_chunks(chunks_to_embed) if chunks_to_embed else []
+            )
+            embedded_chunks: List[Dict] = []
+            for chunk in batch:
+                vector = reusable_embeddings.get(chunk["content_hash"])
+                if vector is None:
+                    embedded_chunks.append(next(newly_embedded_chunks))
+                else:
+                    embedded_chunks.append({**chunk, "embedding": vector})
+                    num_reused += 1
+
+            # the embeddings are stored in the index, not in the chunk metadata
+            vectors = np.array(
+                [chunk.pop("embedding") for chunk in embedded_chunks], dtype=np.float32
+            )
+            self.store.add(vectors, embedded_chunks)
+            num_chunks += len(embedded_chunks)
+
+        self.store.save(self.results_path)
+        self._full_rebuild = False
+
+        LOGGER.info(
+            f"Index refreshed: {len(note_ids)} notes re-indexed into "
+            f"{num_chunks} chunks ({num_reused} embeddings reused), "
+            f"{len(delta.deleted)} notes removed"
+        )
+        return delta
+
+    def _relevant_path(self, path: str, is_directory: bool) -> str | None:
+        """
+        Get the path relative to the vault root of a file system event path which can
+        affect the index, ie, a note (or a directory which can contain notes) inside the
+        vault and not ignored.
+
+        Args:
+            path (str): Path from the file system event.
+            is_directory (bool): Whether the path is a directory.
+
+        Returns:
+            str | None: The relative path or None if the path is not relevant.
+        """
+        assert self._walker is not None, "Watcher must be started first"
+        try:
+            relative_path = Path(path).relative_to(self._walker.vault_path).as_posix()
+        except ValueError:
+            return None
+        if relative_path == "." or not self._walker.includes(
+            relative_path, is_dir=is_directory
+        ):
+            return None
+        return relative_path
+
+    def _on_file_system_event(
+        self, src_path: str, dest_path: str, is_directory: bool
+    ) -> None:
+        """
+        Handle a file system event from the observer thread.
+
+        Args:
+            src_path (str): Path of the changed file or directory.
+            dest_path (str): Destination path for move events, empty otherwise.
+            is_directory (bool): Whether the event is for a directory.
+        """
+        paths = [p for p in (src_path, dest_path) if p]
+        relevant_paths = [
+            relative_path
+            for relative_path in (self._relevant_path(p, is_directory) for p in paths)
+            if relative_path is not None
+        ]
+        if relevant_paths:
+            self.debouncer.notify(relevant_paths)
+
+    def _start_native_observer(self) -> bool:
+        """
+        Start watching the vault with the native file system events of the OS.
+
+        Returns:
+            bool: True if the observer was started, False if `watchdog` is not available.
+        """
+        try:
+            from watchdog.events import FileSystemEvent, FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            LOGGER.warning("watchdog is not installed. Falling back to polling.")
+            return False
+
+        watcher = self
+
+        class _VaultEventHandler(FileSystemEventHandler):
+            def on_any_event(self, event: FileSystemEvent) -> None:
+                if event.event_type in ("opened", "closed_no_write"):
+                    return
+                # the notes changed in a directory have events of their own
+                if event.is_directory and event.event_type == "modified":
+                    return
+                watcher._on_file_system_event(
+                    os.fsdecode(event.src_path),
+                    os.fsdecode(event.dest_path),
+                    event.is_directory,
+                )
+
+        assert self._walker is not None, "Watcher must be started first"
+        observer = Observer()
+        observer.schedule(
+            _VaultEventHandler(), str(self._walker.vault_path), recursive=True
+        )
+        observer.start()
+        self._observer = observer
+        LOGGER.info(f"Watching {self._walker.vault_path} for file system events")
+        return True
+
+    def _take_snapshot(self) -> _Snapshot:
+        """
+        Take a snapshot of the notes in the vault, used to detect changes when polling.
+
+        Returns:
+            _Snapshot: The mtime and size of every note, by relative path.
+        """
+        assert self._walker is not None, "Watcher must be started first"
+        return {
+            vault_file.relative_path: (vault_file.mtime_ns, vault_file.size)
+            for vault_file in self._walker.walk()
+        }
+
+    def poll(self) -> Set[str]:
+        """
+        Scan the vault and notify the debouncer of the notes which were added, modified or
+        deleted since the previous scan.
+
+        Returns:
+            Set[str]: The changed notes, by relative path.
+        """
+        snapshot = self._take_snapshot()
+        changed = {
+            relative_path
+            for relative_path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(relative_path) != self._snapshot.get(relative_path)
+        }
+        self._snapshot = snapshot
+        if changed:
+            self.debouncer.notify(changed)
+        return changed
+
+    def start(self) -> None:
+        """
+        Catch up with the changes made while the watcher was not running and start
+        watching the vault.
+        """
+        self.refresh()
+        # `processor.vault_path` is the vault root found by `_find_vault_root` once ingested
+        self._walker = VaultWalker(
+            self.processor.vault_path.resolve(),
+            ignore_patterns=self.processor.ignore_patterns,
+        )
+        if not (self.use_native_events and self._start_native_observer()):
+            LOGGER.info(
+                f"Polling {self._walker.vault_path} every {self.poll_interval} seconds"
+            )
+            self._snapshot = self._take_snapshot()
+
+    def run(self) -> None:
+        """
+        Start the watcher and refresh the index whenever the notes change, until `stop()`
+        is called (or the process is interrupted).
+        """
+        self.start()
+        next_poll_time = time.monotonic() + self.poll_interval
+        try:
+            while not self._stop_event.wait(self.tick_seconds):
+                if self._observer is None and time.monotonic() >= next_poll_time:
+                    self.poll()
+                    next_poll_time = time.monotonic() + self.poll_interval
+
+                changed = self.debouncer.pop_ready()
+                if changed:
+                    LOGGER.info(f"{len(changed)} paths changed. Refreshing the index.")
+                    try:
+                        self.refresh(changed)
+                    except Exception as e:
+                        # keep watching, the changes are retried after the debounce period
+                        LOGGER.error(f"Error while refreshing the index : {e}")
+                        self.debouncer.notify(changed)
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+                self._observer = None
+            LOGGER.info("Vault watcher stopped.")
+
+    def stop(self) -> None:
+        """
+        Stop the watcher. Safe to call from another thread or a signal handler.
+        """
+        self._stop_event.set()
+
+
+if __name__ == "__main__":
+    from atlas.core.chunker.structural_chunker import StructuralChunker
+    from atlas.core.embedder.sentence_transformer.impl_embedder import (
+        SentenceTransformerEmbedder,
+    )
+    from atlas.core.indexer.faiss_vector_store import FaissVectorStore
+
+    LOGGER.info("Running vault watcher to keep the vector index live")
+    vault_path = r"D:\\Deep learning\\Test Obsidian Vault"
+    processed_data_path = r"D:\\Deep learning\\Atlas\\Resources\\obsidian_index.json"
+    chunked_data_path = r"D:\\Deep learning\\Atlas\\Resources\\chunked_data.json"
+    embedded_chunks_path = r"D:\\Deep learning\\Atlas\\Resources\\embedded_chunks.json"
+    embedding_cache_path = (
+        r"D:\\Deep learning\\Atlas\\Resources\\embedding_cache.sqlite"
+    )
+    results_path = r"D:\\Deep learning\\Atlas\\Resources"
+    encoder_config_path = os.path.join(
+        os.getcwd(), "atlas", "core", "configs", "sentence_transformer_config.yaml"
+    )
+
+    watcher = VaultWatcher(
+        processor=ObsidianVaultProcessor(
+            vault_path, processed_data_path, incremental=True
+        ),
+        chunker=StructuralChunker(
+            processed_data_path, chunked_data_path, max_words=250
+        ),
+        embedder=SentenceTransformerEmbedder(
+            chunked_data_path,
+            embedded_chunks_path,
+            encoder_config_path,
+            cache_path=embedding_cache_path,
+        ),
+        store=FaissVectorStore(
+            dim=384
+        ),  # the encoder model we used generated embeddings of size 384
+        results_path=results_path,
+    )
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
@@ -1,4 +1,5 @@
 import re
+from typing import List, Tuple
 
 
 def slugify(text: str) -> str:
@@ -17,3 +18,35 @@ def slugify(text: str) -> str:
         str: The slugified text.
     """
     return re.sub(r"[^\w]+", "_", text.lower()).strip("_")
+
+
+def sliding_windows(
+    num_items: int, size: int, overlap: int = 0
+) -> List[Tuple[int, int]]:
+    """
+    Get the windows of at most `size` consecutive items, each window starting `overlap`
+    items before the end of the previous one. The last window ends with the last item.
+
+    Eg: sliding_windows(10, 4, overlap=1) -> (0, 4), (3, 7), (6, 10)
+
+    Args:
+        num_items (int): The number of items.
+        size (int): The maximum number of items per window.
+        overlap (int): The number of items shared by two consecutive windows, less than
+                       `size`. Default is 0.
+
+    Returns:
+        List[Tuple[int, int]]: The start (inclusive) and end (exclusive) item index of
+                               every window.
+    """
+    if not 0 <= overlap < size:
+        raise ValueError(f"overlap must be at least 0 and less than size : {overlap}")
+
+    stride = size - overlap
+    windows = []
+    for start in range(0, num_items, stride):
+        end = min(start + size, num_items)
+        windows.append((start, end))
+        if end == num_items:
+            break
+    return windows
@@ -1,14 +1,12 @@
-import json
 from pathlib import Path
 from typing import List, Dict
 import numpy as np
 
 from atlas.core.embedder.config import load_encoder_config
-from atlas.core.embedder.sentence_transformer.impl_encoder import (
-    SentenceTransformerEncoder,
-)
+from atlas.core.embedder.encoder_registry import EncoderRegistry
 
 from atlas.utils.logger import LoggerConfig
+from atlas.utils.io_utils import iter_records
 
 LOGGER = LoggerConfig().logger
 
@@ -18,7 +16,7 @@ def load_embedded_chunks(path: str) -> List[Dict]:
     Load and return the list of chunk dictionaries with added embeddings.
 
     Args:
-        path (str): Path to the list of chunk dictionaries json file.
+        path (str): Path to the list of chunk dictionaries json (or jsonl) file.
 
     Returns:
         List[Dict]: The list of chunk dictionaries with added embeddings.
@@ -26,8 +24,7 @@ def load_embedded_chunks(path: str) -> List[Dict]:
 
     _path = Path(path)
     try:
-        with (_path).open("r", encoding="utf-8") as f:
-            metadata = json.load(f)
+        metadata = list(iter_records(_path))
     except Exception as e:
         LOGGER.error(f"Error loading embedded chunks json file : {e}")
         raise Exception(f"Error loading embedded chunks json file : {e}")
@@ -39,7 +36,8 @@ def load_embedded_chunks(path: str) -> List[Dict]:
 def generate_embedding(text: str, encoder_config_path: str) -> np.ndarray:
     """
     Generate the embedding/vector for a given text using the configuration settings
-    for a specific encoder.
+    for a specific encoder. The encoder is loaded once per process and shared by all
+    calls with the same configuration, see `EncoderRegistry`.
 
     Args:
         text (str): `text` for which to generate embeddings.
@@ -51,6 +49,34 @@ def generate_embedding(text: str, encoder_config_path: str) -> np.ndarray:
     texts = [text]
     _encoder_config_path = Path(encoder_config_path)
     embedding_config = load_encoder_config(_encoder_config_path)
-    encoder = SentenceTransformerEncoder(embedding_config)
-    embedding = encoder.encode(texts)
+    embedding = EncoderRegistry().encode(embedding_config, texts)
     return embedding[0]
+
+
+def warm_up_encoder(encoder_config_path: str) -> None:
+    """
+    Load the encoder of a configuration into the process-wide `EncoderRegistry` ahead of
+    the first query, eg, when a server starts.
+
+    Args:
+        encoder_config_path (str): Path to the configuration settings file for the encoder.
+    """
+    embedding_config = load_encoder_config(Path(encoder_config_path))
+    EncoderRegistry().warm_up(embedding_config)
+
+
+def unload_encoder(encoder_config_path: str | None = None) -> None:
+    """
+    Unload the encoder of a configuration, or all encoders, from the process-wide
+    `EncoderRegistry` to free their memory.
+
+    Args:
+        encoder_config_path (str | None): Path to the configuration settings file for the
+                                          encoder, all encoders if None. Default is None.
+    """
+    embedding_config = (
+        load_encoder_config(Path(encoder_config_path))
+        if encoder_config_path is not None
+        else None
+    )
+    EncoderRegistry().unload(embedding_config)
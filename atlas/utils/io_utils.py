@@ -0,0 +1,124 @@
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterable, Iterator, TextIO, Type
+import json
+
+JSONL_SUFFIX = ".jsonl"
+
+
+def is_jsonl(path: Path) -> bool:
+    """
+    Check if a pipeline file uses the streaming JSON Lines format, ie, one JSON record
+    per line. Any other file is read and written as a single (indented) JSON list.
+
+    Args:
+        path (Path): Path of the pipeline file.
+
+    Returns:
+        bool: True if the file has the `.jsonl` extension.
+    """
+    return Path(path).suffix == JSONL_SUFFIX
+
+
+def iter_records(path: Path) -> Iterator[Dict]:
+    """
+    Read the records of a pipeline file lazily.
+
+    A `.jsonl` file is streamed line by line, so only one record is held in memory at a
+    time. A `.json` file is loaded at once and its records are yielded one by one.
+
+    Args:
+        path (Path): Path of the pipeline file.
+
+    Returns:
+        Iterator[Dict]: The records in the file.
+    """
+    path = Path(path)
+    with path.open("r", encoding="utf-8") as f:
+        if is_jsonl(path):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+class JsonlWriter:
+    """
+    Context manager which appends records to a JSON Lines file atomically.
+
+    Records are appended to a temporary file which replaces the target file only when the
+    context exits without error. This ensures that the file is either fully written or
+    not written at all.
+
+    Args:
+        path (Path): Path of the JSON Lines file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.tmp_path = self.path.with_suffix(".tmp")
+        self.count = 0
+        self._file: TextIO | None = None
+
+    def __enter__(self) -> "JsonlWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.tmp_path.open("w", encoding="utf-8")
+        return self
+
+    def write(self, record: Dict) -> None:
+        """
+        Append a record.
+
+        Args:
+            record (Dict): The record to append.
+        """
+        assert self._file is not None, "JsonlWriter must be used as a context manager"
+        self._file.write(json.dumps(record, ensure_ascii=False))
+        self._file.write("\n")
+        self.count += 1
+
+    def __exit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        assert self._file is not None
+        self._file.close()
+        if exc_type is None:
+            self.tmp_path.replace(self.path)
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+
+
+def write_records(path: Path, records: Iterable[Dict]) -> int:
+    """
+    Write the records of a pipeline file atomically, in the format given by its extension.
+
+    Records are streamed to a `.jsonl` file one at a time. For any other file they are
+    collected and written as a single indented JSON list.
+
+    Args:
+        path (Path): Path of the pipeline file.
+        records (Iterable[Dict]): The records to write.
+
+    Returns:
+        int: Number of records written.
+    """
+    path = Path(path)
+    if is_jsonl(path):
+        with JsonlWriter(path) as writer:
+            for record in records:
+                writer.write(record)
+        return writer.count
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    record_list = list(records)
+
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(record_list, f, indent=2, ensure_ascii=False)
+
+    tmp_path.replace(path)
+    return len(record_list)
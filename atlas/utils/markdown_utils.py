@@ -0,0 +1,81 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+import re
+
+# One precompiled pattern which finds headings, wikilinks and tags in a single walk
+# over the text. The heading title and the wikilink target are captured in lookaheads
+# so that the scan only consumes the heading marker / the opening `[[`. This keeps tags
+# inside headings (`# About #llm`) and inside wikilinks (`[[Note#Section]]`) visible to
+# the scan, the same as when each of them was extracted with its own regex pass.
+_MARKDOWN_PATTERN = re.compile(
+    r"^(?P<hashes>#{1,6})[^\S\r\n]+(?=(?P<title>[^\r\n]*))"
+    r"|\[\[(?=(?P<link>.*?)\]\])"
+    r"|#(?P<tag>\w+)",
+    re.MULTILINE,
+)
+
+
+@dataclass
+class MarkdownScan:
+    """
+    Structural elements of a Markdown note body found by `scan_markdown`.
+
+    `headings` is a list of:
+    {
+        "level": int,
+        "title": str,
+        "start": int,  # offset of the heading line in the text
+        "end": int     # offset of the end of the heading line (excluding the line break)
+    }
+    """
+
+    headings: List[Dict] = field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    wikilinks: List[str] = field(default_factory=list)
+    word_count: int = 0
+
+
+def scan_markdown(text: str) -> MarkdownScan:
+    """
+    Scan a Markdown note body once and extract its headings (with character offsets),
+    tags, wikilinks and word count.
+
+    Below we can see an example of the elements found:
+    # Heading with a #tag
+    This is a link to [[Note1]] and another link to [[Note2|Custom Title]].
+
+    Args:
+        text (str): The Markdown note body.
+
+    Returns:
+        MarkdownScan: The headings, unique sorted tags, unique sorted wikilinks and
+                      word count of the text.
+    """
+    headings = []
+    tags = set()
+    wikilinks = set()
+    links_end = 0  # wikilinks dont overlap, same as with `re.findall`
+
+    for match in _MARKDOWN_PATTERN.finditer(text):
+        if match.group("hashes") is not None:
+            headings.append(
+                {
+                    "level": len(match.group("hashes")),
+                    "title": match.group("title").strip(),
+                    "start": match.start(),
+                    "end": match.end("title"),
+                }
+            )
+        elif match.group("link") is not None:
+            if match.start() >= links_end:
+                wikilinks.add(match.group("link"))
+                links_end = match.end("link") + 2
+        else:
+            tags.add(match.group("tag"))
+
+    return MarkdownScan(
+        headings=headings,
+        tags=sorted(tags),
+        wikilinks=sorted(wikilinks),
+        word_count=len(text.split()),
+    )
@@ -0,0 +1,90 @@
+from collections import deque
+from concurrent.futures import Executor, Future
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def batched(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    """
+    Split an iterable into lists of at most `batch_size` items.
+
+    Eg: batched([1, 2, 3, 4, 5], 2) -> [1, 2], [3, 4], [5]
+
+    Args:
+        items (Iterable[T]): The items to batch.
+        batch_size (int): The maximum number of items per batch.
+
+    Returns:
+        Iterator[List[T]]: The batches, in the original order.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    iterator = iter(items)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def ordered_parallel_map(
+    fn: Callable[[T], R],
+    tasks: Iterable[T],
+    workers: int,
+    initializer: Callable[..., None] | None = None,
+    initargs: Tuple[Any, ...] = (),
+    max_pending: int | None = None,
+) -> Iterator[R]:
+    """
+    Apply `fn` to every task in a pool of worker processes and yield the results in the
+    same order as the tasks, ie, the output is deterministic regardless of which worker
+    finishes first.
+
+    At most `max_pending` tasks are in flight at any time, so that the tasks (and their
+    results) are never all held in memory at once.
+
+    Args:
+        fn (Callable[[T], R]): Module level (ie, picklable) function to run on each task.
+        tasks (Iterable[T]): The tasks to process. Consumed lazily.
+        workers (int): Number of worker processes.
+        initializer (Callable[..., None] | None): Called once in every worker on start up.
+        initargs (Tuple[Any, ...]): Arguments passed to `initializer`.
+        max_pending (int | None): Maximum number of tasks in flight. Default is `2 * workers`.
+
+    Returns:
+        Iterator[R]: The results of `fn`, in task order.
+    """
+    # imported on first use, it pulls in multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=initializer, initargs=initargs
+    ) as executor:
+        yield from ordered_map(executor, fn, tasks, max_pending or 2 * workers)
+
+
+def ordered_map(
+    executor: Executor, fn: Callable[[T], R], tasks: Iterable[T], max_pending: int
+) -> Iterator[R]:
+    """
+    Apply `fn` to every task in an existing pool and yield the results in the same order
+    as the tasks, see `ordered_parallel_map`. The pool is not shut down, so it can be
+    reused, eg, by workers which load a model once.
+
+    Args:
+        executor (Executor): The pool the tasks are submitted to.
+        fn (Callable[[T], R]): Module level (ie, picklable) function to run on each task.
+        tasks (Iterable[T]): The tasks to process. Consumed lazily.
+        max_pending (int): Maximum number of tasks in flight.
+
+    Returns:
+        Iterator[R]: The results of `fn`, in task order.
+    """
+    pending: Deque[Future] = deque()
+    for task in tasks:
+        pending.append(executor.submit(fn, task))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
@@ -1,15 +1,23 @@
+import threading
+
+
 class SingletonMeta(type):
     """
     A metaclass for creating singleton classes.
 
     It ensures that only one instance of a class is created,
-    regardless of how many times the class is instantiated.
+    regardless of how many times the class is instantiated,
+    even by several threads at once.
     """
 
     _instances: dict[type, object] = {}
+    # reentrant, as the constructor of a singleton may create another singleton
+    _lock = threading.RLock()
 
     def __call__(cls, *args, **kwargs):
         if cls not in cls._instances:
-            instance = super().__call__(*args, **kwargs)
-            cls._instances[cls] = instance
+            with SingletonMeta._lock:
+                if cls not in cls._instances:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
         return cls._instances[cls]
@@ -0,0 +1,88 @@
+"""
+Benchmark of the CPU encoding worker pool of `SentenceTransformerEncoder`.
+
+Builds a throwaway synthetic vault, ingests and chunks it once (not timed) and encodes the
+chunk texts on the CPU with every number of worker processes. The CPU threads are split
+evenly between the workers unless `--threads-per-worker` is given, so the speedup shows
+how much more a few single model copies get out of the cores than one model spreading its
+operators over all of them.
+
+Usage:
+    python -m benchmarks.bench_encoder_workers --notes 500 --workers 1 2 4
+"""
+
+import argparse
+import dataclasses
+import time
+from pathlib import Path
+from typing import List
+
+from atlas.core.embedder.config import load_encoder_config
+from atlas.core.embedder.sentence_transformer.impl_encoder import (
+    SentenceTransformerEncoder,
+)
+from benchmarks.bench_token_batching import DEFAULT_CONFIG_PATH, chunk_texts
+
+
+def run(
+    num_notes: int,
+    max_words: int,
+    config_path: str,
+    workers_list: List[int],
+    threads_per_worker: int | None,
+) -> None:
+    """
+    Run the benchmark and print the throughput of every number of workers.
+
+    Args:
+        num_notes (int): Number of notes in the benchmark vault.
+        max_words (int): Maximum number of words per chunk.
+        config_path (str): Path to the encoder configuration file.
+        workers_list (List[int]): Numbers of worker processes to benchmark.
+        threads_per_worker (int | None): Number of torch threads of every worker, the CPU
+                                         count / number of workers if None.
+    """
+    texts = chunk_texts(num_notes, max_words)
+    config = dataclasses.replace(
+        load_encoder_config(Path(config_path)),
+        device="cpu",
+        threads_per_worker=threads_per_worker,
+    )
+
+    print(f"{len(texts)} chunks")
+    print(f"{'workers':>8} {'seconds':>10} {'texts/sec':>10} {'speedup':>8}")
+    baseline = None
+    for num_workers in workers_list:
+        encoder = SentenceTransformerEncoder(
+            dataclasses.replace(config, num_workers=num_workers)
+        )
+        try:
+            # warm up, also waits for the workers to load the model
+            encoder.encode(texts[: config.batch_size * num_workers])
+            start = time.perf_counter()
+            encoder.encode(texts)
+            elapsed = time.perf_counter() - start
+        finally:
+            encoder.close()
+        baseline = baseline or elapsed
+        print(
+            f"{num_workers:>8} {elapsed:>10.3f} {len(texts) / elapsed:>10.1f} "
+            f"{baseline / elapsed:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--max-words", type=int, default=250)
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads-per-worker", type=int, default=None)
+    args = parser.parse_args()
+    run(
+        args.notes,
+        args.max_words,
+        args.config,
+        args.workers,
+        args.threads_per_worker,
+    )
@@ -0,0 +1,108 @@
+"""
+Import time regression benchmark.
+
+Imports every module in a fresh interpreter (`python -X importtime`) several times and
+reports the best cumulative import time of the module itself, ie, without the interpreter
+start up. The ingester, the chunker and the encoder configuration must import within the
+budget, and no module may import a heavy dependency (PyTorch, Sentence Transformers,
+FAISS, ...), which are only imported on first use. Exits with status 1 on a regression.
+
+Usage:
+    python -m benchmarks.bench_import_time --runs 5 --budget-ms 100
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import List, Tuple
+
+# modules which must import within the budget
+FAST_MODULES = [
+    "atlas.core.ingester.obsidian_vault_processor",
+    "atlas.core.chunker.structural_chunker",
+    "atlas.core.embedder.config",
+]
+# modules which may import numpy but no heavy dependency
+LIGHT_MODULES = [
+    "atlas.utils.embedder_utils",
+    "atlas.core.retriever.context",
+    "atlas.core.indexer.run_indexer",
+    "atlas.core.watcher.vault_watcher",
+]
+HEAVY_MODULES = [
+    "torch",
+    "sentence_transformers",
+    "transformers",
+    "faiss",
+    "onnxruntime",
+]
+
+
+def measure_import(module: str) -> Tuple[float, List[str]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Args:
+        module (str): Name of the module.
+
+    Returns:
+        Tuple[float, List[str]]: The cumulative import time of the module in milliseconds
+                                 and the heavy modules it imported.
+    """
+    code = (
+        f"import sys, json, {module}; "
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines are "import time: self [us] | cumulative | imported package"
+    cumulative_us = next(
+        int(line.split("|")[1])
+        for line in reversed(result.stderr.splitlines())
+        if line.startswith("import time:") and line.split("|")[2].strip() == module
+    )
+    return cumulative_us / 1000, json.loads(result.stdout.splitlines()[-1])
+
+
+def run(runs: int, budget_ms: float) -> bool:
+    """
+    Run the benchmark and print the import time of every module.
+
+    Args:
+        runs (int): Number of imports of every module, the best time is kept.
+        budget_ms (float): Maximum import time of the fast modules in milliseconds.
+
+    Returns:
+        bool: True if every module is within its budget and imports no heavy module.
+    """
+    passed = True
+    print(
+        f"{'module':>46} {'best ms':>8} {'median ms':>10} {'status':>7}  heavy imports"
+    )
+    for module in FAST_MODULES + LIGHT_MODULES:
+        times = []
+        heavy: List[str] = []
+        for _ in range(runs):
+            elapsed_ms, heavy = measure_import(module)
+            times.append(elapsed_ms)
+        ok = not heavy and (module not in FAST_MODULES or min(times) < budget_ms)
+        passed = passed and ok
+        print(
+            f"{module:>46} {min(times):>8.1f} {statistics.median(times):>10.1f} "
+            f"{'ok' if ok else 'FAILED':>7}  {', '.join(heavy) or '-'}"
+        )
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    args = parser.parse_args()
+    sys.exit(0 if run(args.runs, args.budget_ms) else 1)
@@ -0,0 +1,200 @@
+"""
+Throughput benchmark of the ingestion (`ObsidianVaultProcessor.ingest()`) and chunking
+(`StructuralChunker.chunk()`) stages on synthetic vaults.
+
+For every vault size, a deterministic synthetic vault is generated (not timed) and each
+stage is run in a fresh subprocess, so that the peak RSS of one stage (or of the vault
+generation) does not leak into the numbers of another. Reported per stage:
+- notes/sec
+- MB/sec of stage input (the vault notes for ingestion, the processed data for chunking)
+- peak RSS of the process running the stage
+
+Usage:
+    python -m benchmarks.bench_ingest --notes 1000 10000 100000 --json results.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.synthetic_vault import VaultSpec, generate_vault
+
+STAGES = ("ingest", "chunk")
+
+
+def peak_rss_mb() -> float | None:
+    """
+    Get the peak resident set size of the current process.
+
+    Returns:
+        float | None: The peak RSS in MB or None if it cannot be measured on this platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None  # type: ignore[assignment]
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return max_rss / 1024**2 if sys.platform == "darwin" else max_rss / 1024
+
+    try:
+        import psutil  # type: ignore[import-untyped]
+    except ImportError:
+        return None
+    memory_info = psutil.Process().memory_info()
+    return getattr(memory_info, "peak_wset", memory_info.rss) / 1024**2
+
+
+def run_stage(
+    stage: str, vault_path: Path, work_dir: Path, suffix: str, workers: int
+) -> Dict:
+    """
+    Run one stage of the pipeline in the current process and measure it.
+
+    Args:
+        stage (str): "ingest" or "chunk".
+        vault_path (Path): The path to the synthetic vault.
+        work_dir (Path): Directory of the pipeline files.
+        suffix (str): Extension of the pipeline files, ".json" or ".jsonl".
+        workers (int): Number of worker processes used to parse notes.
+
+    Returns:
+        Dict: The number of notes, input bytes, elapsed seconds and peak RSS of the stage.
+    """
+    from atlas.core.chunker.structural_chunker import StructuralChunker
+    from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+
+    processed_data_path = work_dir / f"obsidian_index{suffix}"
+    chunked_data_path = work_dir / f"chunked_data{suffix}"
+
+    if stage == "ingest":
+        input_bytes = sum(path.stat().st_size for path in vault_path.rglob("*.md"))
+        processor = ObsidianVaultProcessor(
+            str(vault_path),
+            str(processed_data_path),
+            workers=workers,
+            cache_frontmatter=False,  # measure cold parsing
+        )
+        start = time.perf_counter()
+        processor.ingest()
+        elapsed = time.perf_counter() - start
+    else:
+        input_bytes = processed_data_path.stat().st_size
+        chunker = StructuralChunker(
+            str(processed_data_path), str(chunked_data_path), max_words=250
+        )
+        start = time.perf_counter()
+        chunker.chunk()
+        elapsed = time.perf_counter() - start
+
+    return {
+        "stage": stage,
+        "input_bytes": input_bytes,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run(
+    notes_list: List[int], seed: int, suffix: str, workers: int, keep: Path | None
+) -> List[Dict]:
+    """
+    Run the benchmark and print the results.
+
+    Args:
+        notes_list (List[int]): Vault sizes to benchmark.
+        seed (int): Seed of the synthetic vaults.
+        suffix (str): Extension of the pipeline files, ".json" or ".jsonl".
+        workers (int): Number of worker processes used to parse notes.
+        keep (Path | None): Directory to generate the vaults in and keep them (eg, to
+                            re-run the benchmark without generating them again).
+
+    Returns:
+        List[Dict]: The results, one per vault size and stage.
+    """
+    results = []
+    print(
+        f"{'notes':>8} {'stage':>7} {'seconds':>9} {'notes/sec':>11} "
+        f"{'MB/sec':>8} {'peak RSS MB':>12}"
+    )
+    for num_notes in notes_list:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = keep if keep is not None else Path(tmp_dir)
+            vault_path = root / f"vault_{num_notes}_{seed}"
+            if not (vault_path / ".obsidian").exists():
+                generate_vault(vault_path, VaultSpec(num_notes=num_notes, seed=seed))
+            work_dir = Path(tmp_dir)
+
+            for stage in STAGES:
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        "-m",
+                        "benchmarks.bench_ingest",
+                        "--stage",
+                        stage,
+                        "--vault",
+                        str(vault_path),
+                        "--work-dir",
+                        str(work_dir),
+                        "--suffix",
+                        suffix,
+                        "--workers",
+                        str(workers),
+                    ],
+                    check=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,  # pipeline logs
+                    text=True,
+                ).stdout
+                result = {"notes": num_notes, **json.loads(output.splitlines()[-1])}
+                results.append(result)
+
+                peak_rss = result["peak_rss_mb"]
+                print(
+                    f"{num_notes:>8} {stage:>7} {result['seconds']:>9.3f} "
+                    f"{num_notes / result['seconds']:>11.1f} "
+                    f"{result['input_bytes'] / 1024**2 / result['seconds']:>8.2f} "
+                    f"{'n/a' if peak_rss is None else f'{peak_rss:.1f}':>12}"
+                )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--notes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--suffix", choices=[".json", ".jsonl"], default=".jsonl")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--keep-vaults", type=Path, default=None, help="directory to keep the vaults in"
+    )
+    parser.add_argument("--json", type=Path, default=None, help="file to save results")
+    # used internally to run a single stage in a subprocess
+    parser.add_argument("--stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--vault", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument("--work-dir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage is not None:
+        print(
+            json.dumps(
+                run_stage(
+                    args.stage, args.vault, args.work_dir, args.suffix, args.workers
+                )
+            )
+        )
+    else:
+        results = run(
+            args.notes, args.seed, args.suffix, args.workers, args.keep_vaults
+        )
+        if args.json is not None:
+            args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
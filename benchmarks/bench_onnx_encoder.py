@@ -0,0 +1,97 @@
+"""
+Benchmark of the ONNX Runtime encoder against the PyTorch `SentenceTransformerEncoder`.
+
+Builds a throwaway synthetic vault, ingests and chunks it once (not timed) and encodes the
+chunk texts on the CPU with PyTorch, with the ONNX export of the model and with its int8
+quantized export. Besides the throughput, the parity check reports the cosine similarity
+of every ONNX embedding with the PyTorch embedding of the same text.
+
+Usage:
+    python -m benchmarks.bench_onnx_encoder --notes 500 --onnx-dir /tmp/atlas_onnx
+"""
+
+import argparse
+import dataclasses
+import time
+from pathlib import Path
+
+import numpy as np
+
+from atlas.core.embedder.config import load_encoder_config
+from atlas.core.embedder.encoder_factory import create_encoder
+from benchmarks.bench_token_batching import DEFAULT_CONFIG_PATH, chunk_texts
+
+
+def run(
+    num_notes: int,
+    max_words: int,
+    config_path: str,
+    onnx_dir: str | None,
+    min_cosine: float,
+) -> None:
+    """
+    Run the benchmark and print the throughput and parity of every backend.
+
+    Args:
+        num_notes (int): Number of notes in the benchmark vault.
+        max_words (int): Maximum number of words per chunk.
+        config_path (str): Path to the encoder configuration file.
+        onnx_dir (str | None): Directory of the ONNX export, the default one if None.
+        min_cosine (float): Minimum cosine similarity with the PyTorch embeddings for a
+                            backend to pass the parity check.
+    """
+    texts = chunk_texts(num_notes, max_words)
+    config = dataclasses.replace(
+        load_encoder_config(Path(config_path)), device="cpu", num_workers=1
+    )
+    backends = [
+        ("pytorch", config),
+        ("onnx", dataclasses.replace(config, backend="onnx", onnx_dir=onnx_dir)),
+        (
+            "onnx int8",
+            dataclasses.replace(
+                config, backend="onnx", onnx_dir=onnx_dir, quantize=True
+            ),
+        ),
+    ]
+
+    print(f"{len(texts)} chunks")
+    print(
+        f"{'backend':>10} {'seconds':>10} {'texts/sec':>10} {'speedup':>8} "
+        f"{'min cos':>8} {'mean cos':>8} {'parity':>7}"
+    )
+    reference: np.ndarray | None = None
+    baseline = 0.0
+    for name, backend_config in backends:
+        # exports the model on the first run
+        encoder = create_encoder(backend_config)
+        # warm up
+        encoder.encode(texts[: config.batch_size])
+        start = time.perf_counter()
+        embeddings = encoder.encode(texts)
+        elapsed = time.perf_counter() - start
+
+        # the first backend, PyTorch, is the reference of the others
+        if reference is None:
+            reference = embeddings
+            baseline = elapsed
+        cosines = np.sum(embeddings * reference, axis=1) / (
+            np.linalg.norm(embeddings, axis=1) * np.linalg.norm(reference, axis=1)
+        )
+        parity = "ok" if cosines.min() >= min_cosine else "FAILED"
+        print(
+            f"{name:>10} {elapsed:>10.3f} {len(texts) / elapsed:>10.1f} "
+            f"{baseline / elapsed:>7.2f}x {cosines.min():>8.4f} {cosines.mean():>8.4f} "
+            f"{parity:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--max-words", type=int, default=250)
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--onnx-dir", default=None)
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+    run(args.notes, args.max_words, args.config, args.onnx_dir, args.min_cosine)
@@ -0,0 +1,88 @@
+"""
+Benchmark of the parallel chunking mode of `StructuralChunker`.
+
+Builds a throwaway synthetic vault, ingests it once (not timed) and measures how chunking
+throughput scales with the number of worker processes, against the serial path. The
+throughput of every worker is reported as well, an unbalanced pool shows up as workers
+with far fewer notes.
+
+Usage:
+    python -m benchmarks.bench_parallel_chunking --notes 20000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from atlas.core.chunker.structural_chunker import StructuralChunker
+from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+from benchmarks.synthetic_vault import VaultSpec, generate_vault
+
+
+def run(
+    num_notes: int, workers_list: list[int], batch_size: int, max_words: int
+) -> None:
+    """
+    Run the benchmark and print throughput per worker count.
+
+    Args:
+        num_notes (int): Number of notes in the benchmark vault.
+        workers_list (list[int]): Worker counts to benchmark, 1 is the serial path.
+        batch_size (int): Number of notes sent to a worker at a time.
+        max_words (int): Maximum number of words per chunk.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vault_path = generate_vault(
+            Path(tmp_dir) / "bench_vault", VaultSpec(num_notes=num_notes)
+        )
+        processed_data_path = Path(tmp_dir) / "obsidian_index.jsonl"
+        ObsidianVaultProcessor(
+            str(vault_path), str(processed_data_path), cache_frontmatter=False
+        ).ingest()
+
+        baseline = None
+        print(
+            f"{'workers':>8} {'seconds':>10} {'notes/sec':>12} {'chunks':>10} "
+            f"{'speedup':>8}"
+        )
+        for workers in workers_list:
+            output_path = Path(tmp_dir) / f"chunked_data_{workers}.jsonl"
+            chunker = StructuralChunker(
+                str(processed_data_path),
+                str(output_path),
+                max_words,
+                workers=workers,
+                batch_size=batch_size,
+            )
+            start = time.perf_counter()
+            chunker.chunk()
+            elapsed = time.perf_counter() - start
+            with output_path.open("r", encoding="utf-8") as f:
+                num_chunks = sum(1 for _ in f)
+            baseline = baseline or elapsed
+            print(
+                f"{workers:>8} {elapsed:>10.3f} {num_notes / elapsed:>12.1f} "
+                f"{num_chunks:>10} {baseline / elapsed:>7.2f}x"
+            )
+            for pid, stats in sorted(chunker.worker_stats.items()):
+                print(
+                    f"{'':>8} worker {pid}: {stats.notes} notes in {stats.seconds:.3f}s "
+                    f"({stats.notes_per_second:.1f} notes/sec)"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=20000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--max-words", type=int, default=250)
+    args = parser.parse_args()
+    run(args.notes, args.workers, args.batch_size, args.max_words)
@@ -0,0 +1,68 @@
+"""
+Benchmark of the parallel note parsing mode of `ObsidianVaultProcessor`.
+
+Builds a throwaway synthetic vault and measures how parsing throughput scales with the number of
+worker processes.
+
+Usage:
+    python -m benchmarks.bench_parallel_ingest --notes 5000 --workers 1 2 4 8
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+from benchmarks.synthetic_vault import VaultSpec, generate_vault
+
+
+def run(num_notes: int, workers_list: list[int], batch_size: int) -> None:
+    """
+    Run the benchmark and print throughput per worker count.
+
+    Args:
+        num_notes (int): Number of notes in the benchmark vault.
+        workers_list (list[int]): Worker counts to benchmark.
+        batch_size (int): Number of notes sent to a worker at a time.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vault_path = generate_vault(
+            Path(tmp_dir) / "bench_vault", VaultSpec(num_notes=num_notes)
+        )
+        output_path = Path(tmp_dir) / "obsidian_index.json"
+
+        baseline = None
+        print(f"{'workers':>8} {'seconds':>10} {'notes/sec':>12} {'speedup':>8}")
+        for workers in workers_list:
+            processor = ObsidianVaultProcessor(
+                str(vault_path),
+                str(output_path),
+                workers=workers,
+                batch_size=batch_size,
+                cache_frontmatter=False,
+            )
+            start = time.perf_counter()
+            notes = processor.process()
+            elapsed = time.perf_counter() - start
+            assert len(notes) == num_notes
+            baseline = baseline or elapsed
+            print(
+                f"{workers:>8} {elapsed:>10.3f} {num_notes / elapsed:>12.1f} "
+                f"{baseline / elapsed:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+    run(args.notes, args.workers, args.batch_size)
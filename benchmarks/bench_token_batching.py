@@ -0,0 +1,125 @@
+"""
+Benchmark of token budget batching in `SentenceTransformerEncoder`.
+
+Builds a throwaway synthetic vault, ingests and chunks it once (not timed) and encodes the
+chunk texts with fixed size batches (`batch_size` texts per batch) and with token budget
+batches (`max_batch_tokens` padded tokens per batch). The padded token counts show how much
+of the work is padding.
+
+Usage:
+    python -m benchmarks.bench_token_batching --notes 500 --max-batch-tokens 4096 8192
+"""
+
+import argparse
+import dataclasses
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from atlas.core.chunker.structural_chunker import StructuralChunker
+from atlas.core.embedder.batching import padded_tokens, token_budget_batches
+from atlas.core.embedder.config import load_encoder_config
+from atlas.core.embedder.sentence_transformer.impl_encoder import (
+    SentenceTransformerEncoder,
+)
+from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+from atlas.utils.io_utils import iter_records
+from benchmarks.synthetic_vault import VaultSpec, generate_vault
+
+DEFAULT_CONFIG_PATH = os.path.join(
+    "atlas", "core", "configs", "sentence_transformer_config.yaml"
+)
+
+
+def chunk_texts(num_notes: int, max_words: int) -> List[str]:
+    """
+    Get the chunk texts of a synthetic vault, in chunk file order.
+
+    Args:
+        num_notes (int): Number of notes in the vault.
+        max_words (int): Maximum number of words per chunk.
+
+    Returns:
+        List[str]: The chunk texts.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        vault_path = generate_vault(
+            Path(tmp_dir) / "bench_vault", VaultSpec(num_notes=num_notes)
+        )
+        processed_data_path = Path(tmp_dir) / "obsidian_index.jsonl"
+        ObsidianVaultProcessor(
+            str(vault_path), str(processed_data_path), cache_frontmatter=False
+        ).ingest()
+        chunk_data_path = Path(tmp_dir) / "chunked_data.jsonl"
+        StructuralChunker(
+            str(processed_data_path), str(chunk_data_path), max_words
+        ).chunk()
+        return [chunk["text"] for chunk in iter_records(chunk_data_path)]
+
+
+def run(
+    num_notes: int,
+    max_words: int,
+    config_path: str,
+    max_batch_tokens_list: List[int],
+) -> None:
+    """
+    Run the benchmark and print the throughput of every batching mode.
+
+    Args:
+        num_notes (int): Number of notes in the benchmark vault.
+        max_words (int): Maximum number of words per chunk.
+        config_path (str): Path to the encoder configuration file.
+        max_batch_tokens_list (List[int]): Token budgets to benchmark.
+    """
+    texts = chunk_texts(num_notes, max_words)
+    config = dataclasses.replace(
+        load_encoder_config(Path(config_path)), max_batch_tokens=None
+    )
+    encoder = SentenceTransformerEncoder(config)
+    lengths = encoder.token_lengths(texts)
+    # warm up
+    encoder.encode(texts[: config.batch_size])
+
+    print(f"{len(texts)} chunks, {sum(lengths)} tokens")
+    print(f"{'batching':>24} {'seconds':>10} {'texts/sec':>10} {'padded tokens':>14}")
+    fixed_batches = [
+        list(range(start, min(start + config.batch_size, len(texts))))
+        for start in range(0, len(texts), config.batch_size)
+    ]
+    modes = [(f"batch_size={config.batch_size}", None, fixed_batches)] + [
+        (
+            f"max_batch_tokens={max_batch_tokens}",
+            max_batch_tokens,
+            token_budget_batches(lengths, max_batch_tokens),
+        )
+        for max_batch_tokens in max_batch_tokens_list
+    ]
+    for name, max_batch_tokens, batches in modes:
+        encoder.config = dataclasses.replace(config, max_batch_tokens=max_batch_tokens)
+        start = time.perf_counter()
+        encoder.encode(texts)
+        elapsed = time.perf_counter() - start
+        # fixed size batches are padded as sentence transformers sorts them by length
+        num_padded = padded_tokens(
+            sorted(lengths, reverse=True) if max_batch_tokens is None else lengths,
+            batches,
+        )
+        print(
+            f"{name:>24} {elapsed:>10.3f} {len(texts) / elapsed:>10.1f} "
+            f"{num_padded:>14}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--max-words", type=int, default=250)
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument(
+        "--max-batch-tokens", type=int, nargs="+", default=[2048, 4096, 8192]
+    )
+    args = parser.parse_args()
+    run(args.notes, args.max_words, args.config, args.max_batch_tokens)
@@ -0,0 +1,211 @@
+"""
+Deterministic generator of synthetic Obsidian vaults, used by the benchmarks.
+
+The same `VaultSpec` always produces byte for byte the same vault. Every note is generated
+from its own random generator seeded with `(seed, note index)`, so the first `n` notes of
+a large vault are the same as the notes of a vault with `n` notes.
+
+Usage:
+    python -m benchmarks.synthetic_vault <output dir> --notes 10000 --seed 0
+"""
+
+import argparse
+import math
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+# vocabulary the note bodies are drawn from
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua enim ad minim veniam quis nostrud "
+    "exercitation ullamco laboris nisi aliquip ex ea commodo consequat duis aute irure "
+    "in reprehenderit voluptate velit esse cillum fugiat nulla pariatur excepteur sint "
+    "occaecat cupidatat non proident sunt culpa qui officia deserunt mollit anim id est "
+    "laborum retrieval embedding chunk vector index query context note vault graph"
+).split()
+
+
+@dataclass
+class VaultSpec:
+    """
+    Shape of a synthetic vault.
+
+    Args:
+        num_notes (int): Number of notes. Default is 1000.
+        seed (int): Seed of the random generators. Default is 0.
+        mean_words (int): Mean number of words in a note body. Default is 400.
+        size_sigma (float): Spread of the (log-normal) note size distribution. 0 gives
+                            notes of exactly `mean_words` words. Default is 1.0.
+        max_heading_depth (int): Deepest heading level used (1 - 6). Default is 3.
+        words_per_section (int): Mean number of words between two headings. Default is 120.
+        tag_density (float): Fraction of body words which are tags. Default is 0.02.
+        num_tags (int): Number of distinct tags in the vault. Default is 200.
+        wikilink_density (float): Fraction of body words which are wikilinks. Default is 0.01.
+        frontmatter_keys (int): Number of frontmatter properties per note, 0 for no
+                                frontmatter. Default is 6.
+        num_folders (int): Number of folders the notes are spread over. Default is 50.
+        folder_depth (int): Nesting depth of the folders. Default is 2.
+    """
+
+    num_notes: int = 1000
+    seed: int = 0
+    mean_words: int = 400
+    size_sigma: float = 1.0
+    max_heading_depth: int = 3
+    words_per_section: int = 120
+    tag_density: float = 0.02
+    num_tags: int = 200
+    wikilink_density: float = 0.01
+    frontmatter_keys: int = 6
+    num_folders: int = 50
+    folder_depth: int = 2
+
+
+def note_relative_path(spec: VaultSpec, idx: int) -> str:
+    """
+    Get the path of a note relative to the vault root.
+
+    Args:
+        spec (VaultSpec): Shape of the vault.
+        idx (int): Index of the note.
+
+    Returns:
+        str: Posix style relative path of the note.
+    """
+    folder_idx = idx % max(spec.num_folders, 1)
+    parts = [f"area {folder_idx % 10}"] if spec.folder_depth > 0 else []
+    for depth in range(1, spec.folder_depth):
+        parts.append(f"topic {folder_idx} {depth}")
+    return "/".join([*parts, f"Note {idx}.md"])
+
+
+def _frontmatter(rng: random.Random, spec: VaultSpec, idx: int) -> List[str]:
+    """
+    Generate the frontmatter lines of a note.
+
+    Args:
+        rng (random.Random): Random generator of the note.
+        spec (VaultSpec): Shape of the vault.
+        idx (int): Index of the note.
+
+    Returns:
+        List[str]: The frontmatter lines, including the `---` delimiters.
+    """
+    if spec.frontmatter_keys <= 0:
+        return []
+    properties = [
+        f"title: Note {idx}",
+        f"created: 2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        f"tags: [{', '.join(f'tag{rng.randrange(spec.num_tags)}' for _ in range(3))}]",
+        f"aliases: [N{idx}]",
+        f"status: {rng.choice(['draft', 'review', 'done'])}",
+        f"rating: {rng.randint(1, 5)}",
+    ]
+    for key in range(len(properties), spec.frontmatter_keys):
+        properties.append(f"prop_{key}: {' '.join(rng.choices(_WORDS, k=4))}")
+    return ["---", *properties[: spec.frontmatter_keys], "---"]
+
+
+def generate_note(spec: VaultSpec, idx: int) -> str:
+    """
+    Generate the content of a note.
+
+    Args:
+        spec (VaultSpec): Shape of the vault.
+        idx (int): Index of the note.
+
+    Returns:
+        str: The Markdown content of the note.
+    """
+    rng = random.Random(f"{spec.seed}-{idx}")
+    if spec.size_sigma > 0:
+        mu = math.log(spec.mean_words) - spec.size_sigma**2 / 2
+        num_words = max(1, int(rng.lognormvariate(mu, spec.size_sigma)))
+    else:
+        num_words = spec.mean_words
+
+    lines = _frontmatter(rng, spec, idx)
+    level = 1
+    words: List[str] = []
+    section_words = 0
+    for _ in range(num_words):
+        if section_words == 0 and spec.max_heading_depth > 0:
+            if words:
+                lines.append(" ".join(words))
+                words = []
+            level = max(1, min(spec.max_heading_depth, level + rng.choice([-1, 0, 1])))
+            lines.extend(["", f"{'#' * level} {' '.join(rng.choices(_WORDS, k=3))}"])
+            section_words = max(1, int(rng.expovariate(1 / spec.words_per_section)))
+
+        draw = rng.random()
+        if draw < spec.tag_density:
+            words.append(f"#tag{rng.randrange(spec.num_tags)}")
+        elif draw < spec.tag_density + spec.wikilink_density:
+            words.append(f"[[Note {rng.randrange(spec.num_notes)}]]")
+        else:
+            words.append(rng.choice(_WORDS))
+        section_words -= 1
+        # break paragraphs into lines of a realistic length
+        if len(words) == 16:
+            lines.append(" ".join(words))
+            words = []
+    if words:
+        lines.append(" ".join(words))
+    return "\n".join(lines) + "\n"
+
+
+def generate_vault(root: Path, spec: VaultSpec) -> Path:
+    """
+    Generate a synthetic Obsidian vault.
+
+    Args:
+        root (Path): Directory to create the vault in. Created if it does not exist.
+        spec (VaultSpec): Shape of the vault.
+
+    Returns:
+        Path: The path to the vault root (`root` itself).
+    """
+    vault_path = Path(root)
+    (vault_path / ".obsidian").mkdir(parents=True, exist_ok=True)
+    (vault_path / ".obsidian" / "app.json").write_text("{}", encoding="utf-8")
+    for idx in range(spec.num_notes):
+        note_path = vault_path / note_relative_path(spec, idx)
+        note_path.parent.mkdir(parents=True, exist_ok=True)
+        # always `\n` line endings, the same on every platform
+        note_path.write_text(generate_note(spec, idx), encoding="utf-8", newline="\n")
+    return vault_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--notes", type=int, default=VaultSpec.num_notes)
+    parser.add_argument("--seed", type=int, default=VaultSpec.seed)
+    parser.add_argument("--mean-words", type=int, default=VaultSpec.mean_words)
+    parser.add_argument("--size-sigma", type=float, default=VaultSpec.size_sigma)
+    parser.add_argument(
+        "--max-heading-depth", type=int, default=VaultSpec.max_heading_depth
+    )
+    parser.add_argument("--tag-density", type=float, default=VaultSpec.tag_density)
+    parser.add_argument(
+        "--wikilink-density", type=float, default=VaultSpec.wikilink_density
+    )
+    parser.add_argument(
+        "--frontmatter-keys", type=int, default=VaultSpec.frontmatter_keys
+    )
+    args = parser.parse_args()
+    generate_vault(
+        args.output,
+        VaultSpec(
+            num_notes=args.notes,
+            seed=args.seed,
+            mean_words=args.mean_words,
+            size_sigma=args.size_sigma,
+            max_heading_depth=args.max_heading_depth,
+            tag_density=args.tag_density,
+            wikilink_density=args.wikilink_density,
+            frontmatter_keys=args.frontmatter_keys,
+        ),
+    )
@@ -1,4 +1,5 @@
 from pathlib import Path
+import string
 import yaml
 import pytest
 import json
@@ -163,3 +164,88 @@ def dummy_encoder_config_path(tmp_path: Path) -> Path:
         yaml.dump(config_data, f)
 
     return config_path
+
+
+@pytest.fixture
+def character_tokenizer():
+    """
+    Create a Hugging Face fast tokenizer which splits every word into one token per
+    character (WordPiece over single characters) and adds [CLS] and [SEP] tokens, so that
+    token counts are easy to reason about and no model needs to be downloaded.
+
+    Returns:
+        PreTrainedTokenizerFast: The tokenizer.
+    """
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors
+    from transformers import PreTrainedTokenizerFast
+
+    vocab = {"[UNK]": 0, "[CLS]": 1, "[SEP]": 2, "[PAD]": 3}
+    for character in string.ascii_lowercase + string.digits:
+        vocab[character] = len(vocab)
+        vocab[f"##{character}"] = len(vocab)
+    tokenizer = Tokenizer(models.WordPiece(vocab, unk_token="[UNK]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.BertPreTokenizer()
+    tokenizer.post_processor = processors.TemplateProcessing(
+        single="[CLS] $A [SEP]", special_tokens=[("[CLS]", 1), ("[SEP]", 2)]
+    )
+    return PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        unk_token="[UNK]",
+        cls_token="[CLS]",
+        sep_token="[SEP]",
+        pad_token="[PAD]",
+    )
+
+
+@pytest.fixture
+def tiny_encoder_config(tmp_path: Path, character_tokenizer) -> EncoderConfig:
+    """
+    Create the configuration of a tiny randomly initialized Sentence Transformer model
+    (2 layer BERT with the character tokenizer) saved in a temporary directory, so that
+    encoding can be tested without downloading a model.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        character_tokenizer (PreTrainedTokenizerFast): Tokenizer with one token per character.
+
+    Returns:
+        EncoderConfig: The encoder configuration of the tiny model, on the CPU.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    try:
+        from sentence_transformers.sentence_transformer.modules import (
+            Pooling,
+            Transformer,
+        )
+    except ImportError:  # sentence-transformers < 6
+        from sentence_transformers.models import (  # type: ignore[no-redef, import-not-found]
+            Pooling,
+            Transformer,
+        )
+    from transformers import BertConfig, BertModel
+
+    bert_path = tmp_path / "tiny_bert"
+    torch.manual_seed(0)
+    bert_config = BertConfig(
+        vocab_size=len(character_tokenizer),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+        max_position_embeddings=128,
+    )
+    BertModel(bert_config).save_pretrained(bert_path)
+    character_tokenizer.save_pretrained(bert_path)
+
+    transformer = Transformer(str(bert_path), max_seq_length=64)
+    pooling = Pooling(transformer.get_word_embedding_dimension())
+    model_path = tmp_path / "tiny_sentence_transformer"
+    SentenceTransformer(modules=[transformer, pooling]).save(str(model_path))
+    return EncoderConfig(
+        model_name=str(model_path),
+        batch_size=2,
+        normalize_embeddings=True,
+        device="cpu",
+    )
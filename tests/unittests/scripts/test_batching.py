@@ -0,0 +1,51 @@
+import pytest
+import numpy as np
+from typing import List
+
+from atlas.core.embedder.batching import (
+    encode_in_token_batches,
+    padded_tokens,
+    token_budget_batches,
+)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_token_budget_batches() -> None:
+    """
+    Test that texts are batched by decreasing length, each batch within the token budget
+    once padded, except a text longer than the budget which is batched alone.
+    """
+    lengths = [3, 10, 2, 3, 20, 9, 1]
+    batches = token_budget_batches(lengths, max_batch_tokens=20)
+    assert batches == [[4], [1, 5], [0, 3, 2, 6]]
+    assert sorted(idx for batch in batches for idx in batch) == list(range(7))
+    assert padded_tokens(lengths, batches) == 20 + 20 + 12
+
+    # fixed size batches in the original order pad every text to the longest
+    assert padded_tokens(lengths, [[0, 1, 2, 3], [4, 5, 6]]) == 40 + 60
+    assert token_budget_batches([50], max_batch_tokens=20) == [[0]]
+    assert token_budget_batches([], max_batch_tokens=20) == []
+    with pytest.raises(ValueError):
+        token_budget_batches(lengths, max_batch_tokens=0)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_encode_in_token_batches() -> None:
+    """
+    Test that the embeddings of texts encoded in token budget batches come back in the
+    original order of the texts.
+    """
+    texts = ["a b c", "a b c d e f g h i j", "a", "a b", "a b c d e"]
+    lengths = [len(text.split()) for text in texts]
+    batch_sizes: List[int] = []
+
+    def encode_batch(batch: List[str]) -> np.ndarray:
+        batch_sizes.append(len(batch))
+        return np.array([[len(text), 1.0] for text in batch], dtype=np.float32)
+
+    embeddings = encode_in_token_batches(texts, lengths, 10, encode_batch)
+    assert embeddings[:, 0].tolist() == [len(text) for text in texts]
+    assert batch_sizes == [1, 2, 2]
+    assert encode_in_token_batches([], [], 10, encode_batch).shape == (0, 0)
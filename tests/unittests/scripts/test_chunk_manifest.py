@@ -0,0 +1,275 @@
+import pytest
+from pathlib import Path
+from typing import Dict, List
+
+from atlas.core.chunker.chunk_manifest import ChunkManifest, load_chunk_delta
+from atlas.core.chunker.structural_chunker import StructuralChunker
+from atlas.core.embedder.base.base_embedder import BaseEmbedder
+from atlas.core.embedder.embedding_store import load_embeddings
+from atlas.utils.io_utils import iter_records, write_records
+from atlas.utils.markdown_utils import scan_markdown
+
+
+class CountingEmbedder(BaseEmbedder):
+    """Embedder which embeds a chunk as the length of its text, no model needed."""
+
+    def load_encoder(self) -> None:
+        """No encoder to load, only keep track of the encoded chunks."""
+        self.encoded_chunk_ids: List[str] = []
+
+    def embed_chunks(self, chunks: List[Dict]) -> List[Dict]:
+        """
+        Embed the chunks with the length of their text.
+
+        Args:
+            chunks (List[Dict]): List of chunk dictionaries to be embedded.
+
+        Returns:
+            List[Dict]: List of chunk dictionaries with added embeddings.
+        """
+        self.encoded_chunk_ids.extend(chunk["chunk_id"] for chunk in chunks)
+        return [{**chunk, "embedding": [float(len(chunk["text"]))]} for chunk in chunks]
+
+
+def make_note(note_id: str, raw_text: str) -> Dict:
+    """
+    Create a processed note the way the ingester does.
+
+    Args:
+        note_id (str): ID of the note.
+        raw_text (str): The body of the note.
+
+    Returns:
+        Dict: The processed note.
+    """
+    scan = scan_markdown(raw_text)
+    return {
+        "note_id": note_id,
+        "title": Path(note_id).stem,
+        "relative_path": note_id,
+        "raw_text": raw_text,
+        "frontmatter": {},
+        "headings": scan.headings,
+        "tags": scan.tags,
+        "wikilinks": scan.wikilinks,
+        "word_count": scan.word_count,
+    }
+
+
+NOTE_A = "# Intro\none two three four\n# Body\nfive six seven eight\n"
+NOTE_B = "# Alpha\nsome words in alpha here\n# Beta\nsome words in beta here\n"
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_stable_chunk_ids() -> None:
+    """
+    Test that stable chunk IDs depend on the chunk content and not its position, so a new
+    section at the top of a note does not change the IDs of the chunks after it.
+    """
+    chunker = StructuralChunker("dummy_path", "dummy_output", 5, stable_ids=True)
+    chunks = chunker.create_chunks([make_note("a.md", NOTE_A)])
+    updated_chunks = chunker.create_chunks(
+        [make_note("a.md", "# New\nthe new section text here\n" + NOTE_A)]
+    )
+
+    chunk_ids = [chunk["chunk_id"] for chunk in chunks]
+    assert [chunk["chunk_id"] for chunk in updated_chunks][1:] == chunk_ids
+    assert chunk_ids[0].startswith("a.md::intro::")
+    assert chunks[0]["content_hash"].startswith(chunk_ids[0].rpartition("::")[2])
+    assert [chunk["chunk_index"] for chunk in updated_chunks] == [0, 1, 2]
+
+    # identical chunks under the same heading are numbered
+    duplicates = chunker.create_chunks(
+        [make_note("d.md", "# Same\n" + "w " * 10 + "\n")]
+    )
+    assert [chunk["chunk_id"] for chunk in duplicates] == [
+        duplicates[0]["chunk_id"],
+        duplicates[0]["chunk_id"] + "_1",
+    ]
+    assert duplicates[0]["text"] == duplicates[1]["text"]
+
+    # positional IDs remain the default
+    positional_chunker = StructuralChunker("dummy_path", "dummy_output", 5)
+    positional_chunks = positional_chunker.create_chunks([make_note("a.md", NOTE_A)])
+    assert positional_chunks[0]["chunk_id"] == "a.md::intro::chunk_0"
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_chunk_incremental(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that incremental chunking only re-chunks changed notes, carries over the chunks of
+    unchanged notes and records the added, removed and unchanged chunk IDs.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to spy on the chunked notes.
+    """
+    processed_data_path = tmp_path / "obsidian_index.jsonl"
+    output_path = tmp_path / "chunked_data.jsonl"
+    write_records(
+        processed_data_path, [make_note("a.md", NOTE_A), make_note("b.md", NOTE_B)]
+    )
+
+    def make_chunker() -> StructuralChunker:
+        chunker = StructuralChunker(
+            str(processed_data_path), str(output_path), 5, incremental=True
+        )
+        chunk_note = chunker._chunk_note
+
+        def spy_chunk_note(note):
+            chunked_note_ids.append(note["note_id"])
+            return chunk_note(note)
+
+        monkeypatch.setattr(chunker, "_chunk_note", spy_chunk_note)
+        return chunker
+
+    chunked_note_ids: List[str] = []
+    chunker = make_chunker()
+    chunker.chunk()
+    first_chunks = list(iter_records(output_path))
+    assert chunked_note_ids == ["a.md", "b.md"]
+    assert chunker.delta is not None
+    assert chunker.delta.added == [chunk["chunk_id"] for chunk in first_chunks]
+    assert chunker.delta.removed == chunker.delta.unchanged == []
+
+    # a.md gets a new section at the top, b.md is deleted and c.md is added
+    write_records(
+        processed_data_path,
+        [
+            make_note("a.md", "# New\nthe new section text here\n" + NOTE_A),
+            make_note("c.md", NOTE_B),
+        ],
+    )
+    chunked_note_ids.clear()
+    chunker = make_chunker()
+    chunker.chunk()
+    chunks = list(iter_records(output_path))
+    assert chunked_note_ids == ["a.md", "c.md"]
+
+    chunk_ids = [chunk["chunk_id"] for chunk in chunks]
+    first_ids: Dict[str, List[str]] = {chunk["note_id"]: [] for chunk in first_chunks}
+    for chunk in first_chunks:
+        first_ids[chunk["note_id"]].append(chunk["chunk_id"])
+    delta = load_chunk_delta(tmp_path / "chunked_data.chunk_manifest.json")
+    assert delta == chunker.delta
+    assert delta.unchanged == first_ids["a.md"]
+    assert delta.added == [chunk_ids[0]] + chunk_ids[3:]
+    assert delta.removed == first_ids["b.md"]
+
+    # nothing changed, every chunk is carried over
+    chunked_note_ids.clear()
+    chunker = make_chunker()
+    chunker.chunk()
+    assert chunked_note_ids == []
+    assert list(iter_records(output_path)) == chunks
+    assert chunker.delta is not None
+    assert not chunker.delta.has_changes()
+    assert chunker.delta.unchanged == chunk_ids
+
+    # the same chunks as chunking from scratch
+    full_chunker = StructuralChunker(
+        str(processed_data_path), str(tmp_path / "full.jsonl"), 5, stable_ids=True
+    )
+    full_chunker.chunk()
+    assert list(iter_records(tmp_path / "full.jsonl")) == chunks
+
+    # a new chunking configuration re-chunks every note
+    chunked_note_ids.clear()
+    manifest = ChunkManifest(tmp_path / "chunked_data.chunk_manifest.json")
+    manifest.load()
+    assert manifest.config["max_words"] == 5
+    chunker = make_chunker()
+    chunker.max_words = 100
+    chunker.chunk()
+    assert chunked_note_ids == ["a.md", "c.md"]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_embed_incremental(tmp_path: Path) -> None:
+    """
+    Test that the embedder only encodes the chunks which are not unchanged according to the
+    chunk delta and reuses the previous embeddings of the others.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    processed_data_path = tmp_path / "obsidian_index.jsonl"
+    chunk_data_path = tmp_path / "chunked_data.jsonl"
+    embedded_path = tmp_path / "embedded_chunks.jsonl"
+    write_records(
+        processed_data_path, [make_note("a.md", NOTE_A), make_note("b.md", NOTE_B)]
+    )
+    StructuralChunker(
+        str(processed_data_path), str(chunk_data_path), 5, incremental=True
+    ).chunk()
+    embedder = CountingEmbedder(str(chunk_data_path), str(embedded_path), "unused")
+    embedder.embed()
+    assert len(embedder.encoded_chunk_ids) == 4
+
+    write_records(
+        processed_data_path,
+        [make_note("a.md", NOTE_A), make_note("b.md", "# Alpha\nchanged\n")],
+    )
+    chunker = StructuralChunker(
+        str(processed_data_path), str(chunk_data_path), 5, incremental=True
+    )
+    chunker.chunk()
+    assert chunker.delta is not None
+
+    embedder = CountingEmbedder(str(chunk_data_path), str(embedded_path), "unused")
+    embedder.embed(chunker.delta)
+    assert embedder.encoded_chunk_ids == chunker.delta.added
+    embedded_chunks = list(iter_records(embedded_path))
+    assert [chunk["chunk_id"] for chunk in embedded_chunks] == [
+        chunk["chunk_id"] for chunk in iter_records(chunk_data_path)
+    ]
+    vectors, chunk_ids = load_embeddings(embedded_path)
+    assert chunk_ids == [chunk["chunk_id"] for chunk in embedded_chunks]
+    assert vectors.tolist() == [
+        [float(len(chunk["text"]))] for chunk in embedded_chunks
+    ]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_embed_incremental_renamed_note(tmp_path: Path) -> None:
+    """
+    Test that the chunks of a renamed note, whose chunk IDs all change with the note ID,
+    reuse the previous embeddings of the same content instead of being encoded.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    processed_data_path = tmp_path / "obsidian_index.jsonl"
+    chunk_data_path = tmp_path / "chunked_data.jsonl"
+    embedded_path = tmp_path / "embedded_chunks.jsonl"
+    write_records(
+        processed_data_path, [make_note("a.md", NOTE_A), make_note("b.md", NOTE_B)]
+    )
+    StructuralChunker(
+        str(processed_data_path), str(chunk_data_path), 5, incremental=True
+    ).chunk()
+    CountingEmbedder(str(chunk_data_path), str(embedded_path), "unused").embed()
+    previous_vectors, _ = load_embeddings(embedded_path)
+    previous_vectors = previous_vectors.copy()
+
+    write_records(
+        processed_data_path,
+        [make_note("a.md", NOTE_A), make_note("moved/b.md", NOTE_B)],
+    )
+    chunker = StructuralChunker(
+        str(processed_data_path), str(chunk_data_path), 5, incremental=True
+    )
+    chunker.chunk()
+    assert chunker.delta is not None
+    assert len(chunker.delta.added) == 2
+
+    embedder = CountingEmbedder(str(chunk_data_path), str(embedded_path), "unused")
+    embedder.embed(chunker.delta)
+    assert embedder.encoded_chunk_ids == []
+    vectors, chunk_ids = load_embeddings(embedded_path)
+    assert chunk_ids[2].startswith("moved/b.md::")
+    assert vectors.tolist() == previous_vectors.tolist()
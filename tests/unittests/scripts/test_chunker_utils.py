@@ -1,6 +1,6 @@
 import pytest
 
-from atlas.utils.chunker_utils import slugify
+from atlas.utils.chunker_utils import sliding_windows, slugify
 
 
 @pytest.mark.unittest
@@ -14,3 +14,19 @@ def test_slugify():
     assert slugify("Special #$& Characters") == "special_characters"
     assert slugify("  Leading and Trailing  ") == "leading_and_trailing"
     assert slugify("Multiple   Spaces") == "multiple_spaces"
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_sliding_windows():
+    """
+    Test that sliding windows cover every item, overlap by `overlap` items and end with the
+    last item.
+    """
+    assert sliding_windows(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert sliding_windows(10, 4, overlap=1) == [(0, 4), (3, 7), (6, 10)]
+    assert sliding_windows(8, 4, overlap=2) == [(0, 4), (2, 6), (4, 8)]
+    assert sliding_windows(3, 4, overlap=2) == [(0, 3)]
+    assert sliding_windows(0, 4) == []
+    with pytest.raises(ValueError):
+        sliding_windows(10, 4, overlap=4)
@@ -0,0 +1,171 @@
+import pytest
+import numpy as np
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+from atlas.core.embedder.embedding_cache import EmbeddingCache
+
+
+class CountingEncoder:
+    """Encoder which embeds a text as its length and keeps track of the encoded texts."""
+
+    def __init__(self) -> None:
+        self.encoded_texts: List[str] = []
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts as their length.
+
+        Args:
+            texts (List[str]): The texts to encode.
+
+        Returns:
+            np.ndarray: The embeddings, of shape `(len(texts), 2)`.
+        """
+        self.encoded_texts.extend(texts)
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def write_cache(path: Path, worker: int) -> int:
+    """
+    Encode overlapping texts through a shared cache, in a worker process.
+
+    Args:
+        path (Path): Path of the cache database.
+        worker (int): Index of the worker.
+
+    Returns:
+        int: Number of texts the worker encoded.
+    """
+    cache = EmbeddingCache(path, "model", True)
+    encoder = CountingEncoder()
+    for batch in range(10):
+        texts = [f"text {batch * 5 + worker + i}" for i in range(10)]
+        embeddings = cache.get_or_encode(texts, encoder)
+        assert embeddings[:, 0].tolist() == [len(text) for text in texts]
+    cache.close()
+    return len(encoder.encoded_texts)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_get_or_encode(tmp_path: Path) -> None:
+    """
+    Test that only the texts which are not cached for the same model and normalization are
+    encoded, once, and that the cache persists across instances.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    path = tmp_path / "cache" / "embeddings.sqlite"
+    encoder = CountingEncoder()
+    cache = EmbeddingCache(path, "model", True)
+    embeddings = cache.get_or_encode(["a", "bb", "a"], encoder)
+    assert embeddings.tolist() == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert encoder.encoded_texts == ["a", "bb"]
+    cache.close()
+
+    encoder.encoded_texts.clear()
+    cache = EmbeddingCache(path, "model", True)
+    embeddings = cache.get_or_encode(["bb", "ccc"], encoder)
+    assert embeddings.tolist() == [[2.0, 1.0], [3.0, 1.0]]
+    assert encoder.encoded_texts == ["ccc"]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # embeddings of another model or normalization are not shared
+    encoder.encoded_texts.clear()
+    EmbeddingCache(path, "model", False).get_or_encode(["a"], encoder)
+    EmbeddingCache(path, "other model", True).get_or_encode(["a"], encoder)
+    assert encoder.encoded_texts == ["a", "a"]
+    assert len(cache) == 5
+    assert cache.get_or_encode([], encoder).shape == (0, 0)
+    cache.close()
+
+    with pytest.raises(ValueError):
+        EmbeddingCache(path, "model", True, max_entries=0)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_lru_eviction(tmp_path: Path) -> None:
+    """
+    Test that the least recently used embeddings are evicted beyond `max_entries`.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    encoder = CountingEncoder()
+    cache = EmbeddingCache(tmp_path / "embeddings.sqlite", "model", True, max_entries=3)
+    cache.get_or_encode(["a", "b", "c"], encoder)
+    # "a" is used again, so "b" is now the least recently used
+    cache.get_or_encode(["a"], encoder)
+    cache.get_or_encode(["d"], encoder)
+    assert len(cache) == 3
+    assert [embedding is not None for embedding in cache.get(["a", "b", "c", "d"])] == [
+        True,
+        False,
+        True,
+        True,
+    ]
+    cache.close()
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_concurrent_writers(tmp_path: Path) -> None:
+    """
+    Test that several processes can read and write the same cache at the same time.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    path = tmp_path / "embeddings.sqlite"
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        num_encoded = list(executor.map(write_cache, [path] * 4, range(4)))
+
+    cache = EmbeddingCache(path, "model", True)
+    # texts 0 to 57 are encoded, a text missed by two workers at once is encoded twice
+    assert len(cache) == 58
+    assert 58 <= sum(num_encoded) < 4 * 100
+    cache.close()
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_reads_do_not_lock(tmp_path: Path) -> None:
+    """
+    Test that lookups succeed while another process holds the write lock, since cache hits
+    are marked as recently used along the next write, and that an instance can be shared
+    by several threads.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    path = tmp_path / "embeddings.sqlite"
+    encoder = CountingEncoder()
+    cache = EmbeddingCache(path, "model", True, timeout=0.1)
+    cache.get_or_encode(["a", "bb"], encoder)
+
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN IMMEDIATE")
+    try:
+        embeddings = cache.get_or_encode(["bb", "a"], encoder)
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+    assert embeddings[:, 0].tolist() == [2.0, 1.0]
+    assert encoder.encoded_texts == ["a", "bb"]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(
+                lambda i: cache.get_or_encode([f"text {i % 3}", "a"], encoder),
+                range(12),
+            )
+        )
+    assert all(result[:, 0].tolist() == [6.0, 1.0] for result in results)
+    # the pending marks are written on close
+    cache.close()
+    assert len(EmbeddingCache(path, "model", True)) == 5
@@ -0,0 +1,95 @@
+import pytest
+import numpy as np
+from pathlib import Path
+
+from atlas.core.embedder.embedding_store import (
+    EmbeddingWriter,
+    embedding_paths,
+    load_embeddings,
+)
+from atlas.core.indexer import run_indexer
+from atlas.core.indexer.faiss_vector_store import FaissVectorStore
+from atlas.utils.io_utils import write_records
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_embedding_writer(tmp_path: Path) -> None:
+    """
+    Test that embeddings written in batches are loaded back as a (memory-mapped) float32
+    matrix along the chunk ID of every row, and that a failed write keeps the previous
+    embeddings.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    output_path = tmp_path / "embedded_chunks.jsonl"
+    vectors = np.arange(12, dtype=np.float64).reshape(4, 3)
+    with EmbeddingWriter(output_path) as writer:
+        writer.add(["a", "b", "c"], vectors[:3])
+        writer.add([], np.empty((0, 3)))
+        writer.add(["d"], vectors[3:])
+        with pytest.raises(ValueError):
+            writer.add(["e"], np.zeros((1, 2)))
+    assert embedding_paths(output_path) == (
+        tmp_path / "embedded_chunks.embeddings.npy",
+        tmp_path / "embedded_chunks.embedding_ids.json",
+    )
+
+    loaded, chunk_ids = load_embeddings(output_path)
+    assert isinstance(loaded, np.memmap)
+    assert loaded.dtype == np.float32
+    assert loaded.tolist() == vectors.tolist()
+    assert chunk_ids == ["a", "b", "c", "d"]
+    del loaded
+
+    with pytest.raises(RuntimeError):
+        with EmbeddingWriter(output_path) as writer:
+            writer.add(["x"], np.zeros((1, 3)))
+            raise RuntimeError("embedding failed")
+    loaded, chunk_ids = load_embeddings(output_path, mmap=False)
+    assert loaded.shape == (4, 3)
+    assert chunk_ids == ["a", "b", "c", "d"]
+    assert not (tmp_path / "embedded_chunks.embeddings.tmp").exists()
+
+    with EmbeddingWriter(output_path):
+        pass
+    loaded, chunk_ids = load_embeddings(output_path)
+    assert loaded.shape == (0, 0)
+    assert chunk_ids == []
+
+    with pytest.raises(Exception) as exc_info:
+        load_embeddings(tmp_path / "missing.jsonl")
+    assert "Error loading embeddings" in str(exc_info.value)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_build_and_save_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test that the index is built from the memory-mapped embeddings in batches, with chunk
+    metadata free of embeddings, and that embeddings of other chunks are rejected.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to use small index batches.
+    """
+    output_path = tmp_path / "embedded_chunks.jsonl"
+    chunks = [{"chunk_id": f"c{i}", "note_id": f"n{i}.md"} for i in range(5)]
+    vectors = np.eye(5, dtype=np.float32)
+    write_records(output_path, chunks)
+    with EmbeddingWriter(output_path) as writer:
+        writer.add([chunk["chunk_id"] for chunk in chunks], vectors)
+
+    monkeypatch.setattr(run_indexer, "INDEX_BATCH_SIZE", 2)
+    store = FaissVectorStore(dim=5)
+    run_indexer.build_and_save_index(store, str(tmp_path / "index"), str(output_path))
+    assert store.index.ntotal == 5
+    assert store.metadata == chunks
+    assert store.search(vectors[3], k=1)[0]["chunk_id"] == "c3"
+
+    write_records(output_path, chunks[::-1])
+    with pytest.raises(ValueError):
+        run_indexer.build_and_save_index(
+            FaissVectorStore(dim=5), str(tmp_path / "index"), str(output_path)
+        )
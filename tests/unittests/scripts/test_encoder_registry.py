@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+import pytest
+import numpy as np
+import yaml
+
+from atlas.core.embedder.config import EncoderConfig
+from atlas.core.embedder.encoder_registry import EncoderRegistry
+from atlas.core.embedder.sentence_transformer.impl_encoder import (
+    SentenceTransformerEncoder,
+)
+from atlas.utils.embedder_utils import (
+    generate_embedding,
+    unload_encoder,
+    warm_up_encoder,
+)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_encoder_registry(tiny_encoder_config: EncoderConfig):
+    """
+    Test that the encoder registry loads an encoder once for all threads, encodes with it
+    from several threads at once, and loads it again after it is unloaded.
+
+    Args:
+        tiny_encoder_config (EncoderConfig): Configuration of a tiny local model.
+    """
+    registry = EncoderRegistry()
+    assert registry is EncoderRegistry()
+    texts = ["lorem ipsum", "do re mi fa so la ti", "hello world"]
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            encoders = list(
+                executor.map(lambda _: registry.get(tiny_encoder_config), range(8))
+            )
+            assert all(encoder is encoders[0] for encoder in encoders)
+            assert isinstance(encoders[0], SentenceTransformerEncoder)
+            assert tiny_encoder_config in registry
+
+            expected = encoders[0].encode(texts)
+            results = list(
+                executor.map(
+                    lambda _: registry.encode(tiny_encoder_config, texts), range(8)
+                )
+            )
+        assert all(np.allclose(result, expected, atol=1e-6) for result in results)
+
+        registry.unload(tiny_encoder_config)
+        assert tiny_encoder_config not in registry
+        assert registry.get(tiny_encoder_config) is not encoders[0]
+    finally:
+        registry.unload()
+    assert tiny_encoder_config not in registry
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_generate_embedding_shared_encoder(
+    tmp_path, tiny_encoder_config: EncoderConfig
+):
+    """
+    Test that `generate_embedding` reuses the encoder loaded by `warm_up_encoder` for the
+    same configuration file, until `unload_encoder`.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        tiny_encoder_config (EncoderConfig): Configuration of a tiny local model.
+    """
+    config_path = tmp_path / "encoder_config.yaml"
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(asdict(tiny_encoder_config), f)
+
+    registry = EncoderRegistry()
+    try:
+        warm_up_encoder(str(config_path))
+        encoder = registry.get(tiny_encoder_config)
+        embedding = generate_embedding("hello world", str(config_path))
+        assert registry.get(tiny_encoder_config) is encoder
+        assert np.allclose(embedding, encoder.encode(["hello world"])[0], atol=1e-6)
+        assert np.allclose(
+            generate_embedding("hello world", str(config_path)), embedding
+        )
+
+        unload_encoder(str(config_path))
+        assert tiny_encoder_config not in registry
+    finally:
+        registry.unload()
@@ -2,9 +2,11 @@ import json
 import pytest
 import numpy as np
 from pathlib import Path
+from typing import Dict, List
 import faiss
 
 from atlas.core.indexer.faiss_vector_store import FaissVectorStore
+from atlas.core.indexer.metadata_index import MetadataIndex
 from atlas.utils.embedder_utils import load_embedded_chunks
 
 
@@ -191,3 +193,183 @@ def test_load_negative_file_not_found(
     with pytest.raises(Exception) as exc_info:
         store.load(results_load_path=str(results_load_path))
     assert "Error reading either index file or metadata file" in str(exc_info.value)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_get_remove_and_upsert() -> None:
+    """
+    Test if the chunks of notes can be read from, removed from and upserted into the FAISS vector
+    store while keeping the invariant `FAISS vector ID <-> metadata list index`.
+    """
+    vectors = np.eye(3, dtype=np.float32)
+    metadata = [
+        {"chunk_id": f"{note_id}::chunk_{i}", "note_id": note_id}
+        for i, note_id in enumerate(["a.md", "b.md", "a.md"])
+    ]
+    store = FaissVectorStore(dim=3)
+    store.add(vectors, metadata)
+
+    vectors_a, chunks_a = store.get(["a.md"])
+    assert np.allclose(vectors_a, vectors[[0, 2]])
+    assert chunks_a == [metadata[0], metadata[2]]
+    assert store.get(["missing.md"])[0].shape == (0, 3)
+
+    assert store.remove(["a.md", "missing.md"]) == 2
+    assert store.index.ntotal == 1
+    assert store.metadata == [metadata[1]]
+    assert store.search(vectors[1], k=1)[0]["chunk_id"] == "b.md::chunk_1"
+
+    # b.md is replaced by a new chunk and a.md is added back
+    store.upsert(
+        np.array([[0, 0, 1], [1, 0, 0]], dtype=np.float32),
+        [
+            {"chunk_id": "b.md::chunk_0", "note_id": "b.md"},
+            {"chunk_id": "a.md::chunk_0", "note_id": "a.md"},
+        ],
+    )
+    assert store.index.ntotal == len(store.metadata) == 2
+    assert store.search(vectors[2], k=1)[0]["chunk_id"] == "b.md::chunk_0"
+    assert store.search(vectors[0], k=1)[0]["chunk_id"] == "a.md::chunk_0"
+
+    # a note without chunks anymore is only removed
+    store.upsert(np.empty((0, 3), dtype=np.float32), [], note_ids=["b.md"])
+    assert [chunk["note_id"] for chunk in store.metadata] == ["a.md"]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_search_filtered_by_metadata(tmp_path: Path) -> None:
+    """
+    Test if a search can be restricted to the chunks found in the metadata index and if the
+    metadata index stays in sync with the vector IDs when chunks are removed and loaded.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    vectors = np.eye(4, dtype=np.float32)
+    metadata: List[Dict] = [
+        {"chunk_id": "a.md::chunk_0", "note_id": "a.md", "tags": ["health"]},
+        {"chunk_id": "b.md::chunk_0", "note_id": "b.md", "tags": ["work"]},
+        {
+            "chunk_id": "c.md::chunk_0",
+            "note_id": "c.md",
+            "tags": [],
+            "frontmatter": {"tags": ["Health"]},
+        },
+        {"chunk_id": "d.md::chunk_0", "note_id": "d.md", "tags": ["work"]},
+    ]
+    store = FaissVectorStore(dim=4)
+    store.add(vectors, metadata)
+
+    health_ids = store.metadata_index.lookup("tags", "#health")
+    assert health_ids.tolist() == [0, 2]
+    query_vector = np.array([0.5, 1, 1, 0], dtype=np.float32)
+    results = store.search(query_vector, k=3, ids=health_ids)
+    assert [result["chunk_id"] for result in results] == [
+        "c.md::chunk_0",
+        "a.md::chunk_0",
+    ]
+    assert store.search(vectors[1], k=3, ids=np.empty(0, dtype=np.int64)) == []
+
+    store.remove(["a.md"])
+    work_ids = store.metadata_index.lookup("tags", "work")
+    assert work_ids.tolist() == [0, 2]
+    assert [store.metadata[idx]["note_id"] for idx in work_ids] == ["b.md", "d.md"]
+    assert store.search(vectors[3], k=1, ids=work_ids)[0]["chunk_id"] == "d.md::chunk_0"
+
+    store.save(str(tmp_path))
+    loaded_store = FaissVectorStore(dim=4)
+    loaded_store.load(str(tmp_path))
+    assert loaded_store.metadata_index.lookup("tags", "health").tolist() == [1]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_load_reuses_metadata_index(tmp_path: Path, monkeypatch) -> None:
+    """
+    Test if loading a store reuses the saved metadata index instead of rebuilding it, and
+    rebuilds it when the chunk metadata was changed after the index was saved.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch the index build.
+    """
+    metadata: List[Dict] = [
+        {"chunk_id": "a.md::chunk_0", "note_id": "a.md", "tags": ["health"]},
+        {"chunk_id": "b.md::chunk_0", "note_id": "b.md", "tags": ["work"]},
+    ]
+    store = FaissVectorStore(dim=2)
+    store.add(np.eye(2, dtype=np.float32), metadata)
+    store.save(str(tmp_path))
+
+    builds: List[List[Dict]] = []
+    original_build = MetadataIndex.build
+
+    def build(cls, chunks: List[Dict]) -> MetadataIndex:
+        builds.append(chunks)
+        return original_build(chunks)
+
+    monkeypatch.setattr(MetadataIndex, "build", classmethod(build))
+    loaded_store = FaissVectorStore(dim=2)
+    loaded_store.load(str(tmp_path))
+    assert builds == []
+    assert loaded_store.metadata_index.lookup("tags", "work").tolist() == [1]
+
+    metadata[1]["tags"] = ["health"]
+    with (tmp_path / "metadata.json").open("w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=4)
+    loaded_store.load(str(tmp_path))
+    assert len(builds) == 1
+    assert loaded_store.metadata_index.lookup("tags", "health").tolist() == [0, 1]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_search_duplicates() -> None:
+    """
+    Test if a chunk with near-duplicates is found by filtering on a tag only the note of a
+    duplicate has, lists the notes of its duplicates in `sources`, and is no longer found
+    by that tag once the note of the duplicate is removed.
+    """
+    metadata: List[Dict] = [
+        {
+            "chunk_id": "daily/1.md::routine::chunk_0",
+            "note_id": "daily/1.md",
+            "tags": ["daily"],
+            "duplicates": [
+                {
+                    "chunk_id": "daily/2.md::routine::chunk_0",
+                    "note_id": "daily/2.md",
+                    "tags": ["daily", "gym"],
+                    "frontmatter": {"mood": "good"},
+                },
+                {
+                    "chunk_id": "daily/2.md::routine::chunk_1",
+                    "note_id": "daily/2.md",
+                    "tags": ["daily", "gym"],
+                },
+            ],
+        },
+        {"chunk_id": "gym.md::root::chunk_0", "note_id": "gym.md", "tags": ["sport"]},
+    ]
+    store = FaissVectorStore(dim=2)
+    store.add(np.eye(2, dtype=np.float32), metadata)
+
+    gym_ids = store.metadata_index.lookup("tags", "gym")
+    assert gym_ids.tolist() == [0]
+    assert store.metadata_index.lookup("mood", "good").tolist() == [0]
+    results = store.search(np.array([0.0, 1.0], dtype=np.float32), k=1, ids=gym_ids)
+    assert results[0]["chunk_id"] == "daily/1.md::routine::chunk_0"
+    assert results[0]["sources"] == ["daily/1.md", "daily/2.md"]
+    assert store.search(np.array([0.0, 1.0], dtype=np.float32), k=1)[0]["sources"] == [
+        "gym.md"
+    ]
+
+    store.remove(["daily/2.md"])
+    assert store.index.ntotal == 2
+    assert store.metadata_index.lookup("tags", "gym").tolist() == []
+    assert store.metadata_index.lookup("tags", "daily").tolist() == [0]
+    assert store.search(np.array([1.0, 0.0], dtype=np.float32), k=1)[0]["sources"] == [
+        "daily/1.md"
+    ]
@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import pytest
+
+from benchmarks.bench_import_time import FAST_MODULES, LIGHT_MODULES, measure_import
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+@pytest.mark.parametrize("module", FAST_MODULES + LIGHT_MODULES)
+def test_no_heavy_imports(module: str) -> None:
+    """
+    Test that importing a module in a fresh interpreter does not import PyTorch, Sentence
+    Transformers, FAISS or the other heavy dependencies, which are imported on first use.
+
+    Args:
+        module (str): Name of the module.
+    """
+    _, heavy = measure_import(module)
+    assert heavy == []
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_fast_modules_skip_numpy() -> None:
+    """
+    Test that importing the ingester, the chunker and the encoder configuration does not
+    import numpy either, which alone takes most of the import time budget.
+    """
+    code = f"import sys, {', '.join(FAST_MODULES)}; print('numpy' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
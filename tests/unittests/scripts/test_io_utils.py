@@ -0,0 +1,62 @@
+import pytest
+import json
+from pathlib import Path
+
+from atlas.utils.io_utils import JsonlWriter, iter_records, write_records
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_write_and_iter_records_jsonl(tmp_path: Path):
+    """
+    Test that records are streamed to and from a JSON Lines file, one record per line.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    records = [{"note_id": "a.md", "text": "ünïcode"}, {"note_id": "b.md"}]
+    path = tmp_path / "data.jsonl"
+    count = write_records(path, iter(records))
+    assert count == 2
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+    assert list(iter_records(path)) == records
+    assert not path.with_suffix(".tmp").exists()
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_write_and_iter_records_json(tmp_path: Path):
+    """
+    Test that records are written to and read from a JSON file as a single list.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    records = [{"note_id": "a.md"}, {"note_id": "b.md"}]
+    path = tmp_path / "data.json"
+    count = write_records(path, iter(records))
+    assert count == 2
+    with path.open("r", encoding="utf-8") as f:
+        assert json.load(f) == records
+    assert list(iter_records(path)) == records
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_jsonl_writer_atomic(tmp_path: Path):
+    """
+    Test that an interrupted write leaves the previous file untouched.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    path = tmp_path / "data.jsonl"
+    write_records(path, [{"note_id": "old.md"}])
+
+    with pytest.raises(RuntimeError):
+        with JsonlWriter(path) as writer:
+            writer.write({"note_id": "new.md"})
+            raise RuntimeError("interrupted")
+
+    assert list(iter_records(path)) == [{"note_id": "old.md"}]
+    assert not path.with_suffix(".tmp").exists()
@@ -0,0 +1,40 @@
+import pytest
+
+from atlas.utils.markdown_utils import scan_markdown
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_scan_markdown():
+    """
+    Test that a single scan finds headings with offsets, tags, wikilinks and the word count.
+    """
+    text = (
+        "Intro with #tag1 and [[Note1]].\n"
+        "## Heading about #tag2\n"
+        "Link to [[Note2#Section|Alias]] and #tag1 again.\n"
+        "####### not a heading\n"
+        "# Last"
+    )
+    scan = scan_markdown(text)
+    assert scan.headings == [
+        {"level": 2, "title": "Heading about #tag2", "start": 32, "end": 54},
+        {"level": 1, "title": "Last", "start": 126, "end": 132},
+    ]
+    assert text[32:54] == "## Heading about #tag2"
+    assert scan.tags == ["Section", "tag1", "tag2"]
+    assert scan.wikilinks == ["Note1", "Note2#Section|Alias"]
+    assert scan.word_count == len(text.split())
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_scan_markdown_empty():
+    """
+    Test scanning text without any structural elements.
+    """
+    scan = scan_markdown("Just some plain text.")
+    assert scan.headings == []
+    assert scan.tags == []
+    assert scan.wikilinks == []
+    assert scan.word_count == 4
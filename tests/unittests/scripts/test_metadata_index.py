@@ -0,0 +1,148 @@
+from pathlib import Path
+import pytest
+import numpy as np
+
+from atlas.core.indexer.metadata_index import (
+    KEYS_FILE,
+    POSTINGS_FILE,
+    MetadataIndex,
+)
+
+METADATA = [
+    {
+        "note_id": "a.md",
+        "tags": ["health", "sleep"],
+        "frontmatter": {"date": "2024-01-05", "rating": 4, "draft": True},
+    },
+    {
+        "note_id": "b.md",
+        "tags": ["work"],
+        "frontmatter": {"date": "2024-02-10", "rating": 2.5, "tags": "#Health"},
+    },
+    {
+        "note_id": "c.md",
+        "tags": [],
+        "frontmatter": {"date": "2024-03-01", "rating": 1, "authors": ["ann", "bo"]},
+    },
+    {"note_id": "d.md", "tags": ["Sleep"], "frontmatter": {"nested": {"a": 1}}},
+]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_lookup() -> None:
+    """
+    Test if tags and frontmatter values are looked up to the sorted vector IDs of the chunks
+    carrying them.
+    """
+    index = MetadataIndex.build(METADATA)
+
+    assert index.fields() == ["authors", "date", "draft", "rating", "tags"]
+    assert index.values("tags") == ["health", "sleep", "work"]
+    assert index.lookup("tags", "health").tolist() == [0, 1]
+    assert index.lookup("tags", "#SLEEP").tolist() == [0, 3]
+    assert index.lookup("authors", "bo").tolist() == [2]
+    assert index.lookup("draft", True).tolist() == [0]
+    # booleans and numbers are distinct values
+    assert index.lookup("rating", True).tolist() == []
+    assert index.lookup("rating", 1).tolist() == [2]
+    assert index.lookup("missing", "value").tolist() == []
+    assert index.lookup("nested", {"a": 1}).tolist() == []
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_range() -> None:
+    """
+    Test if range queries return the vector IDs of the chunks with a value within the
+    inclusive bounds.
+    """
+    index = MetadataIndex.build(METADATA)
+
+    assert index.range("date", "2024-01-01", "2024-02-28").tolist() == [0, 1]
+    assert index.range("date", low="2024-02-10").tolist() == [1, 2]
+    assert index.range("date", high="2024-01-05").tolist() == [0]
+    assert index.range("rating", 2, 5).tolist() == [0, 1]
+    assert index.range("rating", low=3).tolist() == [0]
+    with pytest.raises(ValueError):
+        index.range("rating", 1, "5")
+    with pytest.raises(ValueError):
+        index.range("rating")
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_intersect_and_union() -> None:
+    """
+    Test if posting lists are intersected and united into sorted vector IDs.
+    """
+    index = MetadataIndex.build(METADATA)
+    health, sleep = index.lookup("tags", "health"), index.lookup("tags", "sleep")
+
+    assert index.intersect(health, sleep).tolist() == [0]
+    assert index.union(health, sleep).tolist() == [0, 1, 3]
+    assert index.intersect().tolist() == index.union().tolist() == []
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_add_and_remove() -> None:
+    """
+    Test if the index follows the vector IDs of the vector store when chunks are added and
+    removed, ie, the IDs after the removed ones are shifted down.
+    """
+    index = MetadataIndex.build(METADATA[:2])
+    index.add(METADATA[2:], start_id=2)
+    assert index.lookup("tags", "sleep").tolist() == [0, 3]
+
+    index.remove([0, 2])
+    assert index.lookup("tags", "sleep").tolist() == [1]
+    assert index.lookup("tags", "health").tolist() == [0]
+    assert index.range("rating", low=0).tolist() == [0]
+    # values and fields only carried by removed chunks are gone
+    assert "authors" not in index.fields()
+    assert index.values("date") == ["2024-02-10"]
+
+    rebuilt = MetadataIndex.build([METADATA[1], METADATA[3]])
+    for field in rebuilt.fields():
+        for value in rebuilt.values(field):
+            assert np.array_equal(
+                index.lookup(field, value), rebuilt.lookup(field, value)
+            )
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_save_and_load(tmp_path: Path) -> None:
+    """
+    Test if a saved index is loaded memory-mapped with the same posting lists, can still be
+    updated, and is discarded if it was saved from other metadata or is incomplete.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    index = MetadataIndex.build(METADATA)
+    index.save(str(tmp_path), source_stamp=[4, 1])
+
+    loaded = MetadataIndex.load(str(tmp_path), source_stamp=[4, 1])
+    assert loaded is not None
+    assert loaded.fields() == index.fields()
+    for field in index.fields():
+        assert loaded.values(field) == index.values(field)
+        for value in index.values(field):
+            assert isinstance(loaded.lookup(field, value), np.memmap)
+            assert np.array_equal(
+                loaded.lookup(field, value), index.lookup(field, value)
+            )
+    assert loaded.range("rating", low=2).tolist() == [0, 1]
+
+    loaded.add(METADATA[:1], start_id=4)
+    loaded.remove([1])
+    assert loaded.lookup("tags", "sleep").tolist() == [0, 2, 3]
+
+    assert MetadataIndex.load(str(tmp_path), source_stamp=[4, 2]) is None
+    # the postings of another save without its keys
+    np.save(tmp_path / POSTINGS_FILE, np.arange(3, dtype=np.int64))
+    assert MetadataIndex.load(str(tmp_path), source_stamp=[4, 1]) is None
+    (tmp_path / KEYS_FILE).unlink()
+    assert MetadataIndex.load(str(tmp_path), source_stamp=[4, 1]) is None
@@ -0,0 +1,146 @@
+import pytest
+from pathlib import Path
+from typing import Dict
+
+from atlas.core.chunker.structural_chunker import StructuralChunker
+from atlas.core.deduplicator.minhash_deduplicator import MinHashDeduplicator
+from atlas.utils.io_utils import iter_records, write_records
+
+TEMPLATE = (
+    "Morning routine: meditate for ten minutes, write in the journal, review the "
+    "calendar and plan the three most important tasks of the day before opening email. "
+    "Evening routine: tidy the desk, write down what went well and what to improve."
+)
+
+
+def make_chunk(chunk_id: str, text: str) -> Dict:
+    """
+    Create a chunk with only the fields used by the deduplicator.
+
+    Args:
+        chunk_id (str): ID of the chunk.
+        text (str): Text of the chunk.
+
+    Returns:
+        Dict: The chunk.
+    """
+    note_id = chunk_id.partition("::")[0]
+    return {"chunk_id": chunk_id, "note_id": note_id, "text": text, "tags": [note_id]}
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_cluster() -> None:
+    """
+    Test that near-duplicate texts are clustered with the first one, across batches, while
+    different texts and texts without words are kept apart.
+    """
+    deduplicator = MinHashDeduplicator("dummy_path", "dummy_output")
+    texts = [
+        TEMPLATE,
+        "Notes about the roguelike games I played this week and what they taught me.",
+        TEMPLATE.replace("ten", "fifteen"),
+        "",
+    ]
+    batches = [texts, [TEMPLATE + " Extra line.", "---", texts[1].upper()]]
+    representatives = [batch.tolist() for batch in deduplicator.cluster(iter(batches))]
+    assert representatives == [[0, 1, 0, 3], [0, 5, 1]]
+
+    signatures = deduplicator.signatures([TEMPLATE, TEMPLATE.replace("ten", "five")])
+    assert 0.8 < (signatures[0] == signatures[1]).mean() < 1
+
+    with pytest.raises(ValueError):
+        MinHashDeduplicator("dummy_path", "dummy_output", num_perm=100, num_bands=16)
+    with pytest.raises(ValueError):
+        MinHashDeduplicator("dummy_path", "dummy_output", threshold=0)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_deduplicate(tmp_path: Path) -> None:
+    """
+    Test that the deduplicated chunk data drops the duplicates and maps them, with their
+    note metadata, onto their representative.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    chunk_data_path = tmp_path / "chunked_data.jsonl"
+    output_path = tmp_path / "deduplicated_chunks.jsonl"
+    chunks = [
+        make_chunk("daily/1.md::routine::chunk_0", TEMPLATE),
+        make_chunk("ideas.md::root::chunk_0", "A completely unrelated idea."),
+        make_chunk("daily/2.md::routine::chunk_0", TEMPLATE + " Day two."),
+        make_chunk("daily/3.md::routine::chunk_0", TEMPLATE),
+    ]
+    write_records(chunk_data_path, chunks)
+
+    deduplicator = MinHashDeduplicator(str(chunk_data_path), str(output_path))
+    deduplicator.stream_batch_size = 2
+    deduplicator.deduplicate()
+    assert list(iter_records(output_path)) == [
+        {
+            **chunks[0],
+            "duplicates": [
+                {
+                    "chunk_id": "daily/2.md::routine::chunk_0",
+                    "note_id": "daily/2.md",
+                    "tags": ["daily/2.md"],
+                },
+                {
+                    "chunk_id": "daily/3.md::routine::chunk_0",
+                    "note_id": "daily/3.md",
+                    "tags": ["daily/3.md"],
+                },
+            ],
+        },
+        chunks[1],
+    ]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_deduplicate_compact_chunks(tmp_path: Path) -> None:
+    """
+    Test that compact chunks are deduplicated with their text from the note store.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    processed_data_path = tmp_path / "obsidian_index.jsonl"
+    chunk_data_path = tmp_path / "chunked_data.jsonl"
+    output_path = tmp_path / "deduplicated_chunks.jsonl"
+    write_records(
+        processed_data_path,
+        [
+            {
+                "note_id": note_id,
+                "title": note_id[:-3],
+                "relative_path": note_id,
+                "raw_text": TEMPLATE,
+                "frontmatter": {},
+                "headings": [],
+                "tags": [],
+                "wikilinks": [],
+                "word_count": len(TEMPLATE.split()),
+            }
+            for note_id in ["a.md", "b.md"]
+        ],
+    )
+    chunker = StructuralChunker(
+        str(processed_data_path), str(chunk_data_path), 100, compact=True
+    )
+    chunker.chunk()
+
+    MinHashDeduplicator(
+        str(chunk_data_path),
+        str(output_path),
+        note_store_path=str(chunker.note_store_path),
+    ).deduplicate()
+    deduplicated_chunks = list(iter_records(output_path))
+    assert len(deduplicated_chunks) == 1
+    assert deduplicated_chunks[0]["note_id"] == "a.md"
+    # the note metadata of compact chunks is in the note store
+    assert deduplicated_chunks[0]["duplicates"] == [
+        {"chunk_id": "b.md::root::chunk_0", "note_id": "b.md"}
+    ]
@@ -0,0 +1,197 @@
+import hashlib
+import pytest
+import numpy as np
+from pathlib import Path
+from typing import Dict, List
+
+from atlas.core.chunker.note_store import NoteStore
+from atlas.core.chunker.structural_chunker import StructuralChunker
+from atlas.core.embedder.base.base_embedder import BaseEmbedder
+from atlas.core.embedder.embedding_store import load_embeddings
+from atlas.core.indexer.faiss_vector_store import FaissVectorStore
+from atlas.utils.io_utils import iter_records, write_records
+
+
+class LengthEmbedder(BaseEmbedder):
+    """Embedder which embeds a chunk as the length of its text, no model needed."""
+
+    def load_encoder(self) -> None:
+        """No encoder to load."""
+        pass
+
+    def embed_chunks(self, chunks: List[Dict]) -> List[Dict]:
+        """
+        Embed the chunks with the length of their text.
+
+        Args:
+            chunks (List[Dict]): List of chunk dictionaries to be embedded.
+
+        Returns:
+            List[Dict]: List of chunk dictionaries with added embeddings.
+        """
+        return [
+            {**chunk, "embedding": [float(len(text))]}
+            for chunk, text in zip(chunks, self.chunk_texts(chunks))
+        ]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_note_store(tmp_path: Path) -> None:
+    """
+    Test that the note store returns the text and metadata of every note, with chunk offsets
+    in characters even for non ASCII text.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    notes: List[Dict] = [
+        {"note_id": "a.md", "title": "a", "relative_path": "a.md", "raw_text": "\n"},
+        {
+            "note_id": "ü.md",
+            "title": "ü",
+            "relative_path": "ü.md",
+            "raw_text": "  Grüße aus Köln\n",
+            "tags": ["reise"],
+            "frontmatter": {"date": "2024-01-01"},
+        },
+    ]
+    with NoteStore.writer(tmp_path / "notes") as writer:
+        for note in notes:
+            writer.add(note)
+
+    store = NoteStore(tmp_path / "notes")
+    assert len(store) == 2
+    assert "ü.md" in store
+    assert store.text("a.md") == ""
+    assert store.text("ü.md") == "Grüße aus Köln"
+    assert store.metadata("ü.md") == {
+        "title": "ü",
+        "relative_path": "ü.md",
+        "tags": ["reise"],
+        "frontmatter": {"date": "2024-01-01"},
+    }
+
+    chunk = {
+        "chunk_id": "ü.md::root::chunk_1",
+        "note_id": "ü.md",
+        "start": 6,
+        "end": 14,
+    }
+    assert store.chunk_text(chunk) == "aus Köln"
+    assert store.materialize(chunk)["text"] == "aus Köln"
+    assert "text" not in store.materialize(chunk, with_text=False)
+    assert store.chunk_text({**chunk, "text": "as is"}) == "as is"
+    store.close()
+
+    with pytest.raises(Exception) as exc_info:
+        NoteStore(tmp_path / "missing")
+    assert "Error reading note store" in str(exc_info.value)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_compact_chunks(dummy_processed_data_path: Path, tmp_path: Path) -> None:
+    """
+    Test that compact chunks materialize to the same chunks as the full chunks, while the
+    chunk data no longer holds the chunk texts and note metadata.
+
+    Args:
+        dummy_processed_data_path (Path): Path to the dummy processed data file.
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    full_path = tmp_path / "full_chunks.jsonl"
+    compact_path = tmp_path / "compact_chunks.jsonl"
+    StructuralChunker(str(dummy_processed_data_path), str(full_path), 100).chunk()
+    chunker = StructuralChunker(
+        str(dummy_processed_data_path), str(compact_path), 100, compact=True
+    )
+    chunker.chunk()
+    assert chunker.note_store_path == tmp_path / "compact_chunks.notes"
+
+    full_chunks = list(iter_records(full_path))
+    compact_chunks = list(iter_records(compact_path))
+    assert len(compact_chunks) == len(full_chunks) > 2
+    assert all("text" not in chunk and "tags" not in chunk for chunk in compact_chunks)
+    assert compact_path.stat().st_size * 2 < full_path.stat().st_size
+
+    store = NoteStore(tmp_path / "compact_chunks.notes")
+    for full_chunk, compact_chunk in zip(full_chunks, compact_chunks):
+        chunk = store.materialize(compact_chunk)
+        # word split chunks keep the original whitespace of the note
+        assert chunk["text"].split() == full_chunk["text"].split()
+        assert {**chunk, "text": full_chunk["text"]} == {
+            **full_chunk,
+            "start": chunk["start"],
+            "end": chunk["end"],
+            "content_hash": chunk["content_hash"],
+        }
+        assert (
+            hashlib.sha256(chunk["text"].encode("utf-8")).hexdigest()
+            == chunk["content_hash"]
+        )
+    store.close()
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_embed_and_search_compact_chunks(tmp_path: Path) -> None:
+    """
+    Test that compact chunks are encoded with their text from the note store, stay compact
+    once embedded, and are indexed and returned by a search with their note metadata and text.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    processed_data_path = tmp_path / "obsidian_index.jsonl"
+    chunk_data_path = tmp_path / "chunked_data.jsonl"
+    embedded_path = tmp_path / "embedded_chunks.jsonl"
+    write_records(
+        processed_data_path,
+        [
+            {
+                "note_id": note_id,
+                "title": note_id[:-3],
+                "relative_path": note_id,
+                "raw_text": raw_text,
+                "frontmatter": {},
+                "headings": [],
+                "tags": tags,
+                "wikilinks": [],
+                "word_count": len(raw_text.split()),
+            }
+            for note_id, raw_text, tags in [
+                ("a.md", "short note", ["x"]),
+                ("b.md", "a somewhat longer note", ["y"]),
+            ]
+        ],
+    )
+    chunker = StructuralChunker(
+        str(processed_data_path), str(chunk_data_path), 100, compact=True
+    )
+    chunker.chunk()
+
+    embedder = LengthEmbedder(
+        str(chunk_data_path),
+        str(embedded_path),
+        "unused",
+        note_store_path=str(chunker.note_store_path),
+    )
+    embedder.embed()
+    embedded_chunks = list(iter_records(embedded_path))
+    vectors, _ = load_embeddings(embedded_path)
+    assert vectors.tolist() == [[10.0], [22.0]]
+    assert all("text" not in chunk for chunk in embedded_chunks)
+
+    store = FaissVectorStore(
+        dim=1, note_store=NoteStore(tmp_path / "chunked_data.notes")
+    )
+    store.add(vectors, embedded_chunks)
+    assert store.metadata == embedded_chunks
+    ids = store.metadata_index.lookup("tags", "y")
+    results = store.search(np.array([1.0], dtype=np.float32), k=1, ids=ids)
+    assert results[0]["text"] == "a somewhat longer note"
+    assert results[0]["title"] == "b"
+
+    with pytest.raises(ValueError):
+        LengthEmbedder(str(chunk_data_path), str(embedded_path), "unused").embed()
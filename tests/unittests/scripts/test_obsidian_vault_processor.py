@@ -1,9 +1,13 @@
 # mypy: disable-error-code=arg-type
 import pytest
 import json
+import shutil
+import subprocess
 from pathlib import Path
 
 from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+from atlas.core.ingester.frontmatter_cache import FrontmatterCache
+from atlas.core.ingester.manifest import NoteDelta
 
 
 @pytest.fixture
@@ -401,6 +405,8 @@ def test_extract_headings_positive(
         {
             "level": 1,
             "title": "What I learnt about #myself when dealing [[wikilink|custom name]] with ADHD",
+            "start": 0,
+            "end": 77,
         }
     ], "Headings should be correctly extracted."
 
@@ -573,6 +579,8 @@ def test_parse_markdown_note(
             {
                 "level": 1,
                 "title": "What I learnt about #myself when dealing [[wikilink|custom name]] with ADHD",
+                "start": 0,
+                "end": 77,
             }
         ],
         "tags": ["content", "myself"],
@@ -660,3 +668,497 @@ def test_process(dummy_obsidian_vault_path: Path, dummy_output_path: Path) -> No
     assert (
         note_data["title"] == "what I learnt about myself when dealing with ADHD"
     ), "Note title should be correct."
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_ingest_incremental(
+    dummy_obsidian_vault_path: Path, dummy_output_path: Path
+) -> None:
+    """
+    Test if incremental ingestion only re-parses added/modified notes, carries over unchanged
+    notes from the previous index and detects deleted notes.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+    """
+    output_file = dummy_output_path / "obsidian_index.json"
+    existing_note_id = (
+        "_learning about me/what I learnt about myself when dealing with ADHD.md"
+    )
+
+    # first run, all notes are new
+    obsidian_vault_processor = ObsidianVaultProcessor(
+        vault_path=dummy_obsidian_vault_path,
+        output_path=output_file,
+        incremental=True,
+    )
+    obsidian_vault_processor.ingest()
+    assert obsidian_vault_processor.delta is not None
+    assert obsidian_vault_processor.delta.added == [existing_note_id]
+    assert (dummy_output_path / "obsidian_index.manifest.json").exists()
+
+    # second run, nothing changed
+    obsidian_vault_processor = ObsidianVaultProcessor(
+        vault_path=dummy_obsidian_vault_path,
+        output_path=output_file,
+        incremental=True,
+    )
+    obsidian_vault_processor.ingest()
+    assert obsidian_vault_processor.delta is not None
+    assert obsidian_vault_processor.delta.unchanged == [existing_note_id]
+    assert not obsidian_vault_processor.delta.has_changes()
+
+    # third run, one note added and the existing note deleted
+    (dummy_obsidian_vault_path / "new note.md").write_text("# New\n\nSome #new text.\n")
+    (dummy_obsidian_vault_path / existing_note_id).unlink()
+    obsidian_vault_processor = ObsidianVaultProcessor(
+        vault_path=dummy_obsidian_vault_path,
+        output_path=output_file,
+        incremental=True,
+    )
+    obsidian_vault_processor.ingest()
+    assert obsidian_vault_processor.delta is not None
+    assert obsidian_vault_processor.delta.added == ["new note.md"]
+    assert obsidian_vault_processor.delta.deleted == [existing_note_id]
+
+    # fourth run, the new note is modified
+    (dummy_obsidian_vault_path / "new note.md").write_text("# New\n\nChanged #text.\n")
+    obsidian_vault_processor = ObsidianVaultProcessor(
+        vault_path=dummy_obsidian_vault_path,
+        output_path=output_file,
+        incremental=True,
+    )
+    obsidian_vault_processor.ingest()
+    assert obsidian_vault_processor.delta is not None
+    assert obsidian_vault_processor.delta.modified == ["new note.md"]
+
+    with output_file.open("r", encoding="utf-8") as f:
+        saved_data = json.load(f)
+    assert len(saved_data) == 1
+    assert saved_data[0]["tags"] == ["text"]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_process_parallel(
+    dummy_obsidian_vault_path: Path, dummy_output_path: Path
+) -> None:
+    """
+    Test if parsing notes with multiple worker processes gives the same output, in the same
+    order, as the serial path.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+    """
+    for idx in range(10):
+        (dummy_obsidian_vault_path / f"note {idx}.md").write_text(
+            f"# Note {idx}\n\nLinks to [[note {idx + 1}]] with #tag{idx}.\n"
+        )
+
+    serial_processor = ObsidianVaultProcessor(
+        vault_path=dummy_obsidian_vault_path,
+        output_path=dummy_output_path / "obsidian_index.json",
+    )
+    parallel_processor = ObsidianVaultProcessor(
+        vault_path=dummy_obsidian_vault_path,
+        output_path=dummy_output_path / "obsidian_index.json",
+        workers=2,
+        batch_size=3,
+    )
+    serial_data = serial_processor.process()
+    parallel_data = parallel_processor.process()
+    assert len(parallel_data) == 11
+    assert parallel_data == serial_data
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_iter_process(dummy_obsidian_vault_path: Path, dummy_output_path: Path) -> None:
+    """
+    Test if the vault can be processed lazily, one note at a time.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+    """
+    obsidian_vault_processor = ObsidianVaultProcessor(
+        vault_path=dummy_obsidian_vault_path,
+        output_path=dummy_output_path / "obsidian_index.jsonl",
+    )
+    notes = obsidian_vault_processor.iter_process()
+    assert not isinstance(notes, list)
+    assert list(notes) == obsidian_vault_processor.process()
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_ingest_incremental_parallel_jsonl(
+    dummy_obsidian_vault_path: Path, dummy_output_path: Path
+) -> None:
+    """
+    Test if streaming incremental ingestion with multiple workers writes the same index
+    as a full serial ingestion, with unchanged and re-parsed notes kept in order.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+    """
+    for idx in range(10):
+        (dummy_obsidian_vault_path / f"note {idx}.md").write_text(f"# Note {idx}\n")
+
+    def ingest(output_file: Path, incremental: bool) -> ObsidianVaultProcessor:
+        obsidian_vault_processor = ObsidianVaultProcessor(
+            vault_path=dummy_obsidian_vault_path,
+            output_path=output_file,
+            incremental=incremental,
+            workers=2,
+            batch_size=3,
+        )
+        obsidian_vault_processor.ingest()
+        return obsidian_vault_processor
+
+    ingest(dummy_output_path / "obsidian_index.jsonl", incremental=True)
+    (dummy_obsidian_vault_path / "note 4.md").write_text("# Note 4\n\nNow with #tag.\n")
+    (dummy_obsidian_vault_path / "note 7.md").unlink()
+    obsidian_vault_processor = ingest(
+        dummy_output_path / "obsidian_index.jsonl", incremental=True
+    )
+    assert obsidian_vault_processor.delta is not None
+    assert obsidian_vault_processor.delta.modified == ["note 4.md"]
+    assert obsidian_vault_processor.delta.deleted == ["note 7.md"]
+    assert len(obsidian_vault_processor.delta.unchanged) == 9
+
+    ingest(dummy_output_path / "full_index.jsonl", incremental=False)
+    incremental_index = (dummy_output_path / "obsidian_index.jsonl").read_text()
+    full_index = (dummy_output_path / "full_index.jsonl").read_text()
+    assert incremental_index == full_index
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_ingest_incremental_renames(
+    dummy_obsidian_vault_path: Path, dummy_output_path: Path
+) -> None:
+    """
+    Test if incremental ingestion reports a moved note with unchanged content as renamed
+    rather than as a deleted and an added note.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+    """
+    output_file = dummy_output_path / "obsidian_index.json"
+    (dummy_obsidian_vault_path / "a.md").write_text("# A\n\nAlpha.\n")
+    (dummy_obsidian_vault_path / "b.md").write_text("# B\n\nBeta.\n")
+    ObsidianVaultProcessor(
+        dummy_obsidian_vault_path, output_file, incremental=True
+    ).ingest()
+
+    (dummy_obsidian_vault_path / "archive").mkdir()
+    (dummy_obsidian_vault_path / "a.md").rename(
+        dummy_obsidian_vault_path / "archive" / "a.md"
+    )
+    (dummy_obsidian_vault_path / "b.md").unlink()
+    (dummy_obsidian_vault_path / "c.md").write_text("# C\n\nNot beta.\n")
+    obsidian_vault_processor = ObsidianVaultProcessor(
+        dummy_obsidian_vault_path, output_file, incremental=True
+    )
+    obsidian_vault_processor.ingest()
+
+    delta = obsidian_vault_processor.delta
+    assert delta is not None
+    assert delta.renamed == {"a.md": "archive/a.md"}
+    assert delta.added == ["c.md"]
+    assert delta.deleted == ["b.md"]
+    assert delta.modified == []
+    processed_data = json.loads(output_file.read_text())
+    assert "archive/a.md" in [note["note_id"] for note in processed_data]
+
+
+def run_git(repo_path: Path, *args: str) -> None:
+    """
+    Run a git command in a test repository.
+
+    Args:
+        repo_path (Path): The path to the git repository.
+        *args (str): Arguments of the git command.
+    """
+    subprocess.run(
+        ["git", "-c", "user.name=atlas", "-c", "user.email=atlas@test", *args],
+        cwd=repo_path,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_ingest_incremental_git(
+    dummy_obsidian_vault_path: Path,
+    dummy_output_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test if git change detection finds added, modified, deleted and renamed notes from the
+    repository (committed, staged, unstaged and untracked changes) without walking the vault.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch the vault walk.
+    """
+    output_file = dummy_output_path / "obsidian_index.json"
+    existing_note_id = (
+        "_learning about me/what I learnt about myself when dealing with ADHD.md"
+    )
+    long_text = "".join(f"Line {idx} of a long note.\n" for idx in range(20))
+    (dummy_obsidian_vault_path / "long.md").write_text(f"# Long\n\n{long_text}")
+    run_git(dummy_obsidian_vault_path, "init", "-q")
+    run_git(dummy_obsidian_vault_path, "add", "-A")
+    run_git(dummy_obsidian_vault_path, "commit", "-q", "-m", "initial")
+
+    def ingest() -> ObsidianVaultProcessor:
+        obsidian_vault_processor = ObsidianVaultProcessor(
+            dummy_obsidian_vault_path,
+            output_file,
+            incremental=True,
+            change_detection="git",
+        )
+        obsidian_vault_processor.ingest()
+        return obsidian_vault_processor
+
+    # first run, no commit recorded yet so the vault is scanned
+    obsidian_vault_processor = ingest()
+    assert obsidian_vault_processor.delta is not None
+    assert len(obsidian_vault_processor.delta.added) == 2
+    assert obsidian_vault_processor.manifest is not None
+    assert obsidian_vault_processor.manifest.commit is not None
+
+    # from now on only git is asked for changes
+    def no_walk(self, vault_path: Path) -> None:
+        raise AssertionError("The vault should not be walked")
+
+    monkeypatch.setattr(ObsidianVaultProcessor, "_iter_markdown_files", no_walk)
+
+    (dummy_obsidian_vault_path / "a.md").write_text("# A\n\nAlpha.\n")
+    run_git(dummy_obsidian_vault_path, "add", "a.md")
+    run_git(dummy_obsidian_vault_path, "commit", "-q", "-m", "add a")
+    obsidian_vault_processor = ingest()
+    assert obsidian_vault_processor.delta is not None
+    assert obsidian_vault_processor.delta.added == ["a.md"]
+    assert sorted(obsidian_vault_processor.delta.unchanged) == sorted(
+        [existing_note_id, "long.md"]
+    )
+
+    # renamed with changed content (staged), modified (unstaged), untracked and deleted notes
+    run_git(dummy_obsidian_vault_path, "mv", "long.md", "longer.md")
+    (dummy_obsidian_vault_path / "longer.md").write_text(
+        f"# Long\n\n{long_text}One more line.\n"
+    )
+    run_git(dummy_obsidian_vault_path, "add", "longer.md")
+    (dummy_obsidian_vault_path / "a.md").write_text("# A\n\nAlpha, edited.\n")
+    (dummy_obsidian_vault_path / "c.md").write_text("# C\n")
+    (dummy_obsidian_vault_path / ".obsidian" / "ignored.md").write_text("# Ignored\n")
+    (dummy_obsidian_vault_path / existing_note_id).unlink()
+    obsidian_vault_processor = ingest()
+
+    delta = obsidian_vault_processor.delta
+    assert delta is not None
+    assert delta.added == ["c.md"]
+    assert delta.modified == ["a.md", "longer.md"]
+    assert delta.deleted == [existing_note_id]
+    assert delta.renamed == {"long.md": "longer.md"}
+    assert delta.unchanged == []
+    processed_data = json.loads(output_file.read_text())
+    assert [note["note_id"] for note in processed_data] == [
+        "a.md",
+        "c.md",
+        "longer.md",
+    ]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_ingest_incremental_git_fallback(
+    dummy_obsidian_vault_path: Path, dummy_output_path: Path
+) -> None:
+    """
+    Test if git change detection falls back to scanning the vault when the vault is not in
+    a git repository, and if it requires incremental mode.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+    """
+    output_file = dummy_output_path / "obsidian_index.json"
+    for _ in range(2):
+        obsidian_vault_processor = ObsidianVaultProcessor(
+            dummy_obsidian_vault_path,
+            output_file,
+            incremental=True,
+            change_detection="git",
+        )
+        obsidian_vault_processor.ingest()
+    assert obsidian_vault_processor.delta is not None
+    assert len(obsidian_vault_processor.delta.unchanged) == 1
+    assert obsidian_vault_processor.manifest is not None
+    assert obsidian_vault_processor.manifest.commit is None
+
+    with pytest.raises(ValueError):
+        ObsidianVaultProcessor(
+            dummy_obsidian_vault_path, output_file, change_detection="git"
+        )
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_frontmatter_cache(
+    dummy_obsidian_vault_path: Path,
+    dummy_output_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test if a frontmatter block is parsed only once, within a run (notes sharing the
+    same block) and across runs (the cache is saved along with the processed data),
+    including the blocks parsed by worker processes.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to patch the YAML loader.
+    """
+    for idx in range(4):
+        (dummy_obsidian_vault_path / f"template {idx}.md").write_text(
+            f"---\ntype: daily\ncreated: 2024-01-0{idx + 1}\n---\n# Day {idx}\n"
+        )
+    (dummy_obsidian_vault_path / "shared 1.md").write_text("---\na: 1\n---\nOne\n")
+    (dummy_obsidian_vault_path / "shared 2.md").write_text("---\na: 1\n---\nTwo\n")
+
+    output_file = dummy_output_path / "obsidian_index.json"
+    obsidian_vault_processor = ObsidianVaultProcessor(
+        dummy_obsidian_vault_path, output_file, workers=2, batch_size=2
+    )
+    obsidian_vault_processor.ingest()
+    cache_file = dummy_output_path / "obsidian_index.frontmatter_cache.json"
+    # the 4 templates, the shared block and the block of the fixture note
+    assert len(json.loads(cache_file.read_text())["entries"]) == 6
+    expected_index = output_file.read_text()
+
+    def fail_load(*args, **kwargs) -> None:
+        raise AssertionError("The frontmatter should not be parsed")
+
+    monkeypatch.setattr(
+        "atlas.core.ingester.obsidian_vault_processor.yaml.load", fail_load
+    )
+    obsidian_vault_processor = ObsidianVaultProcessor(
+        dummy_obsidian_vault_path, output_file
+    )
+    obsidian_vault_processor.ingest()
+    assert output_file.read_text() == expected_index
+
+    # cached frontmatter is returned as a copy
+    first, _ = obsidian_vault_processor._extract_frontmatter("---\na: 1\n---\nx")
+    first["a"] = 2
+    second, _ = obsidian_vault_processor._extract_frontmatter("---\na: 1\n---\ny")
+    assert second == {"a": 1}
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_frontmatter_cache_lossless(
+    dummy_obsidian_vault_path: Path, dummy_output_path: Path
+) -> None:
+    """
+    Test if a warm ingest (frontmatter from the cache) gives the same notes as a cold one
+    for frontmatter which JSON cannot represent as is, eg, integer, boolean and date keys.
+
+    Args:
+        dummy_obsidian_vault_path (Path): The path to the dummy obsidian vault.
+        dummy_output_path (Path): The path to the dummy output directory.
+    """
+    text = (
+        "---\nscores:\n  1: low\n  2: high\ntrue: yes\n2024-01-01: new year\n"
+        "type: plain\n---\n# Note\n"
+    )
+    output_file = dummy_output_path / "obsidian_index.json"
+    cold_processor = ObsidianVaultProcessor(dummy_obsidian_vault_path, output_file)
+    cold_frontmatter, _ = cold_processor._extract_frontmatter(text)
+    assert cold_frontmatter["scores"] == {1: "low", 2: "high"}
+    plain_frontmatter, _ = cold_processor._extract_frontmatter(
+        "---\ntype: plain\n---\n"
+    )
+    cold_processor.frontmatter_cache.save()
+
+    warm_processor = ObsidianVaultProcessor(dummy_obsidian_vault_path, output_file)
+    warm_processor.frontmatter_cache.load()
+    # only the block JSON represents as is was cached
+    assert len(warm_processor.frontmatter_cache) == 1
+    warm_frontmatter, _ = warm_processor._extract_frontmatter(text)
+    assert warm_frontmatter == cold_frontmatter
+    assert [type(key) for key in warm_frontmatter] == [
+        type(key) for key in cold_frontmatter
+    ]
+    assert warm_processor._extract_frontmatter("---\ntype: plain\n---\n") == (
+        plain_frontmatter,
+        "",
+    )
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_frontmatter_cache_eviction() -> None:
+    """
+    Test if the least recently used frontmatter blocks are evicted from a full cache.
+    """
+    cache = FrontmatterCache(None, max_entries=2)
+    cache.put("a", {"a": 1})
+    cache.put("b", {"b": 1})
+    assert cache.get("a") == {"a": 1}
+    cache.put("c", {"c": 1})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"a": 1}
+    assert cache.get("c") == {"c": 1}
+    assert len(cache) == 2
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_ingest_incremental_delete_last_note(tmp_path: Path) -> None:
+    """
+    Test if deleting the only note of the vault empties the index and the manifest in
+    incremental mode, so that the next run no longer reports the note as deleted.
+
+    Args:
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    vault_path = tmp_path / "vault"
+    (vault_path / ".obsidian").mkdir(parents=True)
+    (vault_path / ".obsidian" / "app.json").write_text("{}")
+    (vault_path / "A.md").write_text("# A\n\nThe only note.\n")
+    output_file = tmp_path / "out" / "index.jsonl"
+
+    def ingest() -> NoteDelta:
+        processor = ObsidianVaultProcessor(
+            vault_path=str(vault_path),
+            output_path=str(output_file),
+            incremental=True,
+            graph_path=str(tmp_path / "out" / "graph"),
+        )
+        processor.ingest()
+        assert processor.delta is not None
+        return processor.delta
+
+    assert ingest().added == ["A.md"]
+    assert len(output_file.read_text().splitlines()) == 1
+
+    (vault_path / "A.md").unlink()
+    assert ingest().deleted == ["A.md"]
+    assert output_file.read_text() == ""
+
+    delta = ingest()
+    assert not delta.has_changes()
+    assert delta.deleted == []
@@ -0,0 +1,72 @@
+import dataclasses
+import pytest
+import numpy as np
+
+from atlas.core.embedder.config import EncoderConfig
+from atlas.core.embedder.encoder_factory import create_encoder
+from atlas.core.embedder.onnx_runtime.impl_encoder import (
+    ONNX_MODEL_FILE,
+    QUANTIZED_MODEL_FILE,
+    OnnxEncoder,
+)
+from atlas.core.embedder.sentence_transformer.impl_encoder import (
+    SentenceTransformerEncoder,
+)
+
+
+def cosine_similarities(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Get the cosine similarity of every row of `a` with the same row of `b`.
+
+    Args:
+        a (np.ndarray): Embeddings, of shape `(num_texts, dim)`.
+        b (np.ndarray): Embeddings, of shape `(num_texts, dim)`.
+
+    Returns:
+        np.ndarray: The cosine similarities, of shape `(num_texts,)`.
+    """
+    return np.sum(a * b, axis=1) / (
+        np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    )
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_onnx_encoder_parity(tmp_path, tiny_encoder_config: EncoderConfig):
+    """
+    Test that the ONNX Runtime encoder selected through the configuration exports the
+    model once and gives the embeddings of the PyTorch encoder, and that its int8
+    quantized export agrees with them in cosine similarity.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        tiny_encoder_config (EncoderConfig): Configuration of a tiny local model.
+    """
+    texts = ["lorem ipsum", "do re mi fa so la ti " * 20, "hello world", "a", "b c"]
+    expected = SentenceTransformerEncoder(tiny_encoder_config).encode(texts)
+
+    onnx_dir = tmp_path / "onnx"
+    onnx_config = dataclasses.replace(
+        tiny_encoder_config, backend="onnx", onnx_dir=str(onnx_dir)
+    )
+    encoder = create_encoder(onnx_config)
+    assert isinstance(encoder, OnnxEncoder)
+    assert (onnx_dir / ONNX_MODEL_FILE).exists()
+    assert not (onnx_dir / QUANTIZED_MODEL_FILE).exists()
+    embeddings = encoder.encode(texts)
+    assert embeddings.dtype == np.float32
+    assert np.allclose(embeddings, expected, atol=1e-5)
+
+    # the export is reused and only quantized
+    export_mtime = (onnx_dir / ONNX_MODEL_FILE).stat().st_mtime_ns
+    quantized_encoder = OnnxEncoder(
+        dataclasses.replace(onnx_config, quantize=True, max_batch_tokens=40)
+    )
+    assert (onnx_dir / ONNX_MODEL_FILE).stat().st_mtime_ns == export_mtime
+    assert (onnx_dir / QUANTIZED_MODEL_FILE).exists()
+    quantized_embeddings = quantized_encoder.encode(texts)
+    assert quantized_embeddings.shape == expected.shape
+    assert np.all(cosine_similarities(quantized_embeddings, expected) > 0.99)
+
+    with pytest.raises(ValueError):
+        create_encoder(dataclasses.replace(tiny_encoder_config, backend="tensorrt"))
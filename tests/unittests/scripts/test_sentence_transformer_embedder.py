@@ -1,14 +1,21 @@
 import pytest
 import json
+import numpy as np
+import yaml
+from dataclasses import asdict
 from pathlib import Path
 from typing import List, Dict
 
+from atlas.core.embedder.config import EncoderConfig
+from atlas.core.embedder.embedding_cache import EmbeddingCache
+from atlas.core.embedder.embedding_store import load_embeddings
 from atlas.core.embedder.sentence_transformer.impl_embedder import (
     SentenceTransformerEmbedder,
 )
 from atlas.core.embedder.sentence_transformer.impl_encoder import (
     SentenceTransformerEncoder,
 )
+from atlas.utils.io_utils import write_records
 
 
 @pytest.fixture
@@ -182,8 +189,14 @@ def test_save_embedded_chunks(tmp_path: Path, dummy_encoder_config_path: Path):
     assert output_file_path.exists()
     with output_file_path.open("r", encoding="utf-8") as f:
         saved_data = json.load(f)
+    embedding = dummy_embedded_chunks[0].pop("embedding")
     assert saved_data == dummy_embedded_chunks
 
+    vectors, chunk_ids = load_embeddings(output_file_path)
+    assert vectors.dtype == np.float32
+    assert vectors.tolist() == [embedding]
+    assert chunk_ids == [dummy_embedded_chunks[0]["chunk_id"]]
+
 
 @pytest.mark.unittest
 @pytest.mark.runonci
@@ -210,4 +223,98 @@ def test_embed(
     with output_file_path.open("r", encoding="utf-8") as f:
         saved_data = json.load(f)
 
-    assert len(saved_data[0]["embedding"]) == 384
+    assert "embedding" not in saved_data[0]
+    vectors, chunk_ids = load_embeddings(output_file_path)
+    assert vectors.shape == (len(saved_data), 384)
+    assert chunk_ids == [chunk["chunk_id"] for chunk in saved_data]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_embed_chunks_cached(
+    tmp_path: Path,
+    dummy_encoder_config_path: Path,
+    dummy_chunks: List[Dict],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """
+    Test that with an embedding cache, a rebuild after an edit only encodes the chunks whose
+    text changed and returns the same embeddings for the others.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        dummy_encoder_config_path (Path): The path to the dummy encoder configuration file.
+        dummy_chunks (List[Dict]): The dummy chunks to embed.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to spy on the encoded texts.
+    """
+    cache_path = tmp_path / "embedding_cache.sqlite"
+    embedder = SentenceTransformerEmbedder(
+        "dummy_path",
+        "dummy_output",
+        str(dummy_encoder_config_path),
+        cache_path=str(cache_path),
+    )
+    embedded_chunks = embedder.embed_chunks(dummy_chunks)
+
+    encoded_texts: List[str] = []
+    encode = embedder.encoder.encode
+
+    def spy_encode(texts):
+        encoded_texts.extend(texts)
+        return encode(texts)
+
+    monkeypatch.setattr(embedder.encoder, "encode", spy_encode)
+    edited_chunks = [dummy_chunks[0], {**dummy_chunks[1], "text": "An edited chunk."}]
+    reembedded_chunks = embedder.embed_chunks(edited_chunks)
+
+    assert encoded_texts == ["An edited chunk."]
+    assert np.array_equal(
+        reembedded_chunks[0]["embedding"], embedded_chunks[0]["embedding"]
+    )
+    assert len(reembedded_chunks[1]["embedding"]) == 384
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_embed_cache_hits_update_eviction(
+    tmp_path: Path, tiny_encoder_config: EncoderConfig
+):
+    """
+    Test that a run in which every chunk is a cache hit marks the embeddings as recently
+    used, so that the next eviction drops the least recently used embedding rather than
+    the least recently inserted one.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        tiny_encoder_config (EncoderConfig): Configuration of a tiny local model.
+    """
+    config_path = tmp_path / "encoder_config.yaml"
+    with config_path.open("w", encoding="utf-8") as f:
+        yaml.safe_dump(asdict(tiny_encoder_config), f)
+    cache_path = tmp_path / "embedding_cache.sqlite"
+
+    def embed(text: str) -> None:
+        chunk_data_path = tmp_path / "chunked_data.jsonl"
+        write_records(chunk_data_path, [{"chunk_id": text, "text": text}])
+        SentenceTransformerEmbedder(
+            str(chunk_data_path),
+            str(tmp_path / "embedded_chunks.jsonl"),
+            str(config_path),
+            cache_path=str(cache_path),
+            cache_max_entries=2,
+        ).embed()
+
+    embed("first text")
+    embed("second text")
+    # only cache hits, the first text is now the most recently used
+    embed("first text")
+    embed("third text")
+
+    cache = EmbeddingCache(
+        cache_path,
+        tiny_encoder_config.model_name,
+        tiny_encoder_config.normalize_embeddings,
+    )
+    cached = cache.get(["first text", "second text", "third text"])
+    assert [embedding is not None for embedding in cached] == [True, False, True]
+    cache.close()
@@ -1,4 +1,7 @@
+import dataclasses
 import pytest
+import numpy as np
+import torch
 
 from atlas.core.embedder.config import EncoderConfig
 from atlas.core.embedder.sentence_transformer.impl_encoder import (
@@ -35,3 +38,65 @@ def test_encode(dummy_encoder_config: EncoderConfig):
     texts = ["lorem ipsum", "do re mi fa so la ti", "hello world"]
     embeddings = encoder.encode(texts)
     assert embeddings.shape == (3, 384)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_encode_token_batches(dummy_encoder_config: EncoderConfig):
+    """
+    Test that encoding texts in token budget batches gives the same embeddings, in the same
+    order, as fixed size batches.
+
+    Args:
+        dummy_encoder_config (EncoderConfig): Loaded encoder configuration data.
+    """
+    encoder = SentenceTransformerEncoder(dummy_encoder_config)
+    texts = ["lorem ipsum", "do re mi fa so la ti " * 50, "hello world", "a"]
+    embeddings = encoder.encode(texts)
+
+    encoder.config = dataclasses.replace(dummy_encoder_config, max_batch_tokens=64)
+    lengths = encoder.token_lengths(texts)
+    assert encoder.model is not None
+    assert lengths[1] == encoder.model.max_seq_length
+    assert np.allclose(encoder.encode(texts), embeddings, atol=1e-5)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_encode_worker_pool(tiny_encoder_config: EncoderConfig):
+    """
+    Test that encoding with a pool of CPU worker processes gives the same embeddings, in
+    the same order, as encoding in the current process, with fixed size and token budget
+    batches.
+
+    Args:
+        tiny_encoder_config (EncoderConfig): Configuration of a tiny local model.
+    """
+    texts = ["lorem ipsum", "do re mi fa so la ti " * 20, "hello world", "a", "b c"]
+    # CUDA falls back to the CPU when it is not available
+    encoder = SentenceTransformerEncoder(
+        dataclasses.replace(tiny_encoder_config, device="cuda")
+    )
+    assert encoder.model is not None
+    expected_device = "cuda" if torch.cuda.is_available() else "cpu"
+    assert encoder.model.device.type == expected_device
+    embeddings = encoder.encode(texts)
+
+    pool_config = dataclasses.replace(
+        tiny_encoder_config, num_workers=2, threads_per_worker=1
+    )
+    pool_encoder = SentenceTransformerEncoder(pool_config)
+    assert pool_encoder.model is None
+    try:
+        assert np.allclose(pool_encoder.encode(texts), embeddings, atol=1e-5)
+        # the batches are scheduled in the main process, the workers are reused
+        pool_encoder.config = dataclasses.replace(pool_config, max_batch_tokens=40)
+        assert np.allclose(pool_encoder.encode(texts), embeddings, atol=1e-5)
+    finally:
+        pool_encoder.close()
+    assert pool_encoder.pool is None
+
+    with pytest.raises(ValueError):
+        SentenceTransformerEncoder(
+            dataclasses.replace(tiny_encoder_config, num_workers=0)
+        )
@@ -3,6 +3,9 @@ import json
 from pathlib import Path
 
 from atlas.core.chunker.structural_chunker import StructuralChunker
+from atlas.core.chunker.token_counter import TokenCounter
+from atlas.utils.markdown_utils import scan_markdown
+from atlas.utils.io_utils import iter_records, write_records
 
 
 @pytest.mark.unittest
@@ -78,6 +81,33 @@ def test_split_by_headings():
     assert sections[1]["text"] == "This is some text under heading 2."
 
 
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_split_by_headings_with_offsets():
+    """Test splitting text by headings using the heading offsets found by the ingester."""
+    chunker = StructuralChunker(
+        processed_data_path="dummy_path", output_path="dummy_output", max_words=250
+    )
+    text = "Intro text.\n## Heading 1\nText under heading 1.\n## Heading 2\n\nText 2."
+    headings = scan_markdown(text).headings
+    sections = chunker._split_by_headings(text, headings)
+    assert sections == chunker._split_by_headings(text)
+    assert sections == [
+        {"heading": None, "text": "Intro text.", "start": 0, "end": 11},
+        {
+            "heading": "Heading 1",
+            "text": "Text under heading 1.",
+            "start": 25,
+            "end": 46,
+        },
+        {"heading": "Heading 2", "text": "Text 2.", "start": 61, "end": 68},
+    ]
+    assert all(
+        text[section["start"] : section["end"]] == section["text"]
+        for section in sections
+    )
+
+
 @pytest.mark.unittest
 @pytest.mark.runonci
 def test_make_chunk():
@@ -155,6 +185,27 @@ def test_create_chunks(dummy_processed_data_path: Path):
             assert chunk["heading"] == "Roguelikes and Life"
 
 
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_iter_chunks(dummy_processed_data_path: Path):
+    """
+    Test creating chunks lazily from a stream of notes.
+
+    Args:
+        dummy_processed_data_path (Path): Path to the dummy processed data file.
+    """
+    chunker = StructuralChunker(
+        processed_data_path=str(dummy_processed_data_path),
+        output_path=str(dummy_processed_data_path.parent / "chunked_data.json"),
+        max_words=100,
+    )
+    chunks = chunker.iter_chunks(chunker.iter_processed_data())
+    assert not isinstance(chunks, list)
+    processed_data = chunker.read_processed_data()
+    assert processed_data is not None
+    assert list(chunks) == chunker.create_chunks(processed_data)
+
+
 @pytest.mark.unittest
 @pytest.mark.runonci
 def test_save_chunked_data(tmp_path: Path):
@@ -215,3 +266,222 @@ def test_chunk(tmp_path: Path, dummy_processed_data_path: Path):
         saved_data[0]["note_id"]
         == "_learning about me/what I learnt about myself when dealing with ADHD.md"
     )
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_chunk_jsonl(tmp_path: Path, dummy_processed_data_path: Path):
+    """
+    Test the chunking process with streaming JSON Lines input and output files.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+        dummy_processed_data_path (Path): Path to the dummy processed data file.
+    """
+    processed_data_path = tmp_path / "obsidian_index.jsonl"
+    write_records(processed_data_path, iter_records(dummy_processed_data_path))
+
+    chunker = StructuralChunker(
+        processed_data_path=str(processed_data_path),
+        output_path=str(tmp_path / "chunked_data.jsonl"),
+        max_words=250,
+    )
+    chunker.chunk()
+    saved_data = list(iter_records(tmp_path / "chunked_data.jsonl"))
+
+    json_chunker = StructuralChunker(
+        processed_data_path=str(dummy_processed_data_path),
+        output_path=str(tmp_path / "chunked_data.json"),
+        max_words=250,
+    )
+    json_chunker.chunk()
+    with (tmp_path / "chunked_data.json").open("r", encoding="utf-8") as f:
+        assert saved_data == json.load(f)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_create_chunks_max_tokens(character_tokenizer) -> None:
+    """
+    Test chunking by tokens of the encoder's tokenizer, where a note with few words but many
+    tokens is split so that no chunk exceeds `max_tokens` (including special tokens).
+
+    Args:
+        character_tokenizer (PreTrainedTokenizerFast): Tokenizer with one token per character.
+    """
+    raw_text = "# Intro\nshort\n# Code\nabcdefgh ijklmnop\nqrst\n"
+    note = {
+        "note_id": "note.md",
+        "title": "note",
+        "relative_path": "note.md",
+        "raw_text": raw_text,
+        "frontmatter": {},
+        "headings": scan_markdown(raw_text).headings,
+        "tags": [],
+        "wikilinks": [],
+        "word_count": 4,
+    }
+    token_counter = TokenCounter(character_tokenizer)
+    chunker = StructuralChunker(
+        processed_data_path="dummy_path",
+        output_path="dummy_output",
+        max_words=250,
+        max_tokens=14,
+        token_counter=token_counter,
+    )
+    chunks = list(chunker.iter_chunks([note]))
+
+    assert [(chunk["heading"], chunk["text"]) for chunk in chunks] == [
+        ("Intro", "short"),
+        ("Code", "abcdefgh"),
+        ("Code", "ijklmnop\nqrst"),
+    ]
+    assert all(
+        count + token_counter.num_special_tokens <= 14
+        for count in token_counter.count([chunk["text"] for chunk in chunks])
+    )
+
+    with pytest.raises(ValueError):
+        StructuralChunker("dummy_path", "dummy_output", max_words=250, max_tokens=12)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+@pytest.mark.parametrize("compact", [False, True])
+def test_create_chunks_overlap(compact: bool) -> None:
+    """
+    Test that the chunks of a section split by size share `overlap` words, while the
+    sections themselves do not overlap.
+
+    Args:
+        compact (bool): Whether the chunks are compact.
+    """
+    raw_text = "# Intro\none two  three\nfour five six seven\n# Short\neight nine\n"
+    note = {
+        "note_id": "note.md",
+        "title": "note",
+        "relative_path": "note.md",
+        "raw_text": raw_text,
+        "frontmatter": {},
+        "headings": scan_markdown(raw_text).headings,
+        "tags": [],
+        "wikilinks": [],
+        "word_count": 10,
+    }
+    chunker = StructuralChunker(
+        "dummy_path", "dummy_output", max_words=3, overlap=1, compact=compact
+    )
+    chunks = chunker.create_chunks([note])
+
+    text = raw_text.strip()
+    chunk_texts = [
+        text[chunk["start"] : chunk["end"]] if compact else chunk["text"]
+        for chunk in chunks
+    ]
+    assert [chunk_text.split() for chunk_text in chunk_texts] == [
+        ["one", "two", "three"],
+        ["three", "four", "five"],
+        ["five", "six", "seven"],
+        ["eight", "nine"],
+    ]
+    assert [chunk["word_count"] for chunk in chunks] == [3, 3, 3, 2]
+    assert [chunk["chunk_index"] for chunk in chunks] == [0, 1, 2, 3]
+    # whitespace is normalized unless the chunks are slices of the note text
+    assert chunk_texts[0] == ("one two  three" if compact else "one two three")
+    assert chunk_texts[1] == ("three\nfour five" if compact else "three four five")
+
+    with pytest.raises(ValueError):
+        StructuralChunker("dummy_path", "dummy_output", max_words=3, overlap=3)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_parallel_chunking(dummy_processed_data_path: Path, tmp_path: Path) -> None:
+    """
+    Test if chunking with multiple workers creates the same chunks in the same order as
+    serial chunking, and reports the throughput of every worker.
+
+    Args:
+        dummy_processed_data_path (Path): Path to the dummy processed data file.
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    processed_data_path = tmp_path / "obsidian_index.jsonl"
+    notes = list(iter_records(dummy_processed_data_path))
+    write_records(
+        processed_data_path,
+        [
+            {**note, "note_id": f"{idx}/{note['note_id']}"}
+            for idx in range(5)
+            for note in notes
+        ],
+    )
+
+    serial_chunker = StructuralChunker(
+        str(processed_data_path), str(tmp_path / "serial.jsonl"), max_words=50
+    )
+    serial_chunker.chunk()
+    parallel_chunker = StructuralChunker(
+        str(processed_data_path),
+        str(tmp_path / "parallel.jsonl"),
+        max_words=50,
+        workers=2,
+        batch_size=3,
+    )
+    parallel_chunker.chunk()
+
+    serial_chunks = list(iter_records(tmp_path / "serial.jsonl"))
+    assert len(serial_chunks) > 10
+    assert list(iter_records(tmp_path / "parallel.jsonl")) == serial_chunks
+    assert serial_chunker.worker_stats == {}
+    assert 1 <= len(parallel_chunker.worker_stats) <= 2
+    assert sum(stats.notes for stats in parallel_chunker.worker_stats.values()) == 10
+    assert sum(stats.chunks for stats in parallel_chunker.worker_stats.values()) == len(
+        serial_chunks
+    )
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_parallel_incremental_chunking(
+    dummy_processed_data_path: Path, tmp_path: Path
+) -> None:
+    """
+    Test if incremental chunking with multiple workers only sends the changed notes to the
+    workers and keeps the carried over chunks in order.
+
+    Args:
+        dummy_processed_data_path (Path): Path to the dummy processed data file.
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    processed_data_path = tmp_path / "obsidian_index.jsonl"
+    notes = [
+        {**note, "note_id": f"{idx}/{note['note_id']}"}
+        for idx in range(5)
+        for note in iter_records(dummy_processed_data_path)
+    ]
+    write_records(processed_data_path, notes)
+
+    def chunk(output_name: str, incremental: bool) -> StructuralChunker:
+        chunker = StructuralChunker(
+            str(processed_data_path),
+            str(tmp_path / output_name),
+            max_words=50,
+            incremental=incremental,
+            stable_ids=True,
+            workers=2,
+            batch_size=3,
+        )
+        chunker.chunk()
+        return chunker
+
+    chunk("chunked_data.jsonl", incremental=True)
+    notes[3] = {**notes[3], "raw_text": notes[3]["raw_text"] + "\nOne more line."}
+    write_records(processed_data_path, notes)
+    chunker = chunk("chunked_data.jsonl", incremental=True)
+    assert sum(stats.notes for stats in chunker.worker_stats.values()) == 1
+    assert chunker.delta is not None and chunker.delta.has_changes()
+
+    chunk("full.jsonl", incremental=False)
+    assert list(iter_records(tmp_path / "chunked_data.jsonl")) == list(
+        iter_records(tmp_path / "full.jsonl")
+    )
@@ -0,0 +1,83 @@
+import pytest
+from pathlib import Path
+
+from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+from benchmarks.synthetic_vault import VaultSpec, generate_vault, note_relative_path
+
+
+def read_vault(vault_path: Path) -> dict:
+    """
+    Read the notes of a vault.
+
+    Args:
+        vault_path (Path): The path to the vault.
+
+    Returns:
+        dict: The content of every note, by relative path.
+    """
+    return {
+        path.relative_to(vault_path).as_posix(): path.read_bytes()
+        for path in sorted(vault_path.rglob("*.md"))
+    }
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_generate_vault_deterministic(tmp_path: Path) -> None:
+    """
+    Test if the same spec always generates the same vault, if a smaller vault is a
+    prefix of a larger one and if another seed generates another vault.
+
+    Args:
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    spec = VaultSpec(num_notes=30, seed=7)
+    first = read_vault(generate_vault(tmp_path / "first", spec))
+    second = read_vault(generate_vault(tmp_path / "second", spec))
+    assert first == second
+    assert len(first) == 30
+
+    other_seed = read_vault(
+        generate_vault(tmp_path / "other", VaultSpec(num_notes=30, seed=8))
+    )
+    assert other_seed != first
+
+    smaller = read_vault(
+        generate_vault(tmp_path / "smaller", VaultSpec(num_notes=10, seed=7))
+    )
+    # wikilink targets depend on the number of notes, the paths dont
+    assert set(smaller) == {note_relative_path(spec, idx) for idx in range(10)}
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_generate_vault_spec(tmp_path: Path) -> None:
+    """
+    Test if the generated notes follow the spec and can be ingested.
+
+    Args:
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    spec = VaultSpec(
+        num_notes=20,
+        mean_words=200,
+        size_sigma=0,
+        max_heading_depth=2,
+        tag_density=0.05,
+        wikilink_density=0.05,
+        frontmatter_keys=8,
+    )
+    vault_path = generate_vault(tmp_path / "vault", spec)
+    notes = ObsidianVaultProcessor(
+        str(vault_path), str(tmp_path / "out.json")
+    ).process()
+
+    assert len(notes) == spec.num_notes
+    for note in notes:
+        assert len(note["frontmatter"]) == spec.frontmatter_keys
+        assert note["headings"]
+        assert all(heading["level"] <= 2 for heading in note["headings"])
+        # headings and multi word wikilinks only add to the body words
+        assert note["word_count"] >= spec.mean_words
+    assert any(note["tags"] for note in notes)
+    assert any(note["wikilinks"] for note in notes)
@@ -0,0 +1,124 @@
+import pytest
+
+from atlas.core.chunker.token_counter import TokenCounter
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_count(character_tokenizer, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test if tokens are counted in batches, without the special tokens, and if the counts
+    of already seen texts are served from the cache.
+
+    Args:
+        character_tokenizer (PreTrainedTokenizerFast): Tokenizer with one token per character.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to spy on the tokenizer calls.
+    """
+    counter = TokenCounter(character_tokenizer, batch_size=2, max_cache_entries=3)
+    assert counter.num_special_tokens == 2
+
+    batches = []
+    tokenize = counter._tokenize
+
+    def spy_tokenize(texts, return_offsets=False):
+        batches.append(list(texts))
+        return tokenize(texts, return_offsets)
+
+    monkeypatch.setattr(counter, "_tokenize", spy_tokenize)
+
+    assert counter.count(["ab cd", "xyz", "ab cd", "q", ""]) == [4, 3, 4, 1, 0]
+    # duplicates are tokenized once, in batches of 2
+    assert batches == [["ab cd", "xyz"], ["q", ""]]
+
+    batches.clear()
+    # "xyz" is the least recently used count and was evicted
+    assert counter.count(["q", "", "new"]) == [1, 0, 3]
+    assert batches == [["new"]]
+    # only the 3 most recently used counts are kept
+    assert counter.count(["ab cd"]) == [4]
+    assert batches == [["new"], ["ab cd"]]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+@pytest.mark.parametrize(
+    "text, max_tokens, expected",
+    [
+        ("ab cd efg", 4, ["ab cd", "efg"]),
+        ("ab cd efg", 3, ["ab", "cd", "efg"]),
+        ("ab\n\n  cd", 10, ["ab\n\n  cd"]),
+        # a word longer than the limit is cut inside the word
+        ("abcdefgh", 3, ["abc", "def", "gh"]),
+        # punctuation stays attached to its word
+        ("ab, cd", 2, ["ab", ",", "cd"]),
+        ("ab, cd", 3, ["ab,", "cd"]),
+        ("", 3, []),
+    ],
+)
+def test_split(
+    character_tokenizer, text: str, max_tokens: int, expected: list[str]
+) -> None:
+    """
+    Test if a text is split into pieces of at most `max_tokens` tokens, cut between words
+    whenever possible.
+
+    Args:
+        character_tokenizer (PreTrainedTokenizerFast): Tokenizer with one token per character.
+        text (str): The text to split.
+        max_tokens (int): The maximum number of tokens per piece.
+        expected (list[str]): The expected pieces.
+    """
+    counter = TokenCounter(character_tokenizer)
+    pieces = counter.split(text, max_tokens)
+    assert pieces == expected
+    assert all(count <= max_tokens for count in counter.count(pieces))
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+@pytest.mark.parametrize(
+    "text, max_tokens, overlap, expected",
+    [
+        ("ab cd ef gh", 5, 2, ["ab cd", "cd ef", "ef gh"]),
+        ("ab cd ef gh ij", 6, 3, ["ab cd ef", "ef gh ij"]),
+        # the overlap never cuts a word in two
+        ("ab cd ef gh", 5, 1, ["ab cd", "ef gh"]),
+        # a window which would add no token after the previous one is skipped
+        ("ab cd efg", 4, 2, ["ab cd", "efg"]),
+    ],
+)
+def test_split_overlap(
+    character_tokenizer, text: str, max_tokens: int, overlap: int, expected: list[str]
+) -> None:
+    """
+    Test if consecutive pieces share at most `overlap` tokens, starting at a word boundary.
+
+    Args:
+        character_tokenizer (PreTrainedTokenizerFast): Tokenizer with one token per character.
+        text (str): The text to split.
+        max_tokens (int): The maximum number of tokens per piece.
+        overlap (int): The maximum number of tokens shared by consecutive pieces.
+        expected (list[str]): The expected pieces.
+    """
+    counter = TokenCounter(character_tokenizer)
+    pieces = [
+        text[start:end] for start, end in counter.split_spans(text, max_tokens, overlap)
+    ]
+    assert pieces == expected
+
+    with pytest.raises(ValueError):
+        counter.split_spans(text, max_tokens, overlap=max_tokens)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_slow_tokenizer_rejected() -> None:
+    """
+    Test if a tokenizer which is not a fast tokenizer (no character offsets) is rejected.
+    """
+
+    class SlowTokenizer:
+        is_fast = False
+
+    with pytest.raises(ValueError):
+        TokenCounter(SlowTokenizer())
@@ -0,0 +1,120 @@
+import pytest
+from pathlib import Path
+
+from atlas.core.ingester.vault_walker import IgnoreRules, VaultWalker
+
+
+@pytest.fixture
+def dummy_vault_tree(tmp_path: Path) -> Path:
+    """
+    Create a dummy vault tree with folders which should be ignored.
+
+    Args:
+        tmp_path (Path): Temporary path provided by pytest.
+
+    Returns:
+        Path: The path to the created dummy vault.
+    """
+    vault_path = tmp_path / "vault"
+    for relative_path in [
+        ".obsidian/plugins/readme.md",
+        ".trash/deleted.md",
+        ".git/info.md",
+        "attachments/big/pasted.md",
+        "b folder/note b.md",
+        "b folder/draft.md",
+        "a note.md",
+        "nested/.obsidian/readme.md",
+        "nested/keep.md",
+        "nested/image.png",
+    ]:
+        file_path = vault_path / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("text")
+    return vault_path
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_walk_default_ignores(dummy_vault_tree: Path) -> None:
+    """
+    Test that the walker skips the default ignored folders at any depth, only yields
+    markdown files, and yields them in a deterministic order (files of a folder before its
+    sub folders) with their stat results.
+
+    Args:
+        dummy_vault_tree (Path): The path to the dummy vault.
+    """
+    files = list(VaultWalker(dummy_vault_tree).walk())
+    assert [f.relative_path for f in files] == [
+        "a note.md",
+        "attachments/big/pasted.md",
+        "b folder/draft.md",
+        "b folder/note b.md",
+        "nested/keep.md",
+    ]
+    assert files[0].path == dummy_vault_tree / "a note.md"
+    assert files[0].size == 4
+    assert files[0].mtime_ns == (dummy_vault_tree / "a note.md").stat().st_mtime_ns
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_walk_custom_ignores(dummy_vault_tree: Path) -> None:
+    """
+    Test that the walker honours custom gitignore-style ignore patterns.
+
+    Args:
+        dummy_vault_tree (Path): The path to the dummy vault.
+    """
+    walker = VaultWalker(
+        dummy_vault_tree, ignore_patterns=["/attachments/", "draft*.md", "!.trash/"]
+    )
+    assert [f.relative_path for f in walker.walk()] == [
+        "a note.md",
+        ".trash/deleted.md",
+        "b folder/note b.md",
+        "nested/keep.md",
+    ]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_ignore_rules() -> None:
+    """
+    Test the matching of gitignore-style patterns.
+    """
+    rules = IgnoreRules(
+        ["# comment", "*.tmp", "build/", "docs/**/private", "!keep.tmp"]
+    )
+    assert rules.is_ignored("a.tmp", is_dir=False)
+    assert rules.is_ignored("x/y/a.tmp", is_dir=False)
+    assert not rules.is_ignored("keep.tmp", is_dir=False)
+    assert rules.is_ignored("x/build", is_dir=True)
+    assert not rules.is_ignored("x/build", is_dir=False)
+    assert rules.is_ignored("docs/private", is_dir=True)
+    assert rules.is_ignored("docs/a/b/private", is_dir=True)
+    assert not rules.is_ignored("other/docs/private", is_dir=True)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_includes(dummy_vault_tree: Path) -> None:
+    """
+    Test if `includes` agrees with the walk for existing files and works for paths
+    which dont exist.
+
+    Args:
+        dummy_vault_tree (Path): The path to the dummy vault.
+    """
+    walker = VaultWalker(dummy_vault_tree, ignore_patterns=["/attachments/"])
+    walked = {f.relative_path for f in walker.walk()}
+    for file_path in dummy_vault_tree.rglob("*"):
+        if file_path.is_file():
+            relative_path = file_path.relative_to(dummy_vault_tree).as_posix()
+            assert walker.includes(relative_path) == (relative_path in walked)
+
+    assert walker.includes("new folder/new note.md")
+    assert not walker.includes(".obsidian/new note.md")
+    assert walker.includes("new folder", is_dir=True)
+    assert not walker.includes("attachments", is_dir=True)
@@ -0,0 +1,420 @@
+# mypy: disable-error-code=arg-type
+import pytest
+import threading
+import time
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, cast
+
+from atlas.core.chunker.structural_chunker import StructuralChunker
+from atlas.core.embedder.base.base_embedder import BaseEmbedder
+from atlas.core.indexer.faiss_vector_store import FaissVectorStore
+from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+from atlas.core.watcher.vault_watcher import ChangeDebouncer, VaultWatcher
+
+DIM = 8
+
+
+class FakeEmbedder(BaseEmbedder):
+    """Embedder which derives deterministic embeddings from the chunk text, no model needed."""
+
+    def load_encoder(self) -> None:
+        """No encoder to load, only keep track of the embedded texts."""
+        self.embedded_texts: List[str] = []
+
+    def embed_chunks(self, chunks: List[Dict]) -> List[Dict]:
+        """
+        Embed the chunks with a hash of their text.
+
+        Args:
+            chunks (List[Dict]): List of chunk dictionaries to be embedded.
+
+        Returns:
+            List[Dict]: List of chunk dictionaries with added embeddings.
+        """
+        embedded_chunks = []
+        for chunk in chunks:
+            self.embedded_texts.append(chunk["text"])
+            digest = hashlib.sha256(chunk["text"].encode("utf-8")).digest()
+            embedding = np.frombuffer(digest[:DIM], dtype=np.uint8) / 255.0
+            embedded_chunks.append({**chunk, "embedding": embedding.tolist()})
+        return embedded_chunks
+
+
+@pytest.fixture
+def dummy_vault_path(tmp_path: Path) -> Path:
+    """
+    Create a dummy obsidian vault with two notes.
+
+    Args:
+        tmp_path (Path): Temporary path provided by pytest.
+
+    Returns:
+        Path: The path to the created dummy obsidian vault.
+    """
+    vault_path = tmp_path / "vault"
+    (vault_path / ".obsidian").mkdir(parents=True)
+    (vault_path / ".obsidian" / "app.json").write_text("{}")
+    (vault_path / "folder").mkdir()
+    (vault_path / "first.md").write_text("# First\n\nThe first note.\n")
+    (vault_path / "folder" / "second.md").write_text("# Second\n\nThe second note.\n")
+    return vault_path
+
+
+def make_watcher(vault_path: Path, tmp_path: Path, **kwargs) -> VaultWatcher:
+    """
+    Create a vault watcher over the dummy vault with a fake embedder.
+
+    Args:
+        vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+
+    Returns:
+        VaultWatcher: The vault watcher.
+    """
+    processed_data_path = tmp_path / "out" / "obsidian_index.jsonl"
+    chunked_data_path = tmp_path / "out" / "chunked_data.jsonl"
+    return VaultWatcher(
+        processor=ObsidianVaultProcessor(
+            vault_path, processed_data_path, incremental=True
+        ),
+        chunker=StructuralChunker(processed_data_path, chunked_data_path, 250),
+        embedder=FakeEmbedder(
+            chunked_data_path, tmp_path / "out" / "embedded.jsonl", "unused"
+        ),
+        store=FaissVectorStore(dim=DIM),
+        results_path=str(tmp_path / "results"),
+        **kwargs,
+    )
+
+
+def store_of(watcher: VaultWatcher) -> FaissVectorStore:
+    """
+    Get the vector store of a watcher created by `make_watcher`.
+
+    Args:
+        watcher (VaultWatcher): The vault watcher.
+
+    Returns:
+        FaissVectorStore: Its vector store.
+    """
+    return cast(FaissVectorStore, watcher.store)
+
+
+def indexed_note_ids(store: FaissVectorStore) -> List[str]:
+    """
+    Get the sorted IDs of the notes in a vector store.
+
+    Args:
+        store (FaissVectorStore): The vector store.
+
+    Returns:
+        List[str]: The IDs of the notes with at least one chunk in the store.
+    """
+    return sorted({chunk["note_id"] for chunk in store.metadata})
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_change_debouncer() -> None:
+    """
+    Test if the debouncer coalesces a burst of changes and releases them once the
+    vault is quiet, or at the latest after the maximum delay.
+    """
+    now = [0.0]
+    debouncer = ChangeDebouncer(2.0, 5.0, clock=lambda: now[0])
+    assert debouncer.pop_ready() == set()
+
+    debouncer.notify(["a.md"])
+    now[0] = 1.5
+    debouncer.notify(["b.md", "a.md"])
+    now[0] = 3.0
+    assert debouncer.pop_ready() == set()  # only 1.5s since the last change
+    now[0] = 3.5
+    assert debouncer.pop_ready() == {"a.md", "b.md"}
+    assert debouncer.pop_ready() == set()
+
+    # constant stream of changes, released after the maximum delay
+    for step in range(12):
+        now[0] = 10.0 + step * 0.5
+        debouncer.notify([f"{step}.md"])
+        ready = debouncer.pop_ready()
+        if ready:
+            break
+    assert now[0] == 15.0
+    assert len(ready) == 11
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_refresh(dummy_vault_path: Path, tmp_path: Path) -> None:
+    """
+    Test if a refresh upserts only the added and modified notes into the vector store and
+    removes the deleted ones, keeping the index and the metadata in sync.
+
+    Args:
+        dummy_vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    watcher = make_watcher(dummy_vault_path, tmp_path)
+    delta = watcher.refresh()
+    assert delta is not None
+    assert indexed_note_ids(store_of(watcher)) == ["first.md", "folder/second.md"]
+    assert store_of(watcher).index.ntotal == len(store_of(watcher).metadata)
+    second_chunks = [
+        chunk
+        for chunk in store_of(watcher).metadata
+        if chunk["note_id"] == "folder/second.md"
+    ]
+
+    (dummy_vault_path / "first.md").write_text("# First\n\nThe first note, edited.\n")
+    (dummy_vault_path / "folder" / "second.md").unlink()
+    (dummy_vault_path / "third.md").write_text("# Third\n\nA new note.\n")
+    delta = watcher.refresh()
+    assert delta is not None
+    assert delta.added == ["third.md"]
+    assert delta.modified == ["first.md"]
+    assert delta.deleted == ["folder/second.md"]
+    assert indexed_note_ids(store_of(watcher)) == ["first.md", "third.md"]
+    assert store_of(watcher).index.ntotal == len(store_of(watcher).metadata)
+    assert not any(chunk in store_of(watcher).metadata for chunk in second_chunks)
+    assert any(
+        "edited" in chunk["text"]
+        for chunk in store_of(watcher).metadata
+        if chunk["note_id"] == "first.md"
+    )
+
+    # the saved index is picked up by a new watcher (or the retriever)
+    restarted_watcher = make_watcher(dummy_vault_path, tmp_path)
+    assert store_of(restarted_watcher).metadata == store_of(watcher).metadata
+    # the embeddings are only kept in the index, not in the chunk metadata
+    assert all("embedding" not in chunk for chunk in store_of(watcher).metadata)
+    query = store_of(watcher).index.reconstruct(0)
+    assert restarted_watcher.store.search(query, k=1)[0]["chunk_id"] == (
+        store_of(watcher).metadata[0]["chunk_id"]
+    )
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_refresh_rebuilds_missing_store(dummy_vault_path: Path, tmp_path: Path) -> None:
+    """
+    Test if all notes are indexed when the vector store is missing, even though the
+    ingester manifest reports them as unchanged.
+
+    Args:
+        dummy_vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    make_watcher(dummy_vault_path, tmp_path).refresh()
+    for path in (tmp_path / "results").iterdir():
+        path.unlink()
+
+    watcher = make_watcher(dummy_vault_path, tmp_path)
+    delta = watcher.refresh()
+    assert delta is not None
+    assert not delta.has_changes()
+    assert indexed_note_ids(store_of(watcher)) == ["first.md", "folder/second.md"]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_refresh_adds_in_batches(
+    dummy_vault_path: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test if a refresh adds the chunks to the vector store one embedding batch at a time
+    instead of all at once.
+
+    Args:
+        dummy_vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+        monkeypatch (pytest.MonkeyPatch): Pytest fixture to record the added batches.
+    """
+    watcher = make_watcher(dummy_vault_path, tmp_path)
+    watcher.embedder.stream_batch_size = 1
+    store = store_of(watcher)
+    added_batch_sizes: List[int] = []
+    original_add = store.add
+
+    def add(vectors: np.ndarray, metadata: List[Dict]) -> None:
+        added_batch_sizes.append(len(metadata))
+        original_add(vectors, metadata)
+
+    monkeypatch.setattr(store, "add", add)
+    watcher.refresh()
+    assert added_batch_sizes == [1, 1]
+    assert indexed_note_ids(store) == ["first.md", "folder/second.md"]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_refresh_renamed_notes(dummy_vault_path: Path, tmp_path: Path) -> None:
+    """
+    Test if the chunks of a renamed note are moved to its new note ID in the vector
+    store with their embeddings carried over rather than re-embedded.
+
+    Args:
+        dummy_vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    watcher = make_watcher(dummy_vault_path, tmp_path)
+    watcher.refresh()
+    previous_vectors, _ = watcher.store.get(["folder/second.md"])
+
+    (dummy_vault_path / "folder" / "second.md").rename(
+        dummy_vault_path / "second renamed.md"
+    )
+    assert isinstance(watcher.embedder, FakeEmbedder)
+    watcher.embedder.embedded_texts.clear()
+    delta = watcher.refresh()
+    assert delta is not None
+    assert delta.renamed == {"folder/second.md": "second renamed.md"}
+    assert watcher.embedder.embedded_texts == []
+
+    assert indexed_note_ids(store_of(watcher)) == ["first.md", "second renamed.md"]
+    vectors, chunks = watcher.store.get(["second renamed.md"])
+    assert np.allclose(vectors, previous_vectors)
+    assert all(chunk["title"] == "second renamed" for chunk in chunks)
+    assert store_of(watcher).index.ntotal == len(store_of(watcher).metadata)
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_refresh_changed_paths(dummy_vault_path: Path, tmp_path: Path) -> None:
+    """
+    Test if a refresh with the changed paths only re-indexes those notes, with a changed
+    directory standing for every note in it, while a refresh without them checks every
+    note.
+
+    Args:
+        dummy_vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    watcher = make_watcher(dummy_vault_path, tmp_path)
+    watcher.refresh()
+
+    (dummy_vault_path / "first.md").write_text("# First\n\nThe first note, edited.\n")
+    (dummy_vault_path / "folder" / "second.md").write_text("# Second\n\nEdited too.\n")
+    delta = watcher.refresh({"first.md"})
+    assert delta is not None
+    assert delta.modified == ["first.md"]
+    assert delta.unchanged == ["folder/second.md"]
+
+    (dummy_vault_path / "folder").rename(dummy_vault_path / "moved")
+    delta = watcher.refresh({"folder", "moved"})
+    assert delta is not None
+    # the note was edited before it was moved, so it is not paired as a rename
+    assert delta.deleted == ["folder/second.md"]
+    assert delta.added == ["moved/second.md"]
+    assert indexed_note_ids(store_of(watcher)) == ["first.md", "moved/second.md"]
+    assert "Edited too" in watcher.store.get(["moved/second.md"])[1][0]["text"]
+
+    (dummy_vault_path / "first.md").write_text("# First\n\nEdited again.\n")
+    delta = watcher.refresh()
+    assert delta is not None
+    assert delta.modified == ["first.md"]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_refresh_reuses_unchanged_chunks(
+    dummy_vault_path: Path, tmp_path: Path
+) -> None:
+    """
+    Test if only the chunks of a modified note whose content changed are re-embedded.
+
+    Args:
+        dummy_vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    sections = {
+        heading: " ".join(f"{heading.lower()}{idx}" for idx in range(200))
+        for heading in ["Intro", "Body"]
+    }
+    note_path = dummy_vault_path / "long.md"
+    note_path.write_text(
+        "".join(f"# {heading}\n\n{text}\n\n" for heading, text in sections.items())
+    )
+    watcher = make_watcher(dummy_vault_path, tmp_path)
+    watcher.refresh()
+    assert len(watcher.store.get(["long.md"])[1]) == 2
+
+    note_path.write_text(
+        f"# Intro\n\n{sections['Intro']}\n\n# Body\n\n{sections['Body']} edited\n\n"
+    )
+    assert isinstance(watcher.embedder, FakeEmbedder)
+    watcher.embedder.embedded_texts.clear()
+    delta = watcher.refresh({"long.md"})
+    assert delta is not None
+    assert delta.modified == ["long.md"]
+    assert len(watcher.embedder.embedded_texts) == 1
+    assert watcher.embedder.embedded_texts[0].endswith("edited")
+    assert len(watcher.store.get(["long.md"])[1]) == 2
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_poll(dummy_vault_path: Path, tmp_path: Path) -> None:
+    """
+    Test if polling detects added, modified and deleted notes and skips ignored folders.
+
+    Args:
+        dummy_vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+    """
+    watcher = make_watcher(dummy_vault_path, tmp_path, use_native_events=False)
+    watcher.start()
+    assert watcher.poll() == set()
+
+    (dummy_vault_path / "first.md").write_text("# First\n\nEdited.\n")
+    (dummy_vault_path / "folder" / "second.md").unlink()
+    (dummy_vault_path / "third.md").write_text("# Third\n")
+    (dummy_vault_path / ".obsidian" / "ignored.md").write_text("# Ignored\n")
+    assert watcher.poll() == {"first.md", "folder/second.md", "third.md"}
+    assert watcher.debouncer.pop_ready() == set()  # still within the debounce period
+
+
+@pytest.mark.unittest
+@pytest.mark.parametrize("use_native_events", [True, False])
+def test_run(dummy_vault_path: Path, tmp_path: Path, use_native_events: bool) -> None:
+    """
+    Test if a running watcher makes a new note searchable without a manual refresh,
+    both with file system events and with polling.
+
+    Args:
+        dummy_vault_path (Path): The path to the dummy obsidian vault.
+        tmp_path (Path): Temporary path provided by pytest.
+        use_native_events (bool): Whether to use file system events.
+    """
+    if use_native_events:
+        pytest.importorskip("watchdog")
+    watcher = make_watcher(
+        dummy_vault_path,
+        tmp_path,
+        debounce_seconds=0.2,
+        poll_interval=0.2,
+        use_native_events=use_native_events,
+    )
+    thread = threading.Thread(target=watcher.run)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while watcher._walker is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert (watcher._observer is not None) == use_native_events
+
+        (dummy_vault_path / "third.md").write_text("# Third\n\nA new note.\n")
+        while time.monotonic() < deadline:
+            if "third.md" in indexed_note_ids(store_of(watcher)):
+                break
+            time.sleep(0.05)
+        assert indexed_note_ids(store_of(watcher)) == [
+            "first.md",
+            "folder/second.md",
+            "third.md",
+        ]
+    finally:
+        watcher.stop()
+        thread.join()
@@ -0,0 +1,139 @@
+import pytest
+import numpy as np
+from pathlib import Path
+
+from atlas.core.graph.wikilink_graph import LinkResolver, WikilinkGraph
+from atlas.core.ingester.obsidian_vault_processor import ObsidianVaultProcessor
+
+NOTE_IDS = [
+    "Home.md",
+    "projects/Atlas.md",
+    "projects/Plan.md",
+    "archive/Plan.md",
+    "archive/old/Atlas.md",
+    "daily/2024-01-01.md",
+]
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+@pytest.mark.parametrize(
+    "wikilink, source_note_id, expected",
+    [
+        ("Home", "projects/Atlas.md", "Home.md"),
+        ("home.md", "projects/Atlas.md", "Home.md"),
+        ("Home|Start here", "projects/Atlas.md", "Home.md"),
+        ("Home#Section|Start here", "projects/Atlas.md", "Home.md"),
+        ("Home#^block-id", "projects/Atlas.md", "Home.md"),
+        # shortest path wins over a deeper note with the same name
+        ("Atlas", "Home.md", "projects/Atlas.md"),
+        # a note in the same folder wins, then the shortest path
+        ("Plan", "projects/Atlas.md", "projects/Plan.md"),
+        ("Plan", "archive/old/Atlas.md", "archive/Plan.md"),
+        ("Atlas", "archive/Plan.md", "projects/Atlas.md"),
+        # full and partial paths
+        ("archive/Plan", "projects/Atlas.md", "archive/Plan.md"),
+        ("old/Atlas", "Home.md", "archive/old/Atlas.md"),
+        ("../Plan", "archive/old/Atlas.md", "archive/Plan.md"),
+        ("./Plan", "projects/Atlas.md", "projects/Plan.md"),
+        # not resolved
+        ("#Section", "Home.md", None),
+        ("Home", "Home.md", None),
+        ("Missing note", "Home.md", None),
+        ("image.png", "Home.md", None),
+        ("other/Atlas", "Home.md", None),
+    ],
+)
+def test_link_resolver(
+    wikilink: str, source_note_id: str, expected: str | None
+) -> None:
+    """
+    Test that wikilinks are resolved to notes the way Obsidian does.
+
+    Args:
+        wikilink (str): The raw wikilink.
+        source_note_id (str): The note containing the link.
+        expected (str | None): The expected resolved note.
+    """
+    resolver = LinkResolver(NOTE_IDS)
+    assert resolver.resolve(wikilink, source_note_id) == expected
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_wikilink_graph_build_save_load(tmp_path: Path) -> None:
+    """
+    Test that the graph holds the resolved links and backlinks and that it is
+    memory-mapped when loaded.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    graph = WikilinkGraph.build(
+        [
+            ("Home.md", ["projects/Atlas|Atlas", "projects/Plan", "Missing"]),
+            ("projects/Atlas.md", ["Plan", "Plan#Goals", "Home"]),
+            ("projects/Plan.md", []),
+            ("archive/Plan.md", ["Atlas"]),
+            ("archive/old/Atlas.md", []),
+            ("daily/2024-01-01.md", []),
+        ]
+    )
+
+    graph_path = tmp_path / "graph"
+    graph.save(str(graph_path))
+    loaded = WikilinkGraph.load(str(graph_path))
+
+    for g in (graph, loaded):
+        assert len(g) == 6
+        assert g.links("Home.md") == ["projects/Atlas.md", "projects/Plan.md"]
+        assert g.links("projects/Atlas.md") == ["Home.md", "projects/Plan.md"]
+        assert g.backlinks("projects/Atlas.md") == ["Home.md", "archive/Plan.md"]
+        assert g.backlinks("projects/Plan.md") == ["Home.md", "projects/Atlas.md"]
+        assert g.links("daily/2024-01-01.md") == []
+        assert g.neighbours("projects/Plan.md") == ["Home.md", "projects/Atlas.md"]
+        assert g.neighbours("projects/Plan.md", hops=2) == [
+            "Home.md",
+            "projects/Atlas.md",
+            "archive/Plan.md",
+        ]
+
+    assert isinstance(loaded.forward_indices, np.memmap)
+    assert isinstance(loaded.backward_indptr, np.memmap)
+    with pytest.raises(KeyError):
+        loaded.links("Missing.md")
+
+
+@pytest.mark.unittest
+@pytest.mark.runonci
+def test_ingest_builds_graph(tmp_path: Path) -> None:
+    """
+    Test that ingestion builds the wikilink graph of the vault when `graph_path` is set.
+
+    Args:
+        tmp_path (Path): Temporary directory provided by pytest.
+    """
+    vault_path = tmp_path / "vault"
+    (vault_path / ".obsidian").mkdir(parents=True)
+    (vault_path / ".obsidian" / "app.json").write_text("{}")
+    (vault_path / "topics").mkdir()
+    (vault_path / "topics" / "Graphs.md").write_text(
+        "Links back to [[Home#Intro|home]].", encoding="utf-8"
+    )
+    (vault_path / "Home.md").write_text(
+        "See [[Graphs|the graph note]], [[Graphs#CSR]] and [[Missing]].",
+        encoding="utf-8",
+    )
+    graph_path = tmp_path / "graph"
+    processor = ObsidianVaultProcessor(
+        str(vault_path),
+        str(tmp_path / "obsidian_index.jsonl"),
+        graph_path=str(graph_path),
+    )
+    processor.ingest()
+
+    graph = WikilinkGraph.load(str(graph_path))
+    assert graph.note_ids == ["Home.md", "topics/Graphs.md"]
+    assert graph.links("Home.md") == ["topics/Graphs.md"]
+    assert graph.backlinks("Home.md") == ["topics/Graphs.md"]
+    assert graph.neighbours("topics/Graphs.md") == ["Home.md"]